@@ -1,24 +1,55 @@
 """Utils for API calls."""
 
+import functools
 import logging
 import os
+import time
 from typing import Any, Callable
 
+import http_session
+import import_metrics
 import logging_utils
+import rate_limiter
 import requests
 
 logging.getLogger('urllib3').setLevel(logging.WARNING)
 logger = logging_utils.get_logger()
 
+_METHOD_NAMES = {
+    requests.get: 'GET',
+    requests.post: 'POST',
+    requests.delete: 'DELETE',
+    requests.patch: 'PATCH',
+}
 
-def _get_header(project_id: str) -> dict[str, str]:
+
+def get_header(project_id: str) -> dict[str, str]:
+  return _build_header(project_id, os.environ.get('GCLOUD_ACCESS_TOKEN'))
+
+
+@functools.lru_cache(maxsize=64)
+def _build_header(project_id: str, token: str | None) -> dict[str, str]:
+  # Headers are shared between calls, callers must not modify them.
   return {
       'Content-Type': 'application/json',
-      'Authorization': f'Bearer {os.environ.get("GCLOUD_ACCESS_TOKEN")}',
+      'Authorization': f'Bearer {token}',
       'X-Goog-User-Project': project_id,
   }
 
 
+def log_connection_stats() -> None:
+  """Logs how often pooled connections were reused versus newly opened."""
+  stats = http_session.get_client().connection_stats()
+  if not stats['requests']:
+    return
+  reuse_ratio = stats['reused_connections'] / stats['requests']
+  logger.info(
+      f'HTTP connections: {stats["requests"]} requests,'
+      f' {stats["new_connections"]} new connections,'
+      f' {stats["reused_connections"]} reused ({reuse_ratio:.0%}).'
+  )
+
+
 def extract_error_details(
     response_err: requests.exceptions.RequestException,
 ) -> list[Any]:
@@ -113,60 +144,180 @@ def create_error_message(
   return f'{method_name} call to {url} returned: {err_description}'
 
 
+def non_valid_json_response(method_name: str, url: str) -> dict[str, Any]:
+  """Returns the result of a call whose response body is not valid JSON."""
+  error_msg = f'{method_name} call to {url} returned non valid JSON.'
+  logger.debug(f'[{method_name} {url}] Json decode error: {error_msg}')
+  return {
+      'json': None,
+      'error_msg': error_msg
+  }
+
+
+def json_response(
+    context: str, status_code: int, ok: bool, data: Any
+) -> dict[str, Any]:
+  """Returns the result of a call from its decoded JSON response.
+
+  Args:
+    context: String identifying the call in debug logs.
+    status_code: HTTP status code of the response.
+    ok: Whether the status code indicates success.
+    data: Decoded JSON body of the response.
+
+  Returns:
+    Dictionary with response and error if any. The decoded body of an error
+    response is returned along with its message.
+  """
+  if not ok:
+    # If the response is an error, capture the error message from the JSON
+    error_msg = (data or {}).get('error', {}).get('message') or f'Call returned HTTP {status_code}.'
+    logger.debug(f'{context} Bad response error: {error_msg}')
+    return {
+        'json': data,
+        'error_msg': error_msg
+    }
+  logger.debug(f'{context} Successful response JSON: {data},')
+  return {
+      'json': data,
+      'error_msg': None
+  }
+
+
+def _response_size(response: requests.Response) -> int:
+  content = getattr(response, 'content', None)
+  return len(content) if isinstance(content, bytes) else 0
+
+
+def _retries_connection_error(
+    err: requests.exceptions.RequestException, retry_server_errors: bool
+) -> bool:
+  # A call that could not connect was never sent and is always safe to retry.
+  if isinstance(err, requests.exceptions.ConnectTimeout):
+    return True
+  return retry_server_errors and isinstance(
+      err, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+  )
+
+
+def _send_request(
+    limiter: rate_limiter.AdaptiveLimiter,
+    method_name: str,
+    url: str,
+    project_id: str,
+    request_body: dict[str, Any] | None,
+) -> tuple[requests.Response, float | None]:
+  """Sends one request in a slot of the limiter and records its response."""
+  limiter.acquire()
+  try:
+    res = http_session.get_client().request(
+        method_name, url, headers=get_header(project_id), json=request_body
+    )
+    retry_after = rate_limiter.parse_retry_after(res.headers.get('Retry-After'))
+    limiter.record_response(res.status_code, retry_after)
+    return res, retry_after
+  finally:
+    limiter.release()
+
+
 def fetch_api_response(
     method: Callable[..., Any],
     url: str,
     project_id: str,
     request_body: dict[str, Any] | None = None,
+    retry_server_errors: bool | None = None,
 ) -> dict[str, Any]:
   """REST api call helper.
 
   Args:
-    method: HTTP method name.
+    method: HTTP method, one of requests.get, requests.post,
+      requests.patch or requests.delete. The request itself is sent through
+      the shared connection pool of http_session, paced by the shared
+      rate_limiter and retried on throttling, transient server errors and
+      connection errors.
     url: URL of the resource.
     project_id: Google Cloud Project id.
     request_body: Optional body of request.
+    retry_server_errors: Whether calls failing with a transient server or
+      connection error are retried, see rate_limiter.retries_server_errors.
+      Defaults to True for all methods but POST.
 
   Returns:
     Dictionary with response and error if any.
   """
-  data, error_msg = None, None
-  method_name = 'GET' if method == requests.get else 'POST'
+  method_name = _METHOD_NAMES.get(method, 'GET')
+  retry_server_errors = rate_limiter.retries_server_errors(
+      method_name, retry_server_errors
+  )
+  retryable_status_codes = rate_limiter.retryable_status_codes(
+      method_name, retry_server_errors
+  )
   context = f'[{method_name} {url}]'
+  limiter = rate_limiter.get_limiter()
+  started = time.monotonic()
+  attempt, bytes_received = 0, 0
+  request_size = import_metrics.body_size(request_body)
 
   logger.debug(
     f'{context} Initiating call with project_id: {project_id} and request_body: {request_body}'
   )
   try:
-    res = method(url, headers=_get_header(project_id), json=request_body)
-    logger.debug(f'{context} Response status: {res.status_code}, Response text: {res.text}')
+    for attempt in range(rate_limiter.MAX_RETRIES + 1):
+      time.sleep(limiter.reserve())
+      try:
+        res, retry_after = _send_request(
+            limiter, method_name, url, project_id, request_body
+        )
+      except requests.exceptions.RequestException as err:
+        if (
+            not _retries_connection_error(err, retry_server_errors)
+            or attempt == rate_limiter.MAX_RETRIES
+        ):
+          raise
+        delay = rate_limiter.backoff_seconds(attempt)
+        logger.info(
+            f'{context} Call failed with {err!r}, retrying in'
+            f' {delay:.1f} seconds...'
+        )
+        time.sleep(delay)
+        continue
+      logger.debug(f'{context} Response status: {res.status_code}, Response text: {res.text}')
+      bytes_received += _response_size(res)
+      if (
+          res.status_code in retryable_status_codes
+          and attempt < rate_limiter.MAX_RETRIES
+      ):
+        delay = rate_limiter.backoff_seconds(attempt, retry_after)
+        logger.info(
+            f'{context} Call returned HTTP {res.status_code}, retrying in'
+            f' {delay:.1f} seconds...'
+        )
+        time.sleep(delay)
+        continue
+      break
+    import_metrics.record_call(
+        started,
+        retries=attempt,
+        bytes_sent=request_size * (attempt + 1),
+        bytes_received=bytes_received,
+        failed=not res.ok,
+    )
     try:
       data = res.json()
     except requests.exceptions.JSONDecodeError:
-      error_msg = 'Call returned non-valid JSON.'
-      logger.debug(f'{context} Json decode error: {error_msg}')
-      return {
-          'json': None,
-          'error_msg': error_msg
-      }
-    if not res.ok:
-      # If the response is an error, capture the error message from the JSON
-      error_msg = data.get('error', {}).get('message') or f'Call returned HTTP {res.status_code}.'
-      logger.debug(f'{context} Bad response error: {error_msg}')
-      return {
-          'json': data,
-          'error_msg': error_msg
-      }
-    logger.debug(f'{context} Successful response JSON: {data},')
-    return {
-        'json': data,
-        'error_msg': None
-    }
+      return non_valid_json_response(method_name, url)
+    return json_response(context, res.status_code, res.ok, data)
   except requests.exceptions.RequestException as err:
+    import_metrics.record_call(
+        started,
+        retries=attempt,
+        bytes_sent=request_size * (attempt + 1),
+        bytes_received=bytes_received,
+        failed=True,
+    )
     error_msg = create_error_message(method_name, url, err)
     logger.debug(f'{context} Exception occurred: {error_msg}')
     return {
         'json': None,
         'error_msg': error_msg
     }
-  
\ No newline at end of file
@@ -0,0 +1,210 @@
+"""Asyncio variant of the REST api call helper in api_call_utils.
+
+A single AsyncClient owns one aiohttp session and bounds the number of requests
+in flight with a semaphore, so one process can keep hundreds of calls running
+without one thread per call.
+
+Typical usage example:
+  async with async_api_call_utils.AsyncClient(max_in_flight=200) as client:
+    response = await client.fetch_api_response('GET', url, project_id)
+"""
+
+import asyncio
+import json
+import time
+from typing import Any
+
+import aiohttp
+import api_call_utils
+import import_metrics
+import logging_utils
+import rate_limiter
+
+logger = logging_utils.get_logger()
+
+DEFAULT_MAX_IN_FLIGHT = 200
+# How often a call waiting for a slot of the rate_limiter checks again.
+_ACQUIRE_POLL_SECONDS = 0.01
+_CONNECTION_ERRORS = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+
+
+def _retries_connection_error(
+    err: Exception, retry_server_errors: bool
+) -> bool:
+  # A call that could not connect was never sent and is always safe to retry.
+  if isinstance(err, aiohttp.ClientConnectorError):
+    return True
+  return retry_server_errors and isinstance(err, _CONNECTION_ERRORS)
+
+
+async def _acquire(limiter: rate_limiter.AdaptiveLimiter) -> None:
+  # Polled so that waiting for a slot never blocks the event loop.
+  while not limiter.try_acquire():
+    await asyncio.sleep(_ACQUIRE_POLL_SECONDS)
+
+
+class AsyncClient:
+  """Async HTTP client with a bounded number of requests in flight.
+
+  The client must be used from the event loop it was opened on.
+
+  Attributes:
+    max_in_flight: Maximum number of requests sent concurrently.
+  """
+
+  def __init__(self, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT):
+    if max_in_flight < 1:
+      raise ValueError('Number of requests in flight must be positive.')
+    self.max_in_flight = max_in_flight
+    self._semaphore: asyncio.Semaphore | None = None
+    self._session: aiohttp.ClientSession | None = None
+
+  async def __aenter__(self) -> 'AsyncClient':
+    await self.open()
+    return self
+
+  async def __aexit__(self, *unused_exc_info) -> None:
+    await self.close()
+
+  async def open(self) -> None:
+    self._semaphore = asyncio.Semaphore(self.max_in_flight)
+    self._session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=self.max_in_flight)
+    )
+
+  async def close(self) -> None:
+    if self._session is not None:
+      await self._session.close()
+      self._session = None
+
+  async def _send_request(
+      self,
+      limiter: rate_limiter.AdaptiveLimiter,
+      method_name: str,
+      url: str,
+      project_id: str,
+      request_body: dict[str, Any] | None,
+  ) -> tuple[aiohttp.ClientResponse, str, float | None]:
+    """Sends one request in a slot of the limiter and records its response."""
+    await _acquire(limiter)
+    try:
+      async with self._session.request(
+          method_name,
+          url,
+          headers=api_call_utils.get_header(project_id),
+          json=request_body,
+      ) as res:
+        text = await res.text()
+      retry_after = rate_limiter.parse_retry_after(
+          res.headers.get('Retry-After')
+      )
+      limiter.record_response(res.status, retry_after)
+      return res, text, retry_after
+    finally:
+      limiter.release()
+
+  async def fetch_api_response(
+      self,
+      method_name: str,
+      url: str,
+      project_id: str,
+      request_body: dict[str, Any] | None = None,
+      retry_server_errors: bool | None = None,
+  ) -> dict[str, Any]:
+    """REST api call helper, see api_call_utils.fetch_api_response.
+
+    Calls are paced and limited by the rate_limiter shared with the threaded
+    calls.
+
+    Args:
+      method_name: HTTP method name, e.g. GET, POST or DELETE.
+      url: URL of the resource.
+      project_id: Google Cloud Project id.
+      request_body: Optional body of request.
+      retry_server_errors: Whether calls failing with a transient server or
+        connection error are retried. Defaults to True for all methods but
+        POST.
+
+    Returns:
+      Dictionary with response and error if any.
+    """
+    if self._session is None:
+      raise RuntimeError('AsyncClient is not open.')
+    context = f'[{method_name} {url}]'
+    logger.debug(
+        f'{context} Initiating call with project_id: {project_id} and'
+        f' request_body: {request_body}'
+    )
+    limiter = rate_limiter.get_limiter()
+    retry_server_errors = rate_limiter.retries_server_errors(
+        method_name, retry_server_errors
+    )
+    retryable_status_codes = rate_limiter.retryable_status_codes(
+        method_name, retry_server_errors
+    )
+    started = time.monotonic()
+    attempt, bytes_received = 0, 0
+    request_size = import_metrics.body_size(request_body)
+    try:
+      async with self._semaphore:
+        for attempt in range(rate_limiter.MAX_RETRIES + 1):
+          await asyncio.sleep(limiter.reserve())
+          try:
+            res, text, retry_after = await self._send_request(
+                limiter, method_name, url, project_id, request_body
+            )
+          except _CONNECTION_ERRORS as err:
+            if (
+                not _retries_connection_error(err, retry_server_errors)
+                or attempt == rate_limiter.MAX_RETRIES
+            ):
+              raise
+            delay = rate_limiter.backoff_seconds(attempt)
+            logger.info(
+                f'{context} Call failed with {err!r}, retrying in'
+                f' {delay:.1f} seconds...'
+            )
+            await asyncio.sleep(delay)
+            continue
+          bytes_received += len(text.encode())
+          logger.debug(
+              f'{context} Response status: {res.status}, Response text: {text}'
+          )
+          if (
+              res.status in retryable_status_codes
+              and attempt < rate_limiter.MAX_RETRIES
+          ):
+            delay = rate_limiter.backoff_seconds(attempt, retry_after)
+            logger.info(
+                f'{context} Call returned HTTP {res.status}, retrying in'
+                f' {delay:.1f} seconds...'
+            )
+            await asyncio.sleep(delay)
+            continue
+          break
+      import_metrics.record_call(
+          started,
+          retries=attempt,
+          bytes_sent=request_size * (attempt + 1),
+          bytes_received=bytes_received,
+          failed=not res.ok,
+      )
+      try:
+        data = json.loads(text)
+      except json.JSONDecodeError:
+        return api_call_utils.non_valid_json_response(method_name, url)
+      return api_call_utils.json_response(context, res.status, res.ok, data)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+      import_metrics.record_call(
+          started,
+          retries=attempt,
+          bytes_sent=request_size * (attempt + 1),
+          bytes_received=bytes_received,
+          failed=True,
+      )
+      error_msg = f'{method_name} call to {url} returned: {err!r}'
+      logger.debug(f'{context} Exception occurred: {error_msg}')
+      return {
+          'json': None,
+          'error_msg': error_msg
+      }
@@ -0,0 +1,224 @@
+"""Glossary variant sending its API calls from an asyncio event loop.
+
+AsyncGlossary keeps the import, validation and reporting logic of Glossary, but
+runs entry creates, relationship creates and deletes as coroutines on a single
+async HTTP client. The number of requests in flight is bounded by a semaphore
+instead of by a number of threads, so it can be set in the hundreds.
+"""
+
+import asyncio
+from concurrent import futures
+import threading
+from typing import Any, Awaitable, Callable, TypeVar
+
+import async_api_call_utils
+import category as bg_category
+import entry_type as entry_type_lib
+import error
+import glossary as dc_glossary
+import glossary_diff
+import glossary_identification
+import import_journal
+import import_metrics
+import relation_type
+import snapshot_cache
+import term as bg_term
+import utils
+
+_R = TypeVar('_R')
+
+
+class AsyncGlossary(dc_glossary.Glossary):
+  """Instance of a Business Glossary backed by an asyncio HTTP client.
+
+  The event loop runs on a dedicated thread created together with the
+  instance, and is stopped by close().
+  """
+
+  def __init__(
+      self,
+      config: glossary_identification.GlossaryId,
+      max_workers: int = async_api_call_utils.DEFAULT_MAX_IN_FLIGHT,
+      journal: import_journal.ImportJournal | None = None,
+      snapshot: snapshot_cache.SnapshotCache | None = None,
+      deterministic_ids: bool = False,
+  ):
+    """Initializes the glossary.
+
+    Args:
+      config: Glossary Configuration.
+      max_workers: Maximum number of API calls in flight.
+      journal: Optional journal of completed creates, see Glossary.
+      snapshot: Optional local snapshot of the glossary entries, see Glossary.
+      deterministic_ids: Whether new entries get ids derived from their
+        display name, see Glossary.
+    """
+    super().__init__(
+        config,
+        max_workers=max_workers,
+        journal=journal,
+        snapshot=snapshot,
+        deterministic_ids=deterministic_ids,
+    )
+    self._loop = asyncio.new_event_loop()
+    self._loop_thread = threading.Thread(
+        target=self._loop.run_forever, name='glossary-event-loop', daemon=True
+    )
+    self._loop_thread.start()
+    self._client = async_api_call_utils.AsyncClient(max_in_flight=max_workers)
+    self._run(self._client.open())
+
+  def close(self) -> None:
+    """Closes the HTTP client and stops the event loop."""
+    if self._loop is not None:
+      self._run(self._client.close())
+      self._loop.call_soon_threadsafe(self._loop.stop)
+      self._loop_thread.join()
+      self._loop.close()
+      self._loop = None
+    super().close()
+
+  def _run(self, coroutine: Awaitable[_R]) -> _R:
+    """Runs a coroutine on the event loop thread and waits for its result."""
+    return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+  def _parallelize(
+      self, task: Callable[..., _R], params: list[tuple[Any, ...]]
+  ) -> list[_R]:
+    """Runs the async variant of task for every tuple of arguments in params.
+
+    Tasks without an async variant (named <task>_async) fall back to the thread
+    pool of Glossary.
+
+    Args:
+      task: Function to run.
+      params: List of argument tuples, one per call.
+
+    Returns:
+      List with the result of each call, in the order of params.
+    """
+    async_task = getattr(self, f'{task.__name__}_async', None)
+    if async_task is None:
+      return super()._parallelize(task, params)
+    if self._loop is None:
+      raise RuntimeError('Glossary was already closed.')
+    # Tasks of the event loop don't inherit the metrics phase of the caller
+    return self._run(
+        import_metrics.run_in_phase(
+            import_metrics.current_phase(), self._gather(async_task, params)
+        )
+    )
+
+  def _submit(
+      self, task: Callable[..., _R], args: tuple[Any, ...]
+  ) -> futures.Future:
+    """Starts the async variant of task with args on the event loop.
+
+    Tasks without an async variant fall back to the thread pool of Glossary.
+
+    Args:
+      task: Function to run.
+      args: Arguments of the call.
+
+    Returns:
+      Future of the result of the call.
+    """
+    async_task = getattr(self, f'{task.__name__}_async', None)
+    if async_task is None:
+      return super()._submit(task, args)
+    if self._loop is None:
+      raise RuntimeError('Glossary was already closed.')
+    return asyncio.run_coroutine_threadsafe(
+        import_metrics.run_in_phase(
+            import_metrics.current_phase(), async_task(*args)
+        ),
+        self._loop,
+    )
+
+  @classmethod
+  async def _gather(
+      cls, task: Callable[..., Awaitable[_R]], params: list[tuple[Any, ...]]
+  ) -> list[_R]:
+    return list(await asyncio.gather(*(task(*args) for args in params)))
+
+  async def _create_glossary_entry_async(
+      self, entry: bg_term.Term | bg_category.Category
+  ) -> dict[str, Any]:
+    """Async variant of Glossary._create_glossary_entry."""
+    endpoint, request_body = self._glossary_entry_request(entry)
+    with import_metrics.phase(self._create_entry_phase(entry)):
+      response = await self._client.fetch_api_response(
+          'POST',
+          endpoint,
+          self._config.project_id,
+          request_body,
+          retry_server_errors=self._deterministic_ids,
+      )
+      if response['error_msg'] and self._deterministic_ids:
+        entry_endpoint = (
+            f'{self._glossary_endpoint}/entries/'
+            f'{glossary_diff.entry_id(entry)}?view=FULL'
+        )
+        return self._previously_created_entry(
+            entry,
+            response,
+            await self._client.fetch_api_response(
+                'GET', entry_endpoint, self._config.project_id
+            ),
+        )
+    return response
+
+  async def _update_glossary_entry_async(
+      self, entry: bg_term.Term | bg_category.Category
+  ) -> dict[str, Any]:
+    """Async variant of Glossary._update_glossary_entry."""
+    endpoint, request_body = self._glossary_entry_update_request(entry)
+    return await self._client.fetch_api_response(
+        'PATCH', endpoint, self._config.project_id, request_body
+    )
+
+  async def _create_relationship_async(
+      self,
+      src_display_name: str,
+      src_type: entry_type_lib.EntryType,
+      dst_display_name: str,
+      dst_type: entry_type_lib.EntryType,
+      relationship_type: relation_type.RelationshipType,
+  ) -> error.EntryImportError | None:
+    """Async variant of Glossary._create_relationship."""
+    request = self._relationship_request(
+        src_display_name,
+        src_type,
+        dst_display_name,
+        dst_type,
+        relationship_type,
+    )
+    if isinstance(request, error.EntryImportError):
+      return request
+    endpoint, request_body = request
+
+    with import_metrics.phase(f'create_{relationship_type.value}'):
+      ret = await self._client.fetch_api_response(
+          'POST', endpoint, self._config.project_id, request_body
+      )
+    return self._relationship_response_error(
+        ret, src_display_name, src_type, dst_display_name, relationship_type
+    )
+
+  async def _remove_glossary_entry_async(
+      self, entry_id: str
+  ) -> dict[str, Any]:
+    """Async variant of Glossary._remove_glossary_entry."""
+    endpoint = f'{self._glossary_endpoint}/entries/{entry_id}'
+    return await self._client.fetch_api_response(
+        'DELETE', endpoint, self._config.project_id
+    )
+
+  async def _remove_relationship_async(
+      self, relationship_name: str
+  ) -> dict[str, Any]:
+    """Async variant of Glossary._remove_relationship."""
+    endpoint = f'{utils.DATACATALOG_BASE_URL}/{relationship_name}'
+    return await self._client.fetch_api_response(
+        'DELETE', endpoint, self._config.project_id
+    )
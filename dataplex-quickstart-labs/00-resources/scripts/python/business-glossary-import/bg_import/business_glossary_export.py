@@ -30,7 +30,7 @@ import csv
 import os
 import requests
 import sys
-from typing import Any, List, Dict
+from typing import Any, Iterable, List, Dict
 import glossary as dc_glossary
 import glossary_identification
 import api_call_utils
@@ -38,7 +38,7 @@ import logging_utils
 import utils
 import time
 import math
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 import multiprocessing
 
 logger = logging_utils.get_logger()
@@ -133,7 +133,7 @@ def process_entry(
 
 
 def export_glossary_entries(
-    entries: List[Dict[str, Any]],
+    entries: Iterable[Dict[str, Any]],
     categories_csv: str,
     terms_csv: str,
     project: str,
@@ -142,7 +142,7 @@ def export_glossary_entries(
     """Exports the glossary entries to a CSV file.
 
     Args:
-        entries: The list of entries to export.
+        entries: The entries to export, possibly still being listed.
         categories_csv: The path to the CSV file to export the categories data.
         terms_csv: The path to the CSV file to export the terms data.
         project: The Google Cloud Project ID.
@@ -173,35 +173,59 @@ def export_glossary_entries(
             terms_file, fieldnames=terms_fields, quoting=csv.QUOTE_ALL
         )
 
-        relationships_data = utils.fetch_all_relationships(entries, project, max_workers)
-        chunk_size = max_workers
-        num_batches = math.ceil(len(entries) / chunk_size)
+        def write_result(future):
+            result = future.result()
+            if result:
+                if result["type"] == "term":
+                    terms_writer.writerow(result["data"])
+                elif result["type"] == "category":
+                    categories_writer.writerow(result["data"])
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            for batch in range(num_batches):
-                start = batch * chunk_size
-                end = start + chunk_size
-                entries_batch = entries[start:end]
-
-                futures = [
-                    executor.submit(process_entry, entry, relationships_data, project)
-                    for entry in entries_batch
-                ]
+        # Entries listed whose relationships are not fetched yet, by name
+        listed_entries = {}
 
-                for future in as_completed(futures):
-                    result = future.result()
-                    if result:
-                        if result["type"] == "term":
-                            terms_writer.writerow(result["data"])
-                        elif result["type"] == "category":
-                            categories_writer.writerow(result["data"])
+        def record_entries(entries):
+            for entry in entries:
+                listed_entries[entry["name"]] = entry
+                yield entry
 
+        # Each entry is transformed as soon as its relationships are fetched,
+        # while the next entries are still being listed
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = set()
+            for entry_name, relationships in utils.iter_all_relationships(
+                record_entries(entries), project, max_workers
+            ):
+                entry = listed_entries.pop(entry_name)
+                pending.add(
+                    executor.submit(
+                        process_entry, entry, {entry_name: relationships}, project
+                    )
+                )
+                done, pending = wait(pending, timeout=0)
+                for future in done:
+                    write_result(future)
+            # Entries whose relationships could not be fetched are exported
+            # without them
+            if listed_entries:
+                logger.warning(
+                    f"Relationships of {len(listed_entries)} entries could not"
+                    " be fetched."
+                )
+            for entry in listed_entries.values():
+                pending.add(executor.submit(process_entry, entry, {}, project))
+            for future in as_completed(pending):
+                write_result(future)
 
 def main():
     args = utils.get_export_arguments()
     utils.validate_export_args(args)
-    entries = utils.fetch_entries(args.project, args.location, args.group)
+    utils.configure_http_session(args)
+    entries = utils.fetch_entries(
+        args.project, args.project, args.location, args.group
+    )
     export_glossary_entries(entries, args.categories_csv, args.terms_csv, args.project)
+    api_call_utils.log_connection_stats()
 
 
 if __name__ == "__main__":
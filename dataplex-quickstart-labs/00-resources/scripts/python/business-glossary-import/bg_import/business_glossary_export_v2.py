@@ -19,21 +19,24 @@ import logging_utils
 import logging
 import utils
 import re
-from typing import Any, List, Dict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, List, Dict, Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 import time
 import api_call_utils
 import requests
 import os
 import sys
 import subprocess
+import threading
 from collections import defaultdict
 
 logger = logging_utils.get_logger()
 
 MAX_WORKERS = 20
 GLOSSARY_EXPORT_LOCATION = "global"
-entrygroup_to_glossaryid_map = {}
+CATALOG_SEARCH_URL = "https://datacatalog.googleapis.com/v1/catalog:search"
+# Terms whose tagged assets are found by one catalog search in by_asset mode.
+TERMS_PER_SEARCH = 20
 
 
 def get_entry_type_name(entry_type: str) -> str:
@@ -106,9 +109,321 @@ def get_export_resource_by_id(entry_id: str, entry_type: str) -> str:
     else:
         return f"projects/{PROJECT}/locations/{GLOSSARY_EXPORT_LOCATION}/glossaries/{NORMALIZED_GLOSSARY}"
 
+def get_dataplex_entry_name(relative_resource_name: str, linked_resource: str) -> str:
+    """
+    Returns the name of the Dataplex entry of an asset found by catalog search.
+
+    Args:
+        relative_resource_name (str): The Data Catalog name of the asset entry.
+        linked_resource (str): The linked resource of the asset, without leading slashes.
+    Returns:
+        str: The entry name, with the linked resource as entry id.
+    """
+    new_entry_id = re.sub(r"^/+", "", linked_resource)
+    return re.sub(r"entries/[^/]+$", f"entries/{new_entry_id}", relative_resource_name)
+
+
+class OnceCache:
+    """
+    Thread-safe memo computing the value of each key once.
+
+    The first thread asking for a key computes its value. Threads asking for
+    the same key meanwhile wait for that result instead of computing it again.
+    Values that are not kept and errors are only shared with those threads:
+    the next request of the key computes it again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict[Any, Future] = {}
+        self._requests = 0
+
+    def get(
+        self,
+        key: Any,
+        compute: Callable[[], Any],
+        keep: Callable[[Any], bool] = lambda value: True,
+    ) -> Any:
+        """
+        Returns the value of key, calling compute if it is not cached.
+
+        Args:
+            key: The key of the value.
+            compute: Function returning the value, or raising its error.
+            keep: Whether a computed value is cached for later requests.
+        Returns:
+            The value computed for key.
+        """
+        with self._lock:
+            self._requests += 1
+            future = self._values.get(key)
+            is_first = future is None
+            if is_first:
+                future = self._values[key] = Future()
+        if is_first:
+            try:
+                value = compute()
+            except Exception as exc:
+                self._evict(key, future)
+                future.set_exception(exc)
+            else:
+                if not keep(value):
+                    self._evict(key, future)
+                future.set_result(value)
+        return future.result()
+
+    def _evict(self, key: Any, future: Future) -> None:
+        with self._lock:
+            if self._values.get(key) is future:
+                del self._values[key]
+
+    def size(self) -> int:
+        """Returns the number of keys whose value is cached or computed."""
+        with self._lock:
+            return len(self._values)
+
+    def requests(self) -> int:
+        """Returns the number of times values were asked for."""
+        with self._lock:
+            return self._requests
+
+
+# Glossary ids by "projects/<project>/locations/<location>/entryGroups/<group>".
+glossary_ids_by_entry_group = OnceCache()
+
+
+class AssetCache:
+    """
+    Per-run memo of the assets found by the term-to-asset link export.
+
+    Many terms tag the same asset. The Dataplex entry of each asset is looked
+    up, and its BASIC relationships fetched, only by the first thread asking
+    for it. Threads asking for the same asset meanwhile wait for that result.
+    """
+
+    def __init__(self, user_project: str):
+        self._user_project = user_project
+        self._assets = OnceCache()
+
+    def relationships(self, relative_resource_name: str, linked_resource: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Returns the BASIC relationships of an asset.
+
+        Args:
+            relative_resource_name (str): The Data Catalog name of the asset entry, the cache key.
+            linked_resource (str): The linked resource of the asset, without leading slashes.
+        Returns:
+            The relationships, or None if the asset has no Dataplex entry or its
+            relationships couldn't be fetched.
+        """
+        return self._assets.get(
+            relative_resource_name,
+            lambda: self._fetch(relative_resource_name, linked_resource),
+        )
+
+    def size(self) -> int:
+        """Returns the number of distinct assets asked for."""
+        return self._assets.size()
+
+    def requests(self) -> int:
+        """Returns the number of times assets were asked for."""
+        return self._assets.requests()
+
+    def _fetch(self, relative_resource_name: str, linked_resource: str) -> Optional[List[Dict[str, Any]]]:
+        relative_resource_name_v2 = get_dataplex_entry_name(relative_resource_name, linked_resource)
+        requested_project_name = ""
+        match = re.match(r"projects/([^/]+)/locations/([^/]+)/", relative_resource_name_v2)
+        if match:
+            requested_project_name = f"projects/{match.group(1)}/locations/{match.group(2)}"
+
+        entry_get_url = f"https://dataplex.googleapis.com/v1/{requested_project_name}:lookupEntry?entry={relative_resource_name_v2}"
+        logger.debug(f"Fetching entry for linked resource: {linked_resource} from URL: {entry_get_url}")
+        entry_check = api_call_utils.fetch_api_response(requests.get, entry_get_url, self._user_project)
+        logger.debug(f"Entry check response: {entry_check}")
+        if not entry_check.get("json") or entry_check.get("error_msg"):
+            logger.warning(f"Dataplex entry not found for linked resource: {linked_resource}")
+            return None
+
+        try:
+            relationships = utils.fetch_relationships(relative_resource_name, self._user_project, "BASIC")
+        except ValueError as exc:
+            logger.warning(f"Skipping linked resource {linked_resource}: {exc}")
+            return None
+        logger.debug(f"Relationships response for {relative_resource_name}: {relationships}")
+        return relationships
+
+
+def build_definition_link(
+    term_entry: Dict[str, Any],
+    relationship: Dict[str, Any],
+    relative_resource_name: str,
+    relative_resource_name_v2: str,
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Constructs the definition entry link of an asset described by a term.
+
+    Args:
+        term_entry (Dict[str, Any]): The glossary term.
+        relationship (Dict[str, Any]): The is_described_by relationship of the asset to the term.
+        relative_resource_name (str): The Data Catalog name of the asset entry.
+        relative_resource_name_v2 (str): The Dataplex name of the asset entry.
+    Returns:
+        The PROJECT_LOCATION_ENTRYGROUP of the asset, grouping the links into
+        files, and the entry link.
+    """
+    rel_id = get_entry_link_id(relationship.get("name", ""))
+    source_column = relationship.get("sourceColumn", "")
+    # extract project & location from the relative resource name
+    m = re.match(r"projects/([^/]+)/locations/([^/]+)/", relative_resource_name_v2)
+    proj = m.group(1) if m else PROJECT
+    loc  = m.group(2) if m else LOCATION
+    entrygroup_match = re.search(r"entryGroups/([^/]+)/", relative_resource_name)
+    eg = entrygroup_match.group(1) if entrygroup_match else "@dataplex"
+    # Normalize project, location, and entry group for filename safety
+    ple = f"{Normalize_name(proj)}_{Normalize_name(loc)}_{Normalize_name(eg)}"
+    entry_link_name = f"projects/{proj}/locations/{loc}/entryGroups/{eg}/entryLinks/{rel_id}"
+    entry_id = get_entry_id(term_entry.get("name", ""))
+    entry_reference_source = {
+        "name": relative_resource_name_v2,
+        "path": f"Schema.{source_column}" if source_column else "",
+        "type": "SOURCE",
+    }
+    entry_reference_target = {
+        "name": f"projects/{PROJECT}/locations/global/entryGroups/@dataplex/entries/{get_export_resource_by_id(entry_id, term_entry.get('entryType', 'glossary_term'))}",
+        "path": "",
+        "type": "TARGET",
+    }
+    link = {
+        "entryLink": {
+            "name": entry_link_name,
+            "entryLinkType": get_entry_link_type_name("is_described_by"),
+            "entryReferences": [entry_reference_source, entry_reference_target],
+        }
+    }
+    return ple, link
+
+
+def search_catalog(request_body: Dict[str, Any], description: str) -> Dict[str, Any]:
+    """
+    Runs one page of a catalog search, stopping the export if it fails.
+
+    Searches are retried on throttling, transient server errors and connection
+    errors by api_call_utils. A search still failing after that would silently
+    drop the definition links of its terms from the exported files, so the
+    export stops instead.
+
+    Args:
+        request_body (Dict[str, Any]): The body of the search request.
+        description (str): What is searched, for the error message.
+    Returns:
+        Dict[str, Any]: The JSON response of the search.
+    """
+    logger.debug(f"Searching for {description}: {request_body}")
+    search_response = api_call_utils.fetch_api_response(requests.post, CATALOG_SEARCH_URL, USER_PROJECT, request_body, retry_server_errors=True)
+    if search_response.get("error_msg"):
+        logger.error(f"Search for {description} failed: {search_response['error_msg']}")
+        sys.exit(1)
+    return search_response.get("json") or {}
+
+
+def search_tagged_assets(term_ids: List[str]) -> Dict[str, str]:
+    """
+    Finds the assets tagged with any of the terms in one catalog search.
+
+    Args:
+        term_ids (List[str]): The entry ids of the terms.
+    Returns:
+        Dict[str, str]: The linked resource of each asset, by the Data Catalog
+        name of its entry.
+    """
+    query = " OR ".join(f"term:{term_id}" for term_id in term_ids)
+    request_body = {
+        "orderBy": "relevance",
+        "pageSize": 1000,
+        "query": f"({query})",
+        "scope": {
+            "includeOrgIds": ORG_IDS,
+        }
+    }
+    assets = {}
+    while True:
+        response_json = search_catalog(request_body, f"the assets of {len(term_ids)} terms")
+        for result in response_json.get("results", []):
+            linked_resource = result.get("linkedResource", "").lstrip("/")
+            relative_resource_name = result.get("relativeResourceName", "")
+            if linked_resource and relative_resource_name:
+                assets[relative_resource_name] = linked_resource
+        page_token = response_json.get("nextPageToken")
+        if not page_token:
+            return assets
+        request_body = {**request_body, "pageToken": page_token}
+
+
+def collect_definition_links_by_asset(
+    entries: List[Dict[str, Any]],
+    asset_cache: AssetCache,
+    max_workers: int = MAX_WORKERS,
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Finds the definition links of all terms by walking each tagged asset once.
+
+    The assets tagged with the terms are found by catalog searches for
+    TERMS_PER_SEARCH terms at a time. The relationships of each asset are then
+    read once, and every relationship to a term of the glossary becomes a link,
+    through an index of the terms by entry uid. This costs one search per
+    TERMS_PER_SEARCH terms and one lookup and relationships listing per asset,
+    instead of one search per term and one relationships scan per term and
+    asset.
+
+    Args:
+        entries (List[Dict[str, Any]]): The glossary entries.
+        asset_cache (AssetCache): The assets looked up in this run.
+        max_workers (int): Number of searches or assets processed at the same time.
+    Returns:
+        The PROJECT_LOCATION_ENTRYGROUP and the entry link of each definition link.
+    """
+    terms_by_uid = {
+        entry["entryUid"]: entry
+        for entry in entries
+        if entry.get("entryType") == "glossary_term" and entry.get("entryUid")
+    }
+    term_ids = [get_entry_id(term.get("name", "")) for term in terms_by_uid.values()]
+    term_id_batches = [
+        term_ids[start:start + TERMS_PER_SEARCH]
+        for start in range(0, len(term_ids), TERMS_PER_SEARCH)
+    ]
+
+    def asset_links(asset: Tuple[str, str]) -> List[Tuple[str, Dict[str, Any]]]:
+        relative_resource_name, linked_resource = asset
+        relationships = asset_cache.relationships(relative_resource_name, linked_resource)
+        relative_resource_name_v2 = get_dataplex_entry_name(relative_resource_name, linked_resource)
+        links = []
+        for rel in relationships or []:
+            term_entry = terms_by_uid.get(get_entry_id(rel.get("destinationEntryName", "")))
+            if term_entry:
+                links.append(build_definition_link(term_entry, rel, relative_resource_name, relative_resource_name_v2))
+        return links
+
+    assets = {}
+    links = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for found_assets in executor.map(search_tagged_assets, term_id_batches):
+            assets.update(found_assets)
+        logger.info(
+            f"Found {len(assets)} assets tagged with {len(term_ids)} terms in"
+            f" {len(term_id_batches)} searches."
+        )
+        for found_links in executor.map(asset_links, assets.items()):
+            links.extend(found_links)
+    return links
+
+
 def fetch_glossary_id(entry_full_name: str, user_project: str) -> str:
     """
     Given an entry name, fetch the glossary ID (entry ID) if not already cached.
+
+    The glossary ID of each entry group is fetched once, even by concurrent
+    workers. Failed lookups are tried again by the next entry of the group.
     """
     match = re.search(r"(projects/[^/]+/locations/[^/]+)/entryGroups/([^/]+)/entries/([^/]+)", entry_full_name)
     if not match:
@@ -116,17 +431,14 @@ def fetch_glossary_id(entry_full_name: str, user_project: str) -> str:
 
     project_loc, entry_group_id, entry_id = match.groups()
     key = f"{project_loc}/entryGroups/{entry_group_id}"
-    if key in entrygroup_to_glossaryid_map:
-        return entrygroup_to_glossaryid_map[key]
 
-    url = f"https://datacatalog.googleapis.com/v2/{key}/entries/{entry_id}"
-    response = api_call_utils.fetch_api_response(requests.get, url, user_project)
-    glossary_name = response.get("json", {}).get("name", "")
+    def fetch() -> str:
+        url = f"https://datacatalog.googleapis.com/v2/{key}/entries/{entry_id}"
+        response = api_call_utils.fetch_api_response(requests.get, url, user_project)
+        glossary_name = (response.get("json") or {}).get("name", "")
+        return utils.normalize_glossary_id(get_entry_id(glossary_name))
 
-    glossary_id = get_entry_id(glossary_name)
-    if glossary_id:
-        entrygroup_to_glossaryid_map[key] = glossary_id
-    return utils.normalize_glossary_id(glossary_id)
+    return glossary_ids_by_entry_group.get(key, fetch, keep=bool)
 
 def build_parent_mapping(
     entries: List[Dict[str, Any]], relationships_data: Dict[str, List[Dict[str, Any]]]
@@ -385,23 +697,43 @@ def export_combined_entry_links_json(
     relationships_data: Dict[str, List[Dict[str, Any]]],
     project_id: str,
     entrylinktype_set: set,
+    definition_links_mode: str = "per_term",
 ):
     """
     Export term-term and term-entry entry links with enhanced filtering and dynamic file handling.
 
     entrylinktype_set is a set of full relationshipType strings, e.g.:
        {"is_synonymous_to", "is_related_to", "is_described_by"} 
+
+    definition_links_mode is "per_term" to search the assets of each term and
+    scan them for that term, or "by_asset" to find the assets of all terms and
+    read the links of every term from each asset once.
     """
     all_links: List[Dict[str, Any]] = []
     seen_link_names = set()
     # group definition links by PROJECT_LOCATION_ENTRYGROUP
     definition_links_by_ple = defaultdict(list)
     term_links: List[Dict[str, Any]] = []
+
+    def add_link(ple: Optional[str], link: Dict[str, Any]) -> None:
+        """Adds a term-term link (ple None) or a definition link, once."""
+        if link["entryLink"]["name"] in seen_link_names:
+            return
+        seen_link_names.add(link["entryLink"]["name"])
+        all_links.append(link)
+        if ple is None:
+            term_links.append(link)
+        else:
+            definition_links_by_ple[ple].append(link)
+
+    # Assets tagged by several terms are only looked up once
+    asset_cache = AssetCache(USER_PROJECT)
     logger.debug("Processing entry links...")
 
-    def process_term_links(entry: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # Workers only return their links, which are merged by the calling thread
+    def process_term_links(entry: Dict[str, Any]) -> List[Tuple[Optional[str], Dict[str, Any]]]:
         logger.debug(f"Processing entry: {entry.get('name', 'Unknown Entry')}")
-        entry_links: List[Dict[str, Any]] = []
+        entry_links: List[Tuple[Optional[str], Dict[str, Any]]] = []
         entry_name = entry.get("name", "")
         relationships = relationships_data.get(entry_name, [])
         logger.debug(f"Found {len(relationships)} relationships for entry: {entry_name}")
@@ -432,22 +764,18 @@ def export_combined_entry_links_json(
                             )
                     link = build_entry_link(source_entry_name, destination_entry_name, link_type, entry_link_id)
                     logger.debug(f"Adding link: {link['entryLink']['name']}")
-                    if link["entryLink"]["name"] not in seen_link_names:
-                        seen_link_names.add(link["entryLink"]["name"])
-                        entry_links.append(link)
-                        term_links.append(link)
+                    entry_links.append((None, link))
         logger.debug(f"Processed {len(entry_links)} links for entry: {entry_name}")
         return entry_links
 
-    def process_term_entry_links(entry: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def process_term_entry_links(entry: Dict[str, Any]) -> List[Tuple[Optional[str], Dict[str, Any]]]:
         logger.debug(f"Processing entry for term-entry links: {entry.get('name', 'Unknown Entry')}")
-        entry_links: List[Dict[str, Any]] = []
+        entry_links: List[Tuple[Optional[str], Dict[str, Any]]] = []
         if entry.get("entryType") != "glossary_term":
             return entry_links
 
         entry_id = get_entry_id(entry.get("name", ""))
         entry_uid = entry.get("entryUid", "")
-        search_url = "https://datacatalog.googleapis.com/v1/catalog:search"
         request_body = {
             "orderBy": "relevance",
             "pageSize": 1000,
@@ -457,10 +785,9 @@ def export_combined_entry_links_json(
             }
         }
 
-        logger.debug(f"Searching for entry links: {search_url} {request_body}")
-        search_response = api_call_utils.fetch_api_response(requests.post, search_url, USER_PROJECT, request_body)
-        logger.debug(f"Search response: {search_response} for {request_body}")
-        results = search_response.get("json", {}).get("results", [])
+        response_json = search_catalog(request_body, f"the assets of term {entry_id}")
+        logger.debug(f"Search response: {response_json} for {request_body}")
+        results = response_json.get("results", [])
 
         for result in results:
             linked_resource = result.get("linkedResource", "").lstrip("/")
@@ -469,79 +796,43 @@ def export_combined_entry_links_json(
             if not linked_resource or not relative_resource_name:
                 continue
 
-            new_entry_id = re.sub(r"^/+", "", linked_resource)
-            relative_resource_name_v2 = re.sub(r"entries/[^/]+$", f"entries/{new_entry_id}", relative_resource_name)
-
-            requested_project_name = ""
-            match = re.match(r"projects/([^/]+)/locations/([^/]+)/", relative_resource_name_v2)
-            if match:
-                project_id_from_relative_resource_name_v2 = match.group(1)
-                location_from_relative_resource_name_v2 = match.group(2)
-                requested_project_name = f"projects/{project_id_from_relative_resource_name_v2}/locations/{location_from_relative_resource_name_v2}"
-
-            entry_get_url = f"https://dataplex.googleapis.com/v1/{requested_project_name}:lookupEntry?entry={relative_resource_name_v2}"
-            logger.debug(f"Fetching entry for linked resource: {linked_resource} from URL: {entry_get_url}")
-            entry_check = api_call_utils.fetch_api_response(requests.get, entry_get_url, USER_PROJECT)
-            logger.debug(f"Entry check response: {entry_check}")
-            if not entry_check.get("json") or entry_check.get("error_msg"):
-                logger.warning(f"Dataplex entry not found for linked resource: {linked_resource}")
+            relative_resource_name_v2 = get_dataplex_entry_name(relative_resource_name, linked_resource)
+            relationships = asset_cache.relationships(relative_resource_name, linked_resource)
+            if relationships is None:
                 continue
 
-            relationships = utils.fetch_relationships(relative_resource_name, USER_PROJECT, "BASIC")
-            logger.debug(f"Relationships response for {relative_resource_name}: {relationships}")
-
             for rel in relationships:
                 logger.debug(f"Processing relationship: {rel.get('name', 'Unknown Relationship')}")
                 dest_entry = rel.get("destinationEntryName", "")
-                source_column = rel.get("sourceColumn", "")
                 if get_entry_id(dest_entry) == entry_uid:
-                    rel_id = get_entry_link_id(rel.get("name", ""))
-                    # extract project & location from the relative resource name
-                    m = re.match(r"projects/([^/]+)/locations/([^/]+)/", relative_resource_name_v2)
-                    proj = m.group(1) if m else PROJECT
-                    loc  = m.group(2) if m else LOCATION
-                    entrygroup_match = re.search(r"entryGroups/([^/]+)/", relative_resource_name)
-                    eg = entrygroup_match.group(1) if entrygroup_match else "@dataplex"
-                    # Normalize project, location, and entry group for filename safety
-                    ple = f"{Normalize_name(proj)}_{Normalize_name(loc)}_{Normalize_name(eg)}"
-                    entry_link_name = f"projects/{proj}/locations/{loc}/entryGroups/{eg}/entryLinks/{rel_id}"
-                    entry_reference_source = {
-                        "name": relative_resource_name_v2,
-                        "path": f"Schema.{source_column}" if source_column else "",
-                        "type": "SOURCE",
-                    }
-                    entry_reference_target = {
-                        "name": f"projects/{PROJECT}/locations/global/entryGroups/@dataplex/entries/{get_export_resource_by_id(entry_id, entry.get('entryType', 'glossary_term'))}",
-                        "path": "",
-                        "type": "TARGET",
-                    }
-
-                    link = {
-                        "entryLink": {
-                            "name": entry_link_name,
-                            "entryLinkType": get_entry_link_type_name("is_described_by"),
-                            "entryReferences": [entry_reference_source, entry_reference_target],
-                        }
-                    }
+                    ple, link = build_definition_link(entry, rel, relative_resource_name, relative_resource_name_v2)
                     logger.debug(f"Adding definition link: {link['entryLink']['name']}")
-                    if link["entryLink"]["name"] not in seen_link_names:
-                        seen_link_names.add(link["entryLink"]["name"])
-                        definition_links_by_ple[ple].append(link)
-                        entry_links.append(link)
+                    entry_links.append((ple, link))
         logger.debug(f"Processed {entry_links} term-entry links for entry: {entry.get('name', 'Unknown Entry')}")
         return entry_links
 
+    export_definition_links = "is_described_by" in entrylinktype_set
     with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
         futures = []
         if {"is_synonymous_to", "is_related_to"} & entrylinktype_set:
             futures += [executor.submit(process_term_links, e) for e in entries]
-        if "is_described_by" in entrylinktype_set:
+        if export_definition_links and definition_links_mode == "per_term":
             futures += [executor.submit(process_term_entry_links, e) for e in entries]
 
-        for future in as_completed(futures):
-            result = future.result()
-            if result:
-                all_links.extend(result)
+        # Merged in submission order, so that the output doesn't depend on
+        # which worker finishes first
+        for future in futures:
+            for ple, link in future.result():
+                add_link(ple, link)
+
+    if export_definition_links and definition_links_mode == "by_asset":
+        for ple, link in collect_definition_links_by_asset(entries, asset_cache):
+            add_link(ple, link)
+    if export_definition_links:
+        logger.info(
+            f"Looked up {asset_cache.size()} assets for {asset_cache.requests()}"
+            " search results of terms."
+        )
 
     # Always write into "Exported_Files/" folder
     default_dir = os.path.join(os.getcwd(), "Exported_Files")
@@ -610,6 +901,7 @@ def main():
 
     utils.validate_export_v2_args(args)
     utils.maybe_override_args_from_url(args)
+    utils.configure_http_session(args)
 
     
     global DATAPLEX_ENTRY_GROUP, USER_PROJECT, PROJECT, LOCATION, GLOSSARY, NORMALIZED_GLOSSARY, PROJECT_NUMBER, DATACATALOG_BASE_URL, ORG_IDS
@@ -651,7 +943,7 @@ def main():
         ORG_IDS = org_ids
 
     logger.info("Fetching entries in the Glossary...")
-    entries = utils.fetch_entries(USER_PROJECT,PROJECT, LOCATION, args.group)
+    entry_stream = utils.fetch_entries(USER_PROJECT,PROJECT, LOCATION, args.group)
 
     # Parse entrylinktype into a set of full relationshipType strings
     entrylinktype_set = parse_entrylinktype_arg(args.entrylinktype)
@@ -662,8 +954,13 @@ def main():
     )
     if need_relationships:
         logger.info("Fetching entry relationships...")
-        relationships_data = utils.fetch_all_relationships(entries, USER_PROJECT, PROJECT)
+        # Relationships are fetched while the entries are still being listed
+        entries = []
+        relationships_data = utils.fetch_all_relationships(
+            utils.record_entries(entry_stream, entries), USER_PROJECT, PROJECT
+        )
     else:
+        entries = list(entry_stream)
         relationships_data = {}
 
     # Build parent_mapping if exporting glossary entries
@@ -691,10 +988,12 @@ def main():
             relationships_data,
             PROJECT,
             entrylinktype_set,
+            args.definition_links,
         )
 
      # Create Glossary in Dataplex if it does not exist
     utils.create_glossary(USER_PROJECT, PROJECT, args.location, args.group, GLOSSARY)
+    api_call_utils.log_connection_stats()
 
 
 if __name__ == "__main__":
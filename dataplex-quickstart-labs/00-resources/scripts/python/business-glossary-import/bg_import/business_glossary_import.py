@@ -1,16 +1,28 @@
 import argparse
+import contextlib
 import sys
 
 
 
+import api_call_utils
+import async_glossary
 import categories_csv_parser
+import category as bg_category
 import entry_type as entry_type_lib
+import error
 import glossary as dc_glossary
 import glossary_identification
+import import_journal
+import import_metrics
 import import_mode as import_mode_lib
+import import_planner
+import import_spool
 import import_types
 import logging_utils
 import parser_types
+import rate_limiter
+import snapshot_cache
+import term as bg_term
 import terms_csv_parser
 import user_report
 import utils
@@ -22,30 +34,76 @@ logger = logging_utils.get_logger()
 def main() -> None:
   args = utils.get_arguments()
   utils.validate_args(args)
+  utils.configure_http_session(args)
   import_mode = utils.get_import_mode(args)
 
+  # Completed creates are only journaled when asked for, so that the run can
+  # be resumed if it is interrupted
+  journal = None
+  if args.journal or args.resume:
+    journal = import_journal.ImportJournal(
+        utils.get_journal_path(args), resume=args.resume
+    )
+
+  snapshot = None
+  if args.snapshot_cache:
+    snapshot = snapshot_cache.SnapshotCache(
+        args.snapshot_cache, refresh=args.refresh_snapshot
+    )
+
   # Create glossary using provided information
+  glossary_class = (
+      async_glossary.AsyncGlossary if args.use_async else dc_glossary.Glossary
+  )
   try:
-    glossary = dc_glossary.Glossary(
+    glossary = glossary_class(
         glossary_identification.GlossaryId(
             project_id=args.project,
             location=args.location,
             entry_group=args.group,
             glossary_id=args.glossary,
-        )
+        ),
+        max_workers=args.max_workers,
+        journal=journal,
+        snapshot=snapshot,
+        deterministic_ids=args.deterministic_ids,
     )
   except ValueError:
     logger.error("Can't proceed with import. Please select a valid glossary.")
     utils.end_program_execution()
-
-  parsers_results = _parse_all_csv_files(args)
-  _print_parsing_errors(parsers_results)
-  if not glossary.is_glossary_empty():
-    _handle_non_empty_glossary(import_mode, glossary)
-
-  imported_entries, imported_relations, import_errors = (
-      _import_glossary_entries(glossary, parsers_results)
-  )
+  finally:
+    # The snapshot is only read and saved while loading the glossary
+    if snapshot is not None:
+      snapshot.close()
+
+  if args.streaming:
+    with journal or contextlib.nullcontext(), glossary:
+      lines_read, imported_counts, imported_relation_counts, import_errors = (
+          _import_streaming(glossary, import_mode, args)
+      )
+    user_report.print_streaming_report(
+        lines_read, imported_counts, imported_relation_counts, import_errors
+    )
+    _finish_import(args, import_errors)
+    return
+
+  with journal or contextlib.nullcontext(), glossary:
+    parsers_results = _parse_all_csv_files(args)
+    _print_parsing_errors(parsers_results)
+    _validate_relationships(
+        glossary, parsers_results, import_mode, args.max_category_depth
+    )
+    if args.plan:
+      _print_import_plan(glossary, parsers_results, import_mode, args)
+      _report_metrics(args)
+      return
+    # The glossary holds the entries of the run being resumed
+    if not args.resume and not glossary.is_glossary_empty():
+      _handle_non_empty_glossary(import_mode, glossary)
+
+    imported_entries, imported_relations, import_errors = (
+        _import_glossary_entries(glossary, parsers_results, import_mode)
+    )
   lines_read = _lines_read(parsers_results)
 
   user_report.print_report(
@@ -54,11 +112,113 @@ def main() -> None:
       imported_relations,
       import_errors,
   )
+  _finish_import(args, import_errors)
+
+
+def _finish_import(
+    args: argparse.Namespace, import_errors: list[error.EntryImportError]
+) -> None:
+  """Reports the API calls and exits with an error if the import had any."""
+  api_call_utils.log_connection_stats()
+  _report_metrics(args)
   if import_errors:
     logger.warning("Import script execution finalized with some errors.")
     sys.exit(1)
 
 
+def _import_streaming(
+    glossary: dc_glossary.Glossary,
+    import_mode: import_mode_lib.ImportMode,
+    args: argparse.Namespace,
+) -> tuple[
+    dict[entry_type_lib.EntryType, int],
+    dict[entry_type_lib.EntryType, int],
+    dict[entry_type_lib.EntryType, int],
+    list[error.EntryImportError],
+]:
+  """Imports the terms CSV file through an on-disk spool, window by window.
+
+  The terms are parsed into the spool, validated and imported
+  args.window_size at a time, so that memory use doesn't grow with the size
+  of the terms CSV file. Categories are parsed and imported as usual.
+
+  Args:
+    glossary: glossary object used to import terms and categories
+    import_mode: strict or clear
+    args: script run arguments
+
+  Returns:
+    A tuple consisting of:
+      * dictionary mapping EntryType to number of entries in the CSV files
+      * dictionary mapping EntryType to number of imported entries
+      * dictionary mapping EntryType to number of imported relations
+      * list of import errors
+  """
+  parsers_results = {}
+  if args.categories_csv:
+    logger.info("Parsing categories input CSV file...")
+    parsers_results[entry_type_lib.EntryType.CATEGORY] = (
+        categories_csv_parser.parse_glossary_csv(args.categories_csv)
+    )
+  _, parsed_categories = _parsed_entries(parsers_results)
+  terms_csv = (
+      args.terms_csv if args.terms_csv is not None else args.terms_csv_legacy
+  )
+
+  with import_spool.ImportSpool() as spool:
+    logger.info("Parsing terms input CSV file into %s...", spool.path)
+    parse_errors = []
+    lines_read = spool.add_terms(
+        terms_csv_parser.iter_glossary_csv(
+            terms_csv, parse_errors, tracked_terms=spool.tracked_terms
+        )
+    )
+    parsers_results[entry_type_lib.EntryType.TERM] = (
+        None,
+        parse_errors,
+        lines_read,
+    )
+    _print_parsing_errors(parsers_results)
+    _exit_on_invalid_relationships(
+        glossary.validate_spooled_relationships(
+            spool,
+            parsed_categories,
+            args.window_size,
+            args.max_category_depth,
+            keep_existing=import_mode != import_mode_lib.ImportMode.CLEAR,
+        )
+    )
+    # The glossary holds the entries of the run being resumed
+    if not args.resume and not glossary.is_glossary_empty():
+      _handle_non_empty_glossary(import_mode, glossary)
+
+    logger.info(
+        "Importing CSV files into Business Glossary in windows of %d"
+        " entries...",
+        args.window_size,
+    )
+    imported_counts, imported_relation_counts, import_errors = (
+        glossary.import_glossary_streaming(
+            spool, parsed_categories, args.window_size
+        )
+    )
+  return (
+      _lines_read(parsers_results),
+      imported_counts,
+      imported_relation_counts,
+      import_errors,
+  )
+
+
+def _report_metrics(args: argparse.Namespace) -> None:
+  """Logs the metrics of the API calls and writes them to the metrics file."""
+  import_metrics.log_summary()
+  if args.metrics_file:
+    import_metrics.write_report(
+        args.metrics_file, import_metrics.Format(args.metrics_format)
+    )
+
+
 def _lines_read(
     parsers_results: dict[entry_type_lib.EntryType, parser_types._ParserReturnType]
 ) -> dict[entry_type_lib.EntryType, int]:
@@ -79,6 +239,7 @@ def _lines_read(
 def _import_glossary_entries(
     glossary: dc_glossary.Glossary,
     parsers_results: dict[entry_type_lib.EntryType, parser_types._ParserReturnType],
+    import_mode: import_mode_lib.ImportMode = import_mode_lib.ImportMode.STRICT,
 ) -> import_types._ImportResult:
   """Unpacks parsed terms and categories and imports them into business glossary.
 
@@ -87,6 +248,8 @@ def _import_glossary_entries(
     parsers_results: dictionary indicating parser result for entry type parser
       result consists of parsed_entries list, parse_errors list and line_parsed
       integer.
+    import_mode: in diff mode only the differences with the glossary are
+      imported.
 
   Returns:
     A tuple consisting of:
@@ -96,12 +259,7 @@ def _import_glossary_entries(
       * lit of import errors
   """
 
-  parsed_terms = None
-  parsed_categories = None
-  if entry_type_lib.EntryType.TERM in parsers_results:
-    parsed_terms, _, _ = parsers_results[entry_type_lib.EntryType.TERM]
-  if entry_type_lib.EntryType.CATEGORY in parsers_results:
-    parsed_categories, _, _ = parsers_results[entry_type_lib.EntryType.CATEGORY]
+  parsed_terms, parsed_categories = _parsed_entries(parsers_results)
 
   entries_to_import = ""
   if parsed_terms:
@@ -110,6 +268,15 @@ def _import_glossary_entries(
     entries_to_import += "categories and "
   entries_to_import = entries_to_import.removesuffix(" and ")
 
+  if import_mode == import_mode_lib.ImportMode.DIFF:
+    logger.info(
+        "Importing changes of CSV file %s into Business Glossary...",
+        entries_to_import,
+    )
+    return glossary.import_glossary_diff(
+        terms=parsed_terms, categories=parsed_categories
+    )
+
   logger.info(
       "Importing CSV file %s into Business Glossary...", entries_to_import
   )
@@ -124,7 +291,7 @@ def _handle_non_empty_glossary(
   """Handles non-empty glossary depending on the import mode.
 
   Args:
-    import_mode: strict,clear
+    import_mode: strict,clear,diff
     glossary: glossary object
   """
   # If the operation mode is Strict, we check that the glossary exists and is
@@ -161,6 +328,95 @@ def _print_parsing_errors(
     utils.end_program_execution()
 
 
+def _print_import_plan(
+    glossary: dc_glossary.Glossary,
+    parsers_results: dict[entry_type_lib.EntryType, parser_types._ParserReturnType],
+    import_mode: import_mode_lib.ImportMode,
+    args: argparse.Namespace,
+) -> None:
+  """Prints the API calls the import would make, without making them.
+
+  Args:
+    glossary: glossary object the entries would be imported into
+    parsers_results: dictionary indicating parser result for entry type
+    import_mode: strict,clear,diff
+    args: script run arguments
+  """
+  parsed_terms, parsed_categories = _parsed_entries(parsers_results)
+  if (
+      import_mode == import_mode_lib.ImportMode.STRICT
+      and not args.resume
+      and not glossary.is_glossary_empty()
+  ):
+    logger.warning(
+        "The target glossary is not empty, the import would stop in strict"
+        " mode."
+    )
+  plan = glossary.plan_import(parsed_terms, parsed_categories, import_mode)
+  import_planner.print_plan(
+      plan, args.max_workers, rate_limiter.get_limiter().max_rate
+  )
+
+
+def _parsed_entries(
+    parsers_results: dict[entry_type_lib.EntryType, parser_types._ParserReturnType],
+) -> tuple[
+    dict[int, bg_term.Term] | None, dict[int, bg_category.Category] | None
+]:
+  """Returns the parsed terms and categories, None for unparsed types."""
+  parsed_terms = None
+  parsed_categories = None
+  if entry_type_lib.EntryType.TERM in parsers_results:
+    parsed_terms, _, _ = parsers_results[entry_type_lib.EntryType.TERM]
+  if entry_type_lib.EntryType.CATEGORY in parsers_results:
+    parsed_categories, _, _ = parsers_results[entry_type_lib.EntryType.CATEGORY]
+  return parsed_terms, parsed_categories
+
+
+def _validate_relationships(
+    glossary: dc_glossary.Glossary,
+    parsers_results: dict[entry_type_lib.EntryType, parser_types._ParserReturnType],
+    import_mode: import_mode_lib.ImportMode,
+    max_category_depth: int,
+) -> None:
+  """Ends the program if any relationship of the parsed entries is invalid.
+
+  Runs before the glossary is changed, so that no entry is created or deleted
+  for an import that would fail on its relationships. In clear mode the
+  entries of the glossary are deleted first, so relationships can only refer
+  to parsed entries.
+
+  Args:
+    glossary: glossary object the entries are imported into
+    parsers_results: dictionary indicating parser result for entry type
+    import_mode: strict, clear or diff
+    max_category_depth: maximum number of nested levels of categories
+  """
+  parsed_terms, parsed_categories = _parsed_entries(parsers_results)
+
+  _exit_on_invalid_relationships(
+      glossary.validate_relationships(
+          parsed_terms,
+          parsed_categories,
+          max_category_depth,
+          keep_existing=import_mode != import_mode_lib.ImportMode.CLEAR,
+      )
+  )
+
+
+def _exit_on_invalid_relationships(
+    validation_errors: list[error.ParseError],
+) -> None:
+  """Ends the program if relationships validation found errors."""
+  if validation_errors:
+    utils.display_parsing_errors(validation_errors)
+    logger.error(
+        "Found %d invalid relationships. Nothing was imported.",
+        len(validation_errors),
+    )
+    utils.end_program_execution()
+
+
 def _parse_all_csv_files(
     args: argparse.Namespace,
 ) -> dict[entry_type_lib.EntryType, parser_types._ParserReturnType]:
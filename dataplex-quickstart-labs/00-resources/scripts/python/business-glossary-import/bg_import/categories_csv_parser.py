@@ -11,6 +11,7 @@ from typing import Any
 import category as bg_category
 import entry_type
 import error
+import name_index
 import parse_utils
 import parser_types
 
@@ -22,10 +23,10 @@ import parser_types
   is_optional_field: Boolean representing if the field is optional.
 """
 _ATTRIBUTE_PARSERS: list[tuple[str, parser_types._ParseFn[Any], bool]] = [
-    ("display_name", parse_utils.parse_category_str, False),
+    ("display_name", parse_utils.parse_category_name, False),
     ("description", parse_utils.parse_category_str, False),
     ("data_stewards", parse_utils.parse_category_data_stewards, True),
-    ("belongs_to_category", parse_utils.parse_category_str, True),
+    ("belongs_to_category", parse_utils.parse_category_name, True),
 ]
 
 _MAX_DISPLAY_NAME_LENGTH = 200
@@ -127,7 +128,7 @@ def _validate_category(
 
   if category.display_name:
     # If the category has appeared before in the CSV file we record an error.
-    if category.display_name.lower() in tracked_categories:
+    if name_index.normalize_name(category.display_name) in tracked_categories:
       err = error.ParseError(
           entry_type.EntryType.CATEGORY,
           message="The category is duplicated in the CSV file.",
@@ -172,37 +173,9 @@ def parse_category(
   Returns:
     A tuple of parsed category and a list of errors.
   """
-  attributes = []
-  errors = []
-
-  for i, (attr_name, parse_fn, is_optional_field) in enumerate(
-      _ATTRIBUTE_PARSERS
-  ):
-    if i >= len(record):
-      # Add the default value to cover for the missing field
-      default_value, _ = parse_fn("")  # pylint:disable=not-callable
-      attributes.append(default_value)
-      # If the field is not mandatory we can skip creating a ParseError
-      if not is_optional_field:
-        err = error.ParseError(
-            entry_type.EntryType.CATEGORY,
-            message="Missing field",
-            line=line_idx + 1,
-            column=i + 1,
-            record=record,
-            resources=[attr_name],
-        )
-        errors.append(err)
-      continue
-
-    value, attr_errors = parse_fn(record[i])  # pylint:disable=not-callable
-    attributes.append(value)
-    for err in attr_errors:
-      err.line = line_idx + 1
-      err.column = i + 1
-      err.record = record
-      err.resources.append(attr_name)
-    errors.extend(attr_errors)
+  attributes, errors = parse_utils.parse_record(
+      entry_type.EntryType.CATEGORY, line_idx, record, _ATTRIBUTE_PARSERS
+  )
 
   (
       display_name,
@@ -224,7 +197,7 @@ def parse_category(
     err.line = line_idx + 1
     err.record = record
   if category.display_name:
-    tracked_categories.add(category.display_name.lower())
+    tracked_categories.add(name_index.normalize_name(category.display_name))
   errors.extend(validation_errors)
 
   return category, errors
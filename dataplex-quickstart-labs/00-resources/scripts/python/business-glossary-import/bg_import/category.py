@@ -12,11 +12,10 @@ Typical usage example:
 """
 
 from __future__ import annotations
-import random
-import re
-import string
 from typing import Any
 
+import entry_id_generator
+
 
 class Category:
   """Initializes an instance of Category.
@@ -32,6 +31,14 @@ class Category:
     category_id: A string containing a unique identifier for the category in DC.
   """
 
+  __slots__ = (
+      "display_name",
+      "description",
+      "data_stewards",
+      "belongs_to_category",
+      "category_id",
+  )
+
   def __init__(
       self,
       display_name: str,
@@ -54,25 +61,7 @@ class Category:
 
   def _generate_category_id(self):
     """Unique glossary category ID."""
-    random_length = 7
-    max_term_id_length = 64
-
-    if not self.display_name:
-      return ""
-
-    max_length = min(len(self.display_name), max_term_id_length - random_length)
-    unique_id = re.sub(r"[^a-zA-Z0-9_]", "_", self.display_name).lower()[
-        :max_length
-    ]
-
-    unique_id = unique_id + "".join(
-        random.choices(string.ascii_lowercase + string.digits, k=random_length)
-    )
-
-    if unique_id[0].isdigit():
-      unique_id = "_" + unique_id
-
-    return unique_id[:max_term_id_length]
+    return entry_id_generator.random_id(self.display_name)
 
   @classmethod
   def from_dict(cls, entry: dict[str, Any]) -> Category | None:
@@ -98,6 +87,14 @@ class Category:
       ]
     except KeyError:
       return None
+    data_stewards = entry["coreAspects"]["business_context"]["jsonContent"].get(
+        "contacts"
+    )
 
-    category = Category(display_name, description, force_category_id=uid)
+    category = Category(
+        display_name,
+        description,
+        data_stewards=data_stewards,
+        force_category_id=uid,
+    )
     return category
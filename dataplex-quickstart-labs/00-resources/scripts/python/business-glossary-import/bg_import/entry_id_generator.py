@@ -0,0 +1,67 @@
+"""Generates the ids of new glossary entries.
+
+Ids are made of the display name, sanitized, followed by a suffix of 7
+characters. The suffix is random by default. Deterministic ids use a stable
+hash of the glossary, the entry type and the display name instead, so that
+importing the same CSV file twice produces the same ids.
+
+Typical usage example:
+  term_id = entry_id_generator.random_id("Cost")
+  term_id = entry_id_generator.deterministic_id("Cost", "project/us/group/g")
+"""
+
+import hashlib
+import random
+import re
+import string
+
+_SUFFIX_LENGTH = 7
+_MAX_ID_LENGTH = 64
+_SUFFIX_ALPHABET = string.ascii_lowercase + string.digits
+_NON_ID_CHARACTERS = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def _entry_id(display_name: str, suffix: str) -> str:
+  if not display_name:
+    return ""
+
+  max_length = min(len(display_name), _MAX_ID_LENGTH - _SUFFIX_LENGTH)
+  unique_id = _NON_ID_CHARACTERS.sub("_", display_name).lower()[:max_length]
+  unique_id = unique_id + suffix
+
+  if unique_id[0].isdigit():
+    unique_id = "_" + unique_id
+  return unique_id[:_MAX_ID_LENGTH]
+
+
+def random_id(display_name: str) -> str:
+  """Returns a new id with a random suffix, or "" for an empty display name."""
+  return _entry_id(
+      display_name, "".join(random.choices(_SUFFIX_ALPHABET, k=_SUFFIX_LENGTH))
+  )
+
+
+def deterministic_id(
+    display_name: str, namespace: str, attempt: int = 0
+) -> str:
+  """Returns the id of an entry derived from its display name.
+
+  Args:
+    display_name: Display name of the entry.
+    namespace: Identifies the glossary and the entry type, so that entries of
+      different glossaries get different ids.
+    attempt: Incremented to get another id when the previous one collides
+      with an existing entry.
+
+  Returns:
+    The id, or "" for an empty display name.
+  """
+  digest = hashlib.sha256(
+      f"{namespace}\0{display_name}\0{attempt}".encode()
+  ).digest()
+  value = int.from_bytes(digest[:8], "big")
+  suffix = []
+  for _ in range(_SUFFIX_LENGTH):
+    value, index = divmod(value, len(_SUFFIX_ALPHABET))
+    suffix.append(_SUFFIX_ALPHABET[index])
+  return _entry_id(display_name, "".join(suffix))
@@ -1,43 +1,143 @@
 """Functions to get the state of glossary."""
 
-import multiprocessing
-import re
-from typing import Any, Iterable, TypeVar
+from concurrent import futures
+import functools
+import queue
+import threading
+import time
+from typing import Any, Callable, Hashable, Iterable, Iterator, TypeVar
 
 import api_call_utils
 import category as bg_category
+import entry_id_generator
 import entry_type as entry_type_lib
 import error
+import glossary_diff
 import glossary_identification
+import http_session
+import import_journal
+import import_metrics
+import import_mode as import_mode_lib
+import import_planner
+import import_spool
 import import_types
 import logging_utils
+import name_index
 import relation_type
+import relationship_validator
 import requests
+import snapshot_cache
+import task_scheduler
 import term as bg_term
 import user_report
 import utils
 
 
 logger = logging_utils.get_logger()
+_R = TypeVar('_R')
+
+# Default number of API calls the glossary keeps in flight at the same time.
+DEFAULT_MAX_WORKERS = 20
+# Default number of terms or relationships a streaming import holds in memory.
+DEFAULT_WINDOW_SIZE = 1000
+# Scheduler label of the tasks category belongs_to category relationships wait
+# for: term creation and term belongs_to category relationships.
+_TERM_HIERARCHY = 'term_hierarchy'
+# Scheduler label of relationship deletes, which run before relationship
+# creates so that a changed belongs_to never has two parents at once.
+_RELATIONSHIP_DELETES = 'relationship_deletes'
+# Stands for the response of a create skipped because a resumed run already
+# made it.
+_RESUMED_RESPONSE = {'json': None, 'error_msg': None}
+# Scheduler label of term deletes, which run before category deletes.
+_TERM_DELETES = 'term_deletes'
+# Minimum delay between two progress messages of long running operations.
+_PROGRESS_LOG_INTERVAL_SECONDS = 10.0
+# Metrics phases of the API calls which are not entry or relationship creates.
+_LOAD_ENTRIES_PHASE = 'load_entries'
+_LOAD_RELATIONSHIPS_PHASE = 'load_relationships'
+_APPLY_DIFF_PHASE = 'apply_diff'
+_CLEAR_PHASE = 'clear'
 
 
 class Glossary:
   """Instance of a Business Glossary.
 
   Contains helper methods to transparently handle several REST operations on the
-  target glossary.
+  target glossary. API calls are run on a thread pool owned by the instance,
+  which is released by close() or by using the glossary as a context manager.
   """
 
-  def __init__(self, config: glossary_identification.GlossaryId):
+  def __init__(
+      self,
+      config: glossary_identification.GlossaryId,
+      max_workers: int = DEFAULT_MAX_WORKERS,
+      journal: import_journal.ImportJournal | None = None,
+      snapshot: snapshot_cache.SnapshotCache | None = None,
+      deterministic_ids: bool = False,
+  ):
+    if max_workers < 1:
+      raise ValueError('Number of workers must be a positive integer.')
     self._config = config
+    self._max_workers = max_workers
+    # Records completed creates of import_glossary, and lists those of the
+    # interrupted run being resumed
+    self._journal = journal
+    # Entries listed by a previous run, only fetched again if they changed
+    self._snapshot = snapshot
+    # New entries get ids derived from their display name instead of random
+    # ones, so that creates can be retried safely
+    self._deterministic_ids = deterministic_ids
+    # Threads are only started once the first batch of tasks is submitted
+    self._executor = futures.ThreadPoolExecutor(
+        max_workers=self._max_workers, thread_name_prefix='glossary'
+    )
     self._glossary_endpoint = Glossary._configure_endpoint_url(self._config)
-    self._category_cache: dict[str, bg_category.Category] = {}
-    self._term_cache: dict[str, bg_term.Term] = {}
+    # Entries of the glossary by display name, also found by normalized name
+    self._names = name_index.NameIndex()
+    # Whether all entries of the glossary were loaded in the caches
+    self._caches_loaded = False
     self._glossary_uid = None
-    # Load UID of the target glossary
-    self._load_glossary_uid()
-    # Store a mapping from display names to Term entries existing in DC
-    self._populate_caches()
+    with import_metrics.phase(_LOAD_ENTRIES_PHASE):
+      # Load UID of the target glossary
+      self._load_glossary_uid()
+      # Store a mapping from display names to Term entries existing in DC
+      if self._snapshot is None:
+        self._populate_caches()
+      else:
+        self._populate_caches_from_snapshot()
+
+  def __enter__(self) -> 'Glossary':
+    return self
+
+  def __exit__(self, *unused_exc_info) -> None:
+    self.close()
+
+  def close(self) -> None:
+    """Waits for in-flight API calls and shuts down the worker threads."""
+    if self._executor is not None:
+      self._executor.shutdown(wait=True)
+      self._executor = None
+
+  @property
+  def _term_cache(self) -> name_index.EntryCache:
+    """Terms existing in the target glossary, by display name."""
+    return self._names.terms
+
+  @_term_cache.setter
+  def _term_cache(self, terms: dict[str, bg_term.Term]) -> None:
+    self._names.terms = name_index.EntryCache(terms)
+
+  @property
+  def _category_cache(self) -> name_index.EntryCache:
+    """Categories existing in the target glossary, by display name."""
+    return self._names.categories
+
+  @_category_cache.setter
+  def _category_cache(
+      self, categories: dict[str, bg_category.Category]
+  ) -> None:
+    self._names.categories = name_index.EntryCache(categories)
 
   @classmethod
   def _configure_endpoint_url(
@@ -53,11 +153,18 @@ class Glossary:
       string
     """
     return (
-        f'https://datacatalog.googleapis.com/v2/projects'
+        f'{utils.DATACATALOG_BASE_URL}/projects'
         f'/{config.project_id}/locations/{config.location}'
         f'/entryGroups/{config.entry_group}'
     )
 
+  def _glossary_key(self) -> str:
+    """Returns the project/location/entryGroup/glossary path of the glossary."""
+    return (
+        f'{self._config.project_id}/{self._config.location}'
+        f'/{self._config.entry_group}/{self._config.glossary_id}'
+    )
+
   def _load_glossary_uid(self) -> None:
     """Fetch glossary UID for the requested glossary."""
     endpoint = f'{self._glossary_endpoint}/entries/{self._config.glossary_id}'
@@ -98,32 +205,146 @@ class Glossary:
     return False
 
   def _populate_caches(self):
-    """Populates internal caches of terms and categories existing in the target glossary."""
-    endpoint = f'{self._glossary_endpoint}/entries?view=FULL'
-    keep_reading, page_token = True, None
-    while keep_reading:
-      if page_token:
-        endpoint_url = f'{endpoint}&pageToken={page_token}'
-      else:
-        endpoint_url = endpoint
-      response = api_call_utils.fetch_api_response(
-          requests.get, endpoint_url, self._config.project_id
-      )
+    """Populates internal caches of terms and categories existing in the target glossary.
 
+    Pages of entries are fetched by a producer thread while the caller parses
+    the previous page, so that parsing overlaps with the next request.
+    """
+    for response in self._entry_pages('FULL'):
       if response['error_msg']:
         logger.error(response['error_msg'])
         return
+      self._populate_term_cache(response)
+      self._populate_category_cache(response)
+    self._caches_loaded = True
 
-      if 'entries' not in response['json']:
+  def _populate_caches_from_snapshot(self) -> None:
+    """Populates internal caches from the snapshot of the target glossary.
+
+    Entries are listed in the BASIC view, and only those created or modified
+    since the snapshot was saved are fetched in full. An entry is reused only
+    if the listing reports the version of the snapshot entry, see
+    snapshot_cache.freshness. The snapshot is then replaced by the current
+    entries. If a call fails, all entries are fetched as by _populate_caches.
+    """
+    key = self._glossary_key()
+    cached = self._snapshot.load(key)
+    entries, changed = [], []
+    for response in self._entry_pages('BASIC' if cached else 'FULL'):
+      if response['error_msg']:
+        logger.error(response['error_msg'])
+        self._populate_caches()
         return
+      for entry in response['json']['entries']:
+        if not cached:
+          entries.append(entry)
+          continue
+        snapshot_entry = cached.get(entry['name'], {})
+        # Aspects are only compared if the listing returned them
+        aspects = 'coreAspects' in entry
+        listed_freshness = snapshot_cache.freshness(entry, aspects)
+        if listed_freshness and listed_freshness == (
+            snapshot_cache.freshness(snapshot_entry, aspects)
+        ):
+          entries.append(snapshot_entry)
+        else:
+          changed.append(entry['name'])
+    reused = len(entries) if cached else 0
+    removed = len(cached) - reused - sum(name in cached for name in changed)
+    for response in self._executor.map(
+        import_metrics.bind_phase(self._get_entry), changed
+    ):
+      if response['error_msg']:
+        logger.error(response['error_msg'])
+        self._populate_caches()
+        return
+      entries.append(response['json'])
 
-      # Check if we need to read another page
-      page_token = response['json'].get('nextPageToken', None)
-      if not page_token:
-        keep_reading = False
+    self._populate_term_cache({'json': {'entries': entries}})
+    self._populate_category_cache({'json': {'entries': entries}})
+    self._caches_loaded = True
+    self._snapshot.save(key, entries)
+    logger.info(
+        f'Glossary snapshot {self._snapshot.path}: {reused} entries reused,'
+        f' {len(entries) - reused} fetched and {removed} removed.'
+    )
 
-      self._populate_term_cache(response)
-      self._populate_category_cache(response)
+  def _get_entry(self, entry_name: str) -> dict[str, Any]:
+    """Fetches an entry with its aspects.
+
+    Args:
+      entry_name: Resource name of the entry.
+
+    Returns:
+      Dictionary with response and response code.
+    """
+    endpoint = (
+        f'{self._glossary_endpoint}/entries/{entry_name.split("/")[-1]}'
+        '?view=FULL'
+    )
+    return api_call_utils.fetch_api_response(
+        requests.get, endpoint, self._config.project_id
+    )
+
+  def _entry_pages(self, view: str) -> Iterator[dict[str, Any]]:
+    """Yields the pages of entries of the target glossary.
+
+    Pages are fetched ahead by a producer thread while the caller processes
+    the previous page.
+
+    Args:
+      view: View of the listed entries, FULL or BASIC.
+
+    Yields:
+      The response of each page. A failed call is the last page.
+    """
+    pages = queue.Queue()
+    producer = threading.Thread(
+        target=import_metrics.bind_phase(self._fetch_entry_pages),
+        args=(pages, view),
+        name='glossary-page-prefetch',
+        daemon=True,
+    )
+    producer.start()
+    try:
+      while (response := pages.get()) is not None:
+        yield response
+    finally:
+      producer.join()
+
+  def _fetch_entry_pages(self, pages: queue.Queue, view: str) -> None:
+    """Puts the pages of entries of the target glossary in a queue.
+
+    Args:
+      pages: Queue receiving the response of each page, and None after the
+        last page or the first failed call.
+      view: View of the listed entries.
+    """
+    endpoint = (
+        f'{self._glossary_endpoint}/entries'
+        f'?view={view}&pageSize={utils.PAGE_SIZE}'
+    )
+    page_token = None
+    try:
+      while True:
+        if page_token:
+          endpoint_url = f'{endpoint}&pageToken={page_token}'
+        else:
+          endpoint_url = endpoint
+        response = api_call_utils.fetch_api_response(
+            requests.get, endpoint_url, self._config.project_id
+        )
+        if not response['error_msg'] and 'entries' not in response['json']:
+          return
+        pages.put(response)
+        if response['error_msg']:
+          return
+        # Check if we need to read another page
+        page_token = response['json'].get('nextPageToken', None)
+        if not page_token:
+          return
+    finally:
+      pages.put(None)
 
   def _populate_term_cache(self, response: dict[str, Any]) -> None:
     """Populates an internal cache of terms existing in the target glossary."""
@@ -158,6 +379,112 @@ class Glossary:
     Returns:
       Dictionary with response and response code.
     """
+    endpoint, request_body = self._glossary_entry_request(entry)
+    with import_metrics.phase(Glossary._create_entry_phase(entry)):
+      # Creates are only retried on server errors when they can be confirmed
+      response = api_call_utils.fetch_api_response(
+          requests.post,
+          endpoint,
+          self._config.project_id,
+          request_body,
+          retry_server_errors=self._deterministic_ids,
+      )
+      if response['error_msg'] and self._deterministic_ids:
+        return self._previously_created_entry(
+            entry, response, self._get_entry(glossary_diff.entry_id(entry))
+        )
+    return response
+
+  @classmethod
+  def _create_entry_phase(
+      cls, entry: bg_term.Term | bg_category.Category
+  ) -> str:
+    """Returns the metrics phase of the creation of an entry."""
+    if isinstance(entry, bg_category.Category):
+      return 'create_category'
+    return 'create_term'
+
+  def _previously_created_entry(
+      self,
+      entry: bg_term.Term | bg_category.Category,
+      create_response: dict[str, Any],
+      get_response: dict[str, Any],
+  ) -> dict[str, Any]:
+    """Checks whether a failed create was made by an earlier attempt.
+
+    With deterministic ids, a create retried after a lost response fails
+    because the entry already exists. The entry is then fetched and the create
+    counts as done if it has the same display name.
+
+    Args:
+      entry: Entry that could not be created.
+      create_response: Response of the failed create.
+      get_response: Response fetching the entry with the id of entry.
+
+    Returns:
+      get_response if the entry was created earlier, create_response
+      otherwise.
+    """
+    if (
+        not get_response['error_msg']
+        and get_response['json'].get('displayName') == entry.display_name
+    ):
+      logger.debug(f'{entry.display_name} was already created.')
+      return get_response
+    return create_response
+
+  def _assign_deterministic_ids(
+      self,
+      entries: dict[
+          entry_type_lib.EntryType,
+          Iterable[bg_term.Term | bg_category.Category],
+      ],
+  ) -> None:
+    """Gives parsed entries ids derived from their display name.
+
+    An id already used in the entry group by an entry of another name or type
+    is replaced by the next candidate id of the entry.
+
+    Args:
+      entries: Parsed entries by type, in line order.
+    """
+    used_ids = {}
+    for entry_type in (
+        entry_type_lib.EntryType.CATEGORY,
+        entry_type_lib.EntryType.TERM,
+    ):
+      for existing in self._entry_cache(entry_type).values():
+        used_ids[glossary_diff.entry_id(existing)] = (
+            entry_type,
+            existing.display_name,
+        )
+    for entry_type, typed_entries in entries.items():
+      namespace = f'{self._glossary_key()}/{entry_type.value}'
+      for entry in typed_entries:
+        attempt = 0
+        while True:
+          new_id = entry_id_generator.deterministic_id(
+              entry.display_name, namespace, attempt
+          )
+          owner = used_ids.setdefault(
+              new_id, (entry_type, entry.display_name)
+          )
+          if owner == (entry_type, entry.display_name):
+            break
+          attempt += 1
+        glossary_diff.set_entry_id(entry, new_id)
+
+  def _glossary_entry_request(
+      self, entry: bg_term.Term | bg_category.Category
+  ) -> tuple[str, dict[str, Any]]:
+    """Builds the endpoint and body of the request creating an entry.
+
+    Args:
+      entry: entry data object - Term or Category.
+
+    Returns:
+      A tuple of the endpoint URL and the JSON body of the request.
+    """
     endpoint = (
         f'{self._glossary_endpoint}/entries?entry_id={entry.category_id}'
         if isinstance(entry, bg_category.Category)
@@ -172,32 +499,63 @@ class Glossary:
 
     dest_entry_name = (
         f'{self._glossary_endpoint}/entries/{self._config.glossary_id}'.replace(
-            'https://datacatalog.googleapis.com/v2/', ''
+            f'{utils.DATACATALOG_BASE_URL}/', ''
         )
     )
 
+    return endpoint, {
+        'entry_type': entry_type,
+        'display_name': entry.display_name,
+        'core_aspects': Glossary._core_aspects(entry),
+        'core_relationships': {
+            'relationship_type': 'is_child_of',
+            'destination_entry_name': dest_entry_name,
+        },
+    }
+
+  @classmethod
+  def _core_aspects(
+      cls, entry: bg_term.Term | bg_category.Category
+  ) -> dict[str, Any]:
+    return {
+        'business_context': {
+            'aspect_type': 'business_context',
+            'json_content': {
+                'description': entry.description,
+                'contacts': entry.data_stewards,
+            },
+        }
+    }
+
+  def _update_glossary_entry(
+      self, entry: bg_term.Term | bg_category.Category
+  ) -> dict[str, Any]:
+    """Updates description and data stewards of an existing entry.
+
+    Args:
+      entry: entry data object - Term or Category, with the id of the existing
+        entry.
+
+    Returns:
+      Dictionary with response and response code.
+    """
+    endpoint, request_body = self._glossary_entry_update_request(entry)
     return api_call_utils.fetch_api_response(
-        requests.post,
+        requests.patch,
         endpoint,
         self._config.project_id,
-        {
-            'entry_type': entry_type,
-            'display_name': entry.display_name,
-            'core_aspects': {
-                'business_context': {
-                    'aspect_type': 'business_context',
-                    'json_content': {
-                        'description': entry.description,
-                        'contacts': entry.data_stewards,
-                    },
-                }
-            },
-            'core_relationships': {
-                'relationship_type': 'is_child_of',
-                'destination_entry_name': dest_entry_name,
-            },
-        },
+        request_body,
+    )
+
+  def _glossary_entry_update_request(
+      self, entry: bg_term.Term | bg_category.Category
+  ) -> tuple[str, dict[str, Any]]:
+    """Builds the endpoint and body of the request updating an entry."""
+    endpoint = (
+        f'{self._glossary_endpoint}/entries/{glossary_diff.entry_id(entry)}'
+        '?update_mask=core_aspects'
     )
+    return endpoint, {'core_aspects': Glossary._core_aspects(entry)}
 
   def _create_glossary_categories(
       self, categories: dict[int, bg_category.Category]
@@ -212,39 +570,60 @@ class Glossary:
     """
     tasks = [(category,) for category in categories.values()]
 
-    return Glossary._parallelize(self._create_glossary_entry, tasks)
-
-  def _create_glossary_terms(
-      self, terms: dict[int, bg_term.Term]
-  ) -> Iterable[Any]:
-    """Create new terms in the target glossary.
-
-    Args:
-      terms: Dictionary mapping from lines in the csv to terms
-
-    Returns:
-      Iterable containing errors
-    """
-    tasks = [(term,) for term in terms.values()]
+    return self._parallelize(self._create_glossary_entry, tasks)
 
-    return Glossary._parallelize(self._create_glossary_entry, tasks)
+  def _entry_cache(
+      self, entry_type: entry_type_lib.EntryType
+  ) -> dict[str, bg_term.Term | bg_category.Category]:
+    """Returns the cache of entries of entry_type, by display name."""
+    return self._names.entries(entry_type)
 
   def _get_entry_from_cache(
       self, display_name: str, entry_type: entry_type_lib.EntryType
   ) -> bg_term.Term | bg_category.Category | None:
     """Returns entry (term or category) based on display_name and entry_type.
 
+    Display names are matched case-insensitively, ignoring differences in
+    Unicode normalization and whitespace, as the CSV parsers do.
+
     Args:
       display_name: string indicating display_name of the entry
       entry_type: EntryType enum indicating entry type
 
     Returns:
+      The entry, or None if there is no entry with that name.
     """
-    if entry_type == entry_type_lib.EntryType.CATEGORY:
-      return self._category_cache.get(display_name)
-    elif entry_type == entry_type_lib.EntryType.TERM:
-      return self._term_cache.get(display_name)
-    return None
+    return self._names.find(entry_type, display_name)
+
+  def _relationship_names(
+      self,
+      terms: dict[int, bg_term.Term] | None,
+      categories: dict[int, bg_category.Category] | None,
+  ) -> name_index.NameIndex:
+    """Returns the entries the relationships of an import refer to.
+
+    Relationships refer to the parsed entries of a type whose CSV file was
+    provided, and to the entries of the glossary otherwise.
+
+    Args:
+      terms: dictionary indicating Term object for related line number
+      categories: dictionary indicating Category object for related line number
+
+    Returns:
+      The index used to canonicalize the relationships of the import.
+    """
+    names = name_index.NameIndex()
+    for entry_type, parsed in (
+        (entry_type_lib.EntryType.TERM, terms),
+        (entry_type_lib.EntryType.CATEGORY, categories),
+    ):
+      if parsed is None:
+        names.entries(entry_type).update(self._entry_cache(entry_type))
+      else:
+        names.entries(entry_type).update(
+            {entry.display_name: entry for entry in parsed.values()}
+        )
+    return names
 
   def _get_entry_id_from_cache(
       self, display_name: str, entry_type: entry_type_lib.EntryType
@@ -300,7 +679,9 @@ class Glossary:
           f' is not a term or "{dst_type}" is not a term.'
       )
       return False, err
-    if src_display_name == dst_display_name and src_type == dst_type:
+    if src_type == dst_type and name_index.normalize_name(
+        src_display_name
+    ) == name_index.normalize_name(dst_display_name):
       err = (
           f'Cannot create "{relationship_type.value}" relation between'
           f' "{src_display_name}" and itself.'
@@ -334,7 +715,7 @@ class Glossary:
 
   @classmethod
   def _parse_entry_path(cls, entry_path) -> tuple[str | None, str | None]:
-    """Parses an entry path containin an optional source column.
+    """Parses an entry path containing an optional source column.
 
     Args:
       entry_path: Path to an entry in the format:
@@ -344,21 +725,7 @@ class Glossary:
       Path of the entry if any.
       Source column in the entry if any.
     """
-    pattern = (
-        r'projects/(?P<projectId>[^/]+)/locations/(?P<location>[^/]+)/entryGroups/(?P<entryGroup>[^/]+)/entries/(?P<entryId>[^:/]+)(:{1}(?P<sourceColumn>[^/]+))?'
-    )
-    match = re.fullmatch(pattern, entry_path)
-    if match is None:
-      return None, None
-
-    entry = (
-        f'projects/{match.group("projectId")}/'
-        f'locations/{match.group("location")}/'
-        f'entryGroups/{match.group("entryGroup")}/'
-        f'entries/{match.group("entryId")}'
-    )
-    source_column = match.group('sourceColumn') or None
-    return entry, source_column
+    return name_index.parse_entry_path(entry_path)
 
   def _create_relationship(
       self,
@@ -380,7 +747,70 @@ class Glossary:
     Returns:
       An error, if any.
     """
+    request = self._relationship_request(
+        src_display_name,
+        src_type,
+        dst_display_name,
+        dst_type,
+        relationship_type,
+    )
+    if isinstance(request, error.EntryImportError):
+      return request
+    endpoint, request_body = request
+
+    with import_metrics.phase(f'create_{relationship_type.value}'):
+      ret = api_call_utils.fetch_api_response(
+          requests.post,
+          endpoint,
+          self._config.project_id,
+          request_body,
+      )
+    return Glossary._relationship_response_error(
+        ret, src_display_name, src_type, dst_display_name, relationship_type
+    )
+
+  @classmethod
+  def _relationship_response_error(
+      cls,
+      response: dict[str, Any],
+      src_display_name: str,
+      src_type: entry_type_lib.EntryType,
+      dst_display_name: str,
+      relationship_type: relation_type.RelationshipType,
+  ) -> error.EntryImportError | None:
+    """Converts the response of a relationship creation into an error, if any."""
+    err = response['error_msg']
+    if err:
+      return error.EntryImportError(
+          src_type,
+          -1,
+          [src_display_name, dst_display_name],
+          message=err,
+          operation=f'create_{relationship_type.value}_relationship',
+      )
+    return None
+
+  def _relationship_request(
+      self,
+      src_display_name: str,
+      src_type: entry_type_lib.EntryType,
+      dst_display_name: str,
+      dst_type: entry_type_lib.EntryType,
+      relationship_type: relation_type.RelationshipType,
+  ) -> tuple[str, dict[str, Any]] | error.EntryImportError:
+    """Validates a relationship and builds the request creating it.
+
+    Args:
+      src_display_name: display name of the source end of the relationship.
+      src_type: EntryType of the source end.
+      dst_display_name: display name of the destination end of the relationship.
+      dst_type: EntryType of the destination end.
+      relationship_type: RELATED, SYNONYMOUS, DESCRIBED or BELONGS_TO.
 
+    Returns:
+      A tuple of the endpoint URL and the JSON body of the request, or an
+      error if the relationship can't be created.
+    """
     valid, error_msg = self._is_relationship_valid(
         src_display_name,
         src_type,
@@ -404,7 +834,7 @@ class Glossary:
       # we want to split the asset
       # [projects/123/locations/us-central1/entryGroups/abc/entries/fileset]
       # from the subfield [field1]
-      entry, source_column = Glossary._parse_entry_path(src_display_name)
+      entry, source_column = self._names.asset_path(src_display_name)
       if entry is None:
         return error.EntryImportError(
             src_type,
@@ -420,7 +850,7 @@ class Glossary:
 
       # For assets described by a term, we use the asset name after extracting
       # the field or column (if any)
-      endpoint = f'https://datacatalog.googleapis.com/v2/{entry}/relationships'
+      endpoint = f'{utils.DATACATALOG_BASE_URL}/{entry}/relationships'
     else:
       # For other entries, we use the internal id
       src_entry_id = self._get_entry_id_from_cache(src_display_name, src_type)
@@ -449,7 +879,7 @@ class Glossary:
       )
     dest_entry_name = (
         f'{self._glossary_endpoint}/entries/{dst_entry_id}'
-    ).replace('https://datacatalog.googleapis.com/v2/', '')
+    ).replace(f'{utils.DATACATALOG_BASE_URL}/', '')
 
     # JSON content of the request
     request_body = {
@@ -466,78 +896,127 @@ class Glossary:
     ):
       request_body['source_column'] = source_column
 
-    ret = api_call_utils.fetch_api_response(
-        requests.post,
-        endpoint,
-        self._config.project_id,
-        request_body,
-    )
+    return endpoint, request_body
 
-    err = ret['error_msg']
-    if err:
-      return error.EntryImportError(
-          src_type,
-          -1,
-          [src_display_name, dst_display_name],
-          message=err,
-          operation=f'create_{relationship_type.value}_relationship',
-      )
+  def _parallelize(
+      self, task: Callable[..., _R], params: list[tuple[Any, ...]]
+  ) -> list[_R]:
+    """Runs task for every tuple of arguments in params on the worker threads.
 
-  def _create_relationships(
-      self,
-      src_type: entry_type_lib.EntryType,
-      dst_type: entry_type_lib.EntryType,
-      related_entries: set[tuple[str, str]],
-      relationship_type: relation_type.RelationshipType,
-  ) -> tuple[
-    list[import_types._CreatedRelationship[relation_type.RelationshipType]],
-    list[error.EntryImportError],
-  ]:
-    """Create a relationship between two entries in DC Business Glossary.
+    Args:
+      task: Function to run.
+      params: List of argument tuples, one per call.
+
+    Returns:
+      List with the result of each call, in the order of params.
+    """
+    if self._executor is None:
+      raise RuntimeError('Glossary was already closed.')
+    # Calls made by the workers are recorded in the phase of the caller
+    task = import_metrics.bind_phase(task)
+    return list(self._executor.map(lambda args: task(*args), params))
+
+  def _submit(
+      self, task: Callable[..., _R], args: tuple[Any, ...]
+  ) -> futures.Future:
+    """Starts task with args on the worker threads.
 
     Args:
-      src_type: EntryType of source entries
-      dst_type: EntryType of destination entries
-      related_entries: Set of tuples containing the entries to create the
-        relationship for
-      relationship_type: SYNONYMOUS, RELATED, DESCRIBED or BELONGS_TO
+      task: Function to run.
+      args: Arguments of the call.
 
     Returns:
-      List of EntryImportError
+      Future of the result of the call.
     """
-    errors: list[error.EntryImportError] = []
-    successful_relations: list[
-      import_types._CreatedRelationship[relation_type.RelationshipType]
-    ] = []
-    if not related_entries:
-      return successful_relations, errors
+    if self._executor is None:
+      raise RuntimeError('Glossary was already closed.')
+    return self._executor.submit(import_metrics.bind_phase(task), *args)
 
-    logger.info(
-        f'Adding {relationship_type.value} relation between'
-        f' {src_type.value} and {dst_type.value} entries...'
+  def validate_relationships(
+      self,
+      terms: dict[int, bg_term.Term] | None,
+      categories: dict[int, bg_category.Category] | None,
+      max_category_depth: int = relationship_validator.MAX_CATEGORY_DEPTH,
+      keep_existing: bool = True,
+  ) -> list[error.ParseError]:
+    """Checks all relationships of the parsed entries before importing them.
+
+    Relationships can refer to entries of the glossary whose type has no
+    parsed CSV file, as those entries are kept by the import.
+
+    Args:
+      terms: dictionary indicating Term object for related line number
+      categories: dictionary indicating Category object for related line number
+      max_category_depth: Maximum number of nested levels of categories.
+      keep_existing: Whether the import keeps the entries of the glossary. If
+        not, as in clear mode, relationships can only refer to parsed entries.
+
+    Returns:
+      List of errors, empty if all relationships can be created.
+    """
+    existing_terms = existing_categories = ()
+    if keep_existing:
+      existing_terms = self._term_cache if terms is None else ()
+      existing_categories = self._category_cache if categories is None else ()
+    return relationship_validator.validate_relationships(
+        terms,
+        categories,
+        existing_terms=existing_terms,
+        existing_categories=existing_categories,
+        max_category_depth=max_category_depth,
     )
-    tasks = [
-        (src, src_type, dst, dst_type, relationship_type)
-        for src, dst in related_entries
-    ]
 
-    ret = Glossary._parallelize(self._create_relationship, tasks)
+  def validate_spooled_relationships(
+      self,
+      spool: import_spool.ImportSpool,
+      categories: dict[int, bg_category.Category] | None,
+      window_size: int = DEFAULT_WINDOW_SIZE,
+      max_category_depth: int = relationship_validator.MAX_CATEGORY_DEPTH,
+      keep_existing: bool = True,
+  ) -> list[error.ParseError]:
+    """Checks all relationships of spooled terms and parsed categories.
 
-    for task, err in zip(tasks, ret):
-      if err:
-        errors.append(err)
-      else:
-        src, _, dst, _, _ = task
-        successful_relation = (src, dst, relationship_type)
-        successful_relations.append(successful_relation)
+    Like validate_relationships, but reads the terms from the spool
+    window_size at a time and looks their relationships up in it.
 
-    return successful_relations, errors
+    Args:
+      spool: Spool holding the parsed terms.
+      categories: dictionary indicating Category object for related line
+        number, or None if no categories CSV file was parsed.
+      window_size: Number of terms held in memory at once.
+      max_category_depth: Maximum number of nested levels of categories.
+      keep_existing: Whether the import keeps the entries of the glossary.
 
-  @classmethod
-  def _parallelize(cls, task, params):
-    pool = multiprocessing.Pool(multiprocessing.cpu_count())
-    results = pool.starmap(task, params)
-    return results
+    Returns:
+      List of errors, empty if all relationships can be created.
+    """
+    if categories is None:
+      category_names = {
+          name_index.normalize_name(name)
+          for name in (self._category_cache if keep_existing else ())
+      }
+    else:
+      category_names = {
+          name_index.normalize_name(category.display_name)
+          for category in categories.values()
+      }
+    errors = []
+    for window in spool.term_windows(window_size):
+      for line_num, term in window:
+        errors.extend(
+            relationship_validator.term_errors(
+                line_num, term, spool.term_names, category_names
+            )
+        )
+    errors.extend(
+        relationship_validator.category_errors(
+            categories or {},
+            spool.term_names,
+            category_names,
+            max_category_depth,
+        )
+    )
+    return sorted(errors, key=lambda err: (err.entry_type.value, err.line))
 
   def import_glossary(
       self,
@@ -557,6 +1036,11 @@ class Glossary:
       * dictionary mapping EntryType to list of imported relations
       * lit of import errors
     """
+    if self._deterministic_ids:
+      self._assign_deterministic_ids({
+          entry_type_lib.EntryType.CATEGORY: (categories or {}).values(),
+          entry_type_lib.EntryType.TERM: (terms or {}).values(),
+      })
     imported_entries = {}
     imported_relations = {
         entry_type_lib.EntryType.TERM: [],
@@ -567,63 +1051,783 @@ class Glossary:
 
     # Import categories if they were parsed
     if categories is not None:
-      (
-          imported_categories,
-          not_imported_belongs_to_relations,
-          categories_import_errors,
-      ) = self._import_glossary_categories(categories)
+      imported_categories, not_imported_belongs_to_relations = (
+          self._import_categories_or_exit(categories, bool(terms))
+      )
       imported_entries[entry_type_lib.EntryType.CATEGORY] = imported_categories
-      import_errors.extend(categories_import_errors)
       not_imported_category_belongs_to_category_relations.update(
           not_imported_belongs_to_relations
       )
-      if categories_import_errors:
-        error_log_suffix = ' No terms were imported.' if terms else ''
-        logger.error(
-            'Errors occurred during categories import.%s', error_log_suffix
-        )
-        user_report.print_report_for_erroneous_categories_import(
-            imported_categories, categories_import_errors
-        )
-        utils.end_program_execution()
-
-    # Import terms if they were parsed
-    if terms is not None:
-      (
-          imported_terms,
-          imported_relations_term_to_term,
-          terms_import_errors,
-      ) = self._import_glossary_terms(terms)
-      imported_entries[entry_type_lib.EntryType.TERM] = imported_terms
-      imported_relations[entry_type_lib.EntryType.TERM].extend(
-          imported_relations_term_to_term
-      )
-      import_errors.extend(terms_import_errors)
 
-    # Import category belongs_to category relations as second (due to hierarhcy
-    # limit)
+    # Import terms if they were parsed, together with all relationships
     (
+        imported_terms,
+        imported_relations_term_to_term,
         imported_relations_category_to_category,
-        category_to_category_relations_import_error,
-    ) = self._create_relationships(
-        src_type=entry_type_lib.EntryType.CATEGORY,
-        dst_type=entry_type_lib.EntryType.CATEGORY,
-        related_entries=not_imported_category_belongs_to_category_relations,
-        relationship_type=relation_type.RelationshipType.BELONGS_TO,
+        terms_import_errors,
+    ) = self._import_glossary_terms(
+        terms or {}, not_imported_category_belongs_to_category_relations
+    )
+    if terms is not None:
+      imported_entries[entry_type_lib.EntryType.TERM] = imported_terms
+    imported_relations[entry_type_lib.EntryType.TERM].extend(
+        imported_relations_term_to_term
     )
     imported_relations[entry_type_lib.EntryType.CATEGORY].extend(
         imported_relations_category_to_category
     )
-    import_errors.extend(category_to_category_relations_import_error)
+    import_errors.extend(terms_import_errors)
 
     return (imported_entries, imported_relations, import_errors)
 
-  def _import_glossary_categories(
-      self, categories: dict[int, bg_category.Category]
-  ) -> tuple[
-    list[bg_category.Category],
-    set[tuple[str, str]],
-    list[error.EntryImportError],
+  def _import_categories_or_exit(
+      self, categories: dict[int, bg_category.Category], has_terms: bool
+  ) -> tuple[list[bg_category.Category], set[tuple[str, str]]]:
+    """Imports categories, and ends the program if any could not be created.
+
+    Args:
+      categories: Categories to add to the glossary.
+      has_terms: Whether terms are imported after the categories.
+
+    Returns:
+      A tuple containing:
+      * a list of successfully imported categories
+      * a set of unimported category belongs_to category relations
+    """
+    (
+        imported_categories,
+        not_imported_belongs_to_relations,
+        categories_import_errors,
+    ) = self._import_glossary_categories(categories)
+    if categories_import_errors:
+      error_log_suffix = ' No terms were imported.' if has_terms else ''
+      logger.error(
+          'Errors occurred during categories import.%s', error_log_suffix
+      )
+      user_report.print_report_for_erroneous_categories_import(
+          imported_categories, categories_import_errors
+      )
+      utils.end_program_execution()
+    return imported_categories, not_imported_belongs_to_relations
+
+  def import_glossary_streaming(
+      self,
+      spool: import_spool.ImportSpool,
+      categories: dict[int, bg_category.Category] | None,
+      window_size: int = DEFAULT_WINDOW_SIZE,
+  ) -> import_types._StreamingImportResult:
+    """Imports spooled terms, categories and relationships in windows.
+
+    Categories are imported as by import_glossary. Terms are then read from
+    the spool and created window_size at a time, and their ids are written
+    back to the spool. Once all terms exist, the spooled relationships are
+    created window_size at a time, the terms they link being looked up in the
+    spool. Created terms are not kept in the caches, so memory use doesn't
+    grow with the number of terms.
+
+    Args:
+      spool: Spool holding the parsed terms and their relationships.
+      categories: dictionary indicating Category object for related line
+        number, or None if no categories CSV file was parsed.
+      window_size: Number of terms or relationships held in memory at once.
+
+    Returns:
+      A tuple consisting of:
+      * dictionary mapping EntryType to the number of imported entries
+      * dictionary mapping EntryType to the number of imported relations
+      * list of import errors
+    """
+    term_type = entry_type_lib.EntryType.TERM
+    category_type = entry_type_lib.EntryType.CATEGORY
+    imported_entries = {}
+    imported_relations = {term_type: 0, category_type: 0}
+    import_errors = []
+    category_relations = set()
+    if categories is not None:
+      if self._deterministic_ids:
+        self._assign_deterministic_ids({category_type: categories.values()})
+      imported_categories, category_relations = (
+          self._import_categories_or_exit(categories, bool(spool.term_count()))
+      )
+      imported_entries[category_type] = len(imported_categories)
+
+    logger.info(
+        f'Adding {spool.term_count()} terms in windows of {window_size}...'
+    )
+    imported_entries[term_type] = 0
+    for window in spool.term_windows(window_size):
+      imported_entries[term_type] += self._import_term_window(
+          spool, window, import_errors
+      )
+      logger.info(f'Added {imported_entries[term_type]} terms.')
+
+    logger.info(
+        f'Adding {spool.relationship_count()} relationships of terms in'
+        f' windows of {window_size}...'
+    )
+    for window in spool.relationship_windows(window_size):
+      imported_relations[term_type] += self._import_spooled_relationships(
+          spool, window, import_errors
+      )
+    # Category hierarchy last, due to the hierarchy height limit
+    imported_relations[category_type] = self._create_relationships(
+        [
+            (
+                src,
+                category_type,
+                dst,
+                category_type,
+                relation_type.RelationshipType.BELONGS_TO,
+            )
+            for src, dst in category_relations
+        ],
+        import_errors,
+    )
+    return imported_entries, imported_relations, import_errors
+
+  def _import_term_window(
+      self,
+      spool: import_spool.ImportSpool,
+      window: list[tuple[int, bg_term.Term]],
+      import_errors: list[error.EntryImportError],
+  ) -> int:
+    """Creates a window of spooled terms and records their ids in the spool.
+
+    Args:
+      spool: Spool the terms were read from.
+      window: Terms by line.
+      import_errors: List the errors of the creates are appended to.
+
+    Returns:
+      Number of terms created, or created by the resumed run.
+    """
+    term_type = entry_type_lib.EntryType.TERM
+    if self._deterministic_ids:
+      self._assign_deterministic_ids({term_type: [term for _, term in window]})
+    restored_lines = {
+        line_num
+        for line_num, term in window
+        if self._restored_entry(term_type, term)
+    }
+    new_terms = [
+        (line_num, term)
+        for line_num, term in window
+        if not self._resume_entry(term_type, term)
+    ]
+    responses = self._parallelize(
+        self._create_glossary_entry, [(term,) for _, term in new_terms]
+    )
+    failed_lines = set()
+    for (line_num, term), response in zip(new_terms, responses):
+      if response['error_msg']:
+        failed_lines.add(line_num)
+        import_errors.append(
+            error.EntryImportError(
+                term_type,
+                line_num,
+                [term.display_name],
+                message=response['error_msg'],
+                operation='add_new_term',
+            )
+        )
+    created = [
+        (line_num, term)
+        for line_num, term in window
+        if line_num not in failed_lines
+    ]
+    for line_num, term in created:
+      if line_num not in restored_lines:
+        self._journal_entry(term_type, line_num, term)
+    spool.set_entry_ids((line_num, term.term_id) for line_num, term in created)
+    return len(created)
+
+  def _import_spooled_relationships(
+      self,
+      spool: import_spool.ImportSpool,
+      relationships: list[import_spool.Relationship],
+      import_errors: list[error.EntryImportError],
+  ) -> int:
+    """Creates a window of spooled relationships.
+
+    The terms the relationships link are looked up in the spool and only
+    cached while the window is created.
+
+    Args:
+      spool: Spool holding the ids of the created terms.
+      relationships: Relationships to create.
+      import_errors: List the errors of the creates are appended to.
+
+    Returns:
+      Number of relationships created.
+    """
+    term_type = entry_type_lib.EntryType.TERM
+    names = {
+        name
+        for src, src_type, dst, dst_type, _ in relationships
+        for name, entry_type in ((src, src_type), (dst, dst_type))
+        if entry_type == term_type
+    }
+    window_terms = [
+        bg_term.Term(display_name, '', force_term_id=entry_id)
+        for display_name, entry_id in spool.term_entry_ids(names).items()
+        if self._term_cache.find(display_name) is None
+    ]
+    for term in window_terms:
+      self._term_cache[term.display_name] = term
+    try:
+      return self._create_relationships(relationships, import_errors)
+    finally:
+      for term in window_terms:
+        self._term_cache.pop(term.display_name, None)
+
+  def _create_relationships(
+      self,
+      relationships: list[import_spool.Relationship],
+      import_errors: list[error.EntryImportError],
+  ) -> int:
+    """Creates relationships concurrently and journals them.
+
+    Args:
+      relationships: Relationships to create. Those recorded in the journal
+        of a resumed run are skipped.
+      import_errors: List the errors of the creates are appended to.
+
+    Returns:
+      Number of relationships created, or created by the resumed run.
+    """
+    if self._journal:
+      pending = [
+          relationship
+          for relationship in relationships
+          if not self._journal.has_relationship(*relationship)
+      ]
+    else:
+      pending = relationships
+    results = self._parallelize(self._create_relationship, pending)
+    failed = 0
+    for relationship, err in zip(pending, results):
+      if err:
+        failed += 1
+        import_errors.append(err)
+      elif self._journal:
+        self._journal.record_relationship(*relationship)
+    return len(relationships) - failed
+
+  def import_glossary_diff(
+      self,
+      terms: dict[int, bg_term.Term] | None,
+      categories: dict[int, bg_category.Category] | None,
+  ) -> import_types._ImportResult:
+    """Makes the target glossary match the parsed terms and categories.
+
+    Only the differences are sent: missing entries are created, entries with a
+    different description or data stewards are updated, entries missing in the
+    CSV files are deleted, and so are relationships. Entries of a type whose CSV
+    file was not provided are left untouched.
+
+    Args:
+      terms: dictionary indicating Term object for related line number
+      categories: dictionary indicating Category object for related line number
+
+    Returns:
+      A tuple consisting of:
+      * dictionary mapping EntryType to list of Entries (Terms or Categories)
+        in the glossary after the import
+      * dictionary mapping EntryType to list of created relations
+      * lit of import errors
+    """
+    term_type = entry_type_lib.EntryType.TERM
+    category_type = entry_type_lib.EntryType.CATEGORY
+    if self._deterministic_ids:
+      # Matched entries take over the id of the existing entry afterwards
+      self._assign_deterministic_ids({
+          category_type: (categories or {}).values(),
+          term_type: (terms or {}).values(),
+      })
+    diffs, new_relationships, deleted_relationships = self._diff_glossary(
+        terms, categories
+    )
+    for entry_type, diff in diffs.items():
+      logger.info(
+          f'{entry_type.value}: {len(diff.new)} new, {len(diff.updated)}'
+          f' updated, {len(diff.deleted)} deleted and {len(diff.unchanged)}'
+          ' unchanged entries.'
+      )
+    logger.info(
+        f'Relationships: {len(new_relationships)} new and'
+        f' {len(deleted_relationships)} deleted.'
+    )
+
+    imported_relations = {term_type: [], category_type: []}
+    import_errors: list[error.EntryImportError] = []
+    scheduler = task_scheduler.DependencyScheduler(self._submit)
+
+    def on_relationship_removed(name: str, response: dict[str, Any]) -> None:
+      if response['error_msg']:
+        import_errors.append(
+            error.EntryImportError(
+                term_type,
+                -1,
+                [name],
+                message=response['error_msg'],
+                operation='delete_relationship',
+            )
+        )
+
+    def on_entry_removed(
+        entry_type: entry_type_lib.EntryType,
+        entry: bg_term.Term | bg_category.Category,
+        response: dict[str, Any],
+    ) -> None:
+      if response['error_msg']:
+        import_errors.append(
+            error.EntryImportError(
+                entry_type,
+                -1,
+                [entry.display_name],
+                message=response['error_msg'],
+                operation=f'delete_{entry_type.value.lower()}',
+            )
+        )
+        return
+      self._entry_cache(entry_type).pop(entry.display_name, None)
+
+    def on_entry_saved(
+        entry_type: entry_type_lib.EntryType,
+        operation: str,
+        line_num: int,
+        entry: bg_term.Term | bg_category.Category,
+        response: dict[str, Any],
+    ) -> None:
+      if response['error_msg']:
+        import_errors.append(
+            error.EntryImportError(
+                entry_type,
+                line_num,
+                [entry.display_name],
+                message=response['error_msg'],
+                operation=operation,
+            )
+        )
+        return
+      self._entry_cache(entry_type)[entry.display_name] = entry
+
+    def on_relationship_created(
+        relationship: glossary_diff.Relationship,
+        err: error.EntryImportError | None,
+    ) -> None:
+      if err:
+        import_errors.append(err)
+      else:
+        src, src_type, dst, _, relationship_type = relationship
+        imported_relations[src_type].append((src, dst, relationship_type))
+
+    for name in deleted_relationships:
+      scheduler.add(
+          self._remove_relationship,
+          (name,),
+          labels=(_RELATIONSHIP_DELETES,),
+          on_done=functools.partial(on_relationship_removed, name),
+      )
+    for entry_type, diff in diffs.items():
+      for entry in diff.deleted:
+        scheduler.add(
+            self._remove_glossary_entry,
+            (glossary_diff.entry_id(entry),),
+            on_done=functools.partial(on_entry_removed, entry_type, entry),
+        )
+      for entry in diff.unchanged.values():
+        self._entry_cache(entry_type)[entry.display_name] = entry
+      type_name = entry_type.value.lower()
+      for task, entries, operation in (
+          (self._create_glossary_entry, diff.new, f'add_new_{type_name}'),
+          (self._update_glossary_entry, diff.updated, f'update_{type_name}'),
+      ):
+        for line_num, entry in entries.items():
+          labels = [(entry_type, entry.display_name)]
+          if entry_type == term_type:
+            labels.append(_TERM_HIERARCHY)
+          scheduler.add(
+              task,
+              (entry,),
+              labels=labels,
+              on_done=functools.partial(
+                  on_entry_saved, entry_type, operation, line_num, entry
+              ),
+          )
+
+    # Category belongs_to category relationships are added last, as they wait
+    # for all term belongs_to relationships
+    for relationship in sorted(
+        new_relationships, key=lambda r: r[1] == category_type
+    ):
+      src, src_type, dst, dst_type, relationship_type = relationship
+      labels, depends_on = [], [
+          (src_type, src),
+          (dst_type, dst),
+          _RELATIONSHIP_DELETES,
+      ]
+      if relationship_type == relation_type.RelationshipType.BELONGS_TO:
+        if src_type == term_type:
+          labels.append(_TERM_HIERARCHY)
+        else:
+          depends_on.append(_TERM_HIERARCHY)
+      scheduler.add(
+          self._create_relationship,
+          relationship,
+          labels=labels,
+          depends_on=depends_on,
+          on_done=functools.partial(on_relationship_created, relationship),
+      )
+    with import_metrics.phase(_APPLY_DIFF_PHASE):
+      scheduler.run()
+
+    imported_entries = {}
+    if terms is not None:
+      imported_entries[term_type] = list(self._term_cache.values())
+    if categories is not None:
+      imported_entries[category_type] = list(self._category_cache.values())
+    return imported_entries, imported_relations, import_errors
+
+  def _diff_glossary(
+      self,
+      terms: dict[int, bg_term.Term] | None,
+      categories: dict[int, bg_category.Category] | None,
+  ) -> tuple[
+      dict[entry_type_lib.EntryType, glossary_diff.EntryDiff],
+      set[glossary_diff.Relationship],
+      list[str],
+  ]:
+    """Compares the parsed entries with the target glossary.
+
+    Args:
+      terms: dictionary indicating Term object for related line number
+      categories: dictionary indicating Category object for related line number
+
+    Returns:
+      A tuple consisting of:
+      * dictionary mapping EntryType to the changes of its entries, for the
+        types whose CSV file was parsed
+      * set of the relationships to create
+      * list of the resource names of the relationships to delete
+    """
+    if not self._caches_loaded:
+      # Entries missing in the caches would be created again
+      logger.error(
+          'The entries of the glossary could not all be loaded, the'
+          ' differences with the CSV files are unknown.'
+      )
+      utils.end_program_execution()
+    diffs = {}
+    if terms is not None:
+      diffs[entry_type_lib.EntryType.TERM] = glossary_diff.diff_entries(
+          terms, self._term_cache
+      )
+    if categories is not None:
+      diffs[entry_type_lib.EntryType.CATEGORY] = glossary_diff.diff_entries(
+          categories, self._category_cache
+      )
+
+    matched = {
+        entry_type: [*diff.updated.values(), *diff.unchanged.values()]
+        for entry_type, diff in diffs.items()
+    }
+    desired = glossary_diff.desired_relationships(
+        (terms or {}).values(),
+        (categories or {}).values(),
+        self._relationship_names(terms, categories),
+    )
+    existing_relationships = self._load_relationships(matched)
+    existing_relationships.update(
+        self._load_asset_relationships(
+            desired, matched.get(entry_type_lib.EntryType.TERM, [])
+        )
+    )
+    new_relationships, deleted_relationships = (
+        glossary_diff.diff_relationships(
+            desired, existing_relationships, set(diffs)
+        )
+    )
+    return diffs, new_relationships, deleted_relationships
+
+  def plan_import(
+      self,
+      terms: dict[int, bg_term.Term] | None,
+      categories: dict[int, bg_category.Category] | None,
+      mode: import_mode_lib.ImportMode,
+  ) -> import_planner.ImportPlan:
+    """Lists the API calls an import would make, without changing anything.
+
+    In diff mode the relationships of the existing entries are loaded to
+    compare them with the CSV files, which only reads the glossary. When
+    resuming, the entries and relationships of the journal are left out.
+
+    Args:
+      terms: dictionary indicating Term object for related line number
+      categories: dictionary indicating Category object for related line number
+      mode: import mode of the planned import.
+
+    Returns:
+      The plan of the import, with the mean latency of the calls made so far.
+    """
+    term_type = entry_type_lib.EntryType.TERM
+    category_type = entry_type_lib.EntryType.CATEGORY
+    plan = import_planner.ImportPlan()
+
+    if mode == import_mode_lib.ImportMode.DIFF:
+      diffs, new_relationships, deleted_relationships = self._diff_glossary(
+          terms, categories
+      )
+      load = plan.add_phase('Load relationships of existing entries')
+      load.calls['list relationships'] = sum(
+          len(diff.updated) + len(diff.unchanged) for diff in diffs.values()
+      ) + len(
+          self._tagged_assets(
+              glossary_diff.desired_relationships(
+                  (terms or {}).values(),
+                  (categories or {}).values(),
+                  self._relationship_names(terms, categories),
+              )
+          )
+      )
+      changes = plan.add_phase('Entries and their relationships')
+      changes.calls['delete relationship'] = len(deleted_relationships)
+      for entry_type, diff in diffs.items():
+        type_name = entry_type.value.lower()
+        changes.calls[f'delete {type_name}'] = len(diff.deleted)
+        changes.calls[f'create {type_name}'] = len(diff.new)
+        changes.calls[f'update {type_name}'] = len(diff.updated)
+    else:
+      if mode == import_mode_lib.ImportMode.CLEAR:
+        clear = plan.add_phase('Clear the glossary')
+        clear.calls['list relationships'] = len(self._category_cache)
+        clear.calls['delete term'] = len(self._term_cache)
+        clear.calls['delete category'] = len(self._category_cache)
+      new_relationships = {
+          relationship
+          for relationship in glossary_diff.desired_relationships(
+              (terms or {}).values(),
+              (categories or {}).values(),
+              self._relationship_names(terms, categories),
+          )
+          if not self._journal or not self._journal.has_relationship(
+              *relationship
+          )
+      }
+      created = plan.add_phase('Categories')
+      created.calls['create category'] = sum(
+          not self._resume_entry(category_type, category)
+          for category in (categories or {}).values()
+      )
+      changes = plan.add_phase('Terms and their relationships')
+      changes.calls['create term'] = sum(
+          not self._resume_entry(term_type, term)
+          for term in (terms or {}).values()
+      )
+
+    # Category belongs_to category relationships wait for all other ones
+    hierarchy = plan.add_phase('Category hierarchy')
+    for _, src_type, _, _, relationship_type in new_relationships:
+      phase = hierarchy if src_type == category_type else changes
+      phase.calls[f'create {relationship_type.value} relationship'] += 1
+
+    plan.latency_seconds = http_session.get_client().mean_latency_seconds()
+    return plan
+
+  def _load_relationships(
+      self,
+      entries: dict[
+        entry_type_lib.EntryType, list[bg_term.Term | bg_category.Category]
+      ],
+  ) -> dict[glossary_diff.Relationship, list[str]]:
+    """Loads the relationships between entries of the target glossary.
+
+    Args:
+      entries: Entries to load the relationships starting from, by type.
+
+    Returns:
+      Dictionary mapping normalized relationships to their resource names.
+    """
+    entries_by_id = {}
+    for entry_type, cache in (
+        (entry_type_lib.EntryType.TERM, self._term_cache),
+        (entry_type_lib.EntryType.CATEGORY, self._category_cache),
+    ):
+      for entry in cache.values():
+        entries_by_id[glossary_diff.entry_id(entry)] = (
+            entry.display_name,
+            entry_type,
+        )
+    sources = [
+        (entry_type, entry)
+        for entry_type, typed_entries in entries.items()
+        for entry in typed_entries
+    ]
+    logger.info(f'Loading relationships of {len(sources)} existing entries...')
+    with import_metrics.phase(_LOAD_RELATIONSHIPS_PHASE):
+      responses = self._parallelize(
+          self._list_relationships,
+          [(glossary_diff.entry_id(entry),) for _, entry in sources],
+      )
+
+    relationships = {}
+    for (src_type, src), response in zip(sources, responses):
+      if response['error_msg']:
+        logger.error(
+            f'Could not load relationships of {src.display_name}:'
+            f' {response["error_msg"]}'
+        )
+        utils.end_program_execution()
+      for relationship in response['json']['relationships']:
+        try:
+          relationship_type = relation_type.RelationshipType(
+              relationship.get('relationshipType')
+          )
+        except ValueError:
+          continue
+        dst_id = relationship.get('destinationEntryName', '').split('/')[-1]
+        if dst_id not in entries_by_id:
+          # Relationships with entries outside of the glossary are not synced
+          continue
+        dst, dst_type = entries_by_id[dst_id]
+        key = glossary_diff.normalize(
+            (src.display_name, src_type, dst, dst_type, relationship_type)
+        )
+        relationships.setdefault(key, []).append(relationship['name'])
+    return relationships
+
+  def _tagged_assets(
+      self, relationships: Iterable[glossary_diff.Relationship]
+  ) -> dict[str, dict[str | None, str]]:
+    """Returns the assets described by terms in a set of relationships.
+
+    Args:
+      relationships: Relationships described by the CSV files.
+
+    Returns:
+      Dictionary mapping the entry path of each asset to the asset paths
+      written in the CSV files, by source column.
+    """
+    assets = {}
+    for src, _, _, _, relationship_type in relationships:
+      if relationship_type != relation_type.RelationshipType.DESCRIBED:
+        continue
+      entry, source_column = self._names.asset_path(src)
+      if entry is not None:
+        assets.setdefault(entry, {})[source_column] = src
+    return assets
+
+  def _load_asset_relationships(
+      self,
+      relationships: Iterable[glossary_diff.Relationship],
+      terms: list[bg_term.Term],
+  ) -> dict[glossary_diff.Relationship, list[str]]:
+    """Loads the links between tagged assets and terms of the target glossary.
+
+    Links are stored on the asset entries, outside of the glossary, so only
+    the assets referenced by the CSV files are listed. Links from other
+    assets are not found and are kept.
+
+    Args:
+      relationships: Relationships described by the CSV files.
+      terms: Existing terms to load the links to.
+
+    Returns:
+      Dictionary mapping normalized relationships to their resource names.
+    """
+    term_type = entry_type_lib.EntryType.TERM
+    described = relation_type.RelationshipType.DESCRIBED
+    terms_by_id = {term.term_id: term.display_name for term in terms}
+    assets = self._tagged_assets(relationships)
+    logger.info(f'Loading relationships of {len(assets)} tagged assets...')
+    with import_metrics.phase(_LOAD_RELATIONSHIPS_PHASE):
+      responses = self._parallelize(
+          self._list_entry_relationships,
+          [(f'{utils.DATACATALOG_BASE_URL}/{asset}',) for asset in assets],
+      )
+
+    links = {}
+    for (asset, paths), response in zip(assets.items(), responses):
+      if response['error_msg']:
+        logger.error(
+            f'Could not load relationships of {asset}:'
+            f' {response["error_msg"]}'
+        )
+        utils.end_program_execution()
+      for relationship in response['json']['relationships']:
+        if relationship.get('relationshipType') != described.value:
+          continue
+        dst_id = relationship.get('destinationEntryName', '').split('/')[-1]
+        if dst_id not in terms_by_id:
+          continue
+        source_column = relationship.get('sourceColumn') or None
+        src = paths.get(source_column) or (
+            f'{asset}:{source_column}' if source_column else asset
+        )
+        key = (src, term_type, terms_by_id[dst_id], term_type, described)
+        links.setdefault(key, []).append(relationship['name'])
+    return links
+
+  def _resume_entry(
+      self,
+      entry_type: entry_type_lib.EntryType,
+      entry: bg_term.Term | bg_category.Category,
+  ) -> bool:
+    """Checks whether the resumed run already created an entry.
+
+    An entry found in the glossary but not in the journal was created right
+    before the run was interrupted.
+
+    Args:
+      entry_type: Type of the entry.
+      entry: Parsed entry. Takes over the id of the created entry.
+
+    Returns:
+      True if the entry was already created.
+    """
+    if self._journal is None or not self._journal.resume:
+      return False
+    entry_id = self._journal.entry_id(entry_type, entry.display_name)
+    if entry_id is None:
+      existing = self._entry_cache(entry_type).get(entry.display_name)
+      if existing is None:
+        return False
+      entry_id = glossary_diff.entry_id(existing)
+    glossary_diff.set_entry_id(entry, entry_id)
+    return True
+
+  def _restored_entry(
+      self,
+      entry_type: entry_type_lib.EntryType,
+      entry: bg_term.Term | bg_category.Category,
+  ) -> bool:
+    """Checks whether the journal of the resumed run records an entry."""
+    return (
+        self._journal is not None
+        and self._journal.resume
+        and self._journal.entry_id(entry_type, entry.display_name) is not None
+    )
+
+  def _journal_entry(
+      self,
+      entry_type: entry_type_lib.EntryType,
+      line_num: int,
+      entry: bg_term.Term | bg_category.Category,
+  ) -> None:
+    if self._journal is not None:
+      self._journal.record_entry(
+          entry_type,
+          line_num,
+          entry.display_name,
+          glossary_diff.entry_id(entry),
+      )
+
+  def _import_glossary_categories(
+      self, categories: dict[int, bg_category.Category]
+  ) -> tuple[
+    list[bg_category.Category],
+    set[tuple[str, str]],
+    list[error.EntryImportError],
   ]:
     """Imports categories into Data Catalog Business Glossary.
 
@@ -642,12 +1846,23 @@ class Glossary:
     # relationships first.
     not_imported_belongs_to_relations = set()
 
-    # Create category entries
-    ret = self._create_glossary_categories(categories)
+    # Create category entries, except those created by a resumed run
+    responses = {}
+    new_categories = {}
+    restored_lines = set()
+    for line_num, category in categories.items():
+      if self._restored_entry(entry_type_lib.EntryType.CATEGORY, category):
+        restored_lines.add(line_num)
+      if self._resume_entry(entry_type_lib.EntryType.CATEGORY, category):
+        responses[line_num] = _RESUMED_RESPONSE
+      else:
+        new_categories[line_num] = category
+    ret = self._create_glossary_categories(new_categories)
+    responses.update(zip(new_categories, ret))
 
     # Gather category creation results and prepare relationships
-    for elem_order, response in zip(categories.items(), ret):
-      line_num, category = elem_order
+    for line_num, category in categories.items():
+      response = responses[line_num]
       err = response['error_msg']
 
       if err:
@@ -662,6 +1877,10 @@ class Glossary:
       else:
         # Populate internal category cache
         self._category_cache[category.display_name] = category
+        if line_num not in restored_lines:
+          self._journal_entry(
+              entry_type_lib.EntryType.CATEGORY, line_num, category
+          )
 
         # Add belongs to category relations to create later
         if category.belongs_to_category:
@@ -676,38 +1895,93 @@ class Glossary:
     )
 
   def _import_glossary_terms(
-      self, terms: dict[int, bg_term.Term]
+      self,
+      terms: dict[int, bg_term.Term],
+      category_belongs_to_relations: set[tuple[str, str]],
   ) -> tuple[
     list[bg_term.Term],
     list[import_types._CreatedRelationship[relation_type.RelationshipType]],
+    list[import_types._CreatedRelationship[relation_type.RelationshipType]],
     list[error.EntryImportError],
   ]:
-    """Imports terms into Data Catalog Business Glossary.
+    """Imports terms and all relationships into Data Catalog Business Glossary.
+
+    Terms and relationships are scheduled as a dependency graph: a relationship
+    is created as soon as the terms it links are created, instead of after all
+    terms. Category belongs_to category relationships are created last, once
+    all terms and their belongs_to relationships are done, due to the hierarchy
+    height limit.
 
     Args:
       terms: List of terms to add to the glossary.
+      category_belongs_to_relations: Set of (category, parent category) pairs
+        to create.
 
     Returns:
       A tuple containing:
       * a list of successfully imported terms
-      * a list of imported relations,
+      * a list of imported relations with a term as source,
+      * a list of imported category belongs_to category relations,
       * a list of import errors
     """
     term_import_errors: list[error.EntryImportError] = []
-    imported_relations = []
-    synonym_relations = set()
-    related_term_relations = set()
-    tagged_asset_relations = set()
-    belongs_to_relations = set()
-
-    # Create term entries
-    ret = self._create_glossary_terms(terms)
-
-    # Gather term creation results and prepare relationships
-    for elem_order, response in zip(terms.items(), ret):
-      line_num, term = elem_order
-      err = response['error_msg']
+    term_relations = []
+    category_relations = []
+    scheduled_relations = set()
+    restored_lines = set()
+    scheduler = task_scheduler.DependencyScheduler(self._submit)
+    names = self._relationship_names(terms, None)
+
+    def add_relationship(
+        src: str,
+        src_type: entry_type_lib.EntryType,
+        dst: str,
+        dst_type: entry_type_lib.EntryType,
+        relationship_type: relation_type.RelationshipType,
+        created_relations: list[
+          import_types._CreatedRelationship[relation_type.RelationshipType]
+        ],
+        labels: tuple[Hashable, ...] = (),
+        depends_on: tuple[Hashable, ...] = (),
+    ) -> None:
+      # Ends are scheduled, deduplicated and journaled by display name
+      relationship = glossary_diff.canonicalize(
+          (src, src_type, dst, dst_type, relationship_type), names
+      )
+      src, src_type, dst, dst_type, _ = relationship
+      if relationship in scheduled_relations:
+        return
+      scheduled_relations.add(relationship)
+      if self._journal and self._journal.has_relationship(*relationship):
+        created_relations.append((src, dst, relationship_type))
+        return
+
+      def on_done(err: error.EntryImportError | None) -> None:
+        if err:
+          term_import_errors.append(err)
+        else:
+          created_relations.append((src, dst, relationship_type))
+          if self._journal:
+            self._journal.record_relationship(*relationship)
+
+      # Wait for the creation of linked terms imported in this run
+      entry_labels = tuple(
+          (entry_type, name)
+          for name, entry_type in ((src, src_type), (dst, dst_type))
+          if entry_type == entry_type_lib.EntryType.TERM
+      )
+      scheduler.add(
+          self._create_relationship,
+          relationship,
+          labels=labels,
+          depends_on=entry_labels + depends_on,
+          on_done=on_done,
+      )
 
+    def on_term_created(
+        line_num: int, term: bg_term.Term, response: dict[str, Any]
+    ) -> None:
+      err = response['error_msg']
       if err:
         new_error = error.EntryImportError(
             entry_type_lib.EntryType.TERM,
@@ -717,78 +1991,89 @@ class Glossary:
             operation='add_new_term',
         )
         term_import_errors.append(new_error)
-      else:
-        # Populate internal term cache
-        self._term_cache[term.display_name] = term
-        # Add synonym relations to create
-        for dst in term.synonyms:
-          # Sort terms by name to make sure the relationship is only created
-          # once.
-          first, second = min(term.display_name, dst), max(
-              term.display_name, dst
-          )
-          synonym_relations.add((first, second))
-
-        # Add related term relations to create
-        for dst in term.related_terms:
-          # Sort terms by name to make sure the relationship is only created
-          # once.
-          first, second = min(term.display_name, dst), max(
-              term.display_name, dst
-          )
-          related_term_relations.add((first, second))
-
-        # Add tagged asset relations to create
-        for src in term.tagged_assets:
-          # Sort terms by name to make sure the relationship is only created
-          # once.
-          tagged_asset_relations.add((src, term.display_name))
-
-        # Add belongs to category relations to create
-        if term.belongs_to_category:
-          belongs_to_relations.add(
-              (term.display_name, term.belongs_to_category)
-          )
+        return
 
-    tasks = [
-        (
+      # Populate internal term cache
+      self._term_cache[term.display_name] = term
+      if line_num not in restored_lines:
+        self._journal_entry(entry_type_lib.EntryType.TERM, line_num, term)
+      # Synonym and related term relationships are normalized by
+      # add_relationship to make sure they are only created once.
+      for dst in term.synonyms:
+        add_relationship(
+            term.display_name,
             entry_type_lib.EntryType.TERM,
+            dst,
             entry_type_lib.EntryType.TERM,
-            synonym_relations,
             relation_type.RelationshipType.SYNONYMOUS,
-        ),
-        (
+            term_relations,
+        )
+      for dst in term.related_terms:
+        add_relationship(
+            term.display_name,
             entry_type_lib.EntryType.TERM,
+            dst,
             entry_type_lib.EntryType.TERM,
-            related_term_relations,
             relation_type.RelationshipType.RELATED,
-        ),
-        (
+            term_relations,
+        )
+      for src in term.tagged_assets:
+        add_relationship(
+            src,
             entry_type_lib.EntryType.TERM,
+            term.display_name,
             entry_type_lib.EntryType.TERM,
-            tagged_asset_relations,
             relation_type.RelationshipType.DESCRIBED,
-        ),
-        (
+            term_relations,
+        )
+      if term.belongs_to_category:
+        add_relationship(
+            term.display_name,
             entry_type_lib.EntryType.TERM,
+            term.belongs_to_category,
             entry_type_lib.EntryType.CATEGORY,
-            belongs_to_relations,
             relation_type.RelationshipType.BELONGS_TO,
-        ),
-    ]
-    for src_type, dst_type, relations, rel_type in tasks:
-      created_relationships, errors = self._create_relationships(
-          src_type=src_type,
-          dst_type=dst_type,
-          related_entries=relations,
-          relationship_type=rel_type,
+            term_relations,
+            labels=(_TERM_HIERARCHY,),
+        )
+
+    if terms:
+      logger.info('Adding terms and their relationships...')
+    resumed_terms = {}
+    for line_num, term in terms.items():
+      if self._restored_entry(entry_type_lib.EntryType.TERM, term):
+        restored_lines.add(line_num)
+      if self._resume_entry(entry_type_lib.EntryType.TERM, term):
+        resumed_terms[line_num] = term
+        continue
+      scheduler.add(
+          self._create_glossary_entry,
+          (term,),
+          labels=(
+              (entry_type_lib.EntryType.TERM, term.display_name),
+              _TERM_HIERARCHY,
+          ),
+          on_done=functools.partial(on_term_created, line_num, term),
+      )
+    # Relationships of resumed terms wait for the terms created above
+    for line_num, term in resumed_terms.items():
+      on_term_created(line_num, term, _RESUMED_RESPONSE)
+    for src, dst in category_belongs_to_relations:
+      add_relationship(
+          src,
+          entry_type_lib.EntryType.CATEGORY,
+          dst,
+          entry_type_lib.EntryType.CATEGORY,
+          relation_type.RelationshipType.BELONGS_TO,
+          category_relations,
+          depends_on=(_TERM_HIERARCHY,),
       )
-      imported_relations.extend(created_relationships)
-      term_import_errors.extend(errors)
+    scheduler.run()
 
     return (
         list(self._term_cache.values()),
-        imported_relations,
+        term_relations,
+        category_relations,
         term_import_errors,
     )
 
@@ -808,36 +2093,203 @@ class Glossary:
         requests.delete, endpoint, self._config.project_id
     )
 
+  def _remove_relationship(self, relationship_name: str) -> dict[str, Any]:
+    """Remove a relationship.
+
+    Args:
+      relationship_name: Resource name of the relationship.
+
+    Returns:
+      Dictionary with response and response code.
+    """
+    endpoint = f'{utils.DATACATALOG_BASE_URL}/{relationship_name}'
+
+    return api_call_utils.fetch_api_response(
+        requests.delete, endpoint, self._config.project_id
+    )
+
+  def _list_relationships(self, entry_id: str) -> dict[str, Any]:
+    """Lists the relationships starting from an entry of the target glossary.
+
+    Args:
+      entry_id: Entry id in the target glossary.
+
+    Returns:
+      Dictionary with the relationships of all pages under
+      ['json']['relationships'], or the error of the first failed call.
+    """
+    return self._list_entry_relationships(
+        f'{self._glossary_endpoint}/entries/{entry_id}'
+    )
+
+  def _list_entry_relationships(self, entry_url: str) -> dict[str, Any]:
+    """Lists the relationships starting from any entry.
+
+    Args:
+      entry_url: URL of the entry.
+
+    Returns:
+      Dictionary with the relationships of all pages under
+      ['json']['relationships'], or the error of the first failed call.
+    """
+    endpoint = (
+        f'{entry_url}/relationships?view=FULL&pageSize={utils.PAGE_SIZE}'
+    )
+    relationships, page_token = [], None
+    while True:
+      endpoint_url = (
+          f'{endpoint}&pageToken={page_token}' if page_token else endpoint
+      )
+      response = api_call_utils.fetch_api_response(
+          requests.get, endpoint_url, self._config.project_id
+      )
+      if response['error_msg']:
+        return response
+      relationships.extend(response['json'].get('relationships', []))
+      page_token = response['json'].get('nextPageToken')
+      if not page_token:
+        return {'json': {'relationships': relationships}, 'error_msg': None}
+
+  def _category_parents(self) -> dict[str, str] | None:
+    """Returns the parent of each category of the target glossary.
+
+    Returns:
+      Dictionary mapping category display names to the display name of the
+      category they belong to, or None if relationships could not be listed.
+    """
+    categories = list(self._category_cache.values())
+    names_by_id = {
+        category.category_id: category.display_name for category in categories
+    }
+    responses = self._parallelize(
+        self._list_relationships,
+        [(category.category_id,) for category in categories],
+    )
+    parents = {}
+    for category, response in zip(categories, responses):
+      if response['error_msg']:
+        logger.error(
+            f'Could not load relationships of {category.display_name}:'
+            f' {response["error_msg"]}'
+        )
+        return None
+      for relationship in response['json']['relationships']:
+        if (
+            relationship.get('relationshipType')
+            != relation_type.RelationshipType.BELONGS_TO.value
+        ):
+          continue
+        parent_id = relationship.get('destinationEntryName', '').split('/')[-1]
+        if parent_id in names_by_id:
+          parents[category.display_name] = names_by_id[parent_id]
+    return parents
+
   def clear_glossary(self) -> bool:
     """Remove existing terms and categories from a Data Catalog Business Glossary.
 
+    Terms are deleted first, together with the relationships stored on them,
+    then categories from the leaves of the category hierarchy up. Each delete
+    removes its entry from the caches as soon as it lands, so a clear that
+    failed part way can be run again to delete what is left.
+
     Args:
       None.
 
     Returns:
-      A boolean indicating if the operation succeeded.
+      A boolean indicating if all entries were deleted.
     """
+    with import_metrics.phase(_CLEAR_PHASE):
+      return self._clear_glossary()
+
+  def _clear_glossary(self) -> bool:
+    term_type = entry_type_lib.EntryType.TERM
+    category_type = entry_type_lib.EntryType.CATEGORY
+    category_parents = self._category_parents()
+    if category_parents is None:
+      return False
+    children = {}
+    for child, parent in category_parents.items():
+      children.setdefault(parent, []).append((category_type, child))
+
+    terms = list(self._term_cache.values())
+    categories = list(self._category_cache.values())
+    total = len(terms) + len(categories)
     logger.info(
-        'Clearing the existing terms and categories in the target glossary.'
+        f'Clearing {len(terms)} terms and {len(categories)} categories in the'
+        ' target glossary.'
     )
-    tasks = []
-    for term in self._term_cache.values():
-      tasks.append((term.term_id,))
-    for category in self._category_cache.values():
-      tasks.append((category.category_id,))
-
-    ret = Glossary._parallelize(self._remove_glossary_entry, tasks)
-    for response in ret:
-      err = response['error_msg']
-
-      if err:
+    started = last_report = time.monotonic()
+    deleted = failed = 0
+    skipped = []
+
+    def on_entry_removed(
+        entry_type: entry_type_lib.EntryType,
+        entry: bg_term.Term | bg_category.Category,
+        response: dict[str, Any],
+    ) -> None:
+      nonlocal deleted, failed, last_report
+      if response['error_msg']:
+        failed += 1
         logger.error(
-            'Could not delete entry (term or catgory) from the target glossary.'
+            f'Could not delete {entry_type.value.lower()}'
+            f' {entry.display_name} from the target glossary:'
+            f' {response["error_msg"]}'
+        )
+      else:
+        deleted += 1
+        self._entry_cache(entry_type).pop(entry.display_name, None)
+      now = time.monotonic()
+      if now - last_report >= _PROGRESS_LOG_INTERVAL_SECONDS:
+        last_report = now
+        logger.info(
+            f'Deleted {deleted}/{total} entries'
+            f' ({deleted / (now - started):.1f}/s).'
         )
-        return False
 
-    # Refresh term cache
-    self._term_cache = {}
-    self._category_cache = {}
+    def removed(response: dict[str, Any]) -> bool:
+      return not response['error_msg']
+
+    scheduler = task_scheduler.DependencyScheduler(self._submit)
+    for term in terms:
+      scheduler.add(
+          self._remove_glossary_entry,
+          (term.term_id,),
+          labels=(_TERM_DELETES,),
+          on_done=functools.partial(on_entry_removed, term_type, term),
+          succeeded=removed,
+      )
+    # A category is deleted once its terms and child categories are gone, and
+    # skipped if one of them could not be deleted, as it would not be empty
+    for category in categories:
+      scheduler.add(
+          self._remove_glossary_entry,
+          (category.category_id,),
+          labels=((category_type, category.display_name),),
+          depends_on=(
+              _TERM_DELETES,
+              *children.get(category.display_name, ()),
+          ),
+          on_done=functools.partial(on_entry_removed, category_type, category),
+          succeeded=removed,
+          on_skipped=functools.partial(skipped.append, category.display_name),
+      )
+    scheduler.run()
+    if skipped:
+      failed += len(skipped)
+      logger.error(
+          f'Skipped deleting {len(skipped)} categories whose terms or child'
+          f' categories could not be deleted: {", ".join(skipped)}.'
+      )
 
+    elapsed = time.monotonic() - started
+    logger.info(
+        f'Deleted {deleted}/{total} entries in {elapsed:.1f}s'
+        f' ({deleted / elapsed if elapsed else 0:.1f}/s).'
+    )
+    if failed:
+      logger.error(
+          f'Could not delete {failed} entries (terms or categories) from the'
+          ' target glossary.'
+      )
+      return False
     return True
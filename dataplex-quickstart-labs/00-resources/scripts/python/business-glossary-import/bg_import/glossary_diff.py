@@ -0,0 +1,263 @@
+"""Computes the changes turning the current glossary into the parsed CSV files.
+
+Entries are matched by normalized display name, see name_index. Parsed entries
+matching an existing entry take over its id and display name, so that they can
+be updated in place and relationships can refer to them.
+
+Typical usage example:
+  term_diff = glossary_diff.diff_entries(parsed_terms, term_cache)
+  to_create, to_delete = glossary_diff.diff_relationships(
+      desired, existing, sources
+  )
+"""
+
+import dataclasses
+from typing import Generic, Iterable, TypeVar
+
+import category as bg_category
+import entry_type as entry_type_lib
+import name_index
+import relation_type
+import term as bg_term
+
+_E = TypeVar('_E', bg_term.Term, bg_category.Category)
+
+# Source name, source type, destination name, destination type and type of a
+# relationship between glossary entries.
+Relationship = tuple[
+    str,
+    entry_type_lib.EntryType,
+    str,
+    entry_type_lib.EntryType,
+    relation_type.RelationshipType,
+]
+
+# Relationships stored once for both of their ends.
+_SYMMETRIC_RELATIONSHIP_TYPES = frozenset({
+    relation_type.RelationshipType.SYNONYMOUS,
+    relation_type.RelationshipType.RELATED,
+})
+
+
+@dataclasses.dataclass
+class EntryDiff(Generic[_E]):
+  """Changes to the entries of one type.
+
+  Attributes:
+    new: Parsed entries missing in the glossary, by line in the CSV file.
+    updated: Parsed entries whose content differs from the glossary, by line.
+    unchanged: Parsed entries identical to the glossary, by line.
+    deleted: Glossary entries missing in the parsed CSV file.
+  """
+
+  new: dict[int, _E] = dataclasses.field(default_factory=dict)
+  updated: dict[int, _E] = dataclasses.field(default_factory=dict)
+  unchanged: dict[int, _E] = dataclasses.field(default_factory=dict)
+  deleted: list[_E] = dataclasses.field(default_factory=list)
+
+
+def entry_id(entry: bg_term.Term | bg_category.Category) -> str:
+  if isinstance(entry, bg_category.Category):
+    return entry.category_id
+  return entry.term_id
+
+
+def set_entry_id(
+    entry: bg_term.Term | bg_category.Category, new_id: str
+) -> None:
+  if isinstance(entry, bg_category.Category):
+    entry.category_id = new_id
+  else:
+    entry.term_id = new_id
+
+
+def _content_changed(
+    entry: bg_term.Term | bg_category.Category,
+    current: bg_term.Term | bg_category.Category,
+) -> bool:
+  return (
+      entry.description != current.description
+      or entry.data_stewards != current.data_stewards
+  )
+
+
+def diff_entries(
+    parsed: dict[int, _E], existing: name_index.EntryCache
+) -> EntryDiff:
+  """Compares parsed entries with the entries existing in the glossary.
+
+  Args:
+    parsed: Parsed entries by line in the CSV file.
+    existing: Glossary entries by display name.
+
+  Returns:
+    EntryDiff. Parsed entries found in the glossary get the id and the display
+    name of the existing entry.
+  """
+  diff = EntryDiff()
+  matched_names = set()
+  for line, entry in parsed.items():
+    current = existing.find(entry.display_name)
+    if current is None:
+      diff.new[line] = entry
+      continue
+    matched_names.add(current.display_name)
+    set_entry_id(entry, entry_id(current))
+    entry.display_name = current.display_name
+    if _content_changed(entry, current):
+      diff.updated[line] = entry
+    else:
+      diff.unchanged[line] = entry
+  diff.deleted = [
+      entry for name, entry in existing.items() if name not in matched_names
+  ]
+  return diff
+
+
+def _order_key(display_name: str) -> tuple[str, str]:
+  return name_index.normalize_name(display_name), display_name
+
+
+def normalize(relationship: Relationship) -> Relationship:
+  """Orders the ends of symmetric relationships by normalized display name."""
+  src, src_type, dst, dst_type, relationship_type = relationship
+  if relationship_type in _SYMMETRIC_RELATIONSHIP_TYPES and _order_key(
+      dst
+  ) < _order_key(src):
+    return (dst, dst_type, src, src_type, relationship_type)
+  return relationship
+
+
+def _display_name(
+    names: name_index.NameIndex, entry_type: entry_type_lib.EntryType, name: str
+) -> str:
+  entry = names.find(entry_type, name)
+  return name if entry is None else entry.display_name
+
+
+def canonicalize(
+    relationship: Relationship, names: name_index.NameIndex
+) -> Relationship:
+  """Returns a relationship between the display names of its entries.
+
+  Ends are looked up in names the way relationship columns are matched, so
+  that "beta" and "Beta" refer to the same relationship. Ends not found and
+  tagged assets are kept as written. Symmetric relationships are normalized.
+
+  Args:
+    relationship: Relationship as written in the CSV files.
+    names: Entries the ends of the relationship refer to.
+
+  Returns:
+    The normalized relationship between display names.
+  """
+  src, src_type, dst, dst_type, relationship_type = relationship
+  if relationship_type != relation_type.RelationshipType.DESCRIBED:
+    src = _display_name(names, src_type, src)
+  dst = _display_name(names, dst_type, dst)
+  return normalize((src, src_type, dst, dst_type, relationship_type))
+
+
+def desired_relationships(
+    terms: Iterable[bg_term.Term],
+    categories: Iterable[bg_category.Category],
+    names: name_index.NameIndex | None = None,
+) -> set[Relationship]:
+  """Returns all relationships described by the parsed entries.
+
+  Args:
+    terms: Parsed terms.
+    categories: Parsed categories.
+    names: Entries the relationships refer to. Defaults to the parsed terms
+      and categories.
+
+  Returns:
+    The canonical relationships, see canonicalize.
+  """
+  terms = list(terms)
+  categories = list(categories)
+  if names is None:
+    names = name_index.NameIndex()
+    names.terms.update({term.display_name: term for term in terms})
+    names.categories.update(
+        {category.display_name: category for category in categories}
+    )
+  term_type = entry_type_lib.EntryType.TERM
+  category_type = entry_type_lib.EntryType.CATEGORY
+  relationships = []
+  for term in terms:
+    for dst in term.synonyms:
+      relationships.append((
+          term.display_name,
+          term_type,
+          dst,
+          term_type,
+          relation_type.RelationshipType.SYNONYMOUS,
+      ))
+    for dst in term.related_terms:
+      relationships.append((
+          term.display_name,
+          term_type,
+          dst,
+          term_type,
+          relation_type.RelationshipType.RELATED,
+      ))
+    for src in term.tagged_assets:
+      relationships.append((
+          src,
+          term_type,
+          term.display_name,
+          term_type,
+          relation_type.RelationshipType.DESCRIBED,
+      ))
+    if term.belongs_to_category:
+      relationships.append((
+          term.display_name,
+          term_type,
+          term.belongs_to_category,
+          category_type,
+          relation_type.RelationshipType.BELONGS_TO,
+      ))
+  for category in categories:
+    if category.belongs_to_category:
+      relationships.append((
+          category.display_name,
+          category_type,
+          category.belongs_to_category,
+          category_type,
+          relation_type.RelationshipType.BELONGS_TO,
+      ))
+  return {
+      canonicalize(relationship, names) for relationship in relationships
+  }
+
+
+def diff_relationships(
+    desired: set[Relationship],
+    existing: dict[Relationship, list[str]],
+    source_types: set[entry_type_lib.EntryType],
+) -> tuple[set[Relationship], list[str]]:
+  """Compares the relationships described by the CSV files with the glossary.
+
+  Args:
+    desired: Relationships described by the parsed entries.
+    existing: Resource names of the relationships existing in the glossary,
+      and of the tagged asset relationships of the assets referenced by the
+      CSV files, by normalized relationship.
+    source_types: Entry types whose CSV file was provided. Existing
+      relationships starting from other entry types are kept.
+
+  Returns:
+    A tuple of the relationships to create and the resource names of the
+    relationships to delete.
+  """
+  to_create = {
+      relationship for relationship in desired if relationship not in existing
+  }
+  to_delete = [
+      name
+      for relationship, names in existing.items()
+      if relationship not in desired and relationship[1] in source_types
+      for name in names
+  ]
+  return to_create, to_delete
@@ -0,0 +1,141 @@
+"""Shared, connection-pooled HTTP session used for all API calls.
+
+Opening a new TCP and TLS connection for every request dominates the wall time
+of large imports and exports. SessionClient keeps a pool of keep-alive
+connections per host that is shared by every thread of the process.
+
+Typical usage example:
+  http_session.configure(pool_size=64)
+  response = http_session.get_client().request('GET', url, headers=headers)
+  stats = http_session.get_client().connection_stats()
+"""
+
+import os
+import threading
+import time
+from typing import Any
+
+import requests
+from requests import adapters
+
+DEFAULT_POOL_SIZE = 32
+# Number of distinct hosts (datacatalog, dataplex, ...) we keep pools for.
+_MAX_HOST_POOLS = 10
+
+
+class SessionClient:
+  """Thread-safe wrapper around a pooled requests.Session.
+
+  Attributes:
+    pool_size: Maximum number of connections kept open per host.
+    keep_alive: Whether connections are reused between requests.
+  """
+
+  def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, keep_alive: bool = True):
+    if pool_size < 1:
+      raise ValueError('Connection pool size must be a positive integer.')
+    self.pool_size = pool_size
+    self.keep_alive = keep_alive
+    self._adapter = adapters.HTTPAdapter(
+        pool_connections=_MAX_HOST_POOLS,
+        pool_maxsize=pool_size,
+        pool_block=True,
+    )
+    self._session = requests.Session()
+    self._session.mount('https://', self._adapter)
+    self._session.mount('http://', self._adapter)
+    if not keep_alive:
+      self._session.headers['Connection'] = 'close'
+    # Number of requests answered and their total duration
+    self._timed_requests = 0
+    self._request_seconds = 0.0
+    self._timing_lock = threading.Lock()
+
+  def request(
+      self,
+      method_name: str,
+      url: str,
+      headers: dict[str, str] | None = None,
+      json: dict[str, Any] | None = None,
+  ) -> requests.Response:
+    """Sends a request through the pooled session.
+
+    Args:
+      method_name: HTTP method name, e.g. GET, POST or DELETE.
+      url: URL of the resource.
+      headers: Optional request headers.
+      json: Optional JSON body of the request.
+
+    Returns:
+      requests.Response.
+    """
+    send = getattr(self._session, method_name.lower())
+    started = time.perf_counter()
+    response = send(url, headers=headers, json=json)
+    elapsed = time.perf_counter() - started
+    with self._timing_lock:
+      self._timed_requests += 1
+      self._request_seconds += elapsed
+    return response
+
+  def mean_latency_seconds(self) -> float | None:
+    """Returns the mean duration of the requests answered so far, if any."""
+    with self._timing_lock:
+      if not self._timed_requests:
+        return None
+      return self._request_seconds / self._timed_requests
+
+  def connection_stats(self) -> dict[str, int]:
+    """Returns how many requests were sent and connections opened so far."""
+    requests_sent, connections_opened = 0, 0
+    pools = self._adapter.poolmanager.pools
+    for key in pools.keys():
+      pool = pools.get(key)
+      if pool is None:
+        continue
+      requests_sent += pool.num_requests
+      connections_opened += pool.num_connections
+    return {
+        'requests': requests_sent,
+        'new_connections': connections_opened,
+        'reused_connections': max(requests_sent - connections_opened, 0),
+    }
+
+  def close(self) -> None:
+    self._session.close()
+
+
+# Process wide client, created lazily. We remember the pid which created it so
+# that a forked child never shares sockets with its parent.
+_client: SessionClient | None = None
+_client_pid: int | None = None
+_pool_size = DEFAULT_POOL_SIZE
+_keep_alive = True
+_lock = threading.Lock()
+
+
+def configure(
+    pool_size: int = DEFAULT_POOL_SIZE, keep_alive: bool = True
+) -> None:
+  """Sets the pool configuration, replacing the current client if any.
+
+  Args:
+    pool_size: Maximum number of connections kept open per host.
+    keep_alive: Whether connections are reused between requests.
+  """
+  global _client, _client_pid, _pool_size, _keep_alive
+  with _lock:
+    if _client is not None and _client_pid == os.getpid():
+      _client.close()
+    _pool_size, _keep_alive = pool_size, keep_alive
+    _client, _client_pid = None, None
+
+
+def get_client() -> SessionClient:
+  """Returns the shared SessionClient of the current process."""
+  global _client, _client_pid
+  with _lock:
+    if _client is None or _client_pid != os.getpid():
+      _client = SessionClient(_pool_size, _keep_alive)
+      _client_pid = os.getpid()
+    return _client
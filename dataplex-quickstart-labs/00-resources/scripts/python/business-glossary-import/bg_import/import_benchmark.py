@@ -0,0 +1,186 @@
+"""End-to-end benchmark of glossary imports against a local fake Data Catalog.
+
+Imports synthetic glossaries with dense relationships through the real
+Glossary (or AsyncGlossary) code, sending every API call over HTTP to the
+in-process fake server of tests/test_utils/fake_datacatalog.py, and prints the
+wall time, the request rate and the metrics of each phase. Latency, server
+errors and throttling of the fake server can be set to compare concurrency
+and batching changes offline.
+
+Every term has a synonym, two related terms, a tagged asset and a category.
+Categories are nested two levels deep. The server shares the process, and so
+the interpreter, with the import: absolute rates are lower than against the
+real API, compare runs with each other.
+
+Typical usage example:
+  python3 bg_import/import_benchmark.py --terms=1000,10000,100000
+  python3 bg_import/import_benchmark.py --terms=10000 --latency-ms=50 \
+      --throttle-rate=0.01 --max-workers=100 --async
+"""
+
+import argparse
+import logging
+import time
+
+import async_glossary
+import category as bg_category
+import glossary as dc_glossary
+import glossary_identification
+import http_session
+import import_metrics
+import logging_utils
+import rate_limiter
+import term as bg_term
+import utils
+from tests.test_utils import fake_datacatalog
+
+_PROJECT = "benchmark-project"
+_LOCATION = "us"
+_ENTRY_GROUP = "benchmark_group"
+_ASSET_ENTRY_GROUP = "benchmark_assets"
+_GLOSSARY = "benchmark_glossary"
+# Categories per term, and top level categories
+_CATEGORY_RATIO = 100
+_TOP_LEVEL_CATEGORIES = 10
+
+
+def make_glossary(
+    term_count: int,
+) -> tuple[dict[int, bg_term.Term], dict[int, bg_category.Category], list[str]]:
+  """Returns synthetic terms, categories and the assets the terms describe.
+
+  Args:
+    term_count: Number of terms.
+
+  Returns:
+    Terms by line, categories by line and resource names of the assets.
+  """
+  category_count = max(term_count // _CATEGORY_RATIO, 1)
+  categories = {}
+  for i in range(category_count):
+    parent = None
+    if i >= _TOP_LEVEL_CATEGORIES:
+      parent = f"Category {i % _TOP_LEVEL_CATEGORIES}"
+    categories[i + 1] = bg_category.Category(
+        f"Category {i}",
+        f"Description of category {i}",
+        data_stewards=["Steward<steward@example.com>"],
+        belongs_to_category=parent,
+    )
+
+  terms, assets = {}, []
+  for i in range(term_count):
+    asset = (
+        f"projects/{_PROJECT}/locations/{_LOCATION}/entryGroups"
+        f"/{_ASSET_ENTRY_GROUP}/entries/asset_{i}"
+    )
+    assets.append(asset)
+    # Relationships only point forward, so that none is listed twice
+    terms[i + 1] = bg_term.Term(
+        f"Term {i}",
+        f"Description of term {i}",
+        data_stewards=["Steward<steward@example.com>"],
+        tagged_assets=[f"{asset}:column_{i % 5}"],
+        synonyms=[f"Term {j}" for j in (i + 3,) if j < term_count],
+        related_terms=[
+            f"Term {j}" for j in (i + 1, i + 2) if j < term_count
+        ],
+        belongs_to_category=f"Category {i % category_count}",
+    )
+  return terms, categories, assets
+
+
+def run(
+    term_count: int,
+    max_workers: int,
+    use_async: bool,
+    fake: fake_datacatalog.FakeDataCatalog,
+) -> None:
+  """Imports a synthetic glossary into the fake server and prints the results.
+
+  Args:
+    term_count: Number of terms of the glossary.
+    max_workers: Number of API calls in flight.
+    use_async: Whether AsyncGlossary is used instead of Glossary.
+    fake: Running fake server, whose entries are replaced.
+  """
+  terms, categories, assets = make_glossary(term_count)
+  fake.reset()
+  fake.add_glossary(_PROJECT, _LOCATION, _ENTRY_GROUP, _GLOSSARY)
+  for asset in assets:
+    fake.add_entry(asset, "bigquery_table", asset.split("/")[-1])
+  import_metrics.reset()
+
+  glossary_class = (
+      async_glossary.AsyncGlossary if use_async else dc_glossary.Glossary
+  )
+  started = time.perf_counter()
+  with glossary_class(
+      glossary_identification.GlossaryId(
+          _PROJECT, _LOCATION, _ENTRY_GROUP, _GLOSSARY
+      ),
+      max_workers=max_workers,
+  ) as glossary:
+    imported_entries, imported_relations, import_errors = (
+        glossary.import_glossary(terms, categories)
+    )
+  elapsed = time.perf_counter() - started
+
+  requests_sent = sum(fake.request_counts.values())
+  relationships = sum(
+      len(relations) for relations in imported_relations.values()
+  )
+  print(
+      f"{term_count} terms, {len(categories)} categories:"
+      f" {sum(len(entries) for entries in imported_entries.values())} entries"
+      f" and {relationships} relationships imported with"
+      f" {len(import_errors)} errors in {elapsed:.1f}s,"
+      f" {requests_sent} requests ({requests_sent / elapsed:.0f}/s),"
+      f" faults injected: {dict(fake.fault_counts)}."
+  )
+  for metrics in import_metrics.get_recorder().phases():
+    report = metrics.to_dict()
+    latency = report["latency_seconds"]
+    print(
+        f"  {metrics.name:<24} {metrics.calls:>8} calls"
+        f" {metrics.retries:>6} retries {report['duration_seconds']:8.1f}s"
+        f"  p50 {latency['p50'] * 1000:6.1f} ms"
+        f"  p99 {latency['p99'] * 1000:6.1f} ms"
+    )
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument(
+      "--terms",
+      default="1000,10000,100000",
+      help="Comma separated numbers of terms of the imported glossaries.",
+  )
+  parser.add_argument(
+      "--max-workers", type=int, default=dc_glossary.DEFAULT_MAX_WORKERS
+  )
+  parser.add_argument("--async", dest="use_async", action="store_true")
+  parser.add_argument("--max-requests-per-second", type=float)
+  parser.add_argument("--latency-ms", type=float, default=0.0)
+  parser.add_argument("--error-rate", type=float, default=0.0)
+  parser.add_argument("--throttle-rate", type=float, default=0.0)
+  parser.add_argument("--retry-after-seconds", type=float, default=0.0)
+  args = parser.parse_args()
+
+  # Keeps the output to the benchmark results
+  logging_utils.get_logger().setLevel(logging.WARNING)
+  rate_limiter.configure(args.max_requests_per_second)
+  http_session.configure(pool_size=args.max_workers)
+  with fake_datacatalog.FakeDataCatalog(
+      latency_seconds=args.latency_ms / 1000,
+      error_rate=args.error_rate,
+      throttle_rate=args.throttle_rate,
+      retry_after_seconds=args.retry_after_seconds,
+  ) as fake:
+    utils.DATACATALOG_BASE_URL = fake.base_url
+    for term_count in (int(count) for count in args.terms.split(",")):
+      run(term_count, args.max_workers, args.use_async, fake)
+
+
+if __name__ == "__main__":
+  main()
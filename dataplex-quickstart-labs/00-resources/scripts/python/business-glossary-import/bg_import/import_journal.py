@@ -0,0 +1,161 @@
+"""Append-only journal of the work completed by an import.
+
+Every successful entry create and relationship create is appended as one JSON
+line to a local file and flushed right away. When an interrupted import is
+restarted with --resume, the journal is replayed so that the completed work is
+skipped.
+
+Typical usage example:
+  with import_journal.ImportJournal(path, resume=True) as journal:
+    if journal.entry_id(EntryType.TERM, 'Cost') is None:
+      ...create the term...
+      journal.record_entry(EntryType.TERM, line, 'Cost', term_id)
+"""
+
+import json
+import os
+import threading
+from typing import Any
+
+import entry_type as entry_type_lib
+import logging_utils
+import relation_type
+
+logger = logging_utils.get_logger()
+
+# Source name, source type, destination name, destination type and type of a
+# relationship.
+_RelationshipKey = tuple[str, str, str, str, str]
+
+
+class ImportJournal:
+  """Thread-safe append-only journal of completed creates.
+
+  Attributes:
+    path: Path of the journal file.
+    resume: Whether the records of a previous run were loaded. Otherwise the
+      file is truncated.
+  """
+
+  def __init__(self, path: str, resume: bool = False):
+    self.path = path
+    self.resume = resume
+    self._entries: dict[tuple[str, str], str] = {}
+    self._relationships: set[_RelationshipKey] = set()
+    self._lock = threading.Lock()
+    if resume:
+      self._load()
+    # Opened on the first record, so that a run failing before importing
+    # anything does not truncate the journal of the run to resume
+    self._file = None
+
+  def __enter__(self) -> 'ImportJournal':
+    return self
+
+  def __exit__(self, *unused_exc_info) -> None:
+    self.close()
+
+  def close(self) -> None:
+    with self._lock:
+      if self._file is not None:
+        self._file.close()
+        self._file = None
+
+  def _load(self) -> None:
+    if not os.path.exists(self.path):
+      logger.warning(
+          f'No journal found at {self.path}, nothing will be skipped.'
+      )
+      return
+    with open(self.path, encoding='utf-8') as journal_file:
+      for line in journal_file:
+        try:
+          record = json.loads(line)
+        except json.JSONDecodeError:
+          # Last record of a run killed while writing it
+          continue
+        if record.get('kind') == 'entry':
+          key = (record['entry_type'], record['display_name'])
+          self._entries[key] = record['entry_id']
+        elif record.get('kind') == 'relationship':
+          self._relationships.add(tuple(record['relationship']))
+    logger.info(
+        f'Resuming from {self.path}: {len(self._entries)} entries and'
+        f' {len(self._relationships)} relationships were already imported.'
+    )
+
+  def _append(self, record: dict[str, Any]) -> None:
+    # Callers hold the lock
+    if self._file is None:
+      mode = 'a' if self.resume else 'w'
+      self._file = open(self.path, mode, encoding='utf-8')
+    self._file.write(json.dumps(record) + '\n')
+    self._file.flush()
+
+  def entry_id(
+      self, entry_type: entry_type_lib.EntryType, display_name: str
+  ) -> str | None:
+    """Returns the id of an entry created by a previous run, if any."""
+    return self._entries.get((entry_type.value, display_name))
+
+  def record_entry(
+      self,
+      entry_type: entry_type_lib.EntryType,
+      line: int,
+      display_name: str,
+      entry_id: str,
+  ) -> None:
+    """Records a created entry.
+
+    Args:
+      entry_type: Type of the entry.
+      line: Line of the entry in the CSV file.
+      display_name: Display name of the entry.
+      entry_id: Id of the created entry.
+    """
+    key = (entry_type.value, display_name)
+    with self._lock:
+      if self._entries.get(key) == entry_id:
+        return
+      self._entries[key] = entry_id
+      self._append({
+          'kind': 'entry',
+          'entry_type': entry_type.value,
+          'line': line,
+          'display_name': display_name,
+          'entry_id': entry_id,
+      })
+
+  @classmethod
+  def _relationship_key(
+      cls,
+      src: str,
+      src_type: entry_type_lib.EntryType,
+      dst: str,
+      dst_type: entry_type_lib.EntryType,
+      relationship_type: relation_type.RelationshipType,
+  ) -> _RelationshipKey:
+    return (src, src_type.value, dst, dst_type.value, relationship_type.value)
+
+  def has_relationship(self, *relationship: Any) -> bool:
+    """Returns whether a relationship was created by a previous run.
+
+    Args:
+      *relationship: Source name, source type, destination name, destination
+        type and type of the relationship.
+    """
+    return self._relationship_key(*relationship) in self._relationships
+
+  def record_relationship(self, *relationship: Any) -> None:
+    """Records a created relationship.
+
+    Args:
+      *relationship: Source name, source type, destination name, destination
+        type and type of the relationship.
+    """
+    key = self._relationship_key(*relationship)
+    with self._lock:
+      if key in self._relationships:
+        return
+      self._relationships.add(key)
+      self._append({'kind': 'relationship', 'relationship': list(key)})
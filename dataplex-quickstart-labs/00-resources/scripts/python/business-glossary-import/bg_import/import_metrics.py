@@ -0,0 +1,342 @@
+"""Timing and throughput of the API calls of an import, by phase.
+
+Every API call is recorded under the phase current in the context it is made
+from: loading the glossary entries, creating categories, terms and each type of
+relationship, clearing the glossary, and so on. Tasks run on worker threads or
+on the event loop keep the phase of the code that submitted them.
+
+Typical usage example:
+  with import_metrics.phase('create_term'):
+    ...make API calls...
+  import_metrics.write_report(path, import_metrics.Format.PROMETHEUS)
+"""
+
+import contextlib
+import contextvars
+import dataclasses
+import enum
+import json
+import math
+import threading
+import time
+from typing import Any, Awaitable, Callable, Iterator, TypeVar
+
+import logging_utils
+
+logger = logging_utils.get_logger()
+_R = TypeVar('_R')
+
+# Phase of the calls made outside of any phase.
+OTHER_PHASE = 'other'
+_QUANTILES = (0.5, 0.95, 0.99)
+
+_current_phase = contextvars.ContextVar(
+    'import_metrics_phase', default=OTHER_PHASE
+)
+
+
+class Format(enum.Enum):
+  JSON = 'json'
+  PROMETHEUS = 'prometheus'
+
+
+@dataclasses.dataclass
+class PhaseMetrics:
+  """API calls of one phase.
+
+  Attributes:
+    name: Name of the phase.
+    calls: Number of API calls, retries excluded.
+    errors: Number of calls which failed.
+    retries: Number of requests sent again after a throttled or failed one.
+    bytes_sent: Size of the request bodies.
+    bytes_received: Size of the response bodies.
+    latencies: Duration of each call in seconds, retries included.
+    started: Monotonic time the first call started at.
+    finished: Monotonic time the last call finished at.
+  """
+
+  name: str
+  calls: int = 0
+  errors: int = 0
+  retries: int = 0
+  bytes_sent: int = 0
+  bytes_received: int = 0
+  latencies: list[float] = dataclasses.field(default_factory=list)
+  started: float | None = None
+  finished: float | None = None
+
+  def duration_seconds(self) -> float:
+    if self.started is None:
+      return 0.0
+    return self.finished - self.started
+
+  def latency_quantile(self, quantile: float) -> float | None:
+    """Returns a quantile of the call latencies, by the nearest-rank method."""
+    if not self.latencies:
+      return None
+    latencies = sorted(self.latencies)
+    rank = max(math.ceil(quantile * len(latencies)), 1)
+    return latencies[rank - 1]
+
+  def to_dict(self) -> dict[str, Any]:
+    duration = self.duration_seconds()
+    return {
+        'calls': self.calls,
+        'errors': self.errors,
+        'retries': self.retries,
+        'bytes_sent': self.bytes_sent,
+        'bytes_received': self.bytes_received,
+        'duration_seconds': duration,
+        'requests_per_second': self.calls / duration if duration else None,
+        'latency_seconds': {
+            f'p{round(quantile * 100)}': self.latency_quantile(quantile)
+            for quantile in _QUANTILES
+        },
+    }
+
+
+class MetricsRecorder:
+  """Thread-safe collection of the metrics of each phase."""
+
+  def __init__(self):
+    self._phases: dict[str, PhaseMetrics] = {}
+    self._lock = threading.Lock()
+
+  def record_call(
+      self,
+      phase_name: str,
+      started: float,
+      finished: float,
+      retries: int = 0,
+      bytes_sent: int = 0,
+      bytes_received: int = 0,
+      failed: bool = False,
+  ) -> None:
+    """Records an API call.
+
+    Args:
+      phase_name: Phase of the call.
+      started: Monotonic time the call started at.
+      finished: Monotonic time the call finished at.
+      retries: Number of times the request was sent again.
+      bytes_sent: Size of the request bodies, retries included.
+      bytes_received: Size of the response bodies, retries included.
+      failed: Whether the call failed.
+    """
+    with self._lock:
+      metrics = self._phases.get(phase_name)
+      if metrics is None:
+        metrics = self._phases[phase_name] = PhaseMetrics(phase_name)
+      metrics.calls += 1
+      metrics.errors += failed
+      metrics.retries += retries
+      metrics.bytes_sent += bytes_sent
+      metrics.bytes_received += bytes_received
+      metrics.latencies.append(finished - started)
+      if metrics.started is None or started < metrics.started:
+        metrics.started = started
+      if metrics.finished is None or finished > metrics.finished:
+        metrics.finished = finished
+
+  def phases(self) -> list[PhaseMetrics]:
+    """Returns the metrics of each phase, in the order phases started."""
+    with self._lock:
+      return sorted(self._phases.values(), key=lambda metrics: metrics.started)
+
+  def report(self) -> dict[str, Any]:
+    """Returns the metrics of all phases as a JSON serializable dictionary."""
+    return {
+        'phases': {
+            metrics.name: metrics.to_dict() for metrics in self.phases()
+        }
+    }
+
+  def to_json(self) -> str:
+    return json.dumps(self.report(), indent=2)
+
+  def to_prometheus(self) -> str:
+    """Returns the metrics of all phases in the Prometheus text format."""
+    phases = self.phases()
+    lines = []
+
+    def add_metric(
+        name: str,
+        metric_type: str,
+        help_text: str,
+        values: Callable[[PhaseMetrics], Any],
+    ) -> None:
+      lines.append(f'# HELP bg_import_{name} {help_text}')
+      lines.append(f'# TYPE bg_import_{name} {metric_type}')
+      for metrics in phases:
+        lines.append(
+            f'bg_import_{name}{{phase="{metrics.name}"}} {values(metrics)}'
+        )
+
+    add_metric('api_calls_total', 'counter', 'API calls.', lambda p: p.calls)
+    add_metric(
+        'api_errors_total', 'counter', 'Failed API calls.', lambda p: p.errors
+    )
+    add_metric(
+        'api_retries_total', 'counter', 'Retried requests.', lambda p: p.retries
+    )
+    add_metric(
+        'bytes_sent_total',
+        'counter',
+        'Size of request bodies.',
+        lambda p: p.bytes_sent,
+    )
+    add_metric(
+        'bytes_received_total',
+        'counter',
+        'Size of response bodies.',
+        lambda p: p.bytes_received,
+    )
+    add_metric(
+        'phase_duration_seconds',
+        'gauge',
+        'Time between the first and the last API call of the phase.',
+        lambda p: p.duration_seconds(),
+    )
+    lines.append(
+        '# HELP bg_import_api_latency_seconds Duration of API calls, retries'
+        ' included.'
+    )
+    lines.append('# TYPE bg_import_api_latency_seconds summary')
+    for metrics in phases:
+      labels = f'phase="{metrics.name}"'
+      for quantile in _QUANTILES:
+        lines.append(
+            f'bg_import_api_latency_seconds{{{labels},quantile="{quantile}"}}'
+            f' {metrics.latency_quantile(quantile)}'
+        )
+      lines.append(
+          f'bg_import_api_latency_seconds_sum{{{labels}}}'
+          f' {sum(metrics.latencies)}'
+      )
+      lines.append(
+          f'bg_import_api_latency_seconds_count{{{labels}}} {metrics.calls}'
+      )
+    return '\n'.join(lines) + '\n'
+
+
+# Process wide recorder.
+_recorder = MetricsRecorder()
+
+
+def get_recorder() -> MetricsRecorder:
+  """Returns the MetricsRecorder shared by all API calls."""
+  return _recorder
+
+
+def reset() -> None:
+  """Drops all recorded metrics."""
+  global _recorder
+  _recorder = MetricsRecorder()
+
+
+@contextlib.contextmanager
+def phase(name: str) -> Iterator[None]:
+  """Records the API calls made in the context under the phase name."""
+  token = _current_phase.set(name)
+  try:
+    yield
+  finally:
+    _current_phase.reset(token)
+
+
+def current_phase() -> str:
+  return _current_phase.get()
+
+
+def bind_phase(task: Callable[..., _R]) -> Callable[..., _R]:
+  """Returns task running in the current phase, from any thread."""
+  name = _current_phase.get()
+
+  def run_in_phase(*args: Any) -> _R:
+    with phase(name):
+      return task(*args)
+
+  return run_in_phase
+
+
+async def run_in_phase(name: str, awaitable: Awaitable[_R]) -> _R:
+  """Awaits awaitable in the phase name.
+
+  Coroutines started on an event loop from another thread don't inherit the
+  phase of that thread.
+
+  Args:
+    name: Name of the phase.
+    awaitable: Awaitable making API calls.
+
+  Returns:
+    Result of awaitable.
+  """
+  with phase(name):
+    return await awaitable
+
+
+def record_call(
+    started: float,
+    retries: int = 0,
+    bytes_sent: int = 0,
+    bytes_received: int = 0,
+    failed: bool = False,
+) -> None:
+  """Records an API call finishing now under the current phase.
+
+  Args:
+    started: time.monotonic() when the call started.
+    retries: Number of times the request was sent again.
+    bytes_sent: Size of the request bodies, retries included.
+    bytes_received: Size of the response bodies, retries included.
+    failed: Whether the call failed.
+  """
+  _recorder.record_call(
+      _current_phase.get(),
+      started,
+      time.monotonic(),
+      retries=retries,
+      bytes_sent=bytes_sent,
+      bytes_received=bytes_received,
+      failed=failed,
+  )
+
+
+def body_size(request_body: dict[str, Any] | None) -> int:
+  """Returns the size of the JSON encoding of a request body."""
+  if request_body is None:
+    return 0
+  return len(json.dumps(request_body).encode())
+
+
+def log_summary() -> None:
+  """Logs the number of calls, throughput and latency of each phase."""
+  for metrics in _recorder.phases():
+    duration = metrics.duration_seconds()
+    rate = f'{metrics.calls / duration:.1f}' if duration else '-'
+    logger.info(
+        f'{metrics.name}: {metrics.calls} calls ({metrics.errors} failed,'
+        f' {metrics.retries} retries) in {duration:.1f}s, {rate} calls per'
+        ' second, latency'
+        f' p50 {metrics.latency_quantile(0.5) * 1000:.0f} ms,'
+        f' p95 {metrics.latency_quantile(0.95) * 1000:.0f} ms,'
+        f' p99 {metrics.latency_quantile(0.99) * 1000:.0f} ms.'
+    )
+
+
+def write_report(path: str, report_format: Format = Format.JSON) -> None:
+  """Writes the metrics of all phases to a file.
+
+  Args:
+    path: Path of the report file.
+    report_format: JSON or Prometheus text format.
+  """
+  if report_format == Format.PROMETHEUS:
+    content = _recorder.to_prometheus()
+  else:
+    content = _recorder.to_json()
+  with open(path, 'w', encoding='utf-8') as report_file:
+    report_file.write(content)
+  logger.info(f'Wrote metrics of API calls to {path}.')
@@ -4,7 +4,8 @@ import enum
 
 @enum.unique
 class ImportMode(enum.Enum):
-  """Import mode {strict, clear}."""
+  """Import mode {strict, clear, diff}."""
 
   STRICT = "strict"
   CLEAR = "clear"
+  DIFF = "diff"
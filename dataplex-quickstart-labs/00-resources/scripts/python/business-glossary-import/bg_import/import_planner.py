@@ -0,0 +1,147 @@
+"""Plans of the API calls made by an import, and estimates of their duration.
+
+A plan lists the calls an import would make, grouped in phases which run one
+after the other. Calls of a phase run concurrently, so a phase lasts as long
+as its slowest bound: the calls spread over the workers, or the calls sent at
+the maximum request rate when one is set.
+
+Typical usage example:
+  plan = glossary.plan_import(terms, categories, import_mode)
+  import_planner.print_plan(plan, max_workers=20, max_requests_per_second=100)
+"""
+
+import collections
+import dataclasses
+
+import logging_utils
+
+logger = logging_utils.get_logger()
+
+# Latency assumed for API calls when none was measured.
+DEFAULT_LATENCY_SECONDS = 0.3
+
+
+@dataclasses.dataclass
+class Phase:
+  """Calls of an import which run concurrently.
+
+  Attributes:
+    name: Description of the phase.
+    calls: Number of API calls, by operation.
+  """
+
+  name: str
+  calls: collections.Counter[str] = dataclasses.field(
+      default_factory=collections.Counter
+  )
+
+  def total_calls(self) -> int:
+    return sum(self.calls.values())
+
+
+@dataclasses.dataclass
+class ImportPlan:
+  """API calls made by an import.
+
+  Attributes:
+    phases: Phases of the import, in order.
+    latency_seconds: Mean latency of the calls made while loading the
+      glossary, if any were made.
+  """
+
+  phases: list[Phase] = dataclasses.field(default_factory=list)
+  latency_seconds: float | None = None
+
+  def add_phase(self, name: str) -> Phase:
+    phase = Phase(name)
+    self.phases.append(phase)
+    return phase
+
+  def total_calls(self) -> int:
+    return sum(phase.total_calls() for phase in self.phases)
+
+  def calls_by_operation(self) -> collections.Counter[str]:
+    calls = collections.Counter()
+    for phase in self.phases:
+      calls.update(phase.calls)
+    return calls
+
+  def estimate_seconds(
+      self, max_workers: int, max_requests_per_second: float | None
+  ) -> float:
+    """Returns the estimated wall time of the import.
+
+    Args:
+      max_workers: Number of API calls in flight at the same time.
+      max_requests_per_second: Maximum rate of API calls, None for no cap.
+
+    Returns:
+      Estimated duration in seconds, ignoring throttling and retries.
+    """
+    latency = self.latency_seconds or DEFAULT_LATENCY_SECONDS
+    seconds = 0.0
+    for phase in self.phases:
+      calls = phase.total_calls()
+      phase_seconds = calls * latency / max_workers
+      if max_requests_per_second is not None:
+        phase_seconds = max(phase_seconds, calls / max_requests_per_second)
+      seconds += phase_seconds
+    return seconds
+
+
+def _format_duration(seconds: float) -> str:
+  minutes, seconds = divmod(round(seconds), 60)
+  hours, minutes = divmod(minutes, 60)
+  if hours:
+    return f'{hours}h {minutes:02d}m {seconds:02d}s'
+  if minutes:
+    return f'{minutes}m {seconds:02d}s'
+  return f'{seconds}s'
+
+
+def print_plan(
+    plan: ImportPlan,
+    max_workers: int,
+    max_requests_per_second: float | None = None,
+) -> None:
+  """Logs the calls of a plan and the estimated duration of the import.
+
+  Args:
+    plan: Plan of the import.
+    max_workers: Number of API calls in flight at the same time.
+    max_requests_per_second: Maximum rate of API calls, None for no cap.
+  """
+  logger.info('Import plan:')
+  for phase in plan.phases:
+    if not phase.total_calls():
+      continue
+    logger.info(f'  {phase.name}:')
+    for operation, count in sorted(phase.calls.items()):
+      if count:
+        logger.info(f'    {operation}: {count}')
+  logger.info('API calls by operation:')
+  for operation, count in sorted(plan.calls_by_operation().items()):
+    if count:
+      logger.info(f'  {operation}: {count}')
+
+  total_calls = plan.total_calls()
+  if not total_calls:
+    logger.info('Nothing to import.')
+    return
+  seconds = plan.estimate_seconds(max_workers, max_requests_per_second)
+  if plan.latency_seconds is None:
+    latency = f'an assumed latency of {DEFAULT_LATENCY_SECONDS * 1000:.0f} ms'
+  else:
+    latency = f'a measured latency of {plan.latency_seconds * 1000:.0f} ms'
+  if max_requests_per_second is None:
+    rate = 'no cap on the request rate'
+  else:
+    rate = f'at most {max_requests_per_second:g} requests per second'
+  logger.info(
+      f'{total_calls} API calls, estimated to take {_format_duration(seconds)}'
+      f' with {latency} per call, {max_workers} workers and {rate}.'
+  )
+  logger.info(
+      'The import would send about'
+      f' {total_calls / max(seconds, 1.0) * 60:.0f} requests per minute.'
+  )
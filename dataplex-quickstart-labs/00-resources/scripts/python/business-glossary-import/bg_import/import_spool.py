@@ -0,0 +1,347 @@
+"""On-disk spool of the terms and relationships of a streaming import.
+
+A streaming import reads the terms CSV file once into a temporary SQLite
+database, then creates the terms and replays their relationships from it in
+windows of a fixed number of rows. Only one window of terms or relationships
+is held in memory at a time, however large the CSV file is.
+
+Typical usage example:
+  with import_spool.ImportSpool() as spool:
+    spool.add_terms(
+        terms_csv_parser.iter_glossary_csv(
+            path, errors, tracked_terms=spool.tracked_terms
+        )
+    )
+    for window in spool.term_windows(1000):
+      ...create the terms of the window...
+      spool.set_entry_ids(ids)
+    for window in spool.relationship_windows(1000):
+      ...create the relationships of the window...
+"""
+
+import collections.abc
+import itertools
+import json
+import os
+import sqlite3
+import tempfile
+from typing import Iterable, Iterator
+
+import entry_type as entry_type_lib
+import name_index
+import relation_type
+import term as bg_term
+
+# Number of rows written to the spool in one transaction.
+_WRITE_BATCH_ROWS = 1000
+
+_SCHEMA = (
+    """
+    CREATE TABLE terms (
+      line INTEGER PRIMARY KEY,
+      display_name TEXT NOT NULL,
+      normalized_name TEXT NOT NULL,
+      term TEXT NOT NULL,
+      entry_id TEXT
+    )
+    """,
+    'CREATE INDEX terms_by_name ON terms (normalized_name)',
+    """
+    CREATE TABLE tracked_names (
+      normalized_name TEXT PRIMARY KEY
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE relationships (
+      id INTEGER PRIMARY KEY,
+      src TEXT NOT NULL,
+      src_type TEXT NOT NULL,
+      dst TEXT NOT NULL,
+      dst_type TEXT NOT NULL,
+      relationship_type TEXT NOT NULL,
+      UNIQUE (src, dst, relationship_type)
+    )
+    """,
+)
+
+# Source name, source type, destination name, destination type and type of a
+# relationship, as taken by Glossary._create_relationship.
+Relationship = tuple[
+    str,
+    entry_type_lib.EntryType,
+    str,
+    entry_type_lib.EntryType,
+    relation_type.RelationshipType,
+]
+
+
+class _TrackedNames(collections.abc.MutableSet):
+  """Set of normalized display names stored in the spool."""
+
+  def __init__(self, connection: sqlite3.Connection):
+    self._connection = connection
+
+  def __contains__(self, name: object) -> bool:
+    return (
+        self._connection.execute(
+            'SELECT 1 FROM tracked_names WHERE normalized_name = ?', (name,)
+        ).fetchone()
+        is not None
+    )
+
+  def __iter__(self) -> Iterator[str]:
+    for (name,) in self._connection.execute(
+        'SELECT normalized_name FROM tracked_names'
+    ):
+      yield name
+
+  def __len__(self) -> int:
+    return self._connection.execute(
+        'SELECT COUNT(*) FROM tracked_names'
+    ).fetchone()[0]
+
+  def add(self, name: str) -> None:
+    self._connection.execute(
+        'INSERT OR IGNORE INTO tracked_names VALUES (?)', (name,)
+    )
+
+  def discard(self, name: str) -> None:
+    self._connection.execute(
+        'DELETE FROM tracked_names WHERE normalized_name = ?', (name,)
+    )
+
+
+class _TermNames(collections.abc.Container):
+  """Normalized display names of the spooled terms."""
+
+  def __init__(self, connection: sqlite3.Connection):
+    self._connection = connection
+
+  def __contains__(self, name: object) -> bool:
+    return (
+        self._connection.execute(
+            'SELECT 1 FROM terms WHERE normalized_name = ?', (name,)
+        ).fetchone()
+        is not None
+    )
+
+
+class ImportSpool:
+  """Terms of a CSV file and their relationships, in a temporary database.
+
+  Attributes:
+    path: Path of the SQLite database file, deleted by close().
+    tracked_terms: Set of the normalized display names read by the terms
+      parser, to pass to terms_csv_parser.iter_glossary_csv.
+    term_names: Container of the normalized display names of the spooled
+      terms.
+  """
+
+  def __init__(self, directory: str | None = None):
+    """Creates an empty spool.
+
+    Args:
+      directory: Directory of the database file. Defaults to the directory of
+        temporary files.
+    """
+    fd, self.path = tempfile.mkstemp(
+        prefix='bg_import_', suffix='.spool', dir=directory
+    )
+    os.close(fd)
+    self._connection = sqlite3.connect(self.path)
+    # The spool only lives as long as the import, so it doesn't need to
+    # survive a crash
+    self._connection.execute('PRAGMA journal_mode = OFF')
+    self._connection.execute('PRAGMA synchronous = OFF')
+    with self._connection:
+      for statement in _SCHEMA:
+        self._connection.execute(statement)
+    self.tracked_terms = _TrackedNames(self._connection)
+    self.term_names = _TermNames(self._connection)
+
+  def __enter__(self) -> 'ImportSpool':
+    return self
+
+  def __exit__(self, *unused_exc_info) -> None:
+    self.close()
+
+  def close(self) -> None:
+    """Closes and deletes the database file."""
+    if self._connection is not None:
+      self._connection.close()
+      self._connection = None
+      os.remove(self.path)
+
+  def add_terms(self, terms: Iterable[tuple[int, bg_term.Term]]) -> int:
+    """Spools terms and the relationships starting from them.
+
+    Relationships are spooled the way import_glossary creates them: synonym
+    and related term relationships from the first of the two terms by name,
+    described_by relationships from the tagged asset, and each relationship
+    only once.
+
+    Args:
+      terms: Terms by line, in file order.
+
+    Returns:
+      Number of terms spooled.
+    """
+    count = 0
+    terms = iter(terms)
+    while batch := list(itertools.islice(terms, _WRITE_BATCH_ROWS)):
+      with self._connection:
+        self._connection.executemany(
+            'INSERT INTO terms VALUES (?, ?, ?, ?, NULL)',
+            (
+                (
+                    line,
+                    term.display_name,
+                    name_index.normalize_name(term.display_name),
+                    json.dumps(_term_fields(term), separators=(',', ':')),
+                )
+                for line, term in batch
+            ),
+        )
+        self._connection.executemany(
+            'INSERT OR IGNORE INTO relationships'
+            ' (src, src_type, dst, dst_type, relationship_type)'
+            ' VALUES (?, ?, ?, ?, ?)',
+            (
+                (
+                    src,
+                    src_type.value,
+                    dst,
+                    dst_type.value,
+                    relationship_type.value,
+                )
+                for _, term in batch
+                for src, src_type, dst, dst_type, relationship_type in (
+                    _term_relationships(term)
+                )
+            ),
+        )
+      count += len(batch)
+    return count
+
+  def term_count(self) -> int:
+    return self._connection.execute('SELECT COUNT(*) FROM terms').fetchone()[0]
+
+  def relationship_count(self) -> int:
+    return self._connection.execute(
+        'SELECT COUNT(*) FROM relationships'
+    ).fetchone()[0]
+
+  def term_windows(
+      self, window_size: int
+  ) -> Iterator[list[tuple[int, bg_term.Term]]]:
+    """Yields the spooled terms by line, window_size terms at a time."""
+    last_line = -1
+    while True:
+      rows = self._connection.execute(
+          'SELECT line, term FROM terms WHERE line > ? ORDER BY line LIMIT ?',
+          (last_line, window_size),
+      ).fetchall()
+      if not rows:
+        return
+      last_line = rows[-1][0]
+      yield [(line, bg_term.Term(**json.loads(term))) for line, term in rows]
+
+  def set_entry_ids(self, entry_ids: Iterable[tuple[int, str]]) -> None:
+    """Records the ids of created terms.
+
+    Args:
+      entry_ids: Line of each created term with its entry id.
+    """
+    with self._connection:
+      self._connection.executemany(
+          'UPDATE terms SET entry_id = ? WHERE line = ?',
+          ((entry_id, line) for line, entry_id in entry_ids),
+      )
+
+  def term_entry_ids(self, names: Iterable[str]) -> dict[str, str]:
+    """Returns the entry ids of created terms, by display name.
+
+    Args:
+      names: Display names, matched by normalized name. Names of terms which
+        were not created are ignored.
+
+    Returns:
+      Dictionary mapping the display names of the spooled terms to their ids.
+    """
+    normalized = list({name_index.normalize_name(name) for name in names})
+    entry_ids = {}
+    # Stays below the limit of 999 parameters of older SQLite versions
+    for start in range(0, len(normalized), 900):
+      chunk = normalized[start:start + 900]
+      rows = self._connection.execute(
+          'SELECT display_name, entry_id FROM terms WHERE entry_id IS NOT NULL'
+          f' AND normalized_name IN ({", ".join("?" * len(chunk))})',
+          chunk,
+      )
+      entry_ids.update(rows)
+    return entry_ids
+
+  def relationship_windows(
+      self, window_size: int
+  ) -> Iterator[list[Relationship]]:
+    """Yields the spooled relationships, window_size at a time."""
+    last_id = 0
+    while True:
+      rows = self._connection.execute(
+          'SELECT id, src, src_type, dst, dst_type, relationship_type'
+          ' FROM relationships WHERE id > ? ORDER BY id LIMIT ?',
+          (last_id, window_size),
+      ).fetchall()
+      if not rows:
+        return
+      last_id = rows[-1][0]
+      yield [
+          (
+              src,
+              entry_type_lib.EntryType(src_type),
+              dst,
+              entry_type_lib.EntryType(dst_type),
+              relation_type.RelationshipType(relationship_type),
+          )
+          for _, src, src_type, dst, dst_type, relationship_type in rows
+      ]
+
+
+def _term_fields(term: bg_term.Term) -> dict[str, object]:
+  return {
+      'display_name': term.display_name,
+      'description': term.description,
+      'data_stewards': term.data_stewards,
+      'tagged_assets': term.tagged_assets,
+      'synonyms': term.synonyms,
+      'related_terms': term.related_terms,
+      'belongs_to_category': term.belongs_to_category,
+  }
+
+
+def _term_relationships(term: bg_term.Term) -> Iterator[Relationship]:
+  """Yields the relationships import_glossary creates for a term."""
+  term_type = entry_type_lib.EntryType.TERM
+  for relationship_type, dst_names in (
+      (relation_type.RelationshipType.SYNONYMOUS, term.synonyms),
+      (relation_type.RelationshipType.RELATED, term.related_terms),
+  ):
+    for dst in dst_names:
+      first, second = sorted((term.display_name, dst))
+      yield first, term_type, second, term_type, relationship_type
+  for src in term.tagged_assets:
+    yield (
+        src,
+        term_type,
+        term.display_name,
+        term_type,
+        relation_type.RelationshipType.DESCRIBED,
+    )
+  if term.belongs_to_category:
+    yield (
+        term.display_name,
+        term_type,
+        term.belongs_to_category,
+        entry_type_lib.EntryType.CATEGORY,
+        relation_type.RelationshipType.BELONGS_TO,
+    )
@@ -19,3 +19,10 @@ _ImportResult = tuple[
   ],
   list[error.EntryImportError],
 ]
+
+# Numbers of imported entries and relations by type, and import errors.
+_StreamingImportResult = tuple[
+  dict[EntryType.EntryType, int],
+  dict[EntryType.EntryType, int],
+  list[error.EntryImportError],
+]
@@ -0,0 +1,163 @@
+"""Lookup of glossary entries and assets by name.
+
+Names are matched the way the CSV parsers detect duplicates: case-folded,
+Unicode NFC normalized and with runs of whitespace collapsed, so that
+"Net  Revenue" in a relationship column finds the term "net revenue".
+
+Typical usage example:
+  index = name_index.NameIndex()
+  index.terms[term.display_name] = term
+  term = index.find(entry_type_lib.EntryType.TERM, 'NET revenue')
+  asset, source_column = index.asset_path(path)
+"""
+
+import re
+import unicodedata
+
+import category as bg_category
+import entry_type as entry_type_lib
+import term as bg_term
+
+_WHITESPACE = re.compile(r'\s+')
+_ENTRY_PATH = re.compile(
+    r'projects/(?P<projectId>[^/]+)/locations/(?P<location>[^/]+)/entryGroups/(?P<entryGroup>[^/]+)/entries/(?P<entryId>[^:/]+)(:{1}(?P<sourceColumn>[^/]+))?'
+)
+
+
+def normalize_name(name: str) -> str:
+  """Returns the key under which a display name is matched."""
+  name = unicodedata.normalize('NFC', name)
+  return _WHITESPACE.sub(' ', name).strip().casefold()
+
+
+def parse_entry_path(entry_path: str) -> tuple[str | None, str | None]:
+  """Parses an entry path containing an optional source column.
+
+  Args:
+    entry_path: Path to an entry in the format:
+      'projects/{project_id}/locations/{location}/entryGroups/{entry_group}/entries/{entry}[:{source_column}]}'
+
+  Returns:
+    Path of the entry if any.
+    Source column in the entry if any.
+  """
+  match = _ENTRY_PATH.fullmatch(entry_path)
+  if match is None:
+    return None, None
+
+  entry = (
+      f'projects/{match.group("projectId")}/'
+      f'locations/{match.group("location")}/'
+      f'entryGroups/{match.group("entryGroup")}/'
+      f'entries/{match.group("entryId")}'
+  )
+  source_column = match.group('sourceColumn') or None
+  return entry, source_column
+
+
+class EntryCache(dict):
+  """Entries by display name, also looked up by normalized name.
+
+  Behaves as a dictionary keyed by the exact display name and keeps an index
+  of the normalized names up to date on every change.
+  """
+
+  def __init__(self, *args, **kwargs):
+    super().__init__()
+    # Normalized name -> display names having it, in insertion order
+    self._normalized: dict[str, dict[str, None]] = {}
+    self.update(*args, **kwargs)
+
+  def __setitem__(self, display_name: str, entry) -> None:
+    if display_name not in self:
+      self._normalized.setdefault(normalize_name(display_name), {})[
+          display_name
+      ] = None
+    super().__setitem__(display_name, entry)
+
+  def __delitem__(self, display_name: str) -> None:
+    super().__delitem__(display_name)
+    self._forget(display_name)
+
+  def _forget(self, display_name: str) -> None:
+    key = normalize_name(display_name)
+    names = self._normalized.get(key)
+    if names is not None:
+      names.pop(display_name, None)
+      if not names:
+        del self._normalized[key]
+
+  def pop(self, display_name: str, *default):
+    if display_name in self:
+      self._forget(display_name)
+    return super().pop(display_name, *default)
+
+  def popitem(self):
+    display_name, entry = super().popitem()
+    self._forget(display_name)
+    return display_name, entry
+
+  def setdefault(self, display_name: str, default=None):
+    if display_name not in self:
+      self[display_name] = default
+    return self[display_name]
+
+  def update(self, *args, **kwargs) -> None:
+    for display_name, entry in dict(*args, **kwargs).items():
+      self[display_name] = entry
+
+  def clear(self) -> None:
+    super().clear()
+    self._normalized.clear()
+
+  def find(self, name: str):
+    """Returns the entry named name, or None.
+
+    An exact match is preferred. Otherwise the entry whose normalized name is
+    the same is returned, unless several entries have that normalized name.
+    """
+    entry = self.get(name)
+    if entry is not None:
+      return entry
+    names = self._normalized.get(normalize_name(name))
+    if names is None or len(names) != 1:
+      return None
+    return self.get(next(iter(names)))
+
+
+class NameIndex:
+  """Names of the terms, categories and assets of one glossary.
+
+  Attributes:
+    terms: Terms by display name.
+    categories: Categories by display name.
+  """
+
+  def __init__(self):
+    self.terms = EntryCache()
+    self.categories = EntryCache()
+    # Asset path -> (entry path, source column), parsed at most once
+    self._asset_paths: dict[str, tuple[str | None, str | None]] = {}
+
+  def entries(self, entry_type: entry_type_lib.EntryType) -> EntryCache:
+    if entry_type == entry_type_lib.EntryType.CATEGORY:
+      return self.categories
+    return self.terms
+
+  def find(
+      self, entry_type: entry_type_lib.EntryType, name: str
+  ) -> bg_term.Term | bg_category.Category | None:
+    """Returns the entry of entry_type named name, or None."""
+    if entry_type == entry_type_lib.EntryType.CATEGORY:
+      return self.categories.find(name)
+    elif entry_type == entry_type_lib.EntryType.TERM:
+      return self.terms.find(name)
+    return None
+
+  def asset_path(self, path: str) -> tuple[str | None, str | None]:
+    """Returns the entry path and the source column of an asset path."""
+    parsed = self._asset_paths.get(path)
+    if parsed is None:
+      parsed = parse_entry_path(path)
+      self._asset_paths[path] = parsed
+    return parsed
@@ -0,0 +1,80 @@
+"""Micro-benchmark of the parsing cost of a terms CSV record.
+
+Parses synthetic term records with the field parsers of terms_csv_parser and
+prints the average cost per row and per field.
+
+Typical usage example:
+  python3 bg_import/parse_benchmark.py --rows=200000 --description-size=2000
+"""
+
+import argparse
+import random
+import string
+import time
+
+import terms_csv_parser
+
+
+def _make_records(rows: int, description_size: int) -> list[list[str]]:
+  """Returns synthetic term records, with repeated categories and stewards."""
+  rng = random.Random(0)
+  words = [
+      "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10)))
+      for _ in range(500)
+  ]
+  description = " ".join(rng.choices(words, k=description_size // 6))
+  description = description[:description_size]
+  records = []
+  for i in range(rows):
+    records.append([
+        f"Term {i}",
+        description,
+        f"Steward {i % 50}<steward{i % 50}@example.com>, Owner<o@example.com>",
+        f"projects/p/locations/us/entryGroups/g/entries/asset_{i}",
+        f'Term {i + 1}, "Term, with comma {i + 2}"',
+        f"Term {i + 3}",
+        f"Category {i % 100}",
+    ])
+  return records
+
+
+def _time_per_row(fn, records: list[list[str]]) -> float:
+  started = time.perf_counter()
+  for line_idx, record in enumerate(records):
+    fn(line_idx, record)
+  return (time.perf_counter() - started) / len(records)
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument("--rows", type=int, default=100000)
+  parser.add_argument("--description-size", type=int, default=1000)
+  args = parser.parse_args()
+
+  records = _make_records(args.rows, args.description_size)
+  # Warm up
+  _time_per_row(terms_csv_parser._parse_attributes, records[:1000])
+
+  per_row = _time_per_row(terms_csv_parser._parse_attributes, records)
+  print(
+      f"{args.rows} rows, {args.description_size} character descriptions:"
+      f" {per_row * 1e6:.2f} us per row"
+  )
+  for i, (attr_name, parse_fn, _) in enumerate(
+      terms_csv_parser._ATTRIBUTE_PARSERS
+  ):
+    field_cost = _time_per_row(
+        lambda unused_idx, record: parse_fn(record[i]), records
+    )
+    print(f"  {attr_name:<20} {field_cost * 1e6:8.2f} us")
+  build_cost = _time_per_row(
+      lambda line_idx, record: terms_csv_parser.parse_term(
+          line_idx, record, set()
+      ),
+      records,
+  )
+  print(f"  {'parse_term (total)':<20} {build_cost * 1e6:8.2f} us")
+
+
+if __name__ == "__main__":
+  main()
@@ -1,7 +1,14 @@
-"""Utility functions to parse each type of field in terms_csv_parser.py."""
+"""Utility functions to parse the fields of the glossary CSV files.
+
+Patterns are compiled once at import time, and the parsers skip them
+altogether for the common fields without quotes or special characters. Names
+are interned, as the same categories, data stewards and related terms are
+repeated across many records.
+"""
 
 import re
-from typing import TypeVar
+import sys
+from typing import Any, Callable, TypeVar
 
 import entry_type as entry_type_lib
 import error
@@ -11,6 +18,68 @@ _ParseErrors = list[error.ParseError]
 _T = TypeVar("_T")
 _ParseResult = tuple[_T, _ParseErrors]
 
+# Field name, parsing function and whether the field is optional.
+AttributeParser = tuple[str, Callable[[str], _ParseResult[Any]], bool]
+
+# A string containing * is only allowed when enclosed between double quotes.
+_QUOTED_STR = re.compile(r'"[^"]*"')
+_DATA_STEWARD = re.compile(r"\s*(?P<name>.*)<(?P<email>.+)>\s*")
+# Items of a comma separated list, which may contain commas between quotes.
+_LIST_ITEM = re.compile(r'(?:[^,"]|"(?:[^"])*")+')
+
+
+def parse_record(
+    entry_type: entry_type_lib.EntryType,
+    line_idx: int,
+    record: list[str],
+    attribute_parsers: list[AttributeParser],
+) -> _ParseResult[list[Any]]:
+  """Parses the fields of a CSV record.
+
+  Args:
+    entry_type: enum indicating parsed entry type (e.g. CATEGORY or TERM).
+    line_idx: Index of the line where the record appears in the CSV file.
+    record: A list of attributes in order conforming to the CSV file schema.
+    attribute_parsers: Parser of each field of the schema, in order.
+
+  Returns:
+    A tuple of the list of parsed attributes and a list of errors. Missing
+    fields get the value parsed from an empty string.
+  """
+  attributes = []
+  errors = []
+  for i, (attr_name, parse_fn, is_optional_field) in enumerate(
+      attribute_parsers
+  ):
+    if i >= len(record):
+      # Add the default value to cover for the missing field
+      default_value, _ = parse_fn("")  # pylint:disable=not-callable
+      attributes.append(default_value)
+      # If the field is not mandatory we can skip creating a ParseError
+      if not is_optional_field:
+        errors.append(
+            error.ParseError(
+                entry_type,
+                message="Missing field",
+                line=line_idx + 1,
+                column=i + 1,
+                record=record,
+                resources=[attr_name],
+            )
+        )
+      continue
+
+    value, attr_errors = parse_fn(record[i])  # pylint:disable=not-callable
+    attributes.append(value)
+    for err in attr_errors:
+      err.line = line_idx + 1
+      err.column = i + 1
+      err.record = record
+      err.resources.append(attr_name)
+    errors.extend(attr_errors)
+
+  return attributes, errors
+
 
 def parse_category_str(s: str) -> _ParseResult[str | None]:
   return _parse_str(entry_type_lib.EntryType.CATEGORY, s)
@@ -20,6 +89,22 @@ def parse_term_str(s: str) -> _ParseResult[str | None]:
   return _parse_str(entry_type_lib.EntryType.TERM, s)
 
 
+def parse_category_name(s: str) -> _ParseResult[str | None]:
+  return _parse_name(entry_type_lib.EntryType.CATEGORY, s)
+
+
+def parse_term_name(s: str) -> _ParseResult[str | None]:
+  return _parse_name(entry_type_lib.EntryType.TERM, s)
+
+
+def _parse_name(
+    entry_type: entry_type_lib.EntryType, s: str
+) -> _ParseResult[str | None]:
+  """Parses a display name, see _parse_str. The parsed name is interned."""
+  name, errors = _parse_str(entry_type, s)
+  return (sys.intern(name) if name is not None else None), errors
+
+
 def _parse_str(
     entry_type: entry_type_lib.EntryType, s: str
 ) -> _ParseResult[str | None]:
@@ -37,10 +122,9 @@ def _parse_str(
     ParseResult with the parsed string, with any unnecessary spaces removed,
       if any, or None otherwise.
   """
-  match = re.fullmatch(r'"[^"]*"|[^*]*', s)
-  if match is None:
+  if "*" in s and _QUOTED_STR.fullmatch(s) is None:
     return None, [error.ParseError(entry_type, f"Error parsing field {s}")]
-  return match.group(0).strip('"').strip(), []
+  return s.strip('"').strip(), []
 
 
 def parse_category_data_stewards(s: str) -> _ParseResult[list[str]]:
@@ -90,10 +174,10 @@ def _parse_data_steward(s: str) -> str | None:
   Returns:
     DataSteward | None.
   """
-  match = re.fullmatch(r"\s*(?P<name>.*)<(?P<email>.+)>\s*", s)
+  match = _DATA_STEWARD.fullmatch(s)
   if not match:
     return None
-  return match[0]
+  return sys.intern(match[0])
 
 
 def parse_list(entities: str) -> _ParseResult[list[str]]:
@@ -101,15 +185,17 @@ def parse_list(entities: str) -> _ParseResult[list[str]]:
 
   Because the list of strings might contain items using the comma value
   themselves (such as display names), we use a regular expression to find
-  matches for items that might appear delimited between quotes.
+  matches for items that might appear delimited between quotes. Lists without
+  quotes are simply split on commas. Empty items are skipped.
 
   Args:
     entities: A string containing a list of comma separated entities.
 
   Returns:
-    ParseResult: List of matched entities.
+    ParseResult: List of matched entities, interned.
   """
-  pattern = r'(?:[^,"]|"(?:[^"])*")+'
-  matches = re.findall(pattern, entities)
-  matches = list(map(lambda x: str.strip(x.replace('"', "")), matches))
-  return matches, []
+  if '"' not in entities:
+    items = [item for item in entities.split(",") if item]
+  else:
+    items = _LIST_ITEM.findall(entities)
+  return [sys.intern(item.replace('"', "").strip()) for item in items], []
@@ -0,0 +1,288 @@
+"""Adaptive limiter shared by all API calls of the process.
+
+The limiter bounds the number of API calls in flight with an AIMD (additive
+increase, multiplicative decrease) rule: a throttled call (HTTP 429 or 503)
+halves the number of calls allowed in flight and pauses all callers for the
+duration the server asked for, and every successful call raises the limit
+again by one call per window of successes. Until the first throttled call the
+number of calls in flight is only bounded by the number of workers. This keeps
+many parallel workers running close to the API quota without turning a burst
+of throttling errors into failed imports.
+
+An optional maximum request rate additionally paces the calls with a token
+bucket. Without it the request rate is not capped.
+
+Typical usage example:
+  limiter = rate_limiter.get_limiter()
+  time.sleep(limiter.reserve())
+  limiter.acquire()
+  try:
+    ...send the request...
+    limiter.record_response(status_code, retry_after)
+  finally:
+    limiter.release()
+"""
+
+import email.utils
+import random
+import threading
+import time
+
+DEFAULT_MIN_IN_FLIGHT = 1.0
+# Calls regained in flight for every window of successful calls.
+DEFAULT_ADDITIVE_INCREASE = 1.0
+MULTIPLICATIVE_DECREASE = 0.5
+# Throttled responses of requests which were already in flight when the limit
+# was decreased do not decrease it again.
+_DECREASE_INTERVAL_SECONDS = 1.0
+
+MAX_RETRIES = 5
+INITIAL_BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 60.0
+
+THROTTLING_STATUS_CODES = frozenset({429, 503})
+RETRYABLE_STATUS_CODES = THROTTLING_STATUS_CODES | {500, 502, 504}
+
+
+def retries_server_errors(
+    method_name: str, retry_server_errors: bool | None = None
+) -> bool:
+  """Returns whether calls of a method that may have been processed are retried.
+
+  A call failing with 500, 502 or 504, or whose connection broke or timed out
+  after it was sent, may have been processed before its response was lost.
+  Sending a create again then makes a duplicate entry or fails because it
+  already exists, so POST calls are not retried on these errors unless the
+  caller can confirm its creates.
+
+  Args:
+    method_name: HTTP method name, e.g. GET or POST.
+    retry_server_errors: Whether transient server errors are retried. Defaults
+      to True for all methods but POST.
+
+  Returns:
+    Whether transient server and connection errors are retried.
+  """
+  if retry_server_errors is None:
+    return method_name != 'POST'
+  return retry_server_errors
+
+
+def retryable_status_codes(
+    method_name: str, retry_server_errors: bool | None = None
+) -> frozenset[int]:
+  """Returns the status codes of the failed calls of a method to retry.
+
+  Args:
+    method_name: HTTP method name, e.g. GET or POST.
+    retry_server_errors: Whether transient server errors are retried, see
+      retries_server_errors.
+
+  Returns:
+    RETRYABLE_STATUS_CODES or THROTTLING_STATUS_CODES.
+  """
+  if retries_server_errors(method_name, retry_server_errors):
+    return RETRYABLE_STATUS_CODES
+  return THROTTLING_STATUS_CODES
+
+
+def parse_retry_after(value: str | None) -> float | None:
+  """Parses a Retry-After header value.
+
+  Args:
+    value: Header value, either a number of seconds or an HTTP date.
+
+  Returns:
+    Number of seconds to wait or None if the value is missing or invalid.
+  """
+  if not value:
+    return None
+  try:
+    return max(float(value), 0.0)
+  except ValueError:
+    pass
+  try:
+    retry_at = email.utils.parsedate_to_datetime(value)
+  except (TypeError, ValueError):
+    return None
+  if retry_at is None:
+    return None
+  return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+def backoff_seconds(attempt: int, retry_after: float | None = None) -> float:
+  """Returns how long to wait before retrying a failed call.
+
+  Args:
+    attempt: Number of the retry, starting at 0.
+    retry_after: Delay requested by the server, if any.
+
+  Returns:
+    retry_after when given, otherwise an exponential backoff with full jitter.
+  """
+  if retry_after is not None:
+    return min(retry_after, MAX_BACKOFF_SECONDS)
+  ceiling = min(INITIAL_BACKOFF_SECONDS * 2**attempt, MAX_BACKOFF_SECONDS)
+  return random.uniform(0, ceiling)
+
+
+class AdaptiveLimiter:
+  """Thread-safe AIMD limit of the calls in flight with an optional rate cap.
+
+  reserve() never blocks, it returns the time the caller has to wait before
+  sending its request. That way the same limiter serves threads (time.sleep)
+  and coroutines (asyncio.sleep). Threads then take a slot with acquire(),
+  coroutines poll try_acquire() so they never block the event loop.
+
+  Attributes:
+    max_rate: Maximum number of requests per second, None for no cap.
+    min_in_flight: Limit below which throttling does not decrease it further.
+    additive_increase: Calls regained in flight per window of successes.
+  """
+
+  def __init__(
+      self,
+      max_rate: float | None = None,
+      min_in_flight: float = DEFAULT_MIN_IN_FLIGHT,
+      additive_increase: float = DEFAULT_ADDITIVE_INCREASE,
+  ):
+    if max_rate is not None and max_rate <= 0:
+      raise ValueError('Request rate must be positive.')
+    if min_in_flight < 1:
+      raise ValueError('Number of calls in flight must be at least 1.')
+    self.max_rate = max_rate
+    self.min_in_flight = min_in_flight
+    self.additive_increase = additive_increase
+    # None until the first throttled call, then the AIMD window.
+    self._limit: float | None = None
+    self._in_flight = 0
+    # The bucket holds at most one second worth of requests.
+    self._tokens = max_rate or 0.0
+    self._last_refill = time.monotonic()
+    self._paused_until = 0.0
+    self._last_decrease = float('-inf')
+    self._condition = threading.Condition()
+
+  @property
+  def limit(self) -> float | None:
+    """Current number of calls allowed in flight, None if not limited yet."""
+    with self._condition:
+      return self._limit
+
+  @property
+  def in_flight(self) -> int:
+    """Number of calls holding a slot."""
+    with self._condition:
+      return self._in_flight
+
+  def reserve(self) -> float:
+    """Takes one token from the bucket.
+
+    Returns:
+      Number of seconds the caller has to wait before sending its request.
+    """
+    with self._condition:
+      now = time.monotonic()
+      wait = 0.0
+      if self.max_rate is not None:
+        elapsed = now - self._last_refill
+        self._tokens = min(
+            self.max_rate, self._tokens + elapsed * self.max_rate
+        )
+        self._last_refill = now
+        self._tokens -= 1
+        if self._tokens < 0:
+          wait = -self._tokens / self.max_rate
+      return max(wait, self._paused_until - now, 0.0)
+
+  def _has_slot(self) -> bool:
+    return self._limit is None or self._in_flight < self._limit
+
+  def try_acquire(self) -> bool:
+    """Takes a slot for one call in flight if one is free.
+
+    Returns:
+      Whether a slot was taken. A taken slot must be given back with release().
+    """
+    with self._condition:
+      if not self._has_slot():
+        return False
+      self._in_flight += 1
+      return True
+
+  def acquire(self) -> None:
+    """Waits for a free slot and takes it for one call in flight."""
+    with self._condition:
+      self._condition.wait_for(self._has_slot)
+      self._in_flight += 1
+
+  def release(self) -> None:
+    """Gives back the slot taken by acquire() or try_acquire()."""
+    with self._condition:
+      self._in_flight -= 1
+      self._condition.notify_all()
+
+  def record_response(
+      self, status_code: int, retry_after: float | None = None
+  ) -> None:
+    """Adjusts the limit to the status code of a response.
+
+    Args:
+      status_code: HTTP status code of the response.
+      retry_after: Parsed Retry-After header of the response, if any.
+    """
+    if status_code in THROTTLING_STATUS_CODES:
+      self.on_throttle(retry_after)
+    else:
+      self.on_success()
+
+  def on_success(self) -> None:
+    """Additively increases the limit after a successful call."""
+    with self._condition:
+      if self._limit is not None:
+        self._limit += self.additive_increase / self._limit
+        self._condition.notify_all()
+
+  def on_throttle(self, retry_after: float | None = None) -> None:
+    """Multiplicatively decreases the limit after a throttled call.
+
+    Args:
+      retry_after: Seconds the server asked to wait. All callers are paused for
+        that long.
+    """
+    with self._condition:
+      now = time.monotonic()
+      if now - self._last_decrease >= _DECREASE_INTERVAL_SECONDS:
+        # The first throttled call limits the calls that were in flight.
+        window = self._limit or max(self._in_flight, 1)
+        self._limit = max(self.min_in_flight, window * MULTIPLICATIVE_DECREASE)
+        self._last_decrease = now
+      if retry_after:
+        self._paused_until = max(self._paused_until, now + retry_after)
+
+
+# Process wide limiter, created lazily.
+_limiter: AdaptiveLimiter | None = None
+_max_rate: float | None = None
+_lock = threading.Lock()
+
+
+def configure(max_rate: float | None = None) -> None:
+  """Sets the maximum request rate, replacing the current limiter if any.
+
+  Args:
+    max_rate: Maximum number of requests per second, None for no cap.
+  """
+  global _limiter, _max_rate
+  with _lock:
+    _max_rate = max_rate
+    _limiter = None
+
+
+def get_limiter() -> AdaptiveLimiter:
+  """Returns the AdaptiveLimiter shared by all API calls."""
+  global _limiter
+  with _lock:
+    if _limiter is None:
+      _limiter = AdaptiveLimiter(_max_rate)
+    return _limiter
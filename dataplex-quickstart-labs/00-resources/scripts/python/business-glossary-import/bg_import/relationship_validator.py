@@ -0,0 +1,311 @@
+"""Validation of the relationships described by parsed CSV files.
+
+All relationships of the parsed terms and categories are checked at once,
+before anything is sent to Data Catalog, so that an import bound to fail on
+a relationship is rejected before creating any entry.
+
+Typical usage example:
+  errors = relationship_validator.validate_relationships(terms, categories)
+  if errors:
+    utils.display_parsing_errors(errors)
+"""
+
+from typing import Container, Iterable
+
+import category as bg_category
+import entry_type as entry_type_lib
+import error
+import name_index
+import term as bg_term
+
+# Maximum number of nested levels of categories, top level categories
+# included.
+MAX_CATEGORY_DEPTH = 3
+
+# Columns of the relationship fields in the CSV files, starting at 1.
+_TERM_TAGGED_ASSETS_COLUMN = 4
+_TERM_SYNONYMS_COLUMN = 5
+_TERM_RELATED_TERMS_COLUMN = 6
+_TERM_BELONGS_TO_COLUMN = 7
+_CATEGORY_BELONGS_TO_COLUMN = 4
+
+
+def validate_relationships(
+    terms: dict[int, bg_term.Term] | None,
+    categories: dict[int, bg_category.Category] | None,
+    existing_terms: Iterable[str] = (),
+    existing_categories: Iterable[str] = (),
+    max_category_depth: int = MAX_CATEGORY_DEPTH,
+) -> list[error.ParseError]:
+  """Returns the errors of all relationships described by parsed entries.
+
+  Reports relationships of an entry with itself, relationships to entries
+  that don't exist or have the wrong type, asset names that aren't entry
+  paths, cycles of categories and categories nested too deep.
+
+  Args:
+    terms: Parsed terms by line, or None if no terms CSV file was parsed.
+    categories: Parsed categories by line, or None if no categories CSV file
+      was parsed.
+    existing_terms: Display names of glossary terms that relationships can
+      refer to besides the parsed terms.
+    existing_categories: Display names of glossary categories that
+      relationships can refer to besides the parsed categories.
+    max_category_depth: Maximum number of nested levels of categories.
+
+  Returns:
+    List of errors, empty if all relationships are valid.
+  """
+  terms = terms or {}
+  categories = categories or {}
+  term_names = {name_index.normalize_name(name) for name in existing_terms}
+  term_names.update(
+      name_index.normalize_name(term.display_name) for term in terms.values()
+  )
+  category_names = {
+      name_index.normalize_name(name) for name in existing_categories
+  }
+  category_names.update(
+      name_index.normalize_name(category.display_name)
+      for category in categories.values()
+  )
+
+  errors = []
+  for line, term in terms.items():
+    errors.extend(term_errors(line, term, term_names, category_names))
+  errors.extend(
+      category_errors(
+          categories, term_names, category_names, max_category_depth
+      )
+  )
+  return sorted(errors, key=lambda err: (err.entry_type.value, err.line))
+
+
+def category_errors(
+    categories: dict[int, bg_category.Category],
+    term_names: Container[str],
+    category_names: Container[str],
+    max_category_depth: int = MAX_CATEGORY_DEPTH,
+) -> list[error.ParseError]:
+  """Returns the errors of the relationships of parsed categories.
+
+  Args:
+    categories: Parsed categories by line.
+    term_names: Normalized display names of all terms.
+    category_names: Normalized display names of all categories.
+    max_category_depth: Maximum number of nested levels of categories.
+
+  Returns:
+    List of errors.
+  """
+  errors = []
+  for line, category in categories.items():
+    err = _belongs_to_error(
+        entry_type_lib.EntryType.CATEGORY,
+        line,
+        category.display_name,
+        category.belongs_to_category,
+        _CATEGORY_BELONGS_TO_COLUMN,
+        term_names,
+        category_names,
+    )
+    if err:
+      errors.append(err)
+  errors.extend(_category_hierarchy_errors(categories, max_category_depth))
+  return errors
+
+
+def term_errors(
+    line: int,
+    term: bg_term.Term,
+    term_names: Container[str],
+    category_names: Container[str],
+) -> list[error.ParseError]:
+  """Returns the errors of the relationships of a term.
+
+  Args:
+    line: Line of the term in the CSV file.
+    term: Parsed term.
+    term_names: Normalized display names of all terms.
+    category_names: Normalized display names of all categories.
+
+  Returns:
+    List of errors.
+  """
+  term_type = entry_type_lib.EntryType.TERM
+  errors = []
+  name = name_index.normalize_name(term.display_name)
+  for column, relationship_type, dst_names in (
+      (_TERM_SYNONYMS_COLUMN, 'synonym', term.synonyms),
+      (_TERM_RELATED_TERMS_COLUMN, 'related', term.related_terms),
+  ):
+    for dst_name in dst_names:
+      dst = name_index.normalize_name(dst_name)
+      message = None
+      if dst == name:
+        message = (
+            f'Term "{term.display_name}" cannot be a {relationship_type} of'
+            ' itself.'
+        )
+      elif dst not in term_names:
+        message = f'"{dst_name}" is not a term of the CSV file or glossary.'
+        if dst in category_names:
+          message = f'"{dst_name}" is a category, not a term.'
+      if message:
+        errors.append(
+            error.ParseError(
+                term_type,
+                message=message,
+                line=line,
+                column=column,
+                resources=[term.display_name, dst_name],
+            )
+        )
+
+  for asset in term.tagged_assets:
+    entry, _ = name_index.parse_entry_path(asset)
+    if entry is None:
+      errors.append(
+          error.ParseError(
+              term_type,
+              message=(
+                  f'Asset "{asset}" does not conform with the expected'
+                  ' "projects/{project_id}/locations/{location}/entryGroups/'
+                  '{entry_group}/entries/{entry_id}[:{source_column}]"'
+                  ' pattern.'
+              ),
+              line=line,
+              column=_TERM_TAGGED_ASSETS_COLUMN,
+              resources=[asset],
+          )
+      )
+
+  err = _belongs_to_error(
+      term_type,
+      line,
+      term.display_name,
+      term.belongs_to_category,
+      _TERM_BELONGS_TO_COLUMN,
+      term_names,
+      category_names,
+  )
+  if err:
+    errors.append(err)
+  return errors
+
+
+def _belongs_to_error(
+    entry_type: entry_type_lib.EntryType,
+    line: int,
+    display_name: str,
+    parent_name: str | None,
+    column: int,
+    term_names: Container[str],
+    category_names: Container[str],
+) -> error.ParseError | None:
+  """Returns the error of a belongs_to relationship, if any."""
+  if not parent_name:
+    return None
+  parent = name_index.normalize_name(parent_name)
+  if (
+      entry_type == entry_type_lib.EntryType.CATEGORY
+      and parent == name_index.normalize_name(display_name)
+  ):
+    message = f'Category "{display_name}" cannot belong to itself.'
+  elif parent in category_names:
+    return None
+  elif parent in term_names:
+    message = f'"{parent_name}" is a term, not a category.'
+  else:
+    message = (
+        f'"{parent_name}" is not a category of the CSV file or glossary.'
+    )
+  return error.ParseError(
+      entry_type,
+      message=message,
+      line=line,
+      column=column,
+      resources=[display_name, parent_name],
+  )
+
+
+def _category_hierarchy_errors(
+    categories: dict[int, bg_category.Category], max_depth: int
+) -> list[error.ParseError]:
+  """Returns the errors of cycles and of categories nested too deep.
+
+  Categories have at most one parent, so the hierarchy is walked up from every
+  category, and each category is visited once overall.
+
+  Args:
+    categories: Parsed categories by line.
+    max_depth: Maximum number of nested levels of categories.
+
+  Returns:
+    List of errors.
+  """
+  category_type = entry_type_lib.EntryType.CATEGORY
+  lines = {}
+  parents = {}
+  display_names = {}
+  for line, category in categories.items():
+    name = name_index.normalize_name(category.display_name)
+    lines[name] = line
+    display_names[name] = category.display_name
+    if category.belongs_to_category:
+      parent = name_index.normalize_name(category.belongs_to_category)
+      if parent != name:
+        parents[name] = parent
+
+  errors = []
+  # Depth of categories, None for categories in or below a cycle
+  depths: dict[str, int | None] = {}
+  for start in lines:
+    path = []
+    on_path = set()
+    name = start
+    while name in lines and name not in depths and name not in on_path:
+      path.append(name)
+      on_path.add(name)
+      name = parents.get(name)
+
+    if name in on_path:
+      cycle = path[path.index(name):]
+      for member in cycle:
+        depths[member] = None
+      path = path[: len(path) - len(cycle)]
+      first = min(cycle, key=lines.get)
+      errors.append(
+          error.ParseError(
+              category_type,
+              message=(
+                  'Categories belong to each other in a cycle: '
+                  + ' -> '.join(display_names[member] for member in cycle)
+                  + f' -> {display_names[cycle[0]]}.'
+              ),
+              line=lines[first],
+              column=_CATEGORY_BELONGS_TO_COLUMN,
+              resources=[display_names[member] for member in cycle],
+          )
+      )
+
+    # Categories whose parent is not parsed are at least on the second level
+    depth = depths.get(name) if name in depths else (0 if name is None else 1)
+    for member in reversed(path):
+      depth = None if depth is None else depth + 1
+      depths[member] = depth
+      if depth is not None and depth > max_depth:
+        errors.append(
+            error.ParseError(
+                category_type,
+                message=(
+                    f'Category "{display_names[member]}" is nested'
+                    f' {depth} levels deep, more than the maximum of'
+                    f' {max_depth}.'
+                ),
+                line=lines[member],
+                column=_CATEGORY_BELONGS_TO_COLUMN,
+                resources=[display_names[member]],
+            )
+        )
+  return errors
@@ -0,0 +1,137 @@
+"""Local snapshots of the entries of glossaries, stored in SQLite.
+
+A snapshot holds the entries listed from an entry group the last time a
+glossary was loaded, as returned by Data Catalog. Later runs only fetch the
+entries whose version, as reported by the listing of the entry group, changed
+since then.
+
+Typical usage example:
+  with snapshot_cache.SnapshotCache(path) as snapshot:
+    entries = snapshot.load(key)
+    ...reuse entries whose freshness() is unchanged...
+    snapshot.save(key, entries.values())
+"""
+
+import json
+import sqlite3
+from typing import Any, Iterable
+
+import logging_utils
+
+logger = logging_utils.get_logger()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+  glossary TEXT NOT NULL,
+  name TEXT NOT NULL,
+  freshness TEXT,
+  entry TEXT NOT NULL,
+  PRIMARY KEY (glossary, name)
+)
+"""
+
+
+# Fields of an entry that change whenever the entry is modified. They are all
+# returned by the BASIC view.
+_VERSION_FIELDS = ('etag', 'updateTime', 'modifyTime')
+
+
+def freshness(entry: dict[str, Any], aspects: bool = True) -> str | None:
+  """Returns the version of an entry and the modification times of its aspects.
+
+  Listings in the BASIC view carry no aspects, so their freshness is compared
+  with aspects=False against the stored entry.
+
+  Args:
+    entry: Entry as returned by Data Catalog.
+    aspects: Whether the modification times of the core aspects are included.
+
+  Returns:
+    A string equal for entries of the same version, or None if the entry has
+    no version field.
+  """
+  version = [entry.get(field) for field in _VERSION_FIELDS]
+  if not any(version):
+    return None
+  if aspects:
+    version.append(
+        sorted(
+            (name, aspect.get('modifyTime'))
+            for name, aspect in (entry.get('coreAspects') or {}).items()
+        )
+    )
+  return json.dumps(version, separators=(',', ':'))
+
+
+class SnapshotCache:
+  """Snapshots of glossary entries, by glossary.
+
+  Attributes:
+    path: Path of the SQLite database file.
+    refresh: Whether stored snapshots are ignored. They are overwritten by the
+      next save.
+  """
+
+  def __init__(self, path: str, refresh: bool = False):
+    self.path = path
+    self.refresh = refresh
+    self._connection = sqlite3.connect(path)
+    with self._connection:
+      self._connection.execute(_SCHEMA)
+
+  def __enter__(self) -> 'SnapshotCache':
+    return self
+
+  def __exit__(self, *unused_exc_info) -> None:
+    self.close()
+
+  def close(self) -> None:
+    self._connection.close()
+
+  def load(self, glossary: str) -> dict[str, dict[str, Any]]:
+    """Returns the entries of the snapshot of a glossary.
+
+    Args:
+      glossary: Key of the glossary, as project/location/entryGroup/glossary.
+
+    Returns:
+      Dictionary mapping entry resource names to entries. Empty if there is no
+      snapshot or if the cache is refreshed.
+    """
+    if self.refresh:
+      return {}
+    rows = self._connection.execute(
+        'SELECT name, entry FROM entries WHERE glossary = ?', (glossary,)
+    )
+    return {name: json.loads(entry) for name, entry in rows}
+
+  def save(self, glossary: str, entries: Iterable[dict[str, Any]]) -> None:
+    """Replaces the snapshot of a glossary.
+
+    Args:
+      glossary: Key of the glossary.
+      entries: Entries as returned by Data Catalog.
+    """
+    with self._connection:
+      self._connection.execute(
+          'DELETE FROM entries WHERE glossary = ?', (glossary,)
+      )
+      self._connection.executemany(
+          'INSERT INTO entries VALUES (?, ?, ?, ?)',
+          (
+              (
+                  glossary,
+                  entry['name'],
+                  freshness(entry),
+                  json.dumps(entry, separators=(',', ':')),
+              )
+              for entry in entries
+          ),
+      )
+
+  def invalidate(self, glossary: str) -> None:
+    """Drops the snapshot of a glossary."""
+    with self._connection:
+      self._connection.execute(
+          'DELETE FROM entries WHERE glossary = ?', (glossary,)
+      )
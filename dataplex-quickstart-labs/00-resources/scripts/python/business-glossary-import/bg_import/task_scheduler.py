@@ -0,0 +1,131 @@
+"""Scheduler running interdependent tasks as soon as they become ready.
+
+Every task carries a set of labels and may depend on labels of other tasks. A
+task is submitted once no unfinished task carries any of the labels it depends
+on, so independent chains of work overlap instead of waiting for each other at
+phase boundaries. Tasks depending on a label of a failed task are skipped.
+
+Typical usage example:
+  scheduler = task_scheduler.DependencyScheduler(
+      lambda fn, args: executor.submit(fn, *args)
+  )
+  scheduler.add(create, (a,), labels=['a'])
+  scheduler.add(link, (a, b), depends_on=['a', 'b'])
+  scheduler.run()
+"""
+
+import collections
+from concurrent import futures
+import dataclasses
+from typing import Any, Callable, Hashable, Iterable
+
+# Submits a task with its arguments and returns the future of its result.
+SubmitFn = Callable[[Callable[..., Any], tuple[Any, ...]], futures.Future]
+
+
+@dataclasses.dataclass
+class _Task:
+  fn: Callable[..., Any]
+  args: tuple[Any, ...]
+  labels: tuple[Hashable, ...]
+  depends_on: tuple[Hashable, ...]
+  on_done: Callable[[Any], None] | None
+  succeeded: Callable[[Any], bool] | None
+  on_skipped: Callable[[], None] | None
+
+
+class DependencyScheduler:
+  """Runs tasks as soon as all tasks they depend on are finished.
+
+  A task depending on a label no unfinished task carries is ready right away.
+  Tasks are submitted from, and their on_done callbacks run on, the thread
+  calling run(). Callbacks may add new tasks; a task's labels are only released
+  after its callback returned, so tasks added by the callback keep dependents
+  of those labels waiting.
+
+  A task whose result is not accepted by its succeeded predicate fails its
+  labels: tasks depending on them are skipped instead of run, and fail their
+  own labels in turn.
+  """
+
+  def __init__(self, submit: SubmitFn):
+    self._submit = submit
+    self._unfinished: collections.Counter[Hashable] = collections.Counter()
+    self._blocked: dict[Hashable, list[_Task]] = collections.defaultdict(list)
+    self._running: dict[futures.Future, _Task] = {}
+    self._failed: set[Hashable] = set()
+
+  def add(
+      self,
+      fn: Callable[..., Any],
+      args: tuple[Any, ...],
+      labels: Iterable[Hashable] = (),
+      depends_on: Iterable[Hashable] = (),
+      on_done: Callable[[Any], None] | None = None,
+      succeeded: Callable[[Any], bool] | None = None,
+      on_skipped: Callable[[], None] | None = None,
+  ) -> None:
+    """Adds a task, submitting it right away if it is ready.
+
+    Args:
+      fn: Function to run.
+      args: Arguments of the call.
+      labels: Labels other tasks can depend on.
+      depends_on: Labels which have to be finished before the task runs.
+      on_done: Optional callback receiving the result of the task.
+      succeeded: Optional predicate telling whether the result of the task is
+        a success. Every result is one by default.
+      on_skipped: Optional callback called instead of running the task, when
+        a task it depends on failed or was skipped.
+    """
+    task = _Task(
+        fn,
+        tuple(args),
+        tuple(labels),
+        tuple(depends_on),
+        on_done,
+        succeeded,
+        on_skipped,
+    )
+    self._unfinished.update(task.labels)
+    self._schedule(task)
+
+  def run(self) -> None:
+    """Waits until all tasks, including those added meanwhile, are finished."""
+    while self._running:
+      done, _ = futures.wait(
+          self._running, return_when=futures.FIRST_COMPLETED
+      )
+      for future in done:
+        task = self._running.pop(future)
+        result = future.result()
+        if task.on_done is not None:
+          task.on_done(result)
+        self._finish(
+            task, task.succeeded is None or task.succeeded(result)
+        )
+    if self._blocked:
+      # Only possible when a task depends on one of its own labels.
+      raise RuntimeError('Tasks with cyclic dependencies were never run.')
+
+  def _schedule(self, task: _Task) -> None:
+    for label in task.depends_on:
+      if self._unfinished[label]:
+        self._blocked[label].append(task)
+        return
+    if self._failed.intersection(task.depends_on):
+      if task.on_skipped is not None:
+        task.on_skipped()
+      self._finish(task, False)
+      return
+    self._running[self._submit(task.fn, task.args)] = task
+
+  def _finish(self, task: _Task, succeeded: bool) -> None:
+    if not succeeded:
+      self._failed.update(task.labels)
+    self._unfinished.subtract(task.labels)
+    for label in task.labels:
+      if self._unfinished[label] <= 0:
+        self._unfinished.pop(label, None)
+        for blocked_task in self._blocked.pop(label, []):
+          self._schedule(blocked_task)
@@ -1,15 +1,19 @@
 """Provides functionality of reading business glossary terms from a CSV file.
 
+Records are read as a stream, so that terms can be consumed while the file
+is still being read.
+
 Typical usage example:
   terms, errors, lines_read = read_glossary_csv()
 """
 
 import csv
 import dataclasses
-from typing import Any
+from typing import Any, Iterator, MutableSet
 
 import entry_type
 import error
+import name_index
 import parse_utils
 import parser_types
 import term as bg_term
@@ -21,13 +25,13 @@ import sys
   is_optional_field: Boolean representing if the field is optional.
 """
 _ATTRIBUTE_PARSERS: list[tuple[str, parser_types._ParseFn[Any], bool]] = [
-    ("display_name", parse_utils.parse_term_str, False),
+    ("display_name", parse_utils.parse_term_name, False),
     ("description", parse_utils.parse_term_str, False),
     ("data_stewards", parse_utils.parse_term_data_stewards, True),
     ("tagged_assets", parse_utils.parse_list, True),
     ("synonyms", parse_utils.parse_list, True),
     ("relations", parse_utils.parse_list, True),
-    ("belongs_to_category", parse_utils.parse_term_str, True),
+    ("belongs_to_category", parse_utils.parse_term_name, True),
 ]
 
 
@@ -61,12 +65,61 @@ def parse_glossary_csv(
   terms = {}
   errors = []
   lines_read = 0
-  csv.field_size_limit(sys.maxsize)
+  for line_idx, term, term_errors in _parse_file(path, errors):
+    if term_errors:
+      errors.extend(term_errors)
+    else:
+      terms[line_idx + 1] = term
+    lines_read += 1
+
+  return terms, errors, lines_read
+
+
+def iter_glossary_csv(
+    path: str,
+    errors: list[error.ParseError],
+    tracked_terms: MutableSet[str] | None = None,
+) -> Iterator[TermEntry]:
+  """Yields the terms of a CSV file as they are parsed.
+
+  Args:
+    path: Path of a CSV file to read.
+    errors: List the errors of the records are appended to.
+    tracked_terms: Set receiving the normalized display names read so far,
+      used to detect duplicated terms. By default an in-memory set.
+
+  Yields:
+    TermEntry for each successfully parsed term, in file order.
+  """
+  for line_idx, term, term_errors in _parse_file(path, errors, tracked_terms):
+    if term_errors:
+      errors.extend(term_errors)
+    else:
+      yield TermEntry(line_idx + 1, term)
 
 
+def _parse_file(
+    path: str,
+    errors: list[error.ParseError],
+    tracked_terms: MutableSet[str] | None = None,
+) -> Iterator[tuple[int, bg_term.Term, parser_types._ParseErrors]]:
+  """Yields the parse result of each non-empty record of a CSV file.
+
+  Args:
+    path: Path of a CSV file to read.
+    errors: List an error is appended to if the file can't be read.
+    tracked_terms: Set of the display names read so far, see
+      iter_glossary_csv.
+
+  Yields:
+    A tuple of the record line index, the parsed term and its errors.
+  """
+  csv.field_size_limit(sys.maxsize)
+
   # Set where we track terms that appeared previously in the glossary.
   # Duplicated terms will be recorded as an error.
-  tracked_terms = set()
+  if tracked_terms is None:
+    tracked_terms = set()
   try:
     with open(path) as csv_file:
       csv_reader = csv.reader(
@@ -76,11 +129,7 @@ def parse_glossary_csv(
         if not record:
           continue
         term, term_errors = parse_term(line_idx, record, tracked_terms)
-        if term_errors:
-          errors.extend(term_errors)
-        else:
-          terms[line_idx + 1] = term
-        lines_read += 1
+        yield line_idx, term, term_errors
   except FileNotFoundError:
     errors.append(
         error.ParseError(
@@ -88,11 +137,9 @@ def parse_glossary_csv(
         )
     )
 
-  return terms, errors, lines_read
-
 
 def _validate_term(
-    term: bg_term.Term, tracked_terms: set[str]
+    term: bg_term.Term, tracked_terms: MutableSet[str]
 ) -> parser_types._ParseErrors:
   """Validates a business glossary term.
 
@@ -130,7 +177,7 @@ def _validate_term(
 
   if term.display_name:
     # If the term has appeared before in the CSV file we record an error.
-    if term.display_name.lower() in tracked_terms:
+    if name_index.normalize_name(term.display_name) in tracked_terms:
       err = error.ParseError(
           entry_type.EntryType.TERM,
           message="The term is duplicated in the CSV file.",
@@ -162,7 +209,7 @@ def _validate_term(
 
 
 def parse_term(
-    line_idx: int, record: list[str], tracked_terms: set[str]
+    line_idx: int, record: list[str], tracked_terms: MutableSet[str]
 ) -> parser_types._ParseResult[bg_term.Term]:
   """Parses a business glossary term.
 
@@ -175,38 +222,48 @@ def parse_term(
   Returns:
     A tuple of parsed term and a list of errors.
   """
-  attributes = []
-  errors = []
+  attributes, errors = _parse_attributes(line_idx, record)
+  return _build_term(line_idx, record, attributes, errors, tracked_terms)
 
-  for i, (attr_name, parse_fn, is_optional_field) in enumerate(
-      _ATTRIBUTE_PARSERS
-  ):
-    if i >= len(record):
-      # Add the default value to cover for the missing field
-      default_value, _ = parse_fn("")  # pylint:disable=not-callable
-      attributes.append(default_value)
-      # If the field is not mandatory we can skip creating a ParseError
-      if not is_optional_field:
-        err = error.ParseError(
-            entry_type.EntryType.TERM,
-            message="Missing field",
-            line=line_idx + 1,
-            column=i + 1,
-            record=record,
-            resources=[attr_name],
-        )
-        errors.append(err)
-      continue
 
-    value, attr_errors = parse_fn(record[i])  # pylint:disable=not-callable
-    attributes.append(value)
-    for err in attr_errors:
-      err.line = line_idx + 1
-      err.column = i + 1
-      err.record = record
-      err.resources.append(attr_name)
-    errors.extend(attr_errors)
+def _parse_attributes(
+    line_idx: int, record: list[str]
+) -> parser_types._ParseResult[list[Any]]:
+  """Parses the fields of a term record.
+
+  Args:
+    line_idx: Index of the line where the term appears in the CSV file.
+    record: A list of term attributes in order conforming to the CSV file
+      schema.
+
+  Returns:
+    A tuple of the list of parsed attributes and a list of errors.
+  """
+  return parse_utils.parse_record(
+      entry_type.EntryType.TERM, line_idx, record, _ATTRIBUTE_PARSERS
+  )
+
+
+def _build_term(
+    line_idx: int,
+    record: list[str],
+    attributes: list[Any],
+    errors: parser_types._ParseErrors,
+    tracked_terms: MutableSet[str],
+) -> parser_types._ParseResult[bg_term.Term]:
+  """Creates and validates a term from its parsed attributes.
+
+  Args:
+    line_idx: Index of the line where the term appears in the CSV file.
+    record: A list of term attributes in order conforming to the CSV file
+      schema.
+    attributes: Parsed attributes of the record.
+    errors: Errors of the parsed attributes.
+    tracked_terms: Set of previously seen display names.
 
+  Returns:
+    A tuple of parsed term and a list of errors.
+  """
   (
       display_name,
       description,
@@ -233,7 +290,7 @@ def parse_term(
     err.line = line_idx + 1
     err.record = record
   if term.display_name:
-    tracked_terms.add(term.display_name.lower())
+    tracked_terms.add(name_index.normalize_name(term.display_name))
   errors.extend(validation_errors)
 
   return term, errors
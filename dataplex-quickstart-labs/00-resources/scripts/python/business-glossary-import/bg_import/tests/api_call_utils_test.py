@@ -14,7 +14,7 @@ class ApiCallUtilsTest(unittest.TestCase):
 
   def test_return_no_error_msg_and_response(self):
     with mock.patch(
-        'api_call_utils.requests.get',
+        'requests.Session.get',
         side_effect=mocks.mocked_get_api_response):
       response = api_call_utils.fetch_api_response(
           requests.get,
@@ -26,7 +26,7 @@ class ApiCallUtilsTest(unittest.TestCase):
 
   def test_return_error_msg_and_response(self):
     with mock.patch(
-        'api_call_utils.requests.get',
+        'requests.Session.get',
         side_effect=mocks.mocked_get_api_response):
       response = api_call_utils.fetch_api_response(
           requests.get,
@@ -36,9 +36,22 @@ class ApiCallUtilsTest(unittest.TestCase):
       self.assertIsNone(response['json'])
       self.assertIsNotNone(response['error_msg'])
 
+  def test_return_error_body_with_error_msg(self):
+    body = {'error': {'code': 404, 'message': 'Entry not found.'}}
+    with mock.patch(
+        'requests.Session.get',
+        return_value=mocks.MockResponse(body, 404)):
+      response = api_call_utils.fetch_api_response(
+          requests.get,
+          'https://datacatalog.googleapis.com/v2/get_call/missing',
+          '12345'
+      )
+      self.assertEqual(response['json'], body)
+      self.assertEqual(response['error_msg'], 'Entry not found.')
+
   def test_return_error_msg_when_exception(self):
     with mock.patch(
-        'api_call_utils.requests.get',
+        'requests.Session.get',
         side_effect=mocks.mocked_get_api_response):
       response = api_call_utils.fetch_api_response(
           requests.get,
@@ -0,0 +1,225 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from aiohttp import web
+import async_api_call_utils
+import async_glossary
+import entry_type as EntryType
+import glossary_identification
+import rate_limiter
+import relation_type
+import term as bg_term
+from tests.test_utils import mocks
+
+
+class AsyncGlossaryTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.enterContext(
+        mock.patch(
+            "requests.Session.get",
+            side_effect=mocks.mocked_get_api_response,
+        )
+    )
+    self.fetch_mock = self.enterContext(
+        mock.patch.object(
+            async_api_call_utils.AsyncClient,
+            "fetch_api_response",
+            new_callable=mock.AsyncMock,
+            return_value={"json": {}, "error_msg": None},
+        )
+    )
+    self.glossary = async_glossary.AsyncGlossary(
+        glossary_identification.GlossaryId(
+            "123", "us", "test_entry_group_with_no_terms", "empty_glossary_exists"
+        )
+    )
+    self.addCleanup(self.glossary.close)
+
+  def test_import_terms_and_relationships(self):
+    term1 = bg_term.Term("Term 1", "Desc1", synonyms=["Term 2"])
+    term2 = bg_term.Term("Term 2", "Desc2")
+
+    imported_entries, imported_relations, import_errors = (
+        self.glossary.import_glossary({1: term1, 2: term2}, None)
+    )
+
+    self.assertCountEqual(
+        imported_entries[EntryType.EntryType.TERM], [term1, term2]
+    )
+    self.assertEqual(
+        imported_relations[EntryType.EntryType.TERM],
+        [("Term 1", "Term 2", relation_type.RelationshipType.SYNONYMOUS)],
+    )
+    self.assertEqual(import_errors, [])
+    # Two entries and one relationship
+    self.assertEqual(self.fetch_mock.await_count, 3)
+
+  def test_import_reports_failed_entries(self):
+    self.fetch_mock.return_value = {"json": None, "error_msg": "Some error"}
+    term1 = bg_term.Term("Term 1", "Desc1")
+
+    imported_entries, _, import_errors = self.glossary.import_glossary(
+        {1: term1}, None
+    )
+
+    self.assertEqual(imported_entries[EntryType.EntryType.TERM], [])
+    self.assertEqual(len(import_errors), 1)
+    self.assertEqual(import_errors[0].line, 1)
+    self.assertEqual(import_errors[0].operation, "add_new_term")
+    self.assertEqual(import_errors[0].message, "Some error")
+
+  def test_invalid_relationship_is_not_sent(self):
+    err = self.glossary._run(
+        self.glossary._create_relationship_async(
+            "Term 1",
+            EntryType.EntryType.TERM,
+            "Term 1",
+            EntryType.EntryType.TERM,
+            relation_type.RelationshipType.RELATED,
+        )
+    )
+    self.assertEqual(
+        err.operation, "create_is_related_to_relationship_validation"
+    )
+    self.fetch_mock.assert_not_awaited()
+
+  def test_remove_entry(self):
+    self.glossary._run(self.glossary._remove_glossary_entry_async("term_id"))
+    self.fetch_mock.assert_awaited_once_with(
+        "DELETE",
+        (
+            "https://datacatalog.googleapis.com/v2/projects/123/locations/us/"
+            "entryGroups/test_entry_group_with_no_terms/entries/term_id"
+        ),
+        "123",
+    )
+
+  def test_tasks_without_async_variant_use_threads(self):
+    ret = self.glossary._parallelize(lambda a: a + 1, [(1,), (2,)])
+    self.assertEqual(ret, [2, 3])
+
+  def test_parallelize_after_close_raises(self):
+    self.glossary.close()
+    with self.assertRaises(RuntimeError):
+      self.glossary._parallelize(
+          self.glossary._remove_glossary_entry, [("term_id",)]
+      )
+
+
+class AsyncClientTest(unittest.IsolatedAsyncioTestCase):
+
+  async def asyncSetUp(self):
+    self.in_flight, self.max_in_flight = 0, 0
+    self.throttled_calls = 0
+    self.dropped_calls = 0
+
+    async def handler(request):
+      self.in_flight += 1
+      self.max_in_flight = max(self.max_in_flight, self.in_flight)
+      await asyncio.sleep(0.01)
+      self.in_flight -= 1
+      if request.path == "/error":
+        return web.json_response({"error": {"message": "Bad call"}}, status=400)
+      if request.path == "/throttled" and not self.throttled_calls:
+        self.throttled_calls += 1
+        return web.json_response(
+            {"error": {"message": "Quota"}},
+            status=429,
+            headers={"Retry-After": "0"},
+        )
+      if request.path == "/dropped" and not self.dropped_calls:
+        self.dropped_calls += 1
+        request.transport.close()
+      if request.path == "/text":
+        return web.Response(text="not json")
+      return web.json_response({"path": request.path})
+
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handler)
+    self.runner = web.AppRunner(app)
+    await self.runner.setup()
+    site = web.TCPSite(self.runner, "127.0.0.1", 0)
+    await site.start()
+    port = self.runner.addresses[0][1]
+    self.base_url = f"http://127.0.0.1:{port}"
+
+  async def asyncTearDown(self):
+    await self.runner.cleanup()
+    rate_limiter.configure()
+
+  async def test_in_flight_requests_are_bounded(self):
+    async with async_api_call_utils.AsyncClient(max_in_flight=5) as client:
+      responses = await asyncio.gather(*(
+          client.fetch_api_response("GET", f"{self.base_url}/{i}", "123")
+          for i in range(30)
+      ))
+    self.assertEqual(self.max_in_flight, 5)
+    self.assertEqual(
+        [r["json"]["path"] for r in responses], [f"/{i}" for i in range(30)]
+    )
+
+  async def test_error_response(self):
+    async with async_api_call_utils.AsyncClient() as client:
+      response = await client.fetch_api_response(
+          "POST", f"{self.base_url}/error", "123", {"a": 1}
+      )
+    self.assertEqual(
+        response,
+        {"json": {"error": {"message": "Bad call"}}, "error_msg": "Bad call"},
+    )
+
+  async def test_throttled_call_is_retried(self):
+    async with async_api_call_utils.AsyncClient() as client:
+      response = await client.fetch_api_response(
+          "GET", f"{self.base_url}/throttled", "123"
+      )
+    self.assertEqual(
+        response, {"json": {"path": "/throttled"}, "error_msg": None}
+    )
+    self.assertEqual(self.throttled_calls, 1)
+
+  async def test_non_valid_json_response(self):
+    async with async_api_call_utils.AsyncClient() as client:
+      response = await client.fetch_api_response(
+          "GET", f"{self.base_url}/text", "123"
+      )
+    self.assertIsNone(response["json"])
+    self.assertEqual(
+        response["error_msg"],
+        f"GET call to {self.base_url}/text returned non valid JSON.",
+    )
+
+  async def test_connection_error(self):
+    with mock.patch.object(rate_limiter, "INITIAL_BACKOFF_SECONDS", 0.0):
+      async with async_api_call_utils.AsyncClient() as client:
+        response = await client.fetch_api_response(
+            "GET", "http://127.0.0.1:1/unreachable", "123"
+        )
+    self.assertIsNone(response["json"])
+    self.assertIn("GET call to http://127.0.0.1:1/unreachable returned",
+                  response["error_msg"])
+    self.assertEqual(rate_limiter.get_limiter().in_flight, 0)
+
+  async def test_dropped_connection_is_retried(self):
+    with mock.patch.object(rate_limiter, "INITIAL_BACKOFF_SECONDS", 0.0):
+      async with async_api_call_utils.AsyncClient() as client:
+        response = await client.fetch_api_response(
+            "GET", f"{self.base_url}/dropped", "123"
+        )
+    self.assertEqual(response, {"json": {"path": "/dropped"}, "error_msg": None})
+    self.assertEqual(self.dropped_calls, 1)
+
+  async def test_dropped_create_is_not_retried(self):
+    async with async_api_call_utils.AsyncClient() as client:
+      response = await client.fetch_api_response(
+          "POST", f"{self.base_url}/dropped", "123", {"a": 1}
+      )
+    self.assertIsNone(response["json"])
+    self.assertEqual(self.dropped_calls, 1)
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,93 @@
+import csv
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import business_glossary_export
+import utils
+
+_ENTRIES = "projects/123/locations/us/entryGroups/group/entries"
+
+
+def _term(name):
+  return {
+      "name": f"{_ENTRIES}/{name}",
+      "displayName": name,
+      "entryType": "glossary_term",
+      "coreAspects": {
+          "business_context": {"jsonContent": {"description": name}}
+      },
+  }
+
+
+class ExportGlossaryEntriesTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.transformed = threading.Event()
+    self.enterContext(
+        mock.patch.object(
+            utils, "fetch_relationships", side_effect=self._fetch_relationships
+        )
+    )
+    process_entry = business_glossary_export.process_entry
+    self.enterContext(
+        mock.patch.object(
+            business_glossary_export,
+            "process_entry",
+            side_effect=self._process_entry(process_entry),
+        )
+    )
+    temp_dir = self.enterContext(tempfile.TemporaryDirectory())
+    self.categories_csv = os.path.join(temp_dir, "categories.csv")
+    self.terms_csv = os.path.join(temp_dir, "terms.csv")
+
+  def _fetch_relationships(self, entry_name, unused_user_project):
+    if entry_name.endswith("failing"):
+      raise ValueError("Denied")
+    return []
+
+  def _process_entry(self, process_entry):
+    def wrapper(*args):
+      self.transformed.set()
+      return process_entry(*args)
+
+    return wrapper
+
+  def _exported_terms(self):
+    # Rows are written without a header, the display name first
+    with open(self.terms_csv, newline="") as terms_file:
+      return sorted(row[0] for row in csv.reader(terms_file))
+
+  def test_entries_are_transformed_while_listing(self):
+    transformed_while_listing = []
+
+    def entries():
+      yield _term("t1")
+      yield _term("t2")
+      # Read once the first entries are being transformed
+      transformed_while_listing.append(self.transformed.wait(timeout=5))
+      yield _term("t3")
+
+    business_glossary_export.export_glossary_entries(
+        entries(), self.categories_csv, self.terms_csv, "123", max_workers=1
+    )
+
+    self.assertEqual(transformed_while_listing, [True])
+    self.assertEqual(self._exported_terms(), ["t1", "t2", "t3"])
+
+  def test_entry_whose_relationships_failed_is_exported(self):
+    business_glossary_export.export_glossary_entries(
+        [_term("t1"), _term("failing")],
+        self.categories_csv,
+        self.terms_csv,
+        "123",
+    )
+
+    self.assertEqual(self._exported_terms(), ["failing", "t1"])
+
+
+if __name__ == "__main__":
+  unittest.main()
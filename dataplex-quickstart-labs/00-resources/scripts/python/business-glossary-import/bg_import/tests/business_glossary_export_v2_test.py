@@ -0,0 +1,457 @@
+from concurrent import futures
+import json
+import math
+import os
+import re
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import business_glossary_export_v2 as export_v2
+
+_ASSET = "projects/p/locations/us/entryGroups/@bigquery/entries/abc"
+_LINKED_RESOURCE = "bigquery.googleapis.com/projects/p/datasets/d/tables/t"
+
+
+class OnceCacheTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.cache = export_v2.OnceCache()
+
+  def test_value_is_computed_once(self):
+    compute = mock.Mock(return_value="value")
+
+    self.assertEqual(self.cache.get("key", compute), "value")
+    self.assertEqual(self.cache.get("key", compute), "value")
+
+    compute.assert_called_once()
+
+  def test_error_is_not_cached(self):
+    compute = mock.Mock(side_effect=[ValueError("Unavailable"), "value"])
+
+    with self.assertRaisesRegex(ValueError, "Unavailable"):
+      self.cache.get("key", compute)
+    self.assertEqual(self.cache.get("key", compute), "value")
+
+    self.assertEqual(compute.call_count, 2)
+    self.assertEqual(self.cache.size(), 1)
+
+  def test_value_not_kept_is_computed_again(self):
+    compute = mock.Mock(side_effect=["", "value", "other"])
+
+    self.assertEqual(self.cache.get("key", compute, keep=bool), "")
+    self.assertEqual(self.cache.get("key", compute, keep=bool), "value")
+    self.assertEqual(self.cache.get("key", compute, keep=bool), "value")
+
+    self.assertEqual(compute.call_count, 2)
+
+
+class FetchGlossaryIdTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.enterContext(
+        mock.patch.object(
+            export_v2, "glossary_ids_by_entry_group", export_v2.OnceCache()
+        )
+    )
+    self.fetch_api_response = self.enterContext(
+        mock.patch.object(export_v2.api_call_utils, "fetch_api_response")
+    )
+
+  def test_failed_lookup_is_tried_again(self):
+    self.fetch_api_response.side_effect = [
+        {"json": None, "error_msg": "Unavailable"},
+        {"json": {"name": f"{_GLOSSARY_GROUP}/entries/my_glossary"}},
+    ]
+    entry = f"{_GLOSSARY_GROUP}/entries/term"
+
+    self.assertEqual(export_v2.fetch_glossary_id(entry, "user-project"), "")
+    self.assertEqual(
+        export_v2.fetch_glossary_id(entry, "user-project"), "my-glossary"
+    )
+    self.assertEqual(
+        export_v2.fetch_glossary_id(entry, "user-project"), "my-glossary"
+    )
+
+    self.assertEqual(self.fetch_api_response.call_count, 2)
+
+
+class AssetCacheTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.fetch_api_response = self.enterContext(
+        mock.patch.object(export_v2.api_call_utils, "fetch_api_response")
+    )
+    self.fetch_relationships = self.enterContext(
+        mock.patch.object(
+            export_v2.utils,
+            "fetch_relationships",
+            return_value=[{"name": f"{_ASSET}/relationships/r"}],
+        )
+    )
+    self.cache = export_v2.AssetCache("user-project")
+
+  def test_asset_is_fetched_once_by_concurrent_terms(self):
+    def lookup_entry(*unused_args):
+      # Lets every term ask for the asset while it is looked up
+      deadline = time.monotonic() + 5
+      while self.cache.requests() < 8 and time.monotonic() < deadline:
+        time.sleep(0.001)
+      return {"json": {"name": _ASSET}, "error_msg": None}
+
+    self.fetch_api_response.side_effect = lookup_entry
+    with futures.ThreadPoolExecutor(max_workers=8) as executor:
+      results = list(
+          executor.map(
+              lambda _: self.cache.relationships(_ASSET, _LINKED_RESOURCE),
+              range(8),
+          )
+      )
+
+    self.assertEqual(results, [[{"name": f"{_ASSET}/relationships/r"}]] * 8)
+    self.fetch_api_response.assert_called_once()
+    self.assertIn(
+        f"entries/{_LINKED_RESOURCE}", self.fetch_api_response.call_args.args[1]
+    )
+    self.fetch_relationships.assert_called_once_with(
+        _ASSET, "user-project", "BASIC"
+    )
+    self.assertEqual(self.cache.size(), 1)
+    self.assertEqual(self.cache.requests(), 8)
+
+  def test_missing_asset_is_remembered(self):
+    self.fetch_api_response.return_value = {"json": None, "error_msg": "404"}
+
+    self.assertIsNone(self.cache.relationships(_ASSET, _LINKED_RESOURCE))
+    self.assertIsNone(self.cache.relationships(_ASSET, _LINKED_RESOURCE))
+
+    self.fetch_api_response.assert_called_once()
+    self.fetch_relationships.assert_not_called()
+
+  def test_assets_are_cached_by_name(self):
+    self.fetch_api_response.return_value = {
+        "json": {"name": _ASSET},
+        "error_msg": None,
+    }
+
+    self.cache.relationships(_ASSET, _LINKED_RESOURCE)
+    self.cache.relationships(f"{_ASSET}2", _LINKED_RESOURCE)
+
+    self.assertEqual(self.fetch_relationships.call_count, 2)
+    self.assertEqual(self.cache.size(), 2)
+
+
+def _term(term_id, uid):
+  return {
+      "name": f"projects/p/locations/us/entryGroups/g/entries/{term_id}",
+      "entryType": "glossary_term",
+      "entryUid": uid,
+  }
+
+
+_GLOSSARY_GROUP = "projects/p/locations/us/entryGroups/g"
+
+
+def _asset(table):
+  return f"projects/p/locations/us/entryGroups/@bigquery/entries/{table}"
+
+
+class DefinitionLinksTest(unittest.TestCase):
+  """Exports definition links of terms tagging shared assets."""
+
+  def setUp(self):
+    super().setUp()
+    for name, value in {
+        "USER_PROJECT": "user-project",
+        "ORG_IDS": ["1"],
+        "PROJECT": "p",
+        "LOCATION": "us",
+        "GLOSSARY": "glossary",
+        "NORMALIZED_GLOSSARY": "glossary",
+        "PROJECT_NUMBER": "42",
+        "DATAPLEX_ENTRY_GROUP": "projects/p/locations/global/entryGroups/@dataplex",
+    }.items():
+      self.enterContext(mock.patch.object(export_v2, name, value, create=True))
+    temp_dir = self.enterContext(tempfile.TemporaryDirectory())
+    self.enterContext(mock.patch.object(os, "getcwd", return_value=temp_dir))
+    self.output_dir = os.path.join(temp_dir, "Exported_Files")
+    self.entries = [
+        _term("term_1", "uid1"),
+        _term("term_2", "uid2"),
+        {"name": "projects/p/locations/us/entryGroups/g/entries/glossary"},
+    ]
+    # Both terms tag table_a, only term_1 tags table_b
+    self.tagged_assets = {
+        "term_1": ["table_a", "table_b"],
+        "term_2": ["table_a"],
+    }
+    self.fetch_api_response = self.enterContext(
+        mock.patch.object(
+            export_v2.api_call_utils,
+            "fetch_api_response",
+            side_effect=self._fetch_api_response,
+        )
+    )
+    self.fetch_relationships = self.enterContext(
+        mock.patch.object(
+            export_v2.utils,
+            "fetch_relationships",
+            side_effect=self._fetch_relationships,
+        )
+    )
+
+  def _fetch_api_response(
+      self, method, url, unused_project, body=None, **unused_kwargs
+  ):
+    if url != export_v2.CATALOG_SEARCH_URL:
+      return {"json": {"name": url}, "error_msg": None}
+    term_ids = re.findall(r"term:(\w+)", body["query"])
+    tables = {
+        table for term_id in term_ids for table in self.tagged_assets[term_id]
+    }
+    return {
+        "json": {
+            "results": [
+                {
+                    "relativeResourceName": _asset(table),
+                    "linkedResource": f"//bigquery/{table}",
+                }
+                for table in sorted(tables)
+            ]
+        },
+        "error_msg": None,
+    }
+
+  def _failing_search(self, method, url, project, body=None, **kwargs):
+    if url == export_v2.CATALOG_SEARCH_URL and "term_2" in body["query"]:
+      return {"json": None, "error_msg": "Backend error"}
+    return self._fetch_api_response(method, url, project, body, **kwargs)
+
+  def _fetch_relationships(self, entry_name, unused_project, unused_view):
+    table = entry_name.split("/")[-1]
+    return [
+        {
+            "name": f"{entry_name}/relationships/{table}_{term_id}",
+            "relationshipType": "is_described_by",
+            "destinationEntryName": (
+                f"projects/p/locations/us/entryGroups/g/entries/{uid}"
+            ),
+            "sourceColumn": "column",
+        }
+        for term_id, uid in (("term_1", "uid1"), ("term_2", "uid2"))
+        if table in self.tagged_assets[term_id]
+    ]
+
+  def _export(self, definition_links_mode):
+    export_v2.export_combined_entry_links_json(
+        self.entries, {}, "p", {"is_described_by"}, definition_links_mode
+    )
+    exported = {}
+    for filename in os.listdir(self.output_dir):
+      with open(os.path.join(self.output_dir, filename)) as links_file:
+        exported[filename] = sorted(links_file)
+    return exported
+
+  def _searches(self):
+    return [
+        call
+        for call in self.fetch_api_response.call_args_list
+        if call.args[1] == export_v2.CATALOG_SEARCH_URL
+    ]
+
+  def test_by_asset_exports_the_links_of_per_term(self):
+    per_term = self._export("per_term")
+    self.assertEqual(len(self._searches()), 2)
+    self.fetch_api_response.reset_mock()
+    self.fetch_relationships.reset_mock()
+
+    by_asset = self._export("by_asset")
+
+    self.assertEqual(by_asset, per_term)
+    self.assertEqual([len(links) for links in by_asset.values()], [3])
+    self.assertEqual(len(self._searches()), 1)
+    self.assertEqual(self.fetch_relationships.call_count, 2)
+
+  def test_searches_are_batched(self):
+    self.entries = [_term(f"term_{i}", f"uid{i}") for i in range(45)]
+    self.tagged_assets = {f"term_{i}": [] for i in range(45)}
+
+    links = export_v2.collect_definition_links_by_asset(
+        self.entries, export_v2.AssetCache("user-project")
+    )
+
+    self.assertEqual(links, [])
+    self.assertEqual(
+        len(self._searches()), math.ceil(45 / export_v2.TERMS_PER_SEARCH)
+    )
+    self.fetch_relationships.assert_not_called()
+
+
+  def test_failed_search_stops_the_export(self):
+    self.fetch_api_response.side_effect = self._failing_search
+
+    for definition_links_mode in ("per_term", "by_asset"):
+      with self.subTest(definition_links_mode):
+        with self.assertRaises(SystemExit) as exit_context:
+          self._export(definition_links_mode)
+        self.assertEqual(exit_context.exception.code, 1)
+        self.assertFalse(os.path.exists(self.output_dir))
+
+
+class EntryLinksStressTest(unittest.TestCase):
+  """Exports links of terms sharing assets and relationships concurrently."""
+
+  _TERMS = 60
+  _ASSETS = 8
+
+  def setUp(self):
+    super().setUp()
+    for name, value in {
+        "USER_PROJECT": "user-project",
+        "ORG_IDS": ["1"],
+        "PROJECT": "p",
+        "LOCATION": "us",
+        "GLOSSARY": "glossary",
+        "NORMALIZED_GLOSSARY": "glossary",
+        "PROJECT_NUMBER": "42",
+        "DATAPLEX_ENTRY_GROUP": (
+            "projects/p/locations/global/entryGroups/@dataplex"
+        ),
+        "MAX_WORKERS": 64,
+        "glossary_ids_by_entry_group": export_v2.OnceCache(),
+    }.items():
+      self.enterContext(mock.patch.object(export_v2, name, value, create=True))
+    temp_dir = self.enterContext(tempfile.TemporaryDirectory())
+    self.enterContext(mock.patch.object(os, "getcwd", return_value=temp_dir))
+    self.output_dir = os.path.join(temp_dir, "Exported_Files")
+    # Switches threads as often as possible to expose races
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    self.addCleanup(sys.setswitchinterval, switch_interval)
+    self.fetch_api_response = self.enterContext(
+        mock.patch.object(
+            export_v2.api_call_utils,
+            "fetch_api_response",
+            side_effect=self._fetch_api_response,
+        )
+    )
+    self.fetch_relationships = self.enterContext(
+        mock.patch.object(
+            export_v2.utils,
+            "fetch_relationships",
+            side_effect=self._fetch_relationships,
+        )
+    )
+
+  def _fetch_api_response(
+      self, method, url, unused_project, body=None, **unused_kwargs
+  ):
+    time.sleep(0)
+    if url != export_v2.CATALOG_SEARCH_URL:
+      return {
+          "json": {"name": f"{_GLOSSARY_GROUP}/entries/glossary"},
+          "error_msg": None,
+      }
+    # Every asset is found twice for every term
+    return {
+        "json": {
+            "results": [
+                {
+                    "relativeResourceName": _asset(f"table_{i % self._ASSETS}"),
+                    "linkedResource": f"//bigquery/table_{i % self._ASSETS}",
+                }
+                for i in range(2 * self._ASSETS)
+            ]
+        },
+        "error_msg": None,
+    }
+
+  def _fetch_relationships(self, entry_name, unused_project, unused_view):
+    time.sleep(0)
+    table = entry_name.split("/")[-1]
+    return [
+        {
+            "name": f"{entry_name}/relationships/{table}_{i}",
+            "destinationEntryName": f"{_GLOSSARY_GROUP}/entries/uid{i}",
+            "sourceColumn": "column",
+        }
+        for i in range(self._TERMS)
+    ]
+
+  def _term_relationships(self, i):
+    """Returns the related_to relationships of term i with its neighbors."""
+    relationships = []
+    for j in ((i - 1) % self._TERMS, (i + 1) % self._TERMS):
+      first, second = sorted((i, j))
+      # Both terms of a pair list the same relationship
+      relationships.append({
+          "name": (
+              f"{_GLOSSARY_GROUP}/entries/term_{first}"
+              f"/relationships/r{first}_{second}"
+          ),
+          "relationshipType": "is_related_to",
+          "sourceEntry": {
+              "name": f"{_GLOSSARY_GROUP}/entries/term_{i}",
+              "entryType": "glossary_term",
+          },
+          "destinationEntry": {
+              "name": f"{_GLOSSARY_GROUP}/entries/term_{j}",
+              "coreRelationships": [{
+                  "destinationEntryName": f"{_GLOSSARY_GROUP}/entries/glossary"
+              }],
+          },
+      })
+    return relationships
+
+  def test_links_are_exported_once(self):
+    entries = [
+        _term(f"term_{i}", f"uid{i}") for i in range(self._TERMS)
+    ]
+    relationships_data = {
+        entry["name"]: self._term_relationships(i)
+        for i, entry in enumerate(entries)
+    }
+
+    export_v2.export_combined_entry_links_json(
+        entries,
+        relationships_data,
+        "p",
+        {"is_related_to", "is_described_by"},
+    )
+
+    with open(
+        os.path.join(self.output_dir, "entrylinks_related_synonyms_glossary.json")
+    ) as links_file:
+      term_links = [json.loads(line) for line in links_file]
+    with open(
+        os.path.join(
+            self.output_dir, "entrylinks_definition_glossary_p_us__bigquery.json"
+        )
+    ) as links_file:
+      definition_links = [json.loads(line) for line in links_file]
+    term_link_names = [link["entryLink"]["name"] for link in term_links]
+    definition_link_names = [
+        link["entryLink"]["name"] for link in definition_links
+    ]
+    self.assertEqual(len(set(term_link_names)), self._TERMS)
+    self.assertEqual(len(term_link_names), self._TERMS)
+    self.assertEqual(
+        len(set(definition_link_names)), self._TERMS * self._ASSETS
+    )
+    self.assertEqual(len(definition_link_names), self._TERMS * self._ASSETS)
+    self.assertEqual(self.fetch_relationships.call_count, self._ASSETS)
+    glossary_lookups = [
+        call
+        for call in self.fetch_api_response.call_args_list
+        if call.args[1].endswith("/entries/glossary")
+    ]
+    self.assertEqual(len(glossary_lookups), 1)
+
+
+if __name__ == "__main__":
+  unittest.main()
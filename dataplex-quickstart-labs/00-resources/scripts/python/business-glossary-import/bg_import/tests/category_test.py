@@ -78,6 +78,12 @@ class CategoryTest(unittest.TestCase):
         actual_category.category_id, expected_category.category_id
     )
 
+  def test_has_no_instance_dict(self):
+    category = bg_category.Category("test-category-1", "description")
+    self.assertFalse(hasattr(category, "__dict__"))
+    with self.assertRaises(AttributeError):
+      category.unknown_attribute = "value"
+
 
 if __name__ == "__main__":
   unittest.main()
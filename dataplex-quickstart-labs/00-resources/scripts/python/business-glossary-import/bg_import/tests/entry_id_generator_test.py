@@ -0,0 +1,35 @@
+import unittest
+
+import entry_id_generator
+
+
+class EntryIdGeneratorTest(unittest.TestCase):
+
+  def test_random_id_is_based_on_display_name(self):
+    self.assertEqual(entry_id_generator.random_id("Term TERM")[:9], "term_term")
+    self.assertEqual(entry_id_generator.random_id("123 term")[:9], "_123_term")
+    self.assertEqual(entry_id_generator.random_id(""), "")
+
+  def test_deterministic_id_is_stable(self):
+    first = entry_id_generator.deterministic_id("Cost", "p/us/g/glossary")
+    second = entry_id_generator.deterministic_id("Cost", "p/us/g/glossary")
+    self.assertEqual(first, second)
+    self.assertEqual(first[:4], "cost")
+    self.assertEqual(len(first), 11)
+
+  def test_deterministic_id_depends_on_namespace_and_attempt(self):
+    ids = {
+        entry_id_generator.deterministic_id("Cost", "p/us/g/glossary"),
+        entry_id_generator.deterministic_id("Cost", "p/us/g/other"),
+        entry_id_generator.deterministic_id("Cost", "p/us/g/glossary", 1),
+    }
+    self.assertEqual(len(ids), 3)
+
+  def test_deterministic_id_is_truncated(self):
+    entry_id = entry_id_generator.deterministic_id("a" * 100, "namespace")
+    self.assertEqual(len(entry_id), 64)
+    self.assertEqual(entry_id[:57], "a" * 57)
+
+
+if __name__ == "__main__":
+  unittest.main()
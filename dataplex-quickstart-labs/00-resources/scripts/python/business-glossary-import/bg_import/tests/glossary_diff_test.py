@@ -0,0 +1,153 @@
+import unittest
+
+import category as bg_category
+import entry_type as EntryType
+import glossary_diff
+import name_index
+import relation_type
+import term as bg_term
+
+TERM = EntryType.EntryType.TERM
+CATEGORY = EntryType.EntryType.CATEGORY
+SYNONYMOUS = relation_type.RelationshipType.SYNONYMOUS
+RELATED = relation_type.RelationshipType.RELATED
+DESCRIBED = relation_type.RelationshipType.DESCRIBED
+BELONGS_TO = relation_type.RelationshipType.BELONGS_TO
+
+
+class GlossaryDiffTest(unittest.TestCase):
+
+  def test_diff_entries(self):
+    existing = name_index.EntryCache({
+        "Same": bg_term.Term("Same", "Desc", force_term_id="same_id"),
+        "Changed": bg_term.Term(
+            "Changed", "Desc", data_stewards=["a"], force_term_id="changed_id"
+        ),
+        "Removed": bg_term.Term("Removed", "Desc", force_term_id="removed_id"),
+    })
+    same = bg_term.Term("Same", "Desc")
+    changed = bg_term.Term("Changed", "Desc", data_stewards=["b"])
+    new = bg_term.Term("New", "Desc")
+
+    diff = glossary_diff.diff_entries({1: same, 2: changed, 3: new}, existing)
+
+    self.assertEqual(diff.new, {3: new})
+    self.assertEqual(diff.updated, {2: changed})
+    self.assertEqual(diff.unchanged, {1: same})
+    self.assertEqual(diff.deleted, [existing["Removed"]])
+    # Matched entries take over the id of the existing entry
+    self.assertEqual(same.term_id, "same_id")
+    self.assertEqual(changed.term_id, "changed_id")
+
+  def test_diff_entries_detects_description_change(self):
+    existing = name_index.EntryCache({
+        "Cat": bg_category.Category("Cat", "Old", force_category_id="cat_id")
+    })
+    category = bg_category.Category("Cat", "New")
+
+    diff = glossary_diff.diff_entries({1: category}, existing)
+
+    self.assertEqual(diff.updated, {1: category})
+    self.assertEqual(glossary_diff.entry_id(category), "cat_id")
+
+  def test_diff_entries_matches_normalized_names(self):
+    existing = name_index.EntryCache({
+        "Net Revenue": bg_term.Term(
+            "Net Revenue", "Desc", force_term_id="revenue_id"
+        )
+    })
+    term = bg_term.Term("net  revenue", "Desc")
+
+    diff = glossary_diff.diff_entries({1: term}, existing)
+
+    self.assertEqual(diff.unchanged, {1: term})
+    self.assertEqual(diff.new, {})
+    self.assertEqual(diff.deleted, [])
+    self.assertEqual(term.term_id, "revenue_id")
+    self.assertEqual(term.display_name, "Net Revenue")
+
+  def test_desired_relationships(self):
+    term = bg_term.Term(
+        "B",
+        "Desc",
+        synonyms=["A"],
+        related_terms=["C"],
+        tagged_assets=["asset"],
+        belongs_to_category="Cat",
+    )
+    category = bg_category.Category("Cat", "Desc", belongs_to_category="Root")
+
+    self.assertEqual(
+        glossary_diff.desired_relationships([term], [category]),
+        {
+            ("A", TERM, "B", TERM, SYNONYMOUS),
+            ("B", TERM, "C", TERM, RELATED),
+            ("asset", TERM, "B", TERM, DESCRIBED),
+            ("B", TERM, "Cat", CATEGORY, BELONGS_TO),
+            ("Cat", CATEGORY, "Root", CATEGORY, BELONGS_TO),
+        },
+    )
+
+  def test_desired_relationships_refer_to_display_names(self):
+    term_a = bg_term.Term("alpha", "Desc", synonyms=["BETA"])
+    term_b = bg_term.Term(
+        "Beta", "Desc", synonyms=["Alpha "], belongs_to_category="cat"
+    )
+    category = bg_category.Category("Cat", "Desc")
+
+    self.assertEqual(
+        glossary_diff.desired_relationships([term_a, term_b], [category]),
+        {
+            ("alpha", TERM, "Beta", TERM, SYNONYMOUS),
+            ("Beta", TERM, "Cat", CATEGORY, BELONGS_TO),
+        },
+    )
+
+  def test_normalize_orders_by_normalized_name(self):
+    self.assertEqual(
+        glossary_diff.normalize(("Beta", TERM, "alpha", TERM, RELATED)),
+        ("alpha", TERM, "Beta", TERM, RELATED),
+    )
+
+  def test_normalize_keeps_direction_of_asymmetric_relationships(self):
+    relationship = ("B", TERM, "A", CATEGORY, BELONGS_TO)
+    self.assertEqual(glossary_diff.normalize(relationship), relationship)
+
+  def test_diff_relationships(self):
+    desired = {
+        ("A", TERM, "B", TERM, SYNONYMOUS),
+        ("A", TERM, "Cat", CATEGORY, BELONGS_TO),
+    }
+    existing = {
+        ("A", TERM, "B", TERM, SYNONYMOUS): ["rel/1"],
+        ("A", TERM, "C", TERM, RELATED): ["rel/2", "rel/3"],
+        ("Cat", CATEGORY, "Root", CATEGORY, BELONGS_TO): ["rel/4"],
+    }
+
+    to_create, to_delete = glossary_diff.diff_relationships(
+        desired, existing, {TERM}
+    )
+
+    self.assertEqual(to_create, {("A", TERM, "Cat", CATEGORY, BELONGS_TO)})
+    # Relationships of categories are kept when no categories were parsed
+    self.assertEqual(to_delete, ["rel/2", "rel/3"])
+
+  def test_diff_relationships_of_tagged_assets(self):
+    desired = {
+        ("asset1", TERM, "New", TERM, DESCRIBED),
+        ("asset2", TERM, "Existing", TERM, DESCRIBED),
+    }
+    existing = {
+        ("asset1", TERM, "Existing", TERM, DESCRIBED): ["asset1/rel/1"],
+    }
+
+    to_create, to_delete = glossary_diff.diff_relationships(
+        desired, existing, {TERM}
+    )
+
+    self.assertEqual(to_create, desired)
+    self.assertEqual(to_delete, ["asset1/rel/1"])
+
+
+if __name__ == "__main__":
+  unittest.main()
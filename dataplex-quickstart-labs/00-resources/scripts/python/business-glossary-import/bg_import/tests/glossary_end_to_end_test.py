@@ -0,0 +1,403 @@
+import collections
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import async_glossary
+import category as bg_category
+import entry_type as entry_type_lib
+import glossary as dc_glossary
+import glossary_identification
+import http_session
+import import_journal
+import import_spool
+import rate_limiter
+import relation_type
+import snapshot_cache
+import term as bg_term
+import utils
+from tests.test_utils import fake_datacatalog
+
+_ASSET = "projects/123/locations/us/entryGroups/assets/entries/table"
+
+
+class GlossaryEndToEndTest(unittest.TestCase):
+  """Imports through the real Glossary into a local fake Data Catalog."""
+
+  def setUp(self):
+    super().setUp()
+    # Seed whose first draws inject both a throttled and a failed call
+    self.fake = self.enterContext(fake_datacatalog.FakeDataCatalog(seed=91))
+    self.fake.add_glossary("123", "us", "group", "glossary")
+    self.fake.add_entry(_ASSET, "bigquery_table", "table")
+    self.enterContext(
+        mock.patch.object(utils, "DATACATALOG_BASE_URL", self.fake.base_url)
+    )
+    rate_limiter.configure(max_rate=10000)
+    self.addCleanup(rate_limiter.configure)
+    self.addCleanup(http_session.configure)
+    self.glossary_id = glossary_identification.GlossaryId(
+        "123", "us", "group", "glossary"
+    )
+
+  def _entries(self):
+    categories = {
+        1: bg_category.Category("Category 1", "Desc"),
+        2: bg_category.Category(
+            "Category 2", "Desc", belongs_to_category="Category 1"
+        ),
+    }
+    terms = {
+        1: bg_term.Term(
+            "Term 1",
+            "Desc",
+            tagged_assets=[f"{_ASSET}:column"],
+            synonyms=["Term 2"],
+            related_terms=["Term 3"],
+            belongs_to_category="Category 2",
+        ),
+        2: bg_term.Term("Term 2", "Desc"),
+        3: bg_term.Term("Term 3", "Desc"),
+    }
+    return terms, categories
+
+  def _relationship_types(self):
+    return collections.Counter(
+        relationship["relationshipType"]
+        for relationship in self.fake.relationships()
+    )
+
+  def test_import_creates_entries_and_relationships(self):
+    terms, categories = self._entries()
+    with dc_glossary.Glossary(self.glossary_id) as glossary:
+      _, _, import_errors = glossary.import_glossary(terms, categories)
+
+    self.assertEqual(import_errors, [])
+    self.assertCountEqual(
+        [entry["displayName"] for entry in self.fake.entries("glossary_term")],
+        ["Term 1", "Term 2", "Term 3"],
+    )
+    self.assertEqual(len(self.fake.entries("glossary_category")), 2)
+    self.assertEqual(
+        self._relationship_types(),
+        {
+            "belongs_to": 2,
+            "is_described_by": 1,
+            "is_synonymous_to": 1,
+            "is_related_to": 1,
+        },
+    )
+    described_by = [
+        relationship
+        for relationship in self.fake.relationships()
+        if relationship["relationshipType"] == "is_described_by"
+    ]
+    self.assertEqual(described_by[0]["sourceEntryName"], _ASSET)
+    self.assertEqual(described_by[0]["sourceColumn"], "column")
+
+  def test_async_import_creates_entries_and_relationships(self):
+    terms, categories = self._entries()
+    with async_glossary.AsyncGlossary(self.glossary_id) as glossary:
+      _, _, import_errors = glossary.import_glossary(terms, categories)
+
+    self.assertEqual(import_errors, [])
+    self.assertEqual(len(self.fake.entries("glossary_term")), 3)
+    self.assertEqual(sum(self._relationship_types().values()), 5)
+
+  def test_streaming_import_creates_entries_and_relationships(self):
+    terms, categories = self._entries()
+    with import_spool.ImportSpool() as spool:
+      spool.add_terms(terms.items())
+      with dc_glossary.Glossary(self.glossary_id) as glossary:
+        self.assertEqual(
+            glossary.validate_spooled_relationships(spool, categories), []
+        )
+        imported_entries, imported_relations, import_errors = (
+            glossary.import_glossary_streaming(spool, categories, 1)
+        )
+        # Created terms aren't kept in memory
+        self.assertEqual(len(glossary._term_cache), 0)
+
+    self.assertEqual(import_errors, [])
+    self.assertEqual(
+        imported_entries,
+        {
+            entry_type_lib.EntryType.TERM: 3,
+            entry_type_lib.EntryType.CATEGORY: 2,
+        },
+    )
+    self.assertEqual(
+        imported_relations,
+        {
+            entry_type_lib.EntryType.TERM: 4,
+            entry_type_lib.EntryType.CATEGORY: 1,
+        },
+    )
+    self.assertCountEqual(
+        [entry["displayName"] for entry in self.fake.entries("glossary_term")],
+        ["Term 1", "Term 2", "Term 3"],
+    )
+    self.assertEqual(
+        self._relationship_types(),
+        {
+            "belongs_to": 2,
+            "is_described_by": 1,
+            "is_synonymous_to": 1,
+            "is_related_to": 1,
+        },
+    )
+
+  def test_resumed_streaming_import_does_not_journal_restored_entries(self):
+    path = os.path.join(
+        self.enterContext(tempfile.TemporaryDirectory()), "import.journal"
+    )
+    terms, categories = self._entries()
+    with import_spool.ImportSpool() as spool:
+      spool.add_terms(terms.items())
+      journal = import_journal.ImportJournal(path)
+      glossary = dc_glossary.Glossary(self.glossary_id, journal=journal)
+      with journal, glossary:
+        glossary.import_glossary_streaming(spool, categories, 1)
+    with open(path, encoding="utf-8") as journal_file:
+      records = journal_file.read()
+    posts = self.fake.request_counts["POST"]
+
+    terms, categories = self._entries()
+    with import_spool.ImportSpool() as spool:
+      spool.add_terms(terms.items())
+      journal = import_journal.ImportJournal(path, resume=True)
+      record_entry = self.enterContext(
+          mock.patch.object(
+              journal, "record_entry", wraps=journal.record_entry
+          )
+      )
+      glossary = dc_glossary.Glossary(self.glossary_id, journal=journal)
+      with journal, glossary:
+        _, _, import_errors = glossary.import_glossary_streaming(
+            spool, categories, 1
+        )
+
+    self.assertEqual(import_errors, [])
+    record_entry.assert_not_called()
+    self.assertEqual(self.fake.request_counts["POST"], posts)
+    with open(path, encoding="utf-8") as journal_file:
+      self.assertEqual(journal_file.read(), records)
+
+  def test_streaming_validation_reports_missing_terms(self):
+    terms, categories = self._entries()
+    terms[3].related_terms = ["Term 4"]
+    with import_spool.ImportSpool() as spool:
+      spool.add_terms(terms.items())
+      with dc_glossary.Glossary(self.glossary_id) as glossary:
+        errors = glossary.validate_spooled_relationships(spool, categories, 1)
+
+    self.assertEqual(len(errors), 1)
+    self.assertEqual(errors[0].line, 3)
+    self.assertEqual(errors[0].resources, ["Term 3", "Term 4"])
+
+  def test_streaming_validation_ignores_categories_being_cleared(self):
+    entries = "projects/123/locations/us/entryGroups/group/entries"
+    self.fake.add_entry(
+        f"{entries}/category",
+        "glossary_category",
+        "Category 2",
+        parent=f"{entries}/glossary",
+    )
+    terms, _ = self._entries()
+    with import_spool.ImportSpool() as spool:
+      spool.add_terms(terms.items())
+      with dc_glossary.Glossary(self.glossary_id) as glossary:
+        kept_errors = glossary.validate_spooled_relationships(spool, None)
+        cleared_errors = glossary.validate_spooled_relationships(
+            spool, None, keep_existing=False
+        )
+
+    self.assertEqual(kept_errors, [])
+    self.assertEqual(
+        [err.resources for err in cleared_errors], [["Term 1", "Category 2"]]
+    )
+
+  def test_entries_are_loaded_across_pages(self):
+    entries = "projects/123/locations/us/entryGroups/group/entries"
+    for i in range(5):
+      self.fake.add_entry(
+          f"{entries}/term_{i}",
+          "glossary_term",
+          f"Term {i}",
+          parent=f"{entries}/glossary",
+      )
+
+    with mock.patch.object(utils, "PAGE_SIZE", 2):
+      with dc_glossary.Glossary(self.glossary_id) as glossary:
+        self.assertEqual(len(glossary._term_cache), 5)
+    # Glossary entry, then the glossary and its terms on pages of two entries
+    self.assertEqual(self.fake.request_counts["GET"], 1 + 3)
+
+  def test_snapshot_reload_only_fetches_modified_entries(self):
+    entries = "projects/123/locations/us/entryGroups/group/entries"
+    for i in range(200):
+      self.fake.add_entry(
+          f"{entries}/term_{i}",
+          "glossary_term",
+          f"Term {i}",
+          parent=f"{entries}/glossary",
+      )
+    path = os.path.join(
+        self.enterContext(tempfile.TemporaryDirectory()), "snapshot.db"
+    )
+
+    def load():
+      self.fake.request_counts.clear()
+      with snapshot_cache.SnapshotCache(path) as snapshot:
+        with dc_glossary.Glossary(self.glossary_id, snapshot=snapshot) as g:
+          return g
+
+    load()
+    glossary = load()
+    # Glossary entry, then a single page of entries in the BASIC view
+    self.assertEqual(self.fake.request_counts["GET"], 2)
+    self.assertEqual(len(glossary._term_cache), 200)
+
+    modified = self.fake.entries("glossary_term")[7]
+    modified["coreAspects"]["business_context"]["jsonContent"] = {
+        "description": "New"
+    }
+    modified["modifyTime"] = "2100-01-01T00:00:00.000000Z"
+    glossary = load()
+    self.assertEqual(self.fake.request_counts["GET"], 3)
+    self.assertEqual(glossary._term_cache["Term 7"].description, "New")
+
+  def test_throttled_and_failed_calls_are_retried(self):
+    self.fake.throttle_rate = 0.15
+    self.fake.error_rate = 0.15
+    # Creates are only retried on throttling, see the tests below
+    self.fake.error_methods = frozenset({"GET", "PATCH", "DELETE"})
+    terms, categories = self._entries()
+    with mock.patch.object(rate_limiter, "INITIAL_BACKOFF_SECONDS", 0.0):
+      with dc_glossary.Glossary(self.glossary_id, max_workers=4) as glossary:
+        _, _, import_errors = glossary.import_glossary(terms, categories)
+
+    self.assertEqual(import_errors, [])
+    self.assertGreater(self.fake.fault_counts[429], 0)
+    self.assertGreater(self.fake.fault_counts[500], 0)
+    self.assertEqual(len(self.fake.entries("glossary_term")), 3)
+    self.assertEqual(sum(self._relationship_types().values()), 5)
+
+  def test_failed_create_is_not_retried(self):
+    with mock.patch.object(rate_limiter, "INITIAL_BACKOFF_SECONDS", 0.0):
+      with dc_glossary.Glossary(self.glossary_id) as glossary:
+        self.fake.error_rate = 1.0
+        self.fake.request_counts.clear()
+        _, _, import_errors = glossary.import_glossary(
+            {1: bg_term.Term("Term 1", "Desc")}, {}
+        )
+
+    self.assertEqual(len(import_errors), 1)
+    self.assertEqual(self.fake.request_counts["POST"], 1)
+
+  def test_failed_create_with_deterministic_ids_is_retried(self):
+    self.fake.error_rate = 0.5
+    self.fake.error_methods = frozenset({"POST"})
+    with mock.patch.object(rate_limiter, "INITIAL_BACKOFF_SECONDS", 0.0):
+      with dc_glossary.Glossary(
+          self.glossary_id, deterministic_ids=True
+      ) as glossary:
+        self.fake.request_counts.clear()
+        _, _, import_errors = glossary.import_glossary(
+            {i: bg_term.Term(f"Term {i}", "Desc") for i in range(4)}, {}
+        )
+
+    self.assertEqual(import_errors, [])
+    self.assertEqual(len(self.fake.entries("glossary_term")), 4)
+    self.assertGreater(self.fake.request_counts["POST"], 4)
+
+  def test_diff_import_deletes_removed_relationships(self):
+    terms, categories = self._entries()
+    with dc_glossary.Glossary(self.glossary_id) as glossary:
+      glossary.import_glossary(terms, categories)
+
+    terms, categories = self._entries()
+    terms[1].related_terms = []
+    with dc_glossary.Glossary(self.glossary_id) as glossary:
+      _, _, import_errors = glossary.import_glossary_diff(terms, categories)
+
+    self.assertEqual(import_errors, [])
+    self.assertNotIn("is_related_to", self._relationship_types())
+    self.assertEqual(self._relationship_types()["is_synonymous_to"], 1)
+
+  def test_diff_import_syncs_tagged_assets_of_existing_terms(self):
+    terms, categories = self._entries()
+    with dc_glossary.Glossary(self.glossary_id) as glossary:
+      glossary.import_glossary(terms, categories)
+
+    terms, categories = self._entries()
+    terms[1].tagged_assets = []
+    terms[2].tagged_assets = [f"{_ASSET}:other"]
+    with dc_glossary.Glossary(self.glossary_id) as glossary:
+      _, _, import_errors = glossary.import_glossary_diff(terms, categories)
+
+    self.assertEqual(import_errors, [])
+    links = [
+        relationship
+        for relationship in self.fake.relationships()
+        if relationship["relationshipType"] == "is_described_by"
+    ]
+    self.assertEqual(len(links), 1)
+    self.assertEqual(links[0]["sourceColumn"], "other")
+    term_2 = next(
+        entry["name"]
+        for entry in self.fake.entries("glossary_term")
+        if entry["displayName"] == "Term 2"
+    )
+    self.assertEqual(links[0]["destinationEntryName"], term_2)
+
+  def _mixed_case_entries(self):
+    terms, categories = self._entries()
+    terms[1].synonyms = ["term  2"]
+    terms[1].related_terms = ["TERM 3"]
+    terms[1].belongs_to_category = "category 2"
+    terms[2].synonyms = ["term 1"]
+    return terms, categories
+
+  def test_mixed_case_references_wait_for_their_terms(self):
+    self.fake.latency_seconds = 0.05
+    terms, categories = self._mixed_case_entries()
+    with dc_glossary.Glossary(self.glossary_id, max_workers=4) as glossary:
+      _, imported_relations, import_errors = glossary.import_glossary(
+          terms, categories
+      )
+
+    self.assertEqual(import_errors, [])
+    self.assertEqual(
+        self._relationship_types(),
+        {
+            "belongs_to": 2,
+            "is_described_by": 1,
+            "is_synonymous_to": 1,
+            "is_related_to": 1,
+        },
+    )
+    self.assertIn(
+        ("Term 1", "Term 2", relation_type.RelationshipType.SYNONYMOUS),
+        imported_relations[entry_type_lib.EntryType.TERM],
+    )
+
+  def test_diff_import_keeps_mixed_case_relationships(self):
+    terms, categories = self._mixed_case_entries()
+    with dc_glossary.Glossary(self.glossary_id) as glossary:
+      glossary.import_glossary(terms, categories)
+    self.fake.request_counts.clear()
+
+    terms, categories = self._mixed_case_entries()
+    with dc_glossary.Glossary(self.glossary_id) as glossary:
+      _, _, import_errors = glossary.import_glossary_diff(terms, categories)
+
+    self.assertEqual(import_errors, [])
+    self.assertEqual(self.fake.request_counts["POST"], 0)
+    self.assertEqual(self.fake.request_counts["DELETE"], 0)
+    self.assertEqual(sum(self._relationship_types().values()), 5)
+
+
+if __name__ == "__main__":
+  unittest.main()
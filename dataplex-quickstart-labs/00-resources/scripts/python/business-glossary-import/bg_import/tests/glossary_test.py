@@ -1,12 +1,20 @@
+import os
+import tempfile
+import threading
 import unittest
 from unittest import mock
 
 import category as bg_category
+import entry_id_generator
 import entry_type as EntryType
 import error
 import glossary as dc_glossary
 import glossary_identification
+import import_journal
+import import_metrics
+import import_mode
 import relation_type
+import snapshot_cache
 import term as bg_term
 import user_report
 import utils
@@ -19,11 +27,11 @@ class GlossaryTest(unittest.TestCase):
     super().setUp()
     self.enterContext(
         mock.patch(
-            "api_call_utils.requests.get",
+            "requests.Session.get",
             side_effect=mocks.mocked_get_api_response,
         )
     )
-    self.post_mock = self.enterContext(mock.patch("requests.post"))
+    self.post_mock = self.enterContext(mock.patch("requests.Session.post"))
 
   def test_glossary_uid_returned(self):
     glossary_id = glossary_identification.GlossaryId(
@@ -69,11 +77,13 @@ class GlossaryTest(unittest.TestCase):
         expected_categories_import_errors,
     )
     expected_imported_terms = []
-    expected_imported_relations_term_to_term = set()
+    expected_imported_relations_term_to_term = []
+    expected_imported_relations_category_to_category = []
     expected_terms_import_errors = []
     expected_import_glossary_terms_ret = (
         expected_imported_terms,
         expected_imported_relations_term_to_term,
+        expected_imported_relations_category_to_category,
         expected_terms_import_errors,
     )
     mock_import_glossary_categories = self.enterContext(
@@ -109,10 +119,7 @@ class GlossaryTest(unittest.TestCase):
     )
     mock_end_program_execution.assert_called_once()
 
-  def test_glossary_clear_terms_and_categories(self):
-    mock_paralellize = self.enterContext(
-        mock.patch.object(dc_glossary.Glossary, "_parallelize", return_valu=[])
-    )
+  def _clear_glossary_fixture(self):
     glossary_id = glossary_identification.GlossaryId(
         "123",
         "us",
@@ -120,37 +127,137 @@ class GlossaryTest(unittest.TestCase):
         "glossary_not_empty",
     )
     glossary = dc_glossary.Glossary(glossary_id)
-    category1 = bg_category.Category(
-        "Category1", "Desc Category1", force_category_id="Category1_xyz"
-    )
-    category2 = bg_category.Category(
-        "Category2", "Desc Category2", force_category_id="Category2_xyz"
-    )
-    term1 = bg_term.Term("Term 1", "Desc Term1", force_term_id="Term1_xyz")
-    term2 = bg_term.Term("Term 1", "Desc Term1", force_term_id="Term2_xyz")
+    self.addCleanup(glossary.close)
     glossary._category_cache = {
-        "Category1": category1,
-        "Category2": category2,
+        "Category1": bg_category.Category(
+            "Category1", "Desc Category1", force_category_id="Category1_xyz"
+        ),
+        "Category2": bg_category.Category(
+            "Category2", "Desc Category2", force_category_id="Category2_xyz"
+        ),
     }
     glossary._term_cache = {
-        "Term1": term1,
-        "Term2": term2,
+        "Term1": bg_term.Term("Term1", "Desc Term1", force_term_id="Term1_xyz"),
+        "Term2": bg_term.Term("Term2", "Desc Term2", force_term_id="Term2_xyz"),
+    }
+    relationships = {
+        "Category2_xyz": [{
+            "name": "Category2_xyz/relationships/1",
+            "relationshipType": "belongs_to",
+            "destinationEntryName": "entries/Category1_xyz",
+        }],
     }
-    expected_tasks = [
-        ("Term1_xyz",),
-        ("Term2_xyz",),
-        ("Category1_xyz",),
-        ("Category2_xyz",),
-    ]
+    self.enterContext(
+        mock.patch.object(
+            dc_glossary.Glossary,
+            "_list_relationships",
+            side_effect=lambda entry_id: {
+                "json": {"relationships": relationships.get(entry_id, [])},
+                "error_msg": None,
+            },
+        )
+    )
+    return glossary
 
-    glossary.clear_glossary()
+  def test_glossary_clear_terms_and_categories(self):
+    glossary = self._clear_glossary_fixture()
+    deleted = []
+    lock = threading.Lock()
 
-    mock_paralellize.assert_called_once_with(
-        glossary._remove_glossary_entry, expected_tasks
+    def remove_entry(entry_id):
+      with lock:
+        deleted.append(entry_id)
+      return {"json": {}, "error_msg": None}
+
+    self.enterContext(
+        mock.patch.object(
+            dc_glossary.Glossary,
+            "_remove_glossary_entry",
+            side_effect=remove_entry,
+        )
     )
 
+    self.assertTrue(glossary.clear_glossary())
+
+    # Terms go first, then categories from the leaves of the hierarchy up
+    self.assertCountEqual(deleted[:2], ["Term1_xyz", "Term2_xyz"])
+    self.assertEqual(deleted[2:], ["Category2_xyz", "Category1_xyz"])
+    self.assertEqual(glossary._term_cache, {})
+    self.assertEqual(glossary._category_cache, {})
+
+  def test_glossary_clear_keeps_entries_that_failed_and_can_be_retried(self):
+    glossary = self._clear_glossary_fixture()
+    remove_mock = self.enterContext(
+        mock.patch.object(
+            dc_glossary.Glossary,
+            "_remove_glossary_entry",
+            side_effect=lambda entry_id: {
+                "json": None if entry_id == "Term2_xyz" else {},
+                "error_msg": "Some error" if entry_id == "Term2_xyz" else None,
+            },
+        )
+    )
+
+    self.assertFalse(glossary.clear_glossary())
+    self.assertEqual(list(glossary._term_cache), ["Term2"])
+    # Categories would not be empty, so their deletes are skipped
+    self.assertCountEqual(
+        [call.args[0] for call in remove_mock.call_args_list],
+        ["Term1_xyz", "Term2_xyz"],
+    )
+    self.assertCountEqual(glossary._category_cache, ["Category1", "Category2"])
+
+    # Running the clear again only deletes what is left
+    remove_mock.reset_mock(side_effect=True)
+    remove_mock.return_value = {"json": {}, "error_msg": None}
+    self.assertTrue(glossary.clear_glossary())
+    self.assertEqual(
+        [call.args[0] for call in remove_mock.call_args_list],
+        ["Term2_xyz", "Category2_xyz", "Category1_xyz"],
+    )
+    self.assertEqual(glossary._term_cache, {})
+    self.assertEqual(glossary._category_cache, {})
+
+  def test_glossary_clear_skips_parent_of_category_that_failed(self):
+    glossary = self._clear_glossary_fixture()
+    remove_mock = self.enterContext(
+        mock.patch.object(
+            dc_glossary.Glossary,
+            "_remove_glossary_entry",
+            side_effect=lambda entry_id: {
+                "json": None if entry_id == "Category2_xyz" else {},
+                "error_msg": (
+                    "Some error" if entry_id == "Category2_xyz" else None
+                ),
+            },
+        )
+    )
+
+    self.assertFalse(glossary.clear_glossary())
+    self.assertCountEqual(
+        [call.args[0] for call in remove_mock.call_args_list],
+        ["Term1_xyz", "Term2_xyz", "Category2_xyz"],
+    )
+    self.assertCountEqual(glossary._category_cache, ["Category1", "Category2"])
+
+  def test_glossary_clear_fails_when_relationships_cannot_be_listed(self):
+    glossary = self._clear_glossary_fixture()
+    self.enterContext(
+        mock.patch.object(
+            dc_glossary.Glossary,
+            "_list_relationships",
+            return_value={"json": None, "error_msg": "Some error"},
+        )
+    )
+    remove_mock = self.enterContext(
+        mock.patch.object(dc_glossary.Glossary, "_remove_glossary_entry")
+    )
+
+    self.assertFalse(glossary.clear_glossary())
+    remove_mock.assert_not_called()
+
   def test_glossary_remove_entry(self):
-    delete_mock = self.enterContext(mock.patch("requests.delete"))
+    delete_mock = self.enterContext(mock.patch("requests.Session.delete"))
     glossary_id = glossary_identification.GlossaryId(
         "123",
         "us",
@@ -180,6 +287,40 @@ class GlossaryTest(unittest.TestCase):
         json=None,
     )
 
+  def test_glossary_parallelize_keeps_order_of_results(self):
+    glossary_id = glossary_identification.GlossaryId(
+        "123", "us", "test_entry_group_with_no_terms", "empty_glossary_exists"
+    )
+    with dc_glossary.Glossary(glossary_id, max_workers=4) as glossary:
+      ret = glossary._parallelize(lambda a, b: a * b, [(i, 2) for i in range(50)])
+    self.assertEqual(ret, [i * 2 for i in range(50)])
+
+  def test_glossary_parallelize_runs_tasks_concurrently(self):
+    glossary_id = glossary_identification.GlossaryId(
+        "123", "us", "test_entry_group_with_no_terms", "empty_glossary_exists"
+    )
+    # All tasks block until max_workers of them are running at the same time
+    barrier = threading.Barrier(3, timeout=5)
+    with dc_glossary.Glossary(glossary_id, max_workers=3) as glossary:
+      ret = glossary._parallelize(barrier.wait, [()] * 3)
+    self.assertCountEqual(ret, [0, 1, 2])
+
+  def test_glossary_parallelize_after_close_raises(self):
+    glossary_id = glossary_identification.GlossaryId(
+        "123", "us", "test_entry_group_with_no_terms", "empty_glossary_exists"
+    )
+    glossary = dc_glossary.Glossary(glossary_id)
+    glossary.close()
+    with self.assertRaises(RuntimeError):
+      glossary._parallelize(print, [("a",)])
+
+  def test_glossary_invalid_max_workers(self):
+    glossary_id = glossary_identification.GlossaryId(
+        "123", "us", "test_entry_group_with_no_terms", "empty_glossary_exists"
+    )
+    with self.assertRaises(ValueError):
+      dc_glossary.Glossary(glossary_id, max_workers=0)
+
   def test_glossary_is_not_empty(self):
     glossary_id = glossary_identification.GlossaryId(
         "123",
@@ -212,6 +353,251 @@ class GlossaryTest(unittest.TestCase):
     is_empty = glossary.is_glossary_empty()
     self.assertTrue(is_empty)
 
+  def _entry_page(self, entry_type, names, next_page_token=None):
+    page = {
+        "entries": [
+            {
+                "name": f"entries/{name}_id",
+                "displayName": name,
+                "entryType": entry_type,
+                "coreAspects": {
+                    "business_context": {"jsonContent": {"description": name}}
+                },
+            }
+            for name in names
+        ]
+    }
+    if next_page_token:
+      page["nextPageToken"] = next_page_token
+    return {"json": page, "error_msg": None}
+
+  def test_glossary_populate_caches_prefetches_next_page(self):
+    glossary_id = glossary_identification.GlossaryId(
+        "123", "us", "test_entry_group_with_no_terms", "empty_glossary_exists"
+    )
+    second_page_requested = threading.Event()
+    requested_urls = []
+    pages = {
+        None: self._entry_page("glossary_term", ["Term1"], "token2"),
+        "token2": self._entry_page("glossary_category", ["Category1"], "t3"),
+        "t3": self._entry_page("glossary_term", ["Term2"]),
+    }
+
+    def fetch(unused_method, url, unused_project_id, unused_body=None):
+      if "/entries?" not in url:
+        return {"json": {"entryUid": "uid"}, "error_msg": None}
+      requested_urls.append(url)
+      page_token = url.split("pageToken=")[1] if "pageToken" in url else None
+      if page_token == "token2":
+        second_page_requested.set()
+      return pages[page_token]
+
+    def parse_term(entry):
+      # The second page is requested while the first one is being parsed
+      if entry["displayName"] == "Term1":
+        self.assertTrue(second_page_requested.wait(timeout=5))
+      return from_dict(entry)
+
+    from_dict = bg_term.Term.from_dict
+    self.enterContext(
+        mock.patch.object(
+            dc_glossary.api_call_utils, "fetch_api_response", side_effect=fetch
+        )
+    )
+    self.enterContext(
+        mock.patch.object(bg_term.Term, "from_dict", side_effect=parse_term)
+    )
+
+    with dc_glossary.Glossary(glossary_id) as glossary:
+      self.assertCountEqual(glossary._term_cache, ["Term1", "Term2"])
+      self.assertEqual(list(glossary._category_cache), ["Category1"])
+    self.assertEqual(len(requested_urls), 3)
+    self.assertIn(f"pageSize={utils.PAGE_SIZE}", requested_urls[0])
+    self.assertTrue(requested_urls[2].endswith("&pageToken=t3"))
+
+  def test_glossary_populate_caches_stops_at_failed_page(self):
+    glossary_id = glossary_identification.GlossaryId(
+        "123", "us", "test_entry_group_with_no_terms", "empty_glossary_exists"
+    )
+
+    def fetch(unused_method, url, unused_project_id, unused_body=None):
+      if "/entries?" not in url:
+        return {"json": {"entryUid": "uid"}, "error_msg": None}
+      if "pageToken" in url:
+        return {"json": None, "error_msg": "Some error"}
+      return self._entry_page("glossary_term", ["Term1"], "token2")
+
+    self.enterContext(
+        mock.patch.object(
+            dc_glossary.api_call_utils, "fetch_api_response", side_effect=fetch
+        )
+    )
+
+    with dc_glossary.Glossary(glossary_id) as glossary:
+      self.assertEqual(list(glossary._term_cache), ["Term1"])
+
+  def test_import_glossary_diff_stops_if_caches_are_incomplete(self):
+    glossary_id = glossary_identification.GlossaryId(
+        "123", "us", "test_entry_group_with_no_terms", "empty_glossary_exists"
+    )
+
+    def fetch(unused_method, url, unused_project_id, unused_body=None):
+      if "/entries?" not in url:
+        return {"json": {"entryUid": "uid"}, "error_msg": None}
+      return {"json": None, "error_msg": "Some error"}
+
+    self.enterContext(
+        mock.patch.object(
+            dc_glossary.api_call_utils, "fetch_api_response", side_effect=fetch
+        )
+    )
+    self.enterContext(
+        mock.patch.object(
+            utils, "end_program_execution", side_effect=SystemExit(1)
+        )
+    )
+    create_entry_mock = self.enterContext(
+        mock.patch.object(dc_glossary.Glossary, "_create_glossary_entry")
+    )
+
+    with dc_glossary.Glossary(glossary_id) as glossary:
+      with self.assertRaises(SystemExit):
+        glossary.import_glossary_diff({1: bg_term.Term("Term1", "Desc")}, None)
+    create_entry_mock.assert_not_called()
+
+  def _snapshot_entry(self, name, modify_time, aspect_modify_time):
+    entry = self._entry_page("glossary_term", [name])["json"]["entries"][0]
+    entry["modifyTime"] = modify_time
+    entry["coreAspects"]["business_context"]["modifyTime"] = aspect_modify_time
+    return entry
+
+  def _listed_entry(self, name, modify_time, aspect_modify_time):
+    return {
+        "name": f"entries/{name}_id",
+        "modifyTime": modify_time,
+        "coreAspects": {
+            "business_context": {"modifyTime": aspect_modify_time}
+        },
+    }
+
+  def _load_from_snapshot(self, listed_entries, modified_entries):
+    """Loads the glossary with a snapshot of Term1, Term2 and Term3.
+
+    Args:
+      listed_entries: Entries returned by the listing, or None if listing in
+        the BASIC view fails. Term1 and Term2 are then listed in the FULL view.
+      modified_entries: Entries returned when fetched, by resource name.
+
+    Returns:
+      The glossary, the requested URLs and the saved snapshot.
+    """
+    glossary_id = glossary_identification.GlossaryId(
+        "123", "us", "test_entry_group_with_no_terms", "empty_glossary_exists"
+    )
+    key = "123/us/test_entry_group_with_no_terms/empty_glossary_exists"
+    temp_dir = self.enterContext(tempfile.TemporaryDirectory())
+    path = os.path.join(temp_dir, "snapshot.db")
+    with snapshot_cache.SnapshotCache(path) as snapshot:
+      snapshot.save(
+          key,
+          [
+              self._snapshot_entry(name, "t1", "a1")
+              for name in ("Term1", "Term2", "Term3")
+          ],
+      )
+    requested_urls = []
+
+    def fetch(unused_method, url, unused_project_id, unused_body=None):
+      requested_urls.append(url)
+      if "/entries?" in url and listed_entries is None:
+        if "view=BASIC" in url:
+          return {"json": {}, "error_msg": "Listing failed."}
+        return self._entry_page("glossary_term", ["Term1", "Term2"])
+      if "/entries?" in url:
+        return {"json": {"entries": listed_entries}, "error_msg": None}
+      for name, entry in modified_entries.items():
+        if url.endswith(f"/{name}?view=FULL"):
+          return {"json": entry, "error_msg": None}
+      return {"json": {"entryUid": "uid"}, "error_msg": None}
+
+    self.enterContext(
+        mock.patch.object(
+            dc_glossary.api_call_utils, "fetch_api_response", side_effect=fetch
+        )
+    )
+
+    with snapshot_cache.SnapshotCache(path) as snapshot:
+      glossary = dc_glossary.Glossary(glossary_id, snapshot=snapshot)
+      glossary.close()
+      saved = snapshot.load(key)
+    return glossary, requested_urls, saved
+
+  def test_glossary_populate_caches_from_snapshot(self):
+    # Term2 was modified and Term3 deleted since the snapshot was saved
+    modified_term2 = dict(
+        self._snapshot_entry("Term2", "t2", "a1"),
+        coreAspects={
+            "business_context": {
+                "jsonContent": {"description": "New"},
+                "modifyTime": "a1",
+            }
+        },
+    )
+
+    glossary, requested_urls, saved = self._load_from_snapshot(
+        [
+            self._listed_entry("Term1", "t1", "a1"),
+            self._listed_entry("Term2", "t2", "a1"),
+        ],
+        {"Term2_id": modified_term2},
+    )
+
+    self.assertCountEqual(glossary._term_cache, ["Term1", "Term2"])
+    self.assertEqual(glossary._term_cache["Term1"].description, "Term1")
+    self.assertEqual(glossary._term_cache["Term2"].description, "New")
+    self.assertIn("view=BASIC", requested_urls[1])
+    self.assertEqual(len(requested_urls), 3)
+    self.assertEqual(saved["entries/Term2_id"]["modifyTime"], "t2")
+    self.assertNotIn("entries/Term3_id", saved)
+
+  def test_glossary_snapshot_listing_error_fetches_all_entries(self):
+    glossary, requested_urls, _ = self._load_from_snapshot(None, {})
+
+    self.assertCountEqual(glossary._term_cache, ["Term1", "Term2"])
+    self.assertIn("view=BASIC", requested_urls[1])
+    self.assertIn("view=FULL", requested_urls[2])
+
+  def test_glossary_snapshot_entry_with_modified_aspect_is_fetched(self):
+    # Only the business context of Term1 was updated since the snapshot
+    modified_term1 = self._snapshot_entry("Term1", "t1", "a2")
+    modified_term1["coreAspects"]["business_context"]["jsonContent"] = {
+        "description": "New"
+    }
+
+    glossary, requested_urls, saved = self._load_from_snapshot(
+        [
+            self._listed_entry("Term1", "t1", "a2"),
+            self._listed_entry("Term2", "t1", "a1"),
+            # Listed without aspects, so only its version is compared
+            {"name": "entries/Term3_id", "modifyTime": "t1"},
+        ],
+        {"Term1_id": modified_term1},
+    )
+
+    self.assertEqual(glossary._term_cache["Term1"].description, "New")
+    self.assertEqual(glossary._term_cache["Term2"].description, "Term2")
+    self.assertEqual(glossary._term_cache["Term3"].description, "Term3")
+    self.assertEqual(
+        [url.split("/")[-1] for url in requested_urls[2:]],
+        ["Term1_id?view=FULL"],
+    )
+    self.assertEqual(
+        saved["entries/Term1_id"]["coreAspects"]["business_context"][
+            "modifyTime"
+        ],
+        "a2",
+    )
+
   def test_glossary_term_is_created(self):
     term = bg_term.Term("Term1", "Desc1")
     glossary_id = glossary_identification.GlossaryId(
@@ -619,6 +1005,98 @@ class GlossaryTest(unittest.TestCase):
     # We should not call post when is_described_by destination is not a term
     self.post_mock.assert_not_called()
 
+  def test_glossary_relation_matches_display_names_case_insensitively(self):
+    term = bg_term.Term("Net Revenue", "Desc", force_term_id="term_id")
+    category = bg_category.Category(
+        "Finance", "Desc", force_category_id="category_id"
+    )
+    glossary_id = glossary_identification.GlossaryId(
+        "123",
+        "us",
+        "test_entry_group_with_categories_and_terms",
+        "glossary_not_empty",
+    )
+    glossary = dc_glossary.Glossary(glossary_id)
+    glossary._term_cache = {term.display_name: term}
+    glossary._category_cache = {category.display_name: category}
+
+    err = glossary._create_relationship(
+        "net  REVENUE",
+        EntryType.EntryType.TERM,
+        "FINANCE",
+        EntryType.EntryType.CATEGORY,
+        relation_type.RelationshipType.BELONGS_TO,
+    )
+
+    self.assertIsNone(err)
+    endpoint = self.post_mock.call_args.args[0]
+    self.assertTrue(endpoint.endswith("/entries/term_id/relationships"))
+    self.assertTrue(
+        self.post_mock.call_args.kwargs["json"][
+            "destination_entry_name"
+        ].endswith("/entries/category_id")
+    )
+
+  def test_glossary_invalidate_relation_with_itself_differing_in_case(self):
+    term = bg_term.Term("Net Revenue", "Desc")
+    glossary_id = glossary_identification.GlossaryId(
+        "123",
+        "us",
+        "test_entry_group_with_categories_and_terms",
+        "glossary_not_empty",
+    )
+    glossary = dc_glossary.Glossary(glossary_id)
+    glossary._term_cache = {term.display_name: term}
+
+    err = glossary._create_relationship(
+        "Net Revenue",
+        EntryType.EntryType.TERM,
+        "net revenue",
+        EntryType.EntryType.TERM,
+        relation_type.RelationshipType.RELATED,
+    )
+
+    self.assertIsNotNone(err)
+    self.post_mock.assert_not_called()
+
+  def test_validate_relationships_uses_glossary_entries_of_unparsed_types(
+      self,
+  ):
+    glossary_id = glossary_identification.GlossaryId(
+        "123",
+        "us",
+        "test_entry_group_with_categories_and_terms",
+        "glossary_not_empty",
+    )
+    glossary = dc_glossary.Glossary(glossary_id)
+    category = bg_category.Category("Existing", "Desc")
+    glossary._category_cache = {category.display_name: category}
+    terms = {1: bg_term.Term("Term", "Desc", belongs_to_category="Existing")}
+
+    self.assertEqual(glossary.validate_relationships(terms, None), [])
+    errors = glossary.validate_relationships(terms, {})
+    self.assertEqual([err.resources for err in errors], [["Term", "Existing"]])
+    self.post_mock.assert_not_called()
+
+  def test_validate_relationships_ignores_glossary_entries_being_cleared(
+      self,
+  ):
+    glossary_id = glossary_identification.GlossaryId(
+        "123",
+        "us",
+        "test_entry_group_with_categories_and_terms",
+        "glossary_not_empty",
+    )
+    glossary = dc_glossary.Glossary(glossary_id)
+    category = bg_category.Category("Existing", "Desc")
+    glossary._category_cache = {category.display_name: category}
+    terms = {1: bg_term.Term("Term", "Desc", belongs_to_category="Existing")}
+
+    errors = glossary.validate_relationships(terms, None, keep_existing=False)
+
+    self.assertEqual([err.resources for err in errors], [["Term", "Existing"]])
+    self.post_mock.assert_not_called()
+
   def test_glossary_invalidate_relation_when_source_entry_is_not_in_cache(self):
     term1 = bg_term.Term(
         "Term 1",
@@ -917,7 +1395,7 @@ class GlossaryTest(unittest.TestCase):
   def test_glossary_unsuccessful_creation_returns_error(self):
     self.post_mock = self.enterContext(
         mock.patch(
-            "api_call_utils.requests.post",
+            "requests.Session.post",
             side_effect=mocks.mocked_post_failed_api_response,
         )
     )
@@ -928,7 +1406,8 @@ class GlossaryTest(unittest.TestCase):
     glossary = dc_glossary.Glossary(glossary_id)
     glossary._term_cache = {term.display_name: term}
     ret = glossary._create_glossary_entry(term)
-    self.assertIsNone(ret["json"])
+    # The body of the error response is returned with its message
+    self.assertEqual(ret["json"], {})
     self.assertIsNotNone(ret["error_msg"])
     self.post_mock.assert_called_with(
         (
@@ -1117,5 +1596,562 @@ class GlossaryTest(unittest.TestCase):
     self.assertEqual(source_column, "subcolumn:with:colons")
 
 
+  def test_import_glossary_streams_relationships(self):
+    glossary_id = glossary_identification.GlossaryId(
+        "123", "us", "test_entry_group_with_no_terms", "empty_glossary_exists"
+    )
+    term1 = bg_term.Term("Term1", "Desc1", synonyms=["Term2"])
+    term2 = bg_term.Term("Term2", "Desc2")
+    term3 = bg_term.Term("Term3", "Desc3")
+    synonym_created = threading.Event()
+
+    def create_entry(entry):
+      # Term3 is only created once the synonym relationship between Term1 and
+      # Term2 exists, which would never happen if all terms were created first.
+      if entry is term3:
+        self.assertTrue(synonym_created.wait(timeout=5))
+      return {"json": {}, "error_msg": None}
+
+    def create_relationship(*unused_args):
+      synonym_created.set()
+
+    self.enterContext(
+        mock.patch.object(
+            dc_glossary.Glossary,
+            "_create_glossary_entry",
+            side_effect=create_entry,
+        )
+    )
+    self.enterContext(
+        mock.patch.object(
+            dc_glossary.Glossary,
+            "_create_relationship",
+            side_effect=create_relationship,
+        )
+    )
+
+    with dc_glossary.Glossary(glossary_id, max_workers=3) as glossary:
+      imported_entries, imported_relations, import_errors = (
+          glossary.import_glossary({1: term1, 2: term2, 3: term3}, None)
+      )
+
+    self.assertCountEqual(
+        imported_entries[EntryType.EntryType.TERM], [term1, term2, term3]
+    )
+    self.assertEqual(
+        imported_relations[EntryType.EntryType.TERM],
+        [("Term1", "Term2", relation_type.RelationshipType.SYNONYMOUS)],
+    )
+    self.assertEqual(import_errors, [])
+
+  def test_import_glossary_relationships_wait_for_their_entries(self):
+    glossary_id = glossary_identification.GlossaryId(
+        "123", "us", "test_entry_group_with_no_terms", "empty_glossary_exists"
+    )
+    category1 = bg_category.Category("Category1", "Desc Category1")
+    category2 = bg_category.Category(
+        "Category2", "Desc Category2", belongs_to_category="Category1"
+    )
+    term1 = bg_term.Term(
+        "Term1",
+        "Desc1",
+        related_terms=["Term2"],
+        belongs_to_category="Category2",
+    )
+    term2 = bg_term.Term("Term2", "Desc2", related_terms=["Term1"])
+    calls = []
+    lock = threading.Lock()
+
+    def create_entry(entry):
+      with lock:
+        calls.append(("create", entry.display_name))
+      return {"json": {}, "error_msg": None}
+
+    def create_relationship(src, unused_src_type, dst, unused_dst_type, rel):
+      with lock:
+        calls.append((rel, src, dst))
+
+    self.enterContext(
+        mock.patch.object(
+            dc_glossary.Glossary,
+            "_create_glossary_entry",
+            side_effect=create_entry,
+        )
+    )
+    self.enterContext(
+        mock.patch.object(
+            dc_glossary.Glossary,
+            "_create_relationship",
+            side_effect=create_relationship,
+        )
+    )
+
+    with dc_glossary.Glossary(glossary_id, max_workers=4) as glossary:
+      _, imported_relations, import_errors = glossary.import_glossary(
+          {1: term1, 2: term2}, {1: category1, 2: category2}
+      )
+
+    self.assertEqual(import_errors, [])
+    related = (relation_type.RelationshipType.RELATED, "Term1", "Term2")
+    term_belongs_to = (
+        relation_type.RelationshipType.BELONGS_TO, "Term1", "Category2"
+    )
+    category_belongs_to = (
+        relation_type.RelationshipType.BELONGS_TO, "Category2", "Category1"
+    )
+    # The related relationship is listed by both terms but created once
+    self.assertEqual(calls.count(related), 1)
+    self.assertGreater(calls.index(related), calls.index(("create", "Term1")))
+    self.assertGreater(calls.index(related), calls.index(("create", "Term2")))
+    self.assertGreater(
+        calls.index(term_belongs_to), calls.index(("create", "Term1"))
+    )
+    # Category hierarchy is created after all term belongs_to relationships
+    self.assertEqual(calls[-1], category_belongs_to)
+    self.assertEqual(
+        imported_relations[EntryType.EntryType.CATEGORY],
+        [("Category2", "Category1", relation_type.RelationshipType.BELONGS_TO)],
+    )
+
+  def test_import_glossary_skips_relationships_of_failed_terms(self):
+    glossary_id = glossary_identification.GlossaryId(
+        "123", "us", "test_entry_group_with_no_terms", "empty_glossary_exists"
+    )
+    term1 = bg_term.Term("Term1", "Desc1", synonyms=["Term2"])
+    self.enterContext(
+        mock.patch.object(
+            dc_glossary.Glossary,
+            "_create_glossary_entry",
+            return_value={"json": None, "error_msg": "Some error"},
+        )
+    )
+    create_relationship_mock = self.enterContext(
+        mock.patch.object(dc_glossary.Glossary, "_create_relationship")
+    )
+
+    with dc_glossary.Glossary(glossary_id) as glossary:
+      _, imported_relations, import_errors = glossary.import_glossary(
+          {1: term1}, None
+      )
+
+    create_relationship_mock.assert_not_called()
+    self.assertEqual(imported_relations[EntryType.EntryType.TERM], [])
+    self.assertEqual(len(import_errors), 1)
+    self.assertEqual(import_errors[0].operation, "add_new_term")
+
+  def test_import_glossary_resume_skips_journaled_work(self):
+    glossary_id = glossary_identification.GlossaryId(
+        "123", "us", "test_entry_group_with_no_terms", "empty_glossary_exists"
+    )
+    temp_dir = self.enterContext(tempfile.TemporaryDirectory())
+    path = os.path.join(temp_dir, "import.journal")
+    with import_journal.ImportJournal(path) as journal:
+      journal.record_entry(EntryType.EntryType.TERM, 1, "Term1", "term1_id")
+      journal.record_relationship(
+          "Term1",
+          EntryType.EntryType.TERM,
+          "Term2",
+          EntryType.EntryType.TERM,
+          relation_type.RelationshipType.SYNONYMOUS,
+      )
+    term1 = bg_term.Term("Term1", "Desc1", synonyms=["Term2"])
+    term2 = bg_term.Term("Term2", "Desc2", related_terms=["Term3"])
+    term3 = bg_term.Term("Term3", "Desc3")
+    create_entry_mock = self.enterContext(
+        mock.patch.object(
+            dc_glossary.Glossary,
+            "_create_glossary_entry",
+            return_value={"json": {}, "error_msg": None},
+        )
+    )
+    create_relationship_mock = self.enterContext(
+        mock.patch.object(
+            dc_glossary.Glossary, "_create_relationship", return_value=None
+        )
+    )
+
+    journal = import_journal.ImportJournal(path, resume=True)
+    glossary = dc_glossary.Glossary(glossary_id, journal=journal)
+    with journal, glossary:
+      # Term3 was created right before the previous run was interrupted
+      glossary._term_cache["Term3"] = bg_term.Term(
+          "Term3", "Desc3", force_term_id="term3_id"
+      )
+      imported_entries, imported_relations, import_errors = (
+          glossary.import_glossary({1: term1, 2: term2, 3: term3}, None)
+      )
+
+    self.assertEqual(import_errors, [])
+    create_entry_mock.assert_called_once_with(term2)
+    create_relationship_mock.assert_called_once_with(
+        "Term2",
+        EntryType.EntryType.TERM,
+        "Term3",
+        EntryType.EntryType.TERM,
+        relation_type.RelationshipType.RELATED,
+    )
+    self.assertEqual(term1.term_id, "term1_id")
+    self.assertEqual(term3.term_id, "term3_id")
+    self.assertCountEqual(
+        imported_entries[EntryType.EntryType.TERM], [term1, term2, term3]
+    )
+    self.assertCountEqual(
+        imported_relations[EntryType.EntryType.TERM],
+        [
+            ("Term1", "Term2", relation_type.RelationshipType.SYNONYMOUS),
+            ("Term2", "Term3", relation_type.RelationshipType.RELATED),
+        ],
+    )
+    # The work of both runs is journaled
+    journal = import_journal.ImportJournal(path, resume=True)
+    self.assertEqual(
+        journal.entry_id(EntryType.EntryType.TERM, "Term2"), term2.term_id
+    )
+    self.assertEqual(
+        journal.entry_id(EntryType.EntryType.TERM, "Term3"), "term3_id"
+    )
+    self.assertTrue(
+        journal.has_relationship(
+            "Term2",
+            EntryType.EntryType.TERM,
+            "Term3",
+            EntryType.EntryType.TERM,
+            relation_type.RelationshipType.RELATED,
+        )
+    )
+
+  def test_import_glossary_with_deterministic_ids(self):
+    glossary_id = glossary_identification.GlossaryId(
+        "123", "us", "test_entry_group_with_no_terms", "empty_glossary_exists"
+    )
+    namespace = "123/us/test_entry_group_with_no_terms/empty_glossary_exists"
+    self.enterContext(
+        mock.patch.object(
+            dc_glossary.Glossary,
+            "_create_glossary_entry",
+            return_value={"json": {}, "error_msg": None},
+        )
+    )
+    ids = []
+    for _ in range(2):
+      term1 = bg_term.Term("Term1", "Desc1")
+      term2 = bg_term.Term("Term2", "Desc2")
+      with dc_glossary.Glossary(
+          glossary_id, deterministic_ids=True
+      ) as glossary:
+        # An existing entry of another name uses the first id of Term2
+        glossary._term_cache["Other"] = bg_term.Term(
+            "Other",
+            "Desc",
+            force_term_id=entry_id_generator.deterministic_id(
+                "Term2", f"{namespace}/{EntryType.EntryType.TERM.value}"
+            ),
+        )
+        glossary.import_glossary({1: term1, 2: term2}, None)
+      ids.append((term1.term_id, term2.term_id))
+
+    self.assertEqual(ids[0], ids[1])
+    self.assertEqual(
+        ids[0],
+        (
+            entry_id_generator.deterministic_id(
+                "Term1", f"{namespace}/{EntryType.EntryType.TERM.value}"
+            ),
+            entry_id_generator.deterministic_id(
+                "Term2", f"{namespace}/{EntryType.EntryType.TERM.value}", 1
+            ),
+        ),
+    )
+
+  def test_glossary_create_retry_finds_entry_created_earlier(self):
+    glossary_id = glossary_identification.GlossaryId(
+        "123", "us", "test_entry_group_with_no_terms", "empty_glossary_exists"
+    )
+    self.post_mock.return_value = mocks.MockResponse(
+        {"error": {"message": "Entry already exists."}}, 409
+    )
+    term = bg_term.Term("Term1", "Desc1", force_term_id="term1_id")
+    get_entry_mock = self.enterContext(
+        mock.patch.object(
+            dc_glossary.Glossary,
+            "_get_entry",
+            return_value={"json": {"displayName": "Term1"}, "error_msg": None},
+        )
+    )
+
+    with dc_glossary.Glossary(glossary_id) as glossary:
+      self.assertEqual(
+          glossary._create_glossary_entry(term)["error_msg"],
+          "Entry already exists.",
+      )
+      glossary._deterministic_ids = True
+      self.assertIsNone(glossary._create_glossary_entry(term)["error_msg"])
+      get_entry_mock.assert_called_once_with("term1_id")
+      # An entry of another name is not mistaken for the term
+      get_entry_mock.return_value = {
+          "json": {"displayName": "Other"},
+          "error_msg": None,
+      }
+      self.assertEqual(
+          glossary._create_glossary_entry(term)["error_msg"],
+          "Entry already exists.",
+      )
+
+  def test_import_glossary_diff_sends_only_changes(self):
+    glossary_id = glossary_identification.GlossaryId(
+        "123", "us", "test_entry_group_with_no_terms", "empty_glossary_exists"
+    )
+    glossary = dc_glossary.Glossary(glossary_id)
+    self.addCleanup(glossary.close)
+    glossary._term_cache = {
+        name: bg_term.Term(name, "Desc", force_term_id=f"{name}_id")
+        for name in ("A", "B", "C")
+    }
+    glossary._category_cache = {
+        "Cat": bg_category.Category("Cat", "Desc", force_category_id="Cat_id")
+    }
+    existing_relationships = {
+        "A_id": [{
+            "name": "rel/ab",
+            "relationshipType": "is_related_to",
+            "destinationEntryName": "projects/123/entries/B_id",
+        }],
+        "B_id": [{
+            "name": "rel/bcat",
+            "relationshipType": "belongs_to",
+            "destinationEntryName": "projects/123/entries/Cat_id",
+        }],
+    }
+    success = {"json": {}, "error_msg": None}
+    mocks_by_method = {
+        name: self.enterContext(
+            mock.patch.object(dc_glossary.Glossary, name, return_value=value)
+        )
+        for name, value in (
+            ("_create_glossary_entry", success),
+            ("_update_glossary_entry", success),
+            ("_remove_glossary_entry", success),
+            ("_remove_relationship", success),
+            ("_create_relationship", None),
+        )
+    }
+    list_mock = self.enterContext(
+        mock.patch.object(
+            dc_glossary.Glossary,
+            "_list_relationships",
+            side_effect=lambda entry_id: {
+                "json": {
+                    "relationships": existing_relationships.get(entry_id, [])
+                },
+                "error_msg": None,
+            },
+        )
+    )
+    term_a = bg_term.Term("A", "Desc", synonyms=["D"])
+    term_b = bg_term.Term("B", "New desc", belongs_to_category="Cat")
+    term_d = bg_term.Term("D", "Desc")
+
+    imported_entries, imported_relations, import_errors = (
+        glossary.import_glossary_diff({1: term_a, 2: term_b, 3: term_d}, None)
+    )
+
+    self.assertEqual(import_errors, [])
+    self.assertCountEqual(
+        [call.args[0] for call in list_mock.call_args_list], ["A_id", "B_id"]
+    )
+    mocks_by_method["_create_glossary_entry"].assert_called_once_with(term_d)
+    mocks_by_method["_update_glossary_entry"].assert_called_once_with(term_b)
+    self.assertEqual(term_b.term_id, "B_id")
+    mocks_by_method["_remove_glossary_entry"].assert_called_once_with("C_id")
+    mocks_by_method["_remove_relationship"].assert_called_once_with("rel/ab")
+    mocks_by_method["_create_relationship"].assert_called_once_with(
+        "A",
+        EntryType.EntryType.TERM,
+        "D",
+        EntryType.EntryType.TERM,
+        relation_type.RelationshipType.SYNONYMOUS,
+    )
+    self.assertCountEqual(
+        imported_entries[EntryType.EntryType.TERM], [term_a, term_b, term_d]
+    )
+    self.assertNotIn(EntryType.EntryType.CATEGORY, imported_entries)
+    self.assertEqual(
+        imported_relations[EntryType.EntryType.TERM],
+        [("A", "D", relation_type.RelationshipType.SYNONYMOUS)],
+    )
+
+  def test_api_calls_are_recorded_by_phase(self):
+    import_metrics.reset()
+    self.addCleanup(import_metrics.reset)
+    self.post_mock.return_value = mocks.MockResponse({}, 200)
+    glossary_id = glossary_identification.GlossaryId(
+        "123", "us", "test_entry_group_with_no_terms", "empty_glossary_exists"
+    )
+    glossary = dc_glossary.Glossary(glossary_id)
+    self.addCleanup(glossary.close)
+
+    glossary.import_glossary(
+        {
+            1: bg_term.Term("A", "Desc", related_terms=["B"]),
+            2: bg_term.Term("B", "Desc"),
+        },
+        {1: bg_category.Category("C", "Desc")},
+    )
+
+    phases = import_metrics.get_recorder().report()["phases"]
+    self.assertEqual(
+        {name: phase["calls"] for name, phase in phases.items()},
+        {
+            "load_entries": 2,
+            "create_category": 1,
+            "create_term": 2,
+            "create_is_related_to": 1,
+        },
+    )
+
+  def test_plan_import_diff_counts_calls_without_changes(self):
+    glossary_id = glossary_identification.GlossaryId(
+        "123", "us", "test_entry_group_with_no_terms", "empty_glossary_exists"
+    )
+    glossary = dc_glossary.Glossary(glossary_id)
+    self.addCleanup(glossary.close)
+    glossary._term_cache = {
+        name: bg_term.Term(name, "Desc", force_term_id=f"{name}_id")
+        for name in ("A", "B", "C")
+    }
+    self.enterContext(
+        mock.patch.object(
+            dc_glossary.Glossary,
+            "_list_relationships",
+            side_effect=lambda entry_id: {
+                "json": {
+                    "relationships": [{
+                        "name": "rel/ab",
+                        "relationshipType": "is_related_to",
+                        "destinationEntryName": "projects/123/entries/B_id",
+                    }] if entry_id == "A_id" else []
+                },
+                "error_msg": None,
+            },
+        )
+    )
+    terms = {
+        1: bg_term.Term("A", "Desc", synonyms=["D"]),
+        2: bg_term.Term("B", "New desc"),
+        3: bg_term.Term("D", "Desc"),
+    }
+
+    plan = glossary.plan_import(terms, None, import_mode.ImportMode.DIFF)
+
+    self.assertEqual(
+        {k: v for k, v in plan.calls_by_operation().items() if v},
+        {
+            "list relationships": 2,
+            "delete relationship": 1,
+            "delete term": 1,
+            "create term": 1,
+            "update term": 1,
+            "create is_synonymous_to relationship": 1,
+        },
+    )
+    self.post_mock.assert_not_called()
+
+  def test_plan_import_strict_counts_creates_by_phase(self):
+    glossary_id = glossary_identification.GlossaryId(
+        "123", "us", "test_entry_group_with_no_terms", "empty_glossary_exists"
+    )
+    glossary = dc_glossary.Glossary(glossary_id)
+    self.addCleanup(glossary.close)
+    terms = {
+        1: bg_term.Term("A", "Desc", related_terms=["B"]),
+        2: bg_term.Term(
+            "B", "Desc", related_terms=["A"], belongs_to_category="Child"
+        ),
+    }
+    categories = {
+        1: bg_category.Category("Parent", "Desc"),
+        2: bg_category.Category("Child", "Desc", belongs_to_category="Parent"),
+    }
+
+    plan = glossary.plan_import(
+        terms, categories, import_mode.ImportMode.STRICT
+    )
+
+    self.assertEqual(
+        [(phase.name, +phase.calls) for phase in plan.phases],
+        [
+            ("Categories", {"create category": 2}),
+            (
+                "Terms and their relationships",
+                {
+                    "create term": 2,
+                    "create is_related_to relationship": 1,
+                    "create belongs_to relationship": 1,
+                },
+            ),
+            ("Category hierarchy", {"create belongs_to relationship": 1}),
+        ],
+    )
+    self.post_mock.assert_not_called()
+
+  def test_import_glossary_diff_reports_failed_updates(self):
+    glossary_id = glossary_identification.GlossaryId(
+        "123", "us", "test_entry_group_with_terms", "glossary_exists"
+    )
+    glossary = dc_glossary.Glossary(glossary_id)
+    self.addCleanup(glossary.close)
+    self.enterContext(
+        mock.patch.object(
+            dc_glossary.Glossary,
+            "_list_relationships",
+            return_value={"json": {"relationships": []}, "error_msg": None},
+        )
+    )
+    self.enterContext(
+        mock.patch.object(
+            dc_glossary.Glossary,
+            "_update_glossary_entry",
+            return_value={"json": None, "error_msg": "Some error"},
+        )
+    )
+    term = bg_term.Term("Purchase number", "New description")
+
+    _, _, import_errors = glossary.import_glossary_diff({4: term}, None)
+
+    self.assertEqual(len(import_errors), 1)
+    self.assertEqual(import_errors[0].line, 4)
+    self.assertEqual(import_errors[0].operation, "update_term")
+    self.assertEqual(import_errors[0].message, "Some error")
+
+  def test_glossary_update_entry(self):
+    patch_mock = self.enterContext(mock.patch("requests.Session.patch"))
+    glossary_id = glossary_identification.GlossaryId(
+        "123", "us", "test_entry_group_with_terms", "glossary_exists"
+    )
+    glossary = dc_glossary.Glossary(glossary_id)
+    self.addCleanup(glossary.close)
+    term = bg_term.Term(
+        "Term1", "Desc1", data_stewards=["a"], force_term_id="term1_id"
+    )
+
+    glossary._update_glossary_entry(term)
+
+    patch_mock.assert_called_once_with(
+        (
+            "https://datacatalog.googleapis.com/v2/projects/123/locations/us/"
+            "entryGroups/test_entry_group_with_terms/entries/term1_id"
+            "?update_mask=core_aspects"
+        ),
+        headers=mock.ANY,
+        json={
+            "core_aspects": {
+                "business_context": {
+                    "aspect_type": "business_context",
+                    "json_content": {"description": "Desc1", "contacts": ["a"]},
+                }
+            }
+        },
+    )
+
 if __name__ == "__main__":
   unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+from unittest import mock
+
+import api_call_utils
+import http_session
+import requests
+from tests.test_utils import mocks
+
+
+class HttpSessionTest(unittest.TestCase):
+
+  def tearDown(self):
+    http_session.configure()
+    super().tearDown()
+
+  def test_client_is_shared(self):
+    self.assertIs(http_session.get_client(), http_session.get_client())
+
+  def test_configure_replaces_client(self):
+    client = http_session.get_client()
+    http_session.configure(pool_size=4, keep_alive=False)
+    new_client = http_session.get_client()
+    self.assertIsNot(client, new_client)
+    self.assertEqual(new_client.pool_size, 4)
+    self.assertFalse(new_client.keep_alive)
+
+  def test_invalid_pool_size(self):
+    with self.assertRaises(ValueError):
+      http_session.SessionClient(pool_size=0)
+
+  def test_request_uses_session_method(self):
+    with mock.patch(
+        'requests.Session.delete',
+        return_value=mocks.MockResponse({}, 200),
+    ) as delete_mock:
+      http_session.get_client().request('DELETE', 'https://example.com/x')
+    delete_mock.assert_called_once_with(
+        'https://example.com/x', headers=None, json=None
+    )
+
+  def test_mean_latency_of_answered_requests(self):
+    client = http_session.SessionClient()
+    self.assertIsNone(client.mean_latency_seconds())
+    with mock.patch(
+        'requests.Session.get', return_value=mocks.MockResponse({}, 200)
+    ), mock.patch('time.perf_counter', side_effect=[1.0, 1.5, 2.0, 2.1]):
+      client.request('GET', 'https://example.com/x')
+      client.request('GET', 'https://example.com/y')
+    self.assertAlmostEqual(client.mean_latency_seconds(), 0.3)
+
+  def test_connection_stats_without_requests(self):
+    self.assertEqual(
+        http_session.SessionClient().connection_stats(),
+        {'requests': 0, 'new_connections': 0, 'reused_connections': 0},
+    )
+
+  def test_connection_stats_counts_reused_connections(self):
+    client = http_session.SessionClient()
+    pool = client._adapter.poolmanager.connection_from_url(
+        'https://datacatalog.googleapis.com'
+    )
+    pool.num_requests, pool.num_connections = 10, 2
+    self.assertEqual(
+        client.connection_stats(),
+        {'requests': 10, 'new_connections': 2, 'reused_connections': 8},
+    )
+
+  def test_fetch_api_response_goes_through_pool(self):
+    with mock.patch(
+        'requests.Session.post',
+        side_effect=mocks.mocked_get_api_response,
+    ) as post_mock:
+      response = api_call_utils.fetch_api_response(
+          requests.post,
+          'https://datacatalog.googleapis.com/v2/get_call/success',
+          '12345',
+          {'key': 'value'},
+      )
+    self.assertIsNone(response['error_msg'])
+    post_mock.assert_called_once()
+
+  def test_headers_are_cached_per_project(self):
+    self.assertIs(
+        api_call_utils.get_header('123'), api_call_utils.get_header('123')
+    )
+    self.assertIsNot(
+        api_call_utils.get_header('123'), api_call_utils.get_header('456')
+    )
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+
+import entry_type as EntryType
+import import_journal
+import relation_type
+
+TERM = EntryType.EntryType.TERM
+CATEGORY = EntryType.EntryType.CATEGORY
+RELATED = relation_type.RelationshipType.RELATED
+
+
+class ImportJournalTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    temp_dir = tempfile.TemporaryDirectory()
+    self.addCleanup(temp_dir.cleanup)
+    self.path = os.path.join(temp_dir.name, "import.journal")
+
+  def _write_journal(self):
+    with import_journal.ImportJournal(self.path) as journal:
+      journal.record_entry(TERM, 1, "Term 1", "term_1_id")
+      journal.record_entry(CATEGORY, 1, "Category 1", "category_1_id")
+      journal.record_relationship("Term 1", TERM, "Term 2", TERM, RELATED)
+
+  def test_resume_loads_records(self):
+    self._write_journal()
+
+    with import_journal.ImportJournal(self.path, resume=True) as journal:
+      self.assertEqual(journal.entry_id(TERM, "Term 1"), "term_1_id")
+      self.assertEqual(
+          journal.entry_id(CATEGORY, "Category 1"), "category_1_id"
+      )
+      self.assertIsNone(journal.entry_id(CATEGORY, "Term 1"))
+      self.assertTrue(
+          journal.has_relationship("Term 1", TERM, "Term 2", TERM, RELATED)
+      )
+      self.assertFalse(
+          journal.has_relationship("Term 2", TERM, "Term 1", TERM, RELATED)
+      )
+
+  def test_resume_appends_records(self):
+    self._write_journal()
+
+    with import_journal.ImportJournal(self.path, resume=True) as journal:
+      journal.record_entry(TERM, 2, "Term 2", "term_2_id")
+
+    journal = import_journal.ImportJournal(self.path, resume=True)
+    self.assertEqual(journal.entry_id(TERM, "Term 1"), "term_1_id")
+    self.assertEqual(journal.entry_id(TERM, "Term 2"), "term_2_id")
+
+  def test_new_run_truncates_journal_on_first_record(self):
+    self._write_journal()
+
+    journal = import_journal.ImportJournal(self.path)
+    self.assertIsNone(journal.entry_id(TERM, "Term 1"))
+    # Nothing is lost until the new run records something
+    self.assertGreater(os.path.getsize(self.path), 0)
+    journal.record_entry(TERM, 2, "Term 2", "term_2_id")
+    journal.close()
+
+    journal = import_journal.ImportJournal(self.path, resume=True)
+    self.assertIsNone(journal.entry_id(TERM, "Term 1"))
+    self.assertEqual(journal.entry_id(TERM, "Term 2"), "term_2_id")
+
+  def test_truncated_last_record_is_skipped(self):
+    self._write_journal()
+    with open(self.path, "a", encoding="utf-8") as journal_file:
+      journal_file.write('{"kind": "entry", "entry_ty')
+
+    journal = import_journal.ImportJournal(self.path, resume=True)
+    self.assertEqual(journal.entry_id(TERM, "Term 1"), "term_1_id")
+
+  def test_records_are_written_once(self):
+    with import_journal.ImportJournal(self.path) as journal:
+      journal.record_entry(TERM, 1, "Term 1", "term_1_id")
+      journal.record_entry(TERM, 1, "Term 1", "term_1_id")
+      journal.record_relationship("Term 1", TERM, "Term 2", TERM, RELATED)
+      journal.record_relationship("Term 1", TERM, "Term 2", TERM, RELATED)
+
+    with open(self.path, encoding="utf-8") as journal_file:
+      self.assertEqual(len(journal_file.readlines()), 2)
+
+  def test_resume_without_journal_skips_nothing(self):
+    journal = import_journal.ImportJournal(self.path, resume=True)
+    self.assertIsNone(journal.entry_id(TERM, "Term 1"))
+    journal.close()
+    self.assertFalse(os.path.exists(self.path))
+
+
+if __name__ == "__main__":
+  unittest.main()
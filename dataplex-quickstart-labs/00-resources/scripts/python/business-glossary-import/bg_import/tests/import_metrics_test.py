@@ -0,0 +1,118 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import api_call_utils
+import import_metrics
+import rate_limiter
+import requests
+from tests.test_utils import mocks
+
+
+class ImportMetricsTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    import_metrics.reset()
+    self.addCleanup(import_metrics.reset)
+
+  def test_phase_metrics(self):
+    recorder = import_metrics.get_recorder()
+    for i in range(100):
+      recorder.record_call(
+          "create_term", 10.0 + i * 0.1, 10.0 + i * 0.1 + (i + 1) / 1000
+      )
+    recorder.record_call(
+        "create_term", 30.0, 30.5, retries=2, bytes_sent=10, failed=True
+    )
+
+    report = recorder.report()["phases"]["create_term"]
+
+    self.assertEqual(report["calls"], 101)
+    self.assertEqual(report["errors"], 1)
+    self.assertEqual(report["retries"], 2)
+    self.assertEqual(report["bytes_sent"], 10)
+    self.assertAlmostEqual(report["duration_seconds"], 20.5)
+    self.assertAlmostEqual(report["requests_per_second"], 101 / 20.5)
+    self.assertAlmostEqual(report["latency_seconds"]["p50"], 0.051)
+    self.assertAlmostEqual(report["latency_seconds"]["p95"], 0.096)
+    self.assertAlmostEqual(report["latency_seconds"]["p99"], 0.1)
+
+  def test_phases_are_ordered_by_start(self):
+    recorder = import_metrics.get_recorder()
+    recorder.record_call("create_term", 2.0, 3.0)
+    recorder.record_call("create_category", 1.0, 2.0)
+
+    self.assertEqual(
+        list(recorder.report()["phases"]),
+        ["create_category", "create_term"],
+    )
+
+  def test_prometheus_format(self):
+    import_metrics.get_recorder().record_call("clear", 1.0, 1.25, retries=1)
+
+    text = import_metrics.get_recorder().to_prometheus()
+
+    self.assertIn('bg_import_api_calls_total{phase="clear"} 1\n', text)
+    self.assertIn('bg_import_api_retries_total{phase="clear"} 1\n', text)
+    self.assertIn(
+        'bg_import_api_latency_seconds{phase="clear",quantile="0.99"} 0.25\n',
+        text,
+    )
+    self.assertIn("# TYPE bg_import_api_latency_seconds summary\n", text)
+
+  def test_bound_task_keeps_phase_on_other_thread(self):
+    phases = []
+    with import_metrics.phase("create_term"):
+      task = import_metrics.bind_phase(
+          lambda: phases.append(import_metrics.current_phase())
+      )
+    thread = threading.Thread(target=task)
+    thread.start()
+    thread.join()
+
+    self.assertEqual(phases, ["create_term"])
+    self.assertEqual(import_metrics.current_phase(), import_metrics.OTHER_PHASE)
+
+  def test_fetch_api_response_records_retries_and_bytes(self):
+    rate_limiter.configure()
+    self.addCleanup(rate_limiter.configure)
+    self.enterContext(mock.patch("time.sleep"))
+    throttled = mocks.MockResponse({"error": {"message": "Quota"}}, 429)
+    throttled.content = b"{}"
+    success = mocks.MockResponse({"name": "entry"}, 200)
+    success.content = b'{"name": "entry"}'
+    with mock.patch(
+        "requests.Session.post", side_effect=[throttled, success]
+    ), import_metrics.phase("create_term"):
+      api_call_utils.fetch_api_response(
+          requests.post,
+          "https://datacatalog.googleapis.com/v2/x",
+          "123",
+          {"a": 1},
+      )
+
+    report = import_metrics.get_recorder().report()["phases"]["create_term"]
+    self.assertEqual(report["calls"], 1)
+    self.assertEqual(report["retries"], 1)
+    self.assertEqual(report["errors"], 0)
+    self.assertEqual(report["bytes_sent"], 2 * len('{"a": 1}'))
+    self.assertEqual(report["bytes_received"], 2 + len(success.content))
+
+  def test_write_report(self):
+    import_metrics.get_recorder().record_call("create_term", 1.0, 2.0)
+    temp_dir = self.enterContext(tempfile.TemporaryDirectory())
+    path = os.path.join(temp_dir, "metrics.json")
+
+    import_metrics.write_report(path)
+
+    with open(path, encoding="utf-8") as report_file:
+      report = json.load(report_file)
+    self.assertEqual(report["phases"]["create_term"]["calls"], 1)
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+import import_planner
+
+
+class ImportPlannerTest(unittest.TestCase):
+
+  def _plan(self, latency_seconds=None):
+    plan = import_planner.ImportPlan(latency_seconds=latency_seconds)
+    plan.add_phase("Categories").calls["create category"] = 100
+    terms = plan.add_phase("Terms")
+    terms.calls["create term"] = 1000
+    terms.calls["create belongs_to relationship"] = 1000
+    return plan
+
+  def test_calls_by_operation(self):
+    plan = self._plan()
+
+    self.assertEqual(plan.total_calls(), 2100)
+    self.assertEqual(
+        plan.calls_by_operation(),
+        {
+            "create category": 100,
+            "create term": 1000,
+            "create belongs_to relationship": 1000,
+        },
+    )
+
+  def test_estimate_bound_by_workers(self):
+    plan = self._plan(latency_seconds=0.5)
+
+    # 100 * 0.5 / 10 + 2000 * 0.5 / 10
+    self.assertAlmostEqual(plan.estimate_seconds(10, 1000.0), 105.0)
+
+  def test_estimate_bound_by_rate(self):
+    plan = self._plan(latency_seconds=0.5)
+
+    # 100 / 10 + 2000 / 10
+    self.assertAlmostEqual(plan.estimate_seconds(100, 10.0), 210.0)
+
+  def test_estimate_without_rate_cap(self):
+    plan = self._plan(latency_seconds=0.5)
+
+    self.assertAlmostEqual(plan.estimate_seconds(100, None), 10.5)
+
+  def test_estimate_without_measured_latency(self):
+    plan = self._plan()
+
+    self.assertAlmostEqual(
+        plan.estimate_seconds(1, 1000.0),
+        2100 * import_planner.DEFAULT_LATENCY_SECONDS,
+    )
+
+  def test_print_plan(self):
+    with self.assertLogs(level="INFO") as logs:
+      import_planner.print_plan(self._plan(0.2), 20, 100.0)
+
+    output = "\n".join(logs.output)
+    self.assertIn("create term: 1000", output)
+    self.assertIn("2100 API calls, estimated to take 21s", output)
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,127 @@
+import os
+import tempfile
+import unittest
+
+import entry_type as entry_type_lib
+import import_spool
+import relation_type
+import term as bg_term
+
+_ASSET = "projects/123/locations/us/entryGroups/assets/entries/table"
+_TERM = entry_type_lib.EntryType.TERM
+_CATEGORY = entry_type_lib.EntryType.CATEGORY
+
+
+def _terms():
+  return [
+      (
+          2,
+          bg_term.Term(
+              "Term B",
+              "Desc B",
+              data_stewards=["Steward<steward@example.com>"],
+              tagged_assets=[_ASSET],
+              synonyms=["Term A"],
+              related_terms=["Term C"],
+              belongs_to_category="Category",
+          ),
+      ),
+      (3, bg_term.Term("Term A", "Desc A", synonyms=["Term B"])),
+      (4, bg_term.Term("Term C", "Desc C")),
+  ]
+
+
+class ImportSpoolTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    temp_dir = tempfile.TemporaryDirectory()
+    self.addCleanup(temp_dir.cleanup)
+    self.spool = import_spool.ImportSpool(temp_dir.name)
+    self.addCleanup(self.spool.close)
+
+  def test_term_windows(self):
+    self.assertEqual(self.spool.add_terms(_terms()), 3)
+
+    windows = list(self.spool.term_windows(2))
+
+    self.assertEqual([len(window) for window in windows], [2, 1])
+    line, term = windows[0][0]
+    self.assertEqual(line, 2)
+    self.assertEqual(term.display_name, "Term B")
+    self.assertEqual(term.description, "Desc B")
+    self.assertEqual(term.data_stewards, ["Steward<steward@example.com>"])
+    self.assertEqual(term.tagged_assets, [_ASSET])
+    self.assertEqual(term.synonyms, ["Term A"])
+    self.assertEqual(term.related_terms, ["Term C"])
+    self.assertEqual(term.belongs_to_category, "Category")
+    self.assertEqual([line for line, _ in windows[1]], [4])
+
+  def test_relationships_are_spooled_once(self):
+    self.spool.add_terms(_terms())
+
+    windows = list(self.spool.relationship_windows(3))
+
+    self.assertEqual([len(window) for window in windows], [3, 1])
+    self.assertEqual(self.spool.relationship_count(), 4)
+    self.assertCountEqual(
+        [relationship for window in windows for relationship in window],
+        [
+            (
+                "Term A",
+                _TERM,
+                "Term B",
+                _TERM,
+                relation_type.RelationshipType.SYNONYMOUS,
+            ),
+            (
+                "Term B",
+                _TERM,
+                "Term C",
+                _TERM,
+                relation_type.RelationshipType.RELATED,
+            ),
+            (
+                _ASSET,
+                _TERM,
+                "Term B",
+                _TERM,
+                relation_type.RelationshipType.DESCRIBED,
+            ),
+            (
+                "Term B",
+                _TERM,
+                "Category",
+                _CATEGORY,
+                relation_type.RelationshipType.BELONGS_TO,
+            ),
+        ],
+    )
+
+  def test_term_entry_ids_of_created_terms(self):
+    self.spool.add_terms(_terms())
+    self.spool.set_entry_ids([(2, "term_b"), (4, "term_c")])
+
+    self.assertEqual(
+        self.spool.term_entry_ids(["term b", "Term A", "Term C", "Other"]),
+        {"Term B": "term_b", "Term C": "term_c"},
+    )
+
+  def test_names(self):
+    self.spool.tracked_terms.add("term a")
+    self.spool.tracked_terms.add("term a")
+    self.spool.add_terms(_terms())
+
+    self.assertIn("term a", self.spool.tracked_terms)
+    self.assertEqual(len(self.spool.tracked_terms), 1)
+    self.assertIn("term c", self.spool.term_names)
+    self.assertNotIn("Term C", self.spool.term_names)
+
+  def test_close_deletes_file(self):
+    self.spool.close()
+
+    self.assertFalse(os.path.exists(self.spool.path))
+
+
+if __name__ == "__main__":
+  unittest.main()
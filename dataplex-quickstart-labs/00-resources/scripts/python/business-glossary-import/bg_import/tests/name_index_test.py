@@ -0,0 +1,74 @@
+import unittest
+from unittest import mock
+
+from parameterized import parameterized
+import entry_type as EntryType
+import name_index
+import term as bg_term
+
+TERM = EntryType.EntryType.TERM
+CATEGORY = EntryType.EntryType.CATEGORY
+
+
+class NameIndexTest(unittest.TestCase):
+
+  @parameterized.expand([
+      ("Net Revenue", "net revenue"),
+      ("  Net \t Revenue\n", "net revenue"),
+      ("STRASSE", "strasse"),
+      ("Straße", "strasse"),
+      # Decomposed "e" followed by a combining acute accent
+      ("Cafe\u0301", "caf\u00e9"),
+  ])
+  def test_normalize_name(self, name, expected):
+    self.assertEqual(name_index.normalize_name(name), expected)
+
+  def test_find_ignores_case_and_whitespace(self):
+    index = name_index.NameIndex()
+    term = bg_term.Term("Net Revenue", "Desc")
+    index.terms[term.display_name] = term
+
+    self.assertIs(index.find(TERM, "Net Revenue"), term)
+    self.assertIs(index.find(TERM, "net  REVENUE"), term)
+    self.assertIsNone(index.find(CATEGORY, "Net Revenue"))
+
+  def test_find_prefers_exact_match_and_rejects_ambiguous_names(self):
+    index = name_index.NameIndex()
+    lower = bg_term.Term("revenue", "Desc")
+    upper = bg_term.Term("REVENUE", "Desc")
+    index.terms.update({"revenue": lower, "REVENUE": upper})
+
+    self.assertIs(index.find(TERM, "REVENUE"), upper)
+    self.assertIsNone(index.find(TERM, "Revenue"))
+
+    del index.terms["REVENUE"]
+    self.assertIs(index.find(TERM, "Revenue"), lower)
+
+  def test_removed_entries_are_not_found(self):
+    cache = name_index.EntryCache({"Term": bg_term.Term("Term", "Desc")})
+
+    cache.pop("Term")
+
+    self.assertIsNone(cache.find("term"))
+    self.assertEqual(cache, {})
+
+  def test_asset_path_is_parsed_once(self):
+    index = name_index.NameIndex()
+    path = "projects/123/locations/us/entryGroups/eg/entries/asset:column"
+
+    with mock.patch.object(
+        name_index, "parse_entry_path", wraps=name_index.parse_entry_path
+    ) as parse_mock:
+      first = index.asset_path(path)
+      second = index.asset_path(path)
+
+    self.assertEqual(
+        first,
+        ("projects/123/locations/us/entryGroups/eg/entries/asset", "column"),
+    )
+    self.assertEqual(first, second)
+    parse_mock.assert_called_once()
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -1,3 +1,4 @@
+import re
 import unittest
 
 from parameterized import parameterized
@@ -150,5 +151,52 @@ class ParseUtilsTest(unittest.TestCase):
     self.assertEqual(ret, ["term 1", "term 2", "term 3", "term, 4"])
 
 
+  @parameterized.expand([
+      ("a,,b",),
+      (" , a ,b, ",),
+      ('a, "b, c"d, e',),
+      ('a, "unclosed, b',),
+      ("",),
+  ])
+  def test_parse_list_matches_pattern_split(self, text: str):
+    ret, _ = parse_utils.parse_list(text)
+    expected = [
+        item.replace('"', "").strip()
+        for item in re.findall(r'(?:[^,"]|"(?:[^"])*")+', text)
+    ]
+    self.assertEqual(ret, expected)
+
+  def test_parse_list_interns_items(self):
+    first, _ = parse_utils.parse_list("".join(["category", " 1"]))
+    second, _ = parse_utils.parse_list('"category 1"')
+    self.assertIs(first[0], second[0])
+
+  @parameterized.expand([
+      ("a*b", None),
+      ('"a*b"', "a*b"),
+      ('"a"*"b"', None),
+      ("plain text", "plain text"),
+  ])
+  def test_parse_str_with_asterisk(self, text: str, expected: str | None):
+    ret, errors = parse_utils.parse_term_str(text)
+    self.assertEqual(ret, expected)
+    self.assertEqual(len(errors), 0 if expected is not None else 1)
+
+  def test_parse_record_reports_missing_fields(self):
+    parsers = [
+        ("display_name", parse_utils.parse_term_name, False),
+        ("description", parse_utils.parse_term_str, False),
+        ("synonyms", parse_utils.parse_list, True),
+    ]
+    attributes, errors = parse_utils.parse_record(
+        entry_type_lib.EntryType.TERM, 4, ["name"], parsers
+    )
+    self.assertEqual(attributes, ["name", "", []])
+    self.assertEqual(len(errors), 1)
+    self.assertEqual(errors[0].line, 5)
+    self.assertEqual(errors[0].column, 2)
+    self.assertEqual(errors[0].resources, ["description"])
+
+
 if __name__ == "__main__":
   unittest.main()
@@ -0,0 +1,289 @@
+import threading
+import unittest
+from unittest import mock
+
+import api_call_utils
+import rate_limiter
+import requests
+from tests.test_utils import mocks
+
+
+class AdaptiveLimiterTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.now = 1000.0
+    self.enterContext(
+        mock.patch("time.monotonic", side_effect=lambda: self.now)
+    )
+    self.limiter = rate_limiter.AdaptiveLimiter()
+
+  def _take_slots(self, count):
+    for _ in range(count):
+      self.assertTrue(self.limiter.try_acquire())
+
+  def test_rate_is_not_capped_by_default(self):
+    self.assertEqual([self.limiter.reserve() for _ in range(1000)], [0] * 1000)
+
+  def test_burst_is_bounded_by_max_rate(self):
+    limiter = rate_limiter.AdaptiveLimiter(max_rate=10)
+    waits = [limiter.reserve() for _ in range(12)]
+    self.assertEqual(waits[:10], [0.0] * 10)
+    self.assertAlmostEqual(waits[10], 0.1)
+    self.assertAlmostEqual(waits[11], 0.2)
+
+  def test_tokens_refill_over_time(self):
+    limiter = rate_limiter.AdaptiveLimiter(max_rate=10)
+    for _ in range(10):
+      limiter.reserve()
+    self.now += 0.5
+    waits = [limiter.reserve() for _ in range(6)]
+    self.assertEqual(waits[:5], [0.0] * 5)
+    self.assertAlmostEqual(waits[5], 0.1)
+
+  def test_calls_in_flight_are_not_limited_before_throttling(self):
+    self._take_slots(500)
+    self.assertIsNone(self.limiter.limit)
+    self.assertEqual(self.limiter.in_flight, 500)
+
+  def test_throttle_halves_calls_in_flight_once_per_interval(self):
+    self._take_slots(40)
+    self.limiter.record_response(429)
+    self.limiter.record_response(429)
+    self.assertEqual(self.limiter.limit, 20)
+    self.now += 1
+    self.limiter.record_response(503)
+    self.assertEqual(self.limiter.limit, 10)
+
+  def test_no_slot_above_the_limit(self):
+    self._take_slots(8)
+    self.limiter.on_throttle()
+    self.assertFalse(self.limiter.try_acquire())
+    for _ in range(5):
+      self.limiter.release()
+    self.assertTrue(self.limiter.try_acquire())
+    self.assertFalse(self.limiter.try_acquire())
+
+  def test_acquire_waits_for_a_released_slot(self):
+    self._take_slots(4)
+    self.limiter.on_throttle()
+    acquired = threading.Event()
+    thread = threading.Thread(
+        target=lambda: (self.limiter.acquire(), acquired.set()), daemon=True
+    )
+    thread.start()
+    self.limiter.release()
+    self.limiter.release()
+    self.assertFalse(acquired.wait(timeout=0.1))
+    self.limiter.release()
+    self.assertTrue(acquired.wait(timeout=5))
+    thread.join()
+    self.assertEqual(self.limiter.in_flight, 2)
+
+  def test_limit_does_not_go_below_min_in_flight(self):
+    self._take_slots(8)
+    for _ in range(10):
+      self.limiter.on_throttle()
+      self.now += 1
+    self.assertEqual(self.limiter.limit, 1)
+
+  def test_success_increases_limit_additively(self):
+    self._take_slots(20)
+    self.limiter.on_throttle()
+    for _ in range(10):
+      self.limiter.record_response(200)
+    # One more call in flight for a window of ten successes
+    self.assertAlmostEqual(self.limiter.limit, 11, delta=0.1)
+    for _ in range(100):
+      self.limiter.record_response(404)
+    self.assertGreater(self.limiter.limit, 17)
+
+  def test_retry_after_pauses_all_callers(self):
+    self.limiter.on_throttle(retry_after=3)
+    self.assertAlmostEqual(self.limiter.reserve(), 3)
+    self.now += 2
+    self.assertAlmostEqual(self.limiter.reserve(), 1)
+    self.now += 1
+    self.assertEqual(self.limiter.reserve(), 0)
+
+  def test_invalid_limits(self):
+    with self.assertRaises(ValueError):
+      rate_limiter.AdaptiveLimiter(max_rate=0)
+    with self.assertRaises(ValueError):
+      rate_limiter.AdaptiveLimiter(min_in_flight=0)
+
+
+class RetryTest(unittest.TestCase):
+
+  def test_parse_retry_after_seconds(self):
+    self.assertEqual(rate_limiter.parse_retry_after("7"), 7)
+
+  def test_parse_retry_after_http_date(self):
+    with mock.patch("time.time", return_value=0):
+      self.assertEqual(
+          rate_limiter.parse_retry_after("Thu, 01 Jan 1970 00:00:30 GMT"), 30
+      )
+
+  def test_parse_invalid_retry_after(self):
+    self.assertIsNone(rate_limiter.parse_retry_after(None))
+    self.assertIsNone(rate_limiter.parse_retry_after("soon"))
+
+  def test_backoff_prefers_retry_after(self):
+    self.assertEqual(rate_limiter.backoff_seconds(3, retry_after=2), 2)
+
+  def test_backoff_is_exponential_and_capped(self):
+    with mock.patch("random.uniform", side_effect=lambda a, b: b):
+      self.assertEqual(rate_limiter.backoff_seconds(0), 1)
+      self.assertEqual(rate_limiter.backoff_seconds(3), 8)
+      self.assertEqual(
+          rate_limiter.backoff_seconds(20), rate_limiter.MAX_BACKOFF_SECONDS
+      )
+
+
+class FetchApiResponseRetryTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    rate_limiter.configure()
+    self.addCleanup(rate_limiter.configure)
+    self.sleep_mock = self.enterContext(mock.patch("time.sleep"))
+
+  def test_retries_throttled_call(self):
+    throttled = mocks.MockResponse({"error": {"message": "Quota"}}, 429)
+    throttled.headers = {"Retry-After": "2"}
+    success = mocks.MockResponse({"name": "entry"}, 200)
+    with mock.patch(
+        "requests.Session.post", side_effect=[throttled, success]
+    ) as post_mock:
+      response = api_call_utils.fetch_api_response(
+          requests.post, "https://datacatalog.googleapis.com/v2/x", "123", {}
+      )
+    self.assertEqual(response, {"json": {"name": "entry"}, "error_msg": None})
+    self.assertEqual(post_mock.call_count, 2)
+    self.sleep_mock.assert_any_call(2)
+    # Halved to a single call in flight, then raised by the success
+    self.assertEqual(rate_limiter.get_limiter().limit, 2)
+    self.assertEqual(rate_limiter.get_limiter().in_flight, 0)
+
+  def test_gives_up_after_max_retries(self):
+    with mock.patch(
+        "requests.Session.get",
+        return_value=mocks.MockResponse({"error": {"message": "Down"}}, 503),
+    ) as get_mock:
+      response = api_call_utils.fetch_api_response(
+          requests.get, "https://datacatalog.googleapis.com/v2/x", "123"
+      )
+    self.assertEqual(
+        response,
+        {"json": {"error": {"message": "Down"}}, "error_msg": "Down"},
+    )
+    self.assertEqual(get_mock.call_count, rate_limiter.MAX_RETRIES + 1)
+
+  def test_client_errors_are_not_retried(self):
+    with mock.patch(
+        "requests.Session.get",
+        side_effect=mocks.mocked_get_api_response,
+    ) as get_mock:
+      api_call_utils.fetch_api_response(
+          requests.get,
+          "https://datacatalog.googleapis.com/v2/get_call/error",
+          "123",
+      )
+    get_mock.assert_called_once()
+
+  def test_create_is_not_retried_on_server_error(self):
+    with mock.patch(
+        "requests.Session.post",
+        return_value=mocks.MockResponse({"error": {"message": "Lost"}}, 502),
+    ) as post_mock:
+      response = api_call_utils.fetch_api_response(
+          requests.post, "https://datacatalog.googleapis.com/v2/x", "123", {}
+      )
+    self.assertIsNone(response["json"])
+    post_mock.assert_called_once()
+
+  def test_confirmed_create_is_retried_on_server_error(self):
+    failed = mocks.MockResponse({"error": {"message": "Lost"}}, 500)
+    success = mocks.MockResponse({"name": "entry"}, 200)
+    with mock.patch(
+        "requests.Session.post", side_effect=[failed, success]
+    ) as post_mock:
+      response = api_call_utils.fetch_api_response(
+          requests.post,
+          "https://datacatalog.googleapis.com/v2/x",
+          "123",
+          {},
+          retry_server_errors=True,
+      )
+    self.assertEqual(response, {"json": {"name": "entry"}, "error_msg": None})
+    self.assertEqual(post_mock.call_count, 2)
+
+  def test_retries_connection_error(self):
+    success = mocks.MockResponse({"name": "entry"}, 200)
+    with mock.patch(
+        "requests.Session.get",
+        side_effect=[
+            requests.exceptions.ConnectionError("Reset"),
+            requests.exceptions.ReadTimeout("Slow"),
+            success,
+        ],
+    ) as get_mock:
+      response = api_call_utils.fetch_api_response(
+          requests.get, "https://datacatalog.googleapis.com/v2/x", "123"
+      )
+    self.assertEqual(response, {"json": {"name": "entry"}, "error_msg": None})
+    self.assertEqual(get_mock.call_count, 3)
+    self.assertEqual(rate_limiter.get_limiter().in_flight, 0)
+
+  def test_gives_up_on_connection_error_after_max_retries(self):
+    with mock.patch(
+        "requests.Session.get",
+        side_effect=requests.exceptions.ConnectionError("Reset"),
+    ) as get_mock:
+      response = api_call_utils.fetch_api_response(
+          requests.get, "https://datacatalog.googleapis.com/v2/x", "123"
+      )
+    self.assertIsNone(response["json"])
+    self.assertIn("Reset", response["error_msg"])
+    self.assertEqual(get_mock.call_count, rate_limiter.MAX_RETRIES + 1)
+
+  def test_create_is_not_retried_on_read_timeout(self):
+    with mock.patch(
+        "requests.Session.post",
+        side_effect=requests.exceptions.ReadTimeout("Slow"),
+    ) as post_mock:
+      response = api_call_utils.fetch_api_response(
+          requests.post, "https://datacatalog.googleapis.com/v2/x", "123", {}
+      )
+    self.assertIsNone(response["json"])
+    post_mock.assert_called_once()
+
+  def test_create_is_retried_on_connect_timeout(self):
+    success = mocks.MockResponse({"name": "entry"}, 200)
+    with mock.patch(
+        "requests.Session.post",
+        side_effect=[requests.exceptions.ConnectTimeout("Unreachable"), success],
+    ) as post_mock:
+      response = api_call_utils.fetch_api_response(
+          requests.post, "https://datacatalog.googleapis.com/v2/x", "123", {}
+      )
+    self.assertEqual(response, {"json": {"name": "entry"}, "error_msg": None})
+    self.assertEqual(post_mock.call_count, 2)
+
+  def test_retryable_status_codes(self):
+    self.assertEqual(
+        rate_limiter.retryable_status_codes("GET"),
+        rate_limiter.RETRYABLE_STATUS_CODES,
+    )
+    self.assertEqual(
+        rate_limiter.retryable_status_codes("POST"),
+        rate_limiter.THROTTLING_STATUS_CODES,
+    )
+    self.assertEqual(
+        rate_limiter.retryable_status_codes("PATCH", retry_server_errors=False),
+        rate_limiter.THROTTLING_STATUS_CODES,
+    )
+
+
+if __name__ == "__main__":
+  unittest.main()
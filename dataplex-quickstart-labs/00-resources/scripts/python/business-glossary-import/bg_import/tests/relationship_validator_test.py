@@ -0,0 +1,132 @@
+import unittest
+
+import category as bg_category
+import entry_type as EntryType
+import relationship_validator
+import term as bg_term
+
+TERM = EntryType.EntryType.TERM
+CATEGORY = EntryType.EntryType.CATEGORY
+ASSET = "projects/p/locations/us/entryGroups/g/entries/asset:column"
+
+
+class RelationshipValidatorTest(unittest.TestCase):
+
+  def test_valid_relationships(self):
+    terms = {
+        1: bg_term.Term(
+            "Term 1",
+            "Desc",
+            tagged_assets=[ASSET],
+            synonyms=["term 2"],
+            related_terms=["Term 2"],
+            belongs_to_category="Category 2",
+        ),
+        2: bg_term.Term("Term 2", "Desc"),
+    }
+    categories = {
+        1: bg_category.Category("Category 1", "Desc"),
+        2: bg_category.Category(
+            "Category 2", "Desc", belongs_to_category="Category 1"
+        ),
+    }
+
+    self.assertEqual(
+        relationship_validator.validate_relationships(terms, categories), []
+    )
+
+  def test_reports_every_invalid_relationship(self):
+    terms = {
+        1: bg_term.Term(
+            "Term 1",
+            "Desc",
+            tagged_assets=["not an asset"],
+            synonyms=["Term 1"],
+            related_terms=["Missing", "Category 1"],
+            belongs_to_category="Term 2",
+        ),
+        2: bg_term.Term("Term 2", "Desc", belongs_to_category="Missing"),
+    }
+    categories = {
+        1: bg_category.Category(
+            "Category 1", "Desc", belongs_to_category="Category 1"
+        ),
+    }
+
+    errors = relationship_validator.validate_relationships(terms, categories)
+
+    self.assertEqual(
+        [(err.entry_type, err.line, err.column) for err in errors],
+        [
+            (CATEGORY, 1, 4),
+            (TERM, 1, 5),
+            (TERM, 1, 6),
+            (TERM, 1, 6),
+            (TERM, 1, 4),
+            (TERM, 1, 7),
+            (TERM, 2, 7),
+        ],
+    )
+
+  def test_relationships_refer_to_existing_entries(self):
+    terms = {
+        1: bg_term.Term(
+            "Term 1",
+            "Desc",
+            related_terms=["Existing term"],
+            belongs_to_category="Existing category",
+        ),
+    }
+
+    errors = relationship_validator.validate_relationships(
+        terms,
+        None,
+        existing_terms=["Existing term"],
+        existing_categories=["Existing category"],
+    )
+
+    self.assertEqual(errors, [])
+
+  def test_reports_category_cycle_once(self):
+    categories = {
+        1: bg_category.Category("A", "Desc", belongs_to_category="B"),
+        2: bg_category.Category("B", "Desc", belongs_to_category="C"),
+        3: bg_category.Category("C", "Desc", belongs_to_category="A"),
+        4: bg_category.Category("D", "Desc", belongs_to_category="C"),
+    }
+
+    errors = relationship_validator.validate_relationships(None, categories)
+
+    self.assertEqual(len(errors), 1)
+    self.assertEqual(errors[0].line, 1)
+    self.assertCountEqual(errors[0].resources, ["A", "B", "C"])
+
+  def test_reports_categories_nested_too_deep(self):
+    categories = {
+        1: bg_category.Category("Level 1", "Desc"),
+    }
+    for level in range(2, 5):
+      categories[level] = bg_category.Category(
+          f"Level {level}", "Desc", belongs_to_category=f"Level {level - 1}"
+      )
+
+    errors = relationship_validator.validate_relationships(
+        None, categories, max_category_depth=2
+    )
+
+    self.assertEqual([err.line for err in errors], [3, 4])
+
+  def test_categories_below_existing_category_count_its_level(self):
+    categories = {
+        1: bg_category.Category("Child", "Desc", belongs_to_category="Root"),
+    }
+
+    errors = relationship_validator.validate_relationships(
+        None, categories, existing_categories=["Root"], max_category_depth=1
+    )
+
+    self.assertEqual([err.line for err in errors], [1])
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,100 @@
+import os
+import tempfile
+import unittest
+
+import snapshot_cache
+
+_GLOSSARY = "123/us/group/glossary"
+
+
+def _entry(name, modify_time):
+  return {"name": name, "displayName": name, "modifyTime": modify_time}
+
+
+class SnapshotCacheTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    temp_dir = tempfile.TemporaryDirectory()
+    self.addCleanup(temp_dir.cleanup)
+    self.path = os.path.join(temp_dir.name, "snapshot.db")
+
+  def test_save_and_load(self):
+    with snapshot_cache.SnapshotCache(self.path) as snapshot:
+      snapshot.save(_GLOSSARY, [_entry("a", "t1"), _entry("b", "t2")])
+
+    with snapshot_cache.SnapshotCache(self.path) as snapshot:
+      self.assertEqual(
+          snapshot.load(_GLOSSARY),
+          {"a": _entry("a", "t1"), "b": _entry("b", "t2")},
+      )
+      self.assertEqual(snapshot.load("123/us/group/other"), {})
+
+  def test_save_replaces_snapshot(self):
+    with snapshot_cache.SnapshotCache(self.path) as snapshot:
+      snapshot.save(_GLOSSARY, [_entry("a", "t1"), _entry("b", "t2")])
+      snapshot.save(_GLOSSARY, [_entry("b", "t3")])
+
+      self.assertEqual(snapshot.load(_GLOSSARY), {"b": _entry("b", "t3")})
+
+  def test_refresh_ignores_snapshot(self):
+    with snapshot_cache.SnapshotCache(self.path) as snapshot:
+      snapshot.save(_GLOSSARY, [_entry("a", "t1")])
+
+    with snapshot_cache.SnapshotCache(self.path, refresh=True) as snapshot:
+      self.assertEqual(snapshot.load(_GLOSSARY), {})
+
+  def test_invalidate(self):
+    with snapshot_cache.SnapshotCache(self.path) as snapshot:
+      snapshot.save(_GLOSSARY, [_entry("a", "t1")])
+      snapshot.save("123/us/group/other", [_entry("b", "t1")])
+      snapshot.invalidate(_GLOSSARY)
+
+      self.assertEqual(snapshot.load(_GLOSSARY), {})
+      self.assertEqual(
+          snapshot.load("123/us/group/other"), {"b": _entry("b", "t1")}
+      )
+
+  def test_freshness_includes_aspect_modify_times(self):
+    entry = dict(
+        _entry("a", "t1"),
+        coreAspects={"business_context": {"modifyTime": "a1"}},
+    )
+    modified_aspect = dict(
+        _entry("a", "t1"),
+        coreAspects={"business_context": {"modifyTime": "a2"}},
+    )
+
+    self.assertEqual(
+        snapshot_cache.freshness(entry), snapshot_cache.freshness(dict(entry))
+    )
+    self.assertNotEqual(
+        snapshot_cache.freshness(entry),
+        snapshot_cache.freshness(modified_aspect),
+    )
+    self.assertNotEqual(
+        snapshot_cache.freshness(entry),
+        snapshot_cache.freshness(_entry("a", "t1")),
+    )
+    self.assertIsNone(snapshot_cache.freshness({"name": "a"}))
+
+  def test_freshness_without_aspects_compares_entry_version(self):
+    entry = dict(
+        _entry("a", "t1"),
+        etag="e1",
+        coreAspects={"business_context": {"modifyTime": "a1"}},
+    )
+    listed = dict(_entry("a", "t1"), etag="e1")
+
+    self.assertEqual(
+        snapshot_cache.freshness(entry, aspects=False),
+        snapshot_cache.freshness(listed, aspects=False),
+    )
+    self.assertNotEqual(
+        snapshot_cache.freshness(entry, aspects=False),
+        snapshot_cache.freshness(dict(listed, etag="e2"), aspects=False),
+    )
+
+
+if __name__ == "__main__":
+  unittest.main()
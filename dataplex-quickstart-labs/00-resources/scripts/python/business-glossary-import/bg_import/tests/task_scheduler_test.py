@@ -0,0 +1,105 @@
+from concurrent import futures
+import threading
+import unittest
+
+import task_scheduler
+
+
+class DependencySchedulerTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.executor = futures.ThreadPoolExecutor(max_workers=4)
+    self.addCleanup(self.executor.shutdown)
+    self.scheduler = task_scheduler.DependencyScheduler(
+        lambda fn, args: self.executor.submit(fn, *args)
+    )
+    self.calls = []
+    self.lock = threading.Lock()
+
+  def record(self, name):
+    with self.lock:
+      self.calls.append(name)
+    return name
+
+  def test_runs_independent_tasks(self):
+    results = []
+    for name in ("a", "b", "c"):
+      self.scheduler.add(self.record, (name,), on_done=results.append)
+    self.scheduler.run()
+    self.assertCountEqual(results, ["a", "b", "c"])
+
+  def test_task_waits_for_its_dependencies(self):
+    release_b = threading.Event()
+
+    def slow_b():
+      self.assertTrue(release_b.wait(timeout=5))
+      return self.record("b")
+
+    self.scheduler.add(self.record, ("a",), labels=["a"])
+    self.scheduler.add(slow_b, (), labels=["b"])
+    self.scheduler.add(self.record, ("a-b",), depends_on=["a", "b"])
+    # Runs as soon as "a" is done, without waiting for "b"
+    self.scheduler.add(
+        self.record,
+        ("after-a",),
+        depends_on=["a"],
+        on_done=lambda unused_result: release_b.set(),
+    )
+    self.scheduler.run()
+    self.assertEqual(self.calls.index("a-b"), 3)
+    self.assertLess(self.calls.index("after-a"), self.calls.index("b"))
+
+  def test_dependents_of_failed_task_are_skipped(self):
+    skipped = []
+    self.scheduler.add(
+        self.record, ("a",), labels=["a"], succeeded=lambda result: False
+    )
+    self.scheduler.add(self.record, ("b",), labels=["b"])
+    self.scheduler.add(
+        self.record,
+        ("after-a",),
+        labels=["after-a"],
+        depends_on=["a", "b"],
+        on_skipped=lambda: skipped.append("after-a"),
+    )
+    self.scheduler.add(
+        self.record,
+        ("after-after-a",),
+        depends_on=["after-a"],
+        on_skipped=lambda: skipped.append("after-after-a"),
+    )
+    self.scheduler.add(self.record, ("after-b",), depends_on=["b"])
+    self.scheduler.run()
+    self.assertCountEqual(self.calls, ["a", "b", "after-b"])
+    self.assertEqual(skipped, ["after-a", "after-after-a"])
+
+  def test_dependency_on_unknown_label_is_ready(self):
+    self.scheduler.add(self.record, ("a",), depends_on=["unknown"])
+    self.scheduler.run()
+    self.assertEqual(self.calls, ["a"])
+
+  def test_tasks_added_by_callbacks_hold_labels(self):
+    def add_child(unused_result):
+      self.scheduler.add(self.record, ("child",), labels=["group"])
+
+    self.scheduler.add(
+        self.record, ("parent",), labels=["group"], on_done=add_child
+    )
+    self.scheduler.add(self.record, ("last",), depends_on=["group"])
+    self.scheduler.run()
+    self.assertEqual(self.calls, ["parent", "child", "last"])
+
+  def test_task_errors_are_raised(self):
+    self.scheduler.add(lambda: 1 / 0, ())
+    with self.assertRaises(ZeroDivisionError):
+      self.scheduler.run()
+
+  def test_cyclic_dependency_raises(self):
+    self.scheduler.add(self.record, ("a",), labels=["a"], depends_on=["a"])
+    with self.assertRaises(RuntimeError):
+      self.scheduler.run()
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -92,5 +92,12 @@ class TermTest(unittest.TestCase):
         actual_term.term_id, expected_term.term_id
     )
 
+  def test_has_no_instance_dict(self):
+    term = bg_term.Term("test-term-1", "description")
+    self.assertFalse(hasattr(term, "__dict__"))
+    with self.assertRaises(AttributeError):
+      term.unknown_attribute = "value"
+
+
 if __name__ == "__main__":
   unittest.main()
@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 from unittest import mock
 
@@ -98,6 +100,18 @@ Term 1,description2,,,,"""
       )
       self.assertEqual(lines_read, 2)
 
+  def test_read_glossary_csv_duplicate_errors_ignore_whitespace(self):
+    content = """Net  Revenue,description1,,,,
+net revenue,description2,,,,"""
+
+    with mock.patch("builtins.open", mock.mock_open(read_data=content)):
+      _, errors, _ = terms_csv_parser.parse_glossary_csv("")
+      self.assertEqual(len(errors), 1)
+      self.assertEqual(errors[0].line, 2)
+      self.assertEqual(
+          errors[0].message, "The term is duplicated in the CSV file."
+      )
+
   def test_read_glossary_csv_empty_display_name(self):
     content = """ ,description1,<email1>,,,
 \"   \",description2,,,,"""
@@ -147,5 +161,37 @@ Term 1,description2,,,,"""
       self.assertEqual(lines_read, 1)
 
 
+  def test_iter_glossary_csv_streams_terms(self):
+    content = (
+        "term1,description1,<email1>,,,\n"
+        "\n"
+        '"term2","multi\nline description",,,,\n'
+        "term3,description3,data steward,,,\n"
+        "TERM1,duplicated,,,,\n"
+        "term4,description4,,,,"
+    )
+    temp_dir = self.enterContext(tempfile.TemporaryDirectory())
+    path = os.path.join(temp_dir, "terms.csv")
+    with open(path, "w") as csv_file:
+      csv_file.write(content)
+
+    errors = []
+    entries = terms_csv_parser.iter_glossary_csv(path, errors)
+
+    self.assertEqual(next(entries).term.display_name, "term1")
+    self.assertEqual(errors, [])
+    self.assertEqual(
+        [(line, term.display_name) for line, term in entries],
+        [(3, "term2"), (6, "term4")],
+    )
+    self.assertEqual(
+        [(err.line, err.message) for err in errors],
+        [
+            (4, "Error parsing data steward data steward"),
+            (5, "The term is duplicated in the CSV file."),
+        ],
+    )
+
+
 if __name__ == "__main__":
   unittest.main()
@@ -0,0 +1,471 @@
+"""In-process fake of the Data Catalog v2 REST API used by bg_import.
+
+FakeDataCatalog serves entries, relationships and their pagination over HTTP
+on a local port, so the real Glossary code (connection pool, rate limiter,
+retries, thread pool or event loop) can run end to end without network access.
+Latency, server errors and throttling can be injected to see how the import
+behaves under load.
+
+Typical usage example:
+  with fake_datacatalog.FakeDataCatalog(latency_seconds=0.01) as fake:
+    glossary_name = fake.add_glossary("p", "us", "group", "glossary")
+    with mock.patch.object(utils, "DATACATALOG_BASE_URL", fake.base_url):
+      ...import into glossary_name...
+    print(fake.request_counts)
+"""
+
+import collections
+import http.server
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from typing import Any
+from urllib import parse
+
+_DEFAULT_PAGE_SIZE = 50
+_MAX_PAGE_SIZE = 1000
+
+_ENTRY = r"projects/[^/]+/locations/[^/]+/entryGroups/[^/]+/entries/[^/:]+"
+_ENTRIES_PATH = re.compile(
+    r"/v2/(?P<group>projects/[^/]+/locations/[^/]+/entryGroups/[^/]+)/entries"
+)
+_ENTRY_PATH = re.compile(rf"/v2/(?P<entry>{_ENTRY})")
+_RELATIONSHIPS_PATH = re.compile(rf"/v2/(?P<entry>{_ENTRY})/relationships")
+_RELATIONSHIP_PATH = re.compile(
+    rf"/v2/(?P<relationship>{_ENTRY}/relationships/[^/]+)"
+)
+
+
+class _FakeError(Exception):
+  """Error response of the fake API."""
+
+  def __init__(self, code: int, status: str, message: str):
+    super().__init__(message)
+    self.code = code
+    self.status = status
+    self.message = message
+
+  def to_dict(self) -> dict[str, Any]:
+    return {
+        "error": {
+            "code": self.code,
+            "message": self.message,
+            "status": self.status,
+        }
+    }
+
+
+def _not_found(name: str) -> _FakeError:
+  return _FakeError(404, "NOT_FOUND", f"Requested entity was not found: {name}")
+
+
+def _page(
+    items: list[dict[str, Any]], query: dict[str, str], field: str
+) -> dict[str, Any]:
+  """Returns the page of items selected by the pageSize and pageToken."""
+  page_size = int(query.get("pageSize") or _DEFAULT_PAGE_SIZE)
+  page_size = min(max(page_size, 1), _MAX_PAGE_SIZE)
+  start = int(query.get("pageToken") or 0)
+  response = {field: items[start:start + page_size]}
+  if start + page_size < len(items):
+    response["nextPageToken"] = str(start + page_size)
+  return response
+
+
+class FakeDataCatalog:
+  """Fake Data Catalog v2 server running on a background thread.
+
+  Attributes:
+    latency_seconds: Time every request waits before it is answered.
+    error_rate: Fraction of requests answered with HTTP 500.
+    error_methods: HTTP methods of the requests error_rate applies to.
+    throttle_rate: Fraction of requests answered with HTTP 429.
+    retry_after_seconds: Retry-After header of throttled responses.
+    request_counts: Number of requests received, by method, faults included.
+    fault_counts: Number of injected faults, by status code.
+  """
+
+  def __init__(
+      self,
+      latency_seconds: float = 0.0,
+      error_rate: float = 0.0,
+      throttle_rate: float = 0.0,
+      retry_after_seconds: float = 0.0,
+      seed: int = 0,
+  ):
+    self.latency_seconds = latency_seconds
+    self.error_rate = error_rate
+    self.error_methods = frozenset({"GET", "POST", "PATCH", "DELETE"})
+    self.throttle_rate = throttle_rate
+    self.retry_after_seconds = retry_after_seconds
+    self.request_counts: collections.Counter[str] = collections.Counter()
+    self.fault_counts: collections.Counter[int] = collections.Counter()
+    self._random = random.Random(seed)
+    self._lock = threading.Lock()
+    # Entries by resource name, in creation order
+    self._entries: dict[str, dict[str, Any]] = {}
+    # Relationships by source entry name, then by relationship name
+    self._relationships: dict[str, dict[str, dict[str, Any]]] = {}
+    self._server: http.server.ThreadingHTTPServer | None = None
+    self._thread: threading.Thread | None = None
+
+  def __enter__(self) -> "FakeDataCatalog":
+    self.start()
+    return self
+
+  def __exit__(self, *unused_exc_info) -> None:
+    self.stop()
+
+  def start(self) -> None:
+    """Starts serving on a free local port."""
+    self._server = http.server.ThreadingHTTPServer(
+        ("127.0.0.1", 0), _handler_class(self)
+    )
+    self._server.daemon_threads = True
+    # Connections are kept alive, so the default backlog of 5 would reject
+    # the connections of a large worker pool opened at once.
+    self._server.socket.listen(1024)
+    self._thread = threading.Thread(
+        target=self._server.serve_forever,
+        name="fake-datacatalog",
+        daemon=True,
+    )
+    self._thread.start()
+
+  def stop(self) -> None:
+    if self._server is not None:
+      self._server.shutdown()
+      self._server.server_close()
+      self._thread.join()
+      self._server, self._thread = None, None
+
+  @property
+  def base_url(self) -> str:
+    """URL to use in place of utils.DATACATALOG_BASE_URL."""
+    host, port = self._server.server_address[:2]
+    return f"http://{host}:{port}/v2"
+
+  def reset(self) -> None:
+    """Deletes all entries and relationships and clears the counters."""
+    with self._lock:
+      self._entries.clear()
+      self._relationships.clear()
+      self.request_counts.clear()
+      self.fault_counts.clear()
+
+  def add_glossary(
+      self, project: str, location: str, entry_group: str, glossary_id: str
+  ) -> str:
+    """Creates an empty glossary and returns its resource name."""
+    name = (
+        f"projects/{project}/locations/{location}/entryGroups/{entry_group}"
+        f"/entries/{glossary_id}"
+    )
+    self.add_entry(name, "glossary", glossary_id)
+    return name
+
+  def add_entry(
+      self,
+      name: str,
+      entry_type: str,
+      display_name: str,
+      description: str = "",
+      parent: str | None = None,
+  ) -> dict[str, Any]:
+    """Creates an entry directly, e.g. an existing term or a tagged asset.
+
+    Args:
+      name: Resource name of the entry.
+      entry_type: glossary, glossary_term, glossary_category or any other
+        type for assets.
+      display_name: Display name of the entry.
+      description: Description in the business context aspect.
+      parent: Resource name of the glossary the entry is a child of, if any.
+
+    Returns:
+      The entry as returned by the API.
+    """
+    entry = _new_entry(
+        name,
+        entry_type,
+        display_name,
+        {"description": description, "contacts": []},
+        parent,
+    )
+    with self._lock:
+      self._entries[name] = entry
+    return entry
+
+  def entries(self, entry_type: str | None = None) -> list[dict[str, Any]]:
+    """Returns the entries, optionally only those of one type."""
+    with self._lock:
+      return [
+          entry
+          for entry in self._entries.values()
+          if entry_type is None or entry["entryType"] == entry_type
+      ]
+
+  def relationships(self) -> list[dict[str, Any]]:
+    """Returns all relationships."""
+    with self._lock:
+      return [
+          relationship
+          for relationships in self._relationships.values()
+          for relationship in relationships.values()
+      ]
+
+  def _inject_fault(self, method: str) -> _FakeError | None:
+    """Draws whether the current request fails, and how."""
+    with self._lock:
+      draw = self._random.random()
+    if draw < self.throttle_rate:
+      return _FakeError(429, "RESOURCE_EXHAUSTED", "Quota exceeded.")
+    if (
+        draw < self.throttle_rate + self.error_rate
+        and method in self.error_methods
+    ):
+      return _FakeError(500, "INTERNAL", "Internal error.")
+    return None
+
+  def handle(
+      self, method: str, url: str, body: dict[str, Any] | None
+  ) -> tuple[int, bytes]:
+    """Answers a request.
+
+    Args:
+      method: HTTP method.
+      url: Path and query of the request.
+      body: Decoded JSON body, if any.
+
+    Returns:
+      HTTP status code and JSON encoded body of the response.
+    """
+    with self._lock:
+      self.request_counts[method] += 1
+    if self.latency_seconds:
+      time.sleep(self.latency_seconds)
+    fault = self._inject_fault(method)
+    if fault is not None:
+      with self._lock:
+        self.fault_counts[fault.code] += 1
+      return fault.code, json.dumps(fault.to_dict()).encode()
+
+    split = parse.urlsplit(url)
+    path = parse.unquote(split.path)
+    query = dict(parse.parse_qsl(split.query))
+    with self._lock:
+      try:
+        status, response = 200, self._route(method, path, query, body or {})
+      except _FakeError as err:
+        status, response = err.code, err.to_dict()
+      # Encoded under the lock, as entries are changed in place
+      return status, json.dumps(response).encode()
+
+  def _route(
+      self,
+      method: str,
+      path: str,
+      query: dict[str, str],
+      body: dict[str, Any],
+  ) -> dict[str, Any]:
+    """Dispatches a request to the method implementing it."""
+    if match := _ENTRIES_PATH.fullmatch(path):
+      if method == "GET":
+        return self._list_entries(match["group"], query)
+      if method == "POST":
+        return self._create_entry(match["group"], query, body)
+    elif match := _RELATIONSHIPS_PATH.fullmatch(path):
+      if method == "GET":
+        return self._list_relationships(match["entry"], query)
+      if method == "POST":
+        return self._create_relationship(match["entry"], body)
+    elif match := _RELATIONSHIP_PATH.fullmatch(path):
+      if method == "DELETE":
+        return self._delete_relationship(match["relationship"])
+    elif match := _ENTRY_PATH.fullmatch(path):
+      if method == "GET":
+        return self._get_entry(match["entry"])
+      if method == "PATCH":
+        return self._update_entry(match["entry"], body)
+      if method == "DELETE":
+        return self._delete_entry(match["entry"])
+    raise _FakeError(404, "NOT_FOUND", f"No method {method} {path}.")
+
+  def _get_entry(self, name: str) -> dict[str, Any]:
+    entry = self._entries.get(name)
+    if entry is None:
+      raise _not_found(name)
+    return entry
+
+  def _list_entries(
+      self, group: str, query: dict[str, str]
+  ) -> dict[str, Any]:
+    prefix = f"{group}/entries/"
+    entries = [
+        entry for name, entry in self._entries.items()
+        if name.startswith(prefix)
+    ]
+    if query.get("view") == "BASIC":
+      entries = [
+          {key: value for key, value in entry.items() if key != "coreAspects"}
+          for entry in entries
+      ]
+    return _page(entries, query, "entries")
+
+  def _create_entry(
+      self, group: str, query: dict[str, str], body: dict[str, Any]
+  ) -> dict[str, Any]:
+    if not query.get("entry_id"):
+      raise _FakeError(400, "INVALID_ARGUMENT", "Missing entry_id.")
+    name = f"{group}/entries/{query['entry_id']}"
+    if name in self._entries:
+      raise _FakeError(409, "ALREADY_EXISTS", f"Entry {name} already exists.")
+    parent = body.get("core_relationships", {}).get("destination_entry_name")
+    if parent is not None and parent not in self._entries:
+      raise _not_found(parent)
+    aspect = body.get("core_aspects", {}).get("business_context", {})
+    entry = _new_entry(
+        name,
+        body.get("entry_type"),
+        body.get("display_name"),
+        aspect.get("json_content", {}),
+        parent,
+    )
+    self._entries[name] = entry
+    return entry
+
+  def _update_entry(self, name: str, body: dict[str, Any]) -> dict[str, Any]:
+    entry = self._get_entry(name)
+    aspect = body.get("core_aspects", {}).get("business_context", {})
+    entry["coreAspects"]["business_context"]["jsonContent"] = aspect.get(
+        "json_content", {}
+    )
+    entry["modifyTime"] = _now()
+    return entry
+
+  def _delete_entry(self, name: str) -> dict[str, Any]:
+    self._get_entry(name)
+    del self._entries[name]
+    self._relationships.pop(name, None)
+    for relationships in self._relationships.values():
+      for relationship_name, relationship in list(relationships.items()):
+        if relationship["destinationEntryName"] == name:
+          del relationships[relationship_name]
+    return {}
+
+  def _list_relationships(
+      self, name: str, query: dict[str, str]
+  ) -> dict[str, Any]:
+    self._get_entry(name)
+    relationships = list(self._relationships.get(name, {}).values())
+    if query.get("view") == "FULL":
+      relationships = [
+          dict(
+              relationship,
+              sourceEntry=self._entries[name],
+              destinationEntry=self._entries[
+                  relationship["destinationEntryName"]
+              ],
+          )
+          for relationship in relationships
+      ]
+    return _page(relationships, query, "relationships")
+
+  def _create_relationship(
+      self, source: str, body: dict[str, Any]
+  ) -> dict[str, Any]:
+    self._get_entry(source)
+    destination = body.get("destination_entry_name", "")
+    self._get_entry(destination)
+    relationship = {
+        "name": f"{source}/relationships/{uuid.uuid4().hex}",
+        "relationshipType": body.get("relationship_type"),
+        "sourceEntryName": source,
+        "destinationEntryName": destination,
+    }
+    if body.get("source_column"):
+      relationship["sourceColumn"] = body["source_column"]
+    self._relationships.setdefault(source, {})[
+        relationship["name"]
+    ] = relationship
+    return relationship
+
+  def _delete_relationship(self, name: str) -> dict[str, Any]:
+    source = name.split("/relationships/")[0]
+    if self._relationships.get(source, {}).pop(name, None) is None:
+      raise _not_found(name)
+    return {}
+
+
+def _new_entry(
+    name: str,
+    entry_type: str,
+    display_name: str,
+    business_context: dict[str, Any],
+    parent: str | None,
+) -> dict[str, Any]:
+  """Returns an entry in the format of the API."""
+  entry = {
+      "name": name,
+      "entryUid": str(uuid.uuid4()),
+      "entryType": entry_type,
+      "displayName": display_name,
+      "modifyTime": _now(),
+      "coreAspects": {
+          "business_context": {
+              "aspectType": "business_context",
+              "jsonContent": business_context,
+          }
+      },
+  }
+  if parent is not None:
+    entry["coreRelationships"] = [{
+        "relationshipType": "is_child_of",
+        "destinationEntryName": parent,
+    }]
+  return entry
+
+
+def _now() -> str:
+  """Returns the current time in the RFC 3339 format of the API."""
+  now = time.time()
+  microseconds = int(now % 1 * 1_000_000)
+  return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(now)) + (
+      f".{microseconds:06d}Z"
+  )
+
+
+def _handler_class(
+    fake: FakeDataCatalog,
+) -> type[http.server.BaseHTTPRequestHandler]:
+  """Returns a request handler class answering with fake."""
+
+  class Handler(http.server.BaseHTTPRequestHandler):
+    # Keeps connections alive, like the real API
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, which Nagle's algorithm would
+    # delay until the client acknowledges the headers
+    disable_nagle_algorithm = True
+
+    def _respond(self) -> None:
+      length = int(self.headers.get("Content-Length") or 0)
+      raw_body = self.rfile.read(length) if length else b""
+      body = json.loads(raw_body) if raw_body else None
+      status, content = fake.handle(self.command, self.path, body)
+      self.send_response(status)
+      self.send_header("Content-Type", "application/json")
+      self.send_header("Content-Length", str(len(content)))
+      if status == 429:
+        self.send_header("Retry-After", f"{fake.retry_after_seconds:g}")
+      self.end_headers()
+      self.wfile.write(content)
+
+    do_GET = do_POST = do_PATCH = do_DELETE = _respond
+
+    def log_message(self, *unused_args) -> None:
+      pass
+
+  return Handler
@@ -12,6 +12,7 @@ class MockResponse():
     json_data: str
     ok:  bool
     reason: str
+    headers: Dict
   """
 
   def __init__(self, json_data, status_code):
@@ -19,6 +20,8 @@ class MockResponse():
     self.json_data = None if self.status_code in (502, 400) else json_data
     self.ok = self.status_code == 200
     self.reason = "OK" if self.status_code == 200 else "Request error"
+    self.text = "" if json_data is None else str(json_data)
+    self.headers = {}
 
   def json(self):
     return self.json_data
@@ -49,7 +52,7 @@ def mocked_get_api_response(url, headers=None, json=None):  # pylint: disable=un
         Glossary entry doesn't exist.
     5. ListEntries:
       r".+/v2/projects/.+/locations/.+/entryGroups
-      /test_entry_group_with_no_terms/entries?view=FULL$"
+      /test_entry_group_with_no_terms/entries?view=FULL&pageSize=<page_size>$"
         Glossary entry exists, but there are no terms associated to it.
     6. GetEntry:
       r".+/v2/projects/.+/locations/.+/entryGroups
@@ -57,7 +60,7 @@ def mocked_get_api_response(url, headers=None, json=None):  # pylint: disable=un
         Glossary entry exists, but there are no terms associated to it.
     7. ListEntries:
       r".+/v2/projects/.+/locations/.+/entryGroups
-      /test_entry_group_with_terms/entries?view=FULL$"
+      /test_entry_group_with_terms/entries?view=FULL&pageSize=<page_size>$"
         Glossary entry exists and there are terms associated to it.
     8. GetEntry:
       r".+/v2/projects/123/locations/us/entryGroups
@@ -65,7 +68,7 @@ def mocked_get_api_response(url, headers=None, json=None):  # pylint: disable=un
         Glossary entry exists and there are terms associated to it.
     9. ListEntries:
       r".+/v2/projects/.+/locations/.+/entryGroups
-      /test_entry_group_with_categories_and_terms/entries?view=FULL$"
+      /test_entry_group_with_categories_and_terms/entries?view=FULL&pageSize=<page_size>$"
         Glossary entry exists and there are categories and terms associated to
         it.
     10. GetEntry:
@@ -75,7 +78,7 @@ def mocked_get_api_response(url, headers=None, json=None):  # pylint: disable=un
         it.
     11. ListEntries:
       r".+/v2/projects/.+/locations/.+/entryGroups
-      /test_entry_group_with_categories/entries?view=FULL$"
+      /test_entry_group_with_categories/entries?view=FULL&pageSize=<page_size>$"
         Glossary entry exists and there are categories and terms associated to
         it.
     12. GetEntry:
@@ -131,7 +134,7 @@ def mocked_get_api_response(url, headers=None, json=None):  # pylint: disable=un
   elif re.fullmatch(
       (
           ".+/v2/projects/.+/locations/.+/"
-          r"entryGroups/test_entry_group_with_no_terms/entries\?view=FULL$"
+          r"entryGroups/test_entry_group_with_no_terms/entries\?view=FULL&pageSize=\d+$"
       ),
       url,
   ):
@@ -208,7 +211,7 @@ def mocked_get_api_response(url, headers=None, json=None):  # pylint: disable=un
   elif re.fullmatch(
       (
           ".+/v2/projects/.+/locations/.+/"
-          r"entryGroups/test_entry_group_with_terms/entries\?view=FULL$"
+          r"entryGroups/test_entry_group_with_terms/entries\?view=FULL&pageSize=\d+$"
       ),
       url,
   ):
@@ -321,7 +324,7 @@ def mocked_get_api_response(url, headers=None, json=None):  # pylint: disable=un
   elif re.fullmatch(
       (
           ".+/v2/projects/.+/locations/.+/"
-          r"entryGroups/test_entry_group_with_categories_and_terms/entries\?view=FULL$"
+          r"entryGroups/test_entry_group_with_categories_and_terms/entries\?view=FULL&pageSize=\d+$"
       ),
       url,
   ):
@@ -467,7 +470,7 @@ def mocked_get_api_response(url, headers=None, json=None):  # pylint: disable=un
   elif re.fullmatch(
       (
           ".+/v2/projects/.+/locations/.+/"
-          r"entryGroups/test_entry_group_with_categories/entries\?view=FULL$"
+          r"entryGroups/test_entry_group_with_categories/entries\?view=FULL&pageSize=\d+$"
       ),
       url,
   ):
@@ -0,0 +1,166 @@
+import threading
+import unittest
+from unittest import mock
+
+import http_session
+import rate_limiter
+import utils
+from tests.test_utils import fake_datacatalog
+
+_ENTRIES = "projects/123/locations/us/entryGroups/group/entries"
+
+
+class FetchEntriesTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.fake = self.enterContext(fake_datacatalog.FakeDataCatalog())
+    self.fake.add_glossary("123", "us", "group", "glossary")
+    for i in range(9):
+      self.fake.add_entry(
+          f"{_ENTRIES}/term_{i}",
+          "glossary_term",
+          f"Term {i}",
+          parent=f"{_ENTRIES}/glossary",
+      )
+    self.enterContext(
+        mock.patch.object(utils, "DATACATALOG_BASE_URL", self.fake.base_url)
+    )
+    self.enterContext(mock.patch.object(utils, "PAGE_SIZE", 2))
+    rate_limiter.configure(max_rate=10000)
+    self.addCleanup(rate_limiter.configure)
+    self.addCleanup(http_session.configure)
+
+  def _producers(self):
+    return [
+        thread
+        for thread in threading.enumerate()
+        if thread.name == "entry-page-prefetch"
+    ]
+
+  def test_yields_entries_of_all_pages(self):
+    entries = utils.fetch_entries("123", "123", "us", "group")
+
+    self.assertEqual(self.fake.request_counts["GET"], 0)
+    names = [entry["name"] for entry in entries]
+
+    self.assertCountEqual(
+        names,
+        [f"{_ENTRIES}/glossary"] + [f"{_ENTRIES}/term_{i}" for i in range(9)],
+    )
+    # Each page is fetched once
+    self.assertEqual(self.fake.request_counts["GET"], 5)
+    self.assertEqual(self._producers(), [])
+
+  def test_closing_the_iterator_stops_fetching(self):
+    entries = utils.fetch_entries("123", "123", "us", "group")
+
+    next(entries)
+    entries.close()
+
+    # The page read, the pages ahead and at most one request in flight
+    self.assertLessEqual(
+        self.fake.request_counts["GET"], 1 + utils.ENTRY_PAGES_AHEAD + 1
+    )
+    self.assertEqual(self._producers(), [])
+
+  def test_failed_page_ends_program(self):
+    with mock.patch.object(
+        utils.api_call_utils,
+        "fetch_api_response",
+        return_value={"json": None, "error_msg": "Denied"},
+    ):
+      with self.assertRaises(SystemExit):
+        list(utils.fetch_entries("123", "123", "us", "group"))
+    self.assertEqual(self._producers(), [])
+
+  def test_relationships_are_fetched_while_listing(self):
+    listed = []
+
+    relationships = utils.fetch_all_relationships(
+        utils.record_entries(
+            utils.fetch_entries("123", "123", "us", "group"), listed
+        ),
+        "123",
+        "123",
+    )
+
+    self.assertEqual(len(listed), 10)
+    self.assertCountEqual(relationships, [entry["name"] for entry in listed])
+
+
+class FetchRelationshipsTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.fetch_api_response = self.enterContext(
+        mock.patch.object(utils.api_call_utils, "fetch_api_response")
+    )
+
+  def test_fetches_all_pages(self):
+    self.fetch_api_response.side_effect = [
+        {
+            "json": {"relationships": [{"name": "a"}], "nextPageToken": "t"},
+            "error_msg": None,
+        },
+        {"json": {"relationships": [{"name": "b"}]}, "error_msg": None},
+    ]
+
+    relationships = utils.fetch_relationships(f"{_ENTRIES}/term", "123")
+
+    self.assertEqual(relationships, [{"name": "a"}, {"name": "b"}])
+    self.assertTrue(
+        self.fetch_api_response.call_args.args[1].endswith("&pageToken=t")
+    )
+
+  def test_failed_page_raises(self):
+    self.fetch_api_response.return_value = {"json": None, "error_msg": "Denied"}
+
+    with self.assertRaisesRegex(ValueError, "Denied"):
+      utils.fetch_relationships(f"{_ENTRIES}/term", "123")
+
+
+class FetchAllRelationshipsTest(unittest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.slow_entry_released = threading.Event()
+    self.enterContext(
+        mock.patch.object(
+            utils, "fetch_relationships", side_effect=self._fetch_relationships
+        )
+    )
+
+  def _fetch_relationships(self, entry_name, unused_user_project):
+    if entry_name == "slow":
+      self.slow_entry_released.wait(timeout=5)
+    if entry_name == "failing":
+      raise ValueError("Denied")
+    return [{"name": f"{entry_name}/relationships/r"}]
+
+  def test_slow_entry_does_not_hold_back_others(self):
+    entries = [{"name": "slow"}] + [{"name": f"e{i}"} for i in range(20)]
+    fetched = utils.iter_all_relationships(entries, "123", max_workers=2)
+
+    first_names = [next(fetched)[0] for _ in range(20)]
+    self.assertNotIn("slow", first_names)
+    self.slow_entry_released.set()
+
+    self.assertEqual([name for name, _ in fetched], ["slow"])
+
+  def test_failed_entry_is_skipped(self):
+    entries = [{"name": "e1"}, {"name": "failing"}, {"name": "e2"}]
+
+    relationships = utils.fetch_all_relationships(entries, "123", "123")
+
+    self.assertEqual(
+        relationships,
+        {
+            "e1": [{"name": "e1/relationships/r"}],
+            "e2": [{"name": "e2/relationships/r"}],
+        },
+    )
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -71,6 +71,36 @@ def print_report(
   _print_statistics(lines_read, imported_entries)
 
 
+def print_streaming_report(
+    lines_read: dict[entry_type_lib.EntryType, int],
+    imported_entries: dict[entry_type_lib.EntryType, int],
+    imported_relations: dict[entry_type_lib.EntryType, int],
+    import_errors: list[error.EntryImportError],
+) -> None:
+  """Implements the User Report generated after a streaming import.
+
+  Reports errors and statistics like print_report, but only the numbers of
+  imported entries and relationships, as a streaming import doesn't keep them.
+
+  Args:
+    lines_read: A dictionary mapping entry type (Term, Category) to number of
+      entries in the original CSV file.
+    imported_entries: A dictionary mapping entry type to the number of entries
+      that were successfully created.
+    imported_relations: A dictionary mapping entry type to the number of
+      relationships successfully created from entries of that type.
+    import_errors: List of all error instances that happened during import.
+  """
+  _print_import_errors(import_errors)
+  for entries_name, entry_type in entries_name_type_pairs:
+    if imported_relations.get(entry_type):
+      logger.info(
+          f"Relationships successfully imported from {entries_name} csv:"
+          f" {imported_relations[entry_type]}."
+      )
+  _print_entry_counts(lines_read, imported_entries)
+
+
 def _print_import_errors(import_errors: list[error.EntryImportError]) -> None:
   if import_errors:
     logger.info("Import errors report:")
@@ -145,9 +175,22 @@ def _print_statistics(
       bg_category.Category]] A dictionary mapping entry type to list of all
       entries (Terms or Categories) that were successfully created.
   """
+  _print_entry_counts(
+      lines_read,
+      {
+          entry_type: len(entries)
+          for entry_type, entries in imported_entries.items()
+      },
+  )
+
+
+def _print_entry_counts(
+    lines_read: dict[entry_type_lib.EntryType, int],
+    imported_counts: dict[entry_type_lib.EntryType, int],
+) -> None:
   for entries_name, entry_type in entries_name_type_pairs:
-    if entry_type in lines_read and entry_type in imported_entries:
-      imported_entries_count = len(imported_entries[entry_type])
+    if entry_type in lines_read and entry_type in imported_counts:
+      imported_entries_count = imported_counts[entry_type]
       parsed_entries_count = lines_read[entry_type]
       logger.info(f"Statistics of imported {entries_name}:")
       logger.info(
@@ -2,18 +2,23 @@
 """
 
 import argparse
+import itertools
 import os
+import queue
 import sys
+import threading
 import error
 import import_mode as import_mode_lib
 import logging_utils
-from typing import Any, List, Dict
+from typing import Any, Iterable, Iterator, List, Dict, Tuple
 import api_call_utils
+import http_session
+import rate_limiter
+import relationship_validator
 import requests
 import re
 import time
-import math
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 
 logger = logging_utils.get_logger()
@@ -21,6 +26,9 @@ DATACATALOG_BASE_URL = "https://datacatalog.googleapis.com/v2"
 DATAPLEX_BASE_URL = "https://dataplex.googleapis.com/v1"
 PAGE_SIZE = 1000
 MAX_WORKERS = 20
+# Pages of entries fetched ahead of the caller of fetch_entries.
+ENTRY_PAGES_AHEAD = 2
+STREAMING_WINDOW_SIZE = 1000
 GLOSSARY_PATH_REGEX = "glossaries/"
 
 def access_token_exists() -> bool:
@@ -104,6 +112,63 @@ def glossary_argument_parser(parser: argparse.Namespace) -> None:
         type=str,
     )
 
+def http_argument_parser(parser: argparse.ArgumentParser) -> None:
+  """Defines flags configuring the shared HTTP connection pool and rate limiter.
+
+  Args:
+    parser: argparse.ArgumentParser().
+  """
+  parser.add_argument(
+      "--http-pool-size",
+      help=(
+          "Maximum number of connections kept open per API host. The default"
+          f" value is {http_session.DEFAULT_POOL_SIZE}."
+      ),
+      metavar="<pool_size>",
+      default=http_session.DEFAULT_POOL_SIZE,
+      type=int,
+  )
+  parser.add_argument(
+      "--no-keep-alive",
+      help="Open a new connection for every API call instead of reusing them.",
+      action="store_true",
+  )
+  parser.add_argument(
+      "--max-requests-per-second",
+      help=(
+          "Upper bound of the API request rate. By default the rate is not"
+          " capped, the number of calls in flight is lowered automatically"
+          " when the API throttles requests and raised back afterwards."
+      ),
+      metavar="<max_rate>",
+      default=None,
+      type=float,
+  )
+
+
+def configure_http_session(args: argparse.Namespace) -> None:
+  """Configures the shared HTTP pool and rate limiter from run arguments."""
+  pool_size = vars(args).get("http_pool_size") or http_session.DEFAULT_POOL_SIZE
+  if pool_size < 1:
+    logger.error("--http-pool-size must be a positive integer.")
+    sys.exit(1)
+  max_workers = vars(args).get("max_workers")
+  if max_workers and max_workers > pool_size:
+    logger.warning(
+        f"--max-workers ({max_workers}) is greater than --http-pool-size"
+        f" ({pool_size}), some workers will wait for a free connection."
+    )
+  http_session.configure(
+      pool_size=pool_size,
+      keep_alive=not vars(args).get("no_keep_alive", False),
+  )
+  max_rate = vars(args).get("max_requests_per_second")
+  if max_rate is not None and max_rate <= 0:
+    logger.error("--max-requests-per-second must be a positive number.")
+    sys.exit(1)
+  rate_limiter.configure(max_rate=max_rate)
+
+
 def configure_argument_parser(parser: argparse.ArgumentParser) -> None:
   """Defines flags and parses arguments related to preprocess_csv().
 
@@ -112,6 +177,7 @@ def configure_argument_parser(parser: argparse.ArgumentParser) -> None:
   """
   
   glossary_argument_parser(parser)
+  http_argument_parser(parser)
   parser.add_argument(
       "terms_csv_legacy",
       help="Path to the CSV file containing the terms data to import.",
@@ -131,9 +197,29 @@ def configure_argument_parser(parser: argparse.ArgumentParser) -> None:
       metavar="[Terms CSV file]",
       type=str,
   )
+  parser.add_argument(
+      "--max-workers",
+      help=(
+          "Maximum number of API calls in flight during import. The default"
+          f" value is {MAX_WORKERS}."
+      ),
+      metavar="<max_workers>",
+      default=MAX_WORKERS,
+      type=int,
+  )
+  parser.add_argument(
+      "--async",
+      help=(
+          "Send API calls from an asyncio event loop instead of worker"
+          " threads. --max-workers then sets the number of requests in flight"
+          " and can be set in the hundreds."
+      ),
+      dest="use_async",
+      action="store_true",
+  )
   parser.add_argument(
       "--import-mode",
-      choices=["strict", "clear"],
+      choices=["strict", "clear", "diff"],
       default="strict",
       type=str,
       help=(
@@ -143,8 +229,127 @@ def configure_argument_parser(parser: argparse.ArgumentParser) -> None:
           " and if it does, stops executing the program.\n"
           "clear\tRemove all the pre-existing entries in the target glossary"
           " before proceeding with validation and import.\n"
+          "diff\tCompare the CSV files with the target glossary and only"
+          " create, update or delete the entries and relationships that"
+          " differ.\n"
       )
   )
+  parser.add_argument(
+      "--journal",
+      help=(
+          "Record the entries and relationships created by the import in"
+          " a journal at this path, so that an interrupted run can be"
+          " resumed with --resume. No journal is written unless --journal or"
+          " --resume is given."
+      ),
+      metavar="<journal_path>",
+      type=str,
+  )
+  parser.add_argument(
+      "--resume",
+      help=(
+          "Resume an interrupted import: entries and relationships recorded"
+          " in the journal are not created again. Use the same CSV files,"
+          " glossary and --journal as the interrupted run. Without"
+          " --journal, the journal is a file named after the target glossary"
+          " in the working directory."
+      ),
+      action="store_true",
+  )
+  parser.add_argument(
+      "--metrics-file",
+      help=(
+          "Path of a file receiving the number, latency, retries, bytes and"
+          " throughput of the API calls of each phase of the import."
+      ),
+      metavar="<metrics_path>",
+      type=str,
+  )
+  parser.add_argument(
+      "--metrics-format",
+      choices=["json", "prometheus"],
+      default="json",
+      help="Format of the --metrics-file report. The default is json.",
+      type=str,
+  )
+  parser.add_argument(
+      "--plan",
+      help=(
+          "Parse the CSV files and compare them with the target glossary,"
+          " then print the API calls the import would make and an estimate"
+          " of its duration, without changing the glossary."
+      ),
+      action="store_true",
+  )
+  parser.add_argument(
+      "--max-category-depth",
+      help=(
+          "Maximum number of nested levels of categories. Imports with deeper"
+          " categories are rejected before any change is made. The default"
+          f" value is {relationship_validator.MAX_CATEGORY_DEPTH}."
+      ),
+      metavar="<max_category_depth>",
+      default=relationship_validator.MAX_CATEGORY_DEPTH,
+      type=int,
+  )
+  parser.add_argument(
+      "--deterministic-ids",
+      help=(
+          "Derive the ids of new terms and categories from a hash of the"
+          " glossary and their display name instead of a random suffix."
+          " Importing the same CSV file again then produces the same ids, and"
+          " a create retried after a lost response is recognized as done."
+      ),
+      action="store_true",
+  )
+  parser.add_argument(
+      "--snapshot-cache",
+      help=(
+          "Path of a local SQLite file keeping a snapshot of the target"
+          " glossary entries between runs. Only the entries modified since the"
+          " previous run are then fetched in full."
+      ),
+      metavar="<snapshot_path>",
+      type=str,
+  )
+  parser.add_argument(
+      "--streaming",
+      help=(
+          "Import a terms CSV file too large to hold in memory: terms are"
+          " parsed into a temporary file, then validated and imported"
+          " --window-size terms at a time, and their relationships once all"
+          " terms exist. Not available in diff mode or with --plan."
+      ),
+      action="store_true",
+  )
+  parser.add_argument(
+      "--window-size",
+      help=(
+          "Number of terms or relationships held in memory at once by a"
+          f" --streaming import. The default value is {STREAMING_WINDOW_SIZE}."
+      ),
+      metavar="<window_size>",
+      default=STREAMING_WINDOW_SIZE,
+      type=int,
+  )
+  parser.add_argument(
+      "--refresh-snapshot",
+      help=(
+          "Ignore the stored snapshot of the target glossary and replace it"
+          " with freshly fetched entries."
+      ),
+      action="store_true",
+  )
+
+
+def get_journal_path(args: argparse.Namespace) -> str:
+  """Returns the path of the import journal of the target glossary."""
+  if args.journal:
+    return args.journal
+  return (
+      f"bg_import_{args.project}_{args.location}_{args.group}_{args.glossary}"
+      ".journal"
+  )
 
 
 def display_parsing_errors(errors: list[error.ParseError]) -> None:
@@ -188,6 +393,39 @@ def validate_args(args: argparse.Namespace) -> None:
         " passed in --terms-csv argument."
     )
 
+  if args.max_workers < 1:
+    logger.error("--max-workers must be a positive integer.")
+    sys.exit(1)
+
+  if args.max_category_depth < 1:
+    logger.error("--max-category-depth must be a positive integer.")
+    sys.exit(1)
+
+  if args.refresh_snapshot and not args.snapshot_cache:
+    logger.error("--refresh-snapshot requires --snapshot-cache.")
+    sys.exit(1)
+
+  if args.window_size < 1:
+    logger.error("--window-size must be a positive integer.")
+    sys.exit(1)
+
+  if args.streaming:
+    if not args.terms_csv and not args.terms_csv_legacy:
+      logger.error("--streaming requires a terms CSV file.")
+      sys.exit(1)
+    if get_import_mode(args) == import_mode_lib.ImportMode.DIFF:
+      logger.error("--streaming is not available in diff mode.")
+      sys.exit(1)
+    if args.plan:
+      logger.error("--streaming can't be used with --plan.")
+      sys.exit(1)
+
+  if args.resume and get_import_mode(args) == import_mode_lib.ImportMode.DIFF:
+    logger.warning(
+        "--resume is not needed in diff mode, which only imports what is"
+        " still missing."
+    )
+
   _verify_csv_file_existence(args, "terms_csv_legacy")
   _verify_csv_file_existence(args, "terms_csv", prefix="--")
   _verify_csv_file_existence(args, "categories_csv", prefix="--")
@@ -220,6 +458,7 @@ def get_export_arguments() -> argparse.Namespace:
         formatter_class=argparse.RawTextHelpFormatter
     )
     glossary_argument_parser(parser)
+    http_argument_parser(parser)
     configure_export_argument_parser(parser)
     return parser.parse_args()
 
@@ -317,6 +556,7 @@ def configure_export_v2_arg_parser(parser: argparse.ArgumentParser) -> None:
     location, and output JSON file path.
     """
     glossary_argument_parser(parser)
+    http_argument_parser(parser)
 
     parser.add_argument(
         "--user-project",
@@ -352,6 +592,19 @@ def configure_export_v2_arg_parser(parser: argparse.ArgumentParser) -> None:
         type=str,
     )
 
+    parser.add_argument(
+        "--definition-links",
+        choices=["per_term", "by_asset"],
+        default="per_term",
+        type=str,
+        help=(
+            "Sets how definition (term-entry) links are found:\n"
+            "per_term\tSearch the assets tagged with each term and scan each asset for the term.\n"
+            "by_asset\tSearch the assets of many terms at once and read the links of all terms\n"
+            "\tfrom each asset once. Faster when terms tag many of the same assets.\n"
+        )
+    )
+
     parser.add_argument(
     "--url",
     help=(
@@ -411,123 +664,212 @@ def fetch_relationships(entry_name: str, user_project: str, view:str = "FULL") -
 
     Returns:
         A list of dictionaries containing the relationships.
+
+    Raises:
+        ValueError: A page of relationships could not be fetched.
     """
     fetch_relationships_url = (
         DATACATALOG_BASE_URL + f"/{entry_name}/relationships?view={view}&pageSize={PAGE_SIZE}"
     )
-
-    response = api_call_utils.fetch_api_response(
-        requests.get, fetch_relationships_url, user_project
-    )
-    if response["error_msg"]:
-        logger.error(f"Error fetching relationships: {response['error_msg']}")
-        sys.exit(1)
-    relationships = response["json"].get("relationships", [])
-    next_page_token = response["json"].get("nextPageToken", None)
-    while next_page_token:
-        # Fetch the next page of relationships
-        fetch_next_page_url = (
-            DATACATALOG_BASE_URL + f"/{entry_name}/relationships?view={view}&pageSize={PAGE_SIZE}&pageToken={next_page_token}"
-        )
+    relationships = []
+    next_page_token = None
+    while True:
+        if next_page_token:
+            endpoint_url = f"{fetch_relationships_url}&pageToken={next_page_token}"
+        else:
+            endpoint_url = fetch_relationships_url
         response = api_call_utils.fetch_api_response(
-            requests.get, fetch_next_page_url, user_project
+            requests.get, endpoint_url, user_project
         )
         if response["error_msg"]:
-            logger.error(f"Error fetching relationships: {response['error_msg']}")
-            sys.exit(1)
-
+            raise ValueError(
+                f"Error fetching relationships of {entry_name}: {response['error_msg']}"
+            )
         relationships.extend(response["json"].get("relationships", []))
+        # Fetch the next page of relationships, if any
         next_page_token = response["json"].get("nextPageToken", None)
+        if not next_page_token:
+            return relationships
+
+
+def iter_all_relationships(
+    entries: Iterable[Dict[str, Any]], user_project: str, max_workers: int = MAX_WORKERS
+) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """Yields the relationships of all entries as soon as each is fetched.
+
+    Workers are fed continuously: as soon as the relationships of an entry are
+    fetched, the next entry is submitted, so that an entry with many pages of
+    relationships only keeps its own worker busy. Entries are read from the
+    iterable as workers need them, with at most max_workers entries waiting
+    for a worker.
+
+    An entry whose relationships can't be fetched is logged and skipped.
+
+    Args:
+        entries: The entries, possibly still being listed by fetch_entries.
+        user_project: The Google Cloud Project ID billed for the calls.
+        max_workers: Number of relationship fetches running at the same time.
+
+    Yields:
+        The name of each entry with its relationships, in completion order.
+    """
+    entries = iter(entries)
+    entry_names = {}
+    pending = set()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            while True:
+                while len(pending) < 2 * max_workers:
+                    entry = next(entries, None)
+                    if entry is None:
+                        break
+                    future = executor.submit(
+                        fetch_relationships, entry["name"], user_project
+                    )
+                    entry_names[future] = entry["name"]
+                    pending.add(future)
+                if not pending:
+                    return
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    entry_name = entry_names.pop(future)
+                    try:
+                        relationships = future.result()
+                    except Exception as exc:
+                        logger.error(
+                            f"Error fetching relationships for {entry_name}: {exc}"
+                        )
+                        continue
+                    yield entry_name, relationships
+        finally:
+            # The caller stopped reading: drop the fetches not started yet
+            for future in pending:
+                future.cancel()
 
-    return relationships
 
 def fetch_all_relationships(
-    entries: List[Dict[str, Any]], user_project: str,project: str, max_workers: int = MAX_WORKERS
+    entries: Iterable[Dict[str, Any]], user_project: str,project: str, max_workers: int = MAX_WORKERS
 ) -> Dict[str, List[Dict[str, Any]]]:
-    """Fetches relationships for all entries concurrently, processing in batches."""
-    relationships_data = {}
-    chunk_size = max_workers
-    num_batches = math.ceil(len(entries) / chunk_size)
-
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        for batch in range(num_batches):
-            start = batch * chunk_size
-            end = start + chunk_size
-            entries_batch = entries[start:end]
-            future_to_entry = {
-                executor.submit(fetch_relationships, entry["name"], user_project): entry[
-                    "name"
-                ]
-                for entry in entries_batch
-            }
-
-            for future in as_completed(future_to_entry):
-                entry_name = future_to_entry[future]
-                try:
-                    relationships_data[entry_name] = future.result()
-                except Exception as exc:
-                    logger.error(
-                        f"Error fetching relationships for {entry_name}: {exc}"
-                    )
+    """Fetches relationships for all entries concurrently.
 
+    Entries are read from the iterable as workers become free, so that
+    relationships are fetched while the entries of a fetch_entries iterator
+    are listed. Entries whose relationships can't be fetched are logged and
+    left out.
+    """
+    relationships_data = {}
+    listed = 0
+
+    def count_entries():
+        nonlocal listed
+        for entry in entries:
+            listed += 1
+            yield entry
+
+    for entry_name, relationships in iter_all_relationships(
+        count_entries(), user_project, max_workers
+    ):
+        relationships_data[entry_name] = relationships
+    if len(relationships_data) < listed:
+        logger.warning(
+            f"Relationships of {listed - len(relationships_data)} of {listed}"
+            " entries could not be fetched."
+        )
     return relationships_data
 
 
 def fetch_entries(
     user_project: str, project: str, location: str, entry_group: str
-) -> List[Dict[str, Any]]:
-    """Fetches all entries in the glossary.
+) -> Iterator[Dict[str, Any]]:
+    """Yields all entries in the glossary as their pages are listed.
+
+    Pages are fetched by a producer thread, so that the request of the next
+    page is in flight while the caller processes the entries of the previous
+    one. At most ENTRY_PAGES_AHEAD pages are held waiting for the caller.
 
     Args:
+        user_project: The Google Cloud Project ID billed for the calls.
         project: The Google Cloud Project ID.
         location: The location of the glossary.
         entry_group: The entry group of the glossary.
 
-    Returns:
-        A list of dictionaries containing the entries.
+    Yields:
+        Dictionaries describing the entries, in listing order.
     """
-    entries = []
-    get_full_entry_url = (
+    list_entries_url = (
         DATACATALOG_BASE_URL
         + f"/projects/{project}/locations/{location}/entryGroups/{entry_group}/entries?view=FULL&pageSize={PAGE_SIZE}"
     )
-    response = api_call_utils.fetch_api_response(
-        requests.get, get_full_entry_url, user_project
+    pages = queue.Queue(maxsize=ENTRY_PAGES_AHEAD)
+    stop = threading.Event()
+    producer = threading.Thread(
+        target=_fetch_entry_pages,
+        args=(pages, stop, list_entries_url, user_project),
+        name="entry-page-prefetch",
+        daemon=True,
     )
+    producer.start()
+    response = {}
+    try:
+        while (response := pages.get()) is not None:
+            if response["error_msg"]:
+                logger.error(
+                    f"Can't proceed with export. Details: {response['error_msg']}"
+                )
+                sys.exit(1)
+            yield from response["json"].get("entries", [])
+    finally:
+        stop.set()
+        # Makes room for a producer waiting to put a page, until it is done
+        while response is not None:
+            response = pages.get()
+        producer.join()
+
+
+def _fetch_entry_pages(
+    pages: queue.Queue, stop: threading.Event, url: str, user_project: str
+) -> None:
+    """Puts the responses of the pages of a listing in a queue.
 
-    if response["error_msg"]:
-        logger.error(
-        f"Can't proceed with export. Details: {response['error_msg']}"
-        )
-        sys.exit(1)
-
-    with ThreadPoolExecutor() as executor:
-        futures = []
-        page_token = None
-
-        while True:
-            if page_token:
-                endpoint_url = f"{get_full_entry_url}&pageToken={page_token}"
-            else:
-                endpoint_url = get_full_entry_url
+    Args:
+        pages: Queue receiving the response of each page, and None after the
+            last page or the first failed call.
+        stop: Event set when the caller stops reading the pages.
+        url: URL of the first page.
+        user_project: The Google Cloud Project ID billed for the calls.
+    """
+    page_token = None
+    try:
+        while not stop.is_set():
+            endpoint_url = f"{url}&pageToken={page_token}" if page_token else url
+            try:
+                response = api_call_utils.fetch_api_response(
+                    requests.get, endpoint_url, user_project
+                )
+            except Exception as exc:
+                response = {"json": None, "error_msg": str(exc)}
+            pages.put(response)
+            if response["error_msg"]:
+                return
+            page_token = response["json"].get("nextPageToken", None)
+            if not page_token:
+                return
+    finally:
+        pages.put(None)
+
+
+def record_entries(
+    entries: Iterable[Dict[str, Any]], listed: List[Dict[str, Any]]
+) -> Iterator[Dict[str, Any]]:
+    """Yields entries, appending each one to listed.
+
+    Lets a consumer of the fetch_entries iterator, like
+    fetch_all_relationships, start on the entries while the caller keeps them.
+    """
+    for entry in entries:
+        listed.append(entry)
+        yield entry
 
-            future = executor.submit(
-                api_call_utils.fetch_api_response, requests.get, endpoint_url, user_project
-            )
-            futures.append(future)
-
-            # Wait for the current future to complete and process its results
-            for future in as_completed(futures):
-                response = future.result()
-                if response["error_msg"]:
-                    raise ValueError(response["error_msg"])
-                if "entries" in response["json"]:
-                    entries.extend(response["json"]["entries"])
-                page_token = response["json"].get("nextPageToken", None)
-                if not page_token:
-                    return entries
-            # clear the futures list to avoid any memory build-up
-            futures = []
 
 def normalize_glossary_id(glossary: str) -> str:
     """Converts a string to a valid Dataplex glossary_id (lowercase, numbers, hyphens only)."""